@@ -6,10 +6,11 @@ API с полной изоляцией от runtime loop. Предоставля
 на внутреннюю работу системы.
 
 Безопасные endpoints:
-- GET /status - чтение состояния из snapshots
+- GET /status - чтение опубликованного runtime loop состояния (snapshot только при холодном старте)
 - GET /refresh-cache - no-op для совместимости
 - GET /clear-data - очистка логов и snapshots
 - POST /event - добавление внешних событий
+- POST /events - пакетное добавление событий (JSON массив или NDJSON)
 
 Опциональная защита через API ключ для предотвращения случайного доступа.
 """
@@ -17,14 +18,26 @@ API с полной изоляцией от runtime loop. Предоставля
 import os
 from typing import Optional
 
-from fastapi import FastAPI, Header, HTTPException, Query, status
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, ConfigDict
 
+from src.environment.event_ingest import (
+    STATUS_INVALID,
+    STATUS_VALID,
+    BatchTooLargeError,
+    event_from_payload,
+    iter_json_array,
+    iter_ndjson,
+)
+from src.runtime.status_publisher import StatusFileReader, get_published_status
 from src.state.self_state import SelfState
 
 # Конфигурация
 API_KEY = os.getenv("LIFE_API_KEY", None)  # Опциональный API ключ для защиты
 
+# Читатель файла живого статуса, публикуемого runtime loop
+status_file_reader = StatusFileReader()
+
 # Инициализация
 app = FastAPI(
     title="Life Experiment API",
@@ -93,17 +106,26 @@ class ExtendedStatusResponse(BaseModel):
     model_config = ConfigDict(extra="allow")
 
 
-def get_current_state() -> dict:
-    """Получение текущего состояния системы из последнего snapshot."""
-    from src.state.self_state import SelfState
+def get_current_state(limits: Optional[dict] = None) -> dict:
+    """
+    Получение текущего состояния системы.
+
+    Использует опубликованный runtime loop документ статуса (с лимитами - его
+    представление); последний snapshot читается только при холодном старте,
+    когда статус еще не опубликован, и при memory_limit больше числа
+    опубликованных записей памяти.
+    """
+    published = get_published_status(status_file_reader, limits)
+    if published is not None:
+        return published.view(limits).to_dict()
 
     try:
         state = SelfState().load_latest_snapshot()
-        return state.get_safe_status_dict()
+        return state.get_safe_status_dict(limits=limits)
     except FileNotFoundError:
         # Если нет snapshots, возвращаем начальное состояние
         state = SelfState()
-        return state.get_safe_status_dict()
+        return state.get_safe_status_dict(limits=limits)
 
 
 def check_api_access(x_api_key: Optional[str] = Header(None)):
@@ -125,6 +147,7 @@ async def root():
         "endpoints": {
             "status": "/status - состояние системы",
             "event": "/event - создание события",
+            "events": "/events - пакетное создание событий",
             "health": "/health - проверка здоровья API",
             "refresh-cache": "/refresh-cache - обновление кэша",
         },
@@ -154,7 +177,9 @@ async def refresh_cache(x_api_key: Optional[str] = Header(None)):
 
 @app.get("/status", response_model=ExtendedStatusResponse)
 async def get_status(
+    response: Response,
     x_api_key: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     minimal: bool = Query(False, description="Минимальный статус"),
     memory_limit: Optional[int] = Query(None, description="Лимит записей памяти"),
     events_limit: Optional[int] = Query(None, description="Лимит последних событий"),
@@ -162,18 +187,25 @@ async def get_status(
     """Получение статуса системы Life."""
     check_api_access(x_api_key)
 
-    # Получаем текущее состояние
-    status_data = get_current_state()
-
-    # Применяем лимиты если указаны
     limits = {}
     if memory_limit is not None:
         limits["memory_limit"] = memory_limit
     if events_limit is not None:
         limits["events_limit"] = events_limit
 
-    if limits:
-        status_data = SelfState().get_safe_status_dict(limits=limits)
+    # Статус отдается по ETag опубликованного документа (с лимитами - его представления)
+    if not minimal:
+        published = get_published_status(status_file_reader, limits)
+        if published is not None:
+            published = published.view(limits)
+            if published.matches(if_none_match):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                                headers={"ETag": published.etag})
+            response.headers["ETag"] = published.etag
+            return ExtendedStatusResponse(**published.to_dict())
+
+    # Получаем текущее состояние
+    status_data = get_current_state(limits)
 
     if minimal:
         # Для минимального статуса возвращаем только основные метрики
@@ -211,5 +243,45 @@ async def create_event(event: EventCreate, x_api_key: Optional[str] = Header(Non
         metadata=event.metadata,
         message=f"Event '{event.type}' accepted by Life system",
     )
+
+
+@app.post("/events")
+async def create_events(request: Request, x_api_key: Optional[str] = Header(None)):
+    """
+    Пакетное создание событий: JSON массив или NDJSON (по событию в строке).
+
+    Только проверяет элементы: у FastAPI API нет доступа к очереди событий
+    runtime loop, поэтому корректные элементы получают статус "valid", а не
+    "accepted". Постановку в очередь выполняет POST /events main_server_api.
+    """
+    check_api_access(x_api_key)
+
+    raw = (await request.body()).strip()
+    try:
+        items = iter_json_array(raw) if raw.startswith(b"[") else iter_ndjson(raw.splitlines())
+        results = []
+        for index, (payload, error) in enumerate(items):
+            if error is None:
+                try:
+                    event_from_payload(payload)
+                except ValueError as e:
+                    error = str(e)
+            if error is None:
+                results.append({"index": index, "status": STATUS_VALID})
+            else:
+                results.append({"index": index, "status": STATUS_INVALID, "error": error})
+    except BatchTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid batch: {e}")
+
+    invalid = sum(1 for result in results if result["status"] == STATUS_INVALID)
+    return {
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+        "results": results,
+    }
+
+
 # API теперь читает состояние из snapshot файлов,
 # поэтому установка ссылки на живой объект больше не требуется
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark Archive Storage - стоимость сохранения архива памяти по мере его роста.
+
+Сравнивает:
+- legacy: полная перезапись JSON-файла (json.dump всех записей при каждом сохранении)
+- segmented: append-only SegmentedArchiveStorage (дописываются только новые записи)
+
+Ожидаемый результат: время сохранения segmented остается постоянным при росте
+архива до миллионов записей, время legacy растет линейно.
+
+Использование:
+    python scripts/benchmark_archive_storage.py [--total-entries 1000000] [--batch-size 1000]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory.memory import ArchiveMemory
+from src.memory.memory_types import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+
+def make_batch(start: int, size: int) -> List[MemoryEntry]:
+    """Создает пачку записей, похожих на архивируемые из активной памяти."""
+    return [
+        MemoryEntry(
+            event_type=f"benchmark_event_{i % 20}",
+            meaning_significance=0.1 + (i % 10) * 0.09,
+            timestamp=1_700_000_000.0 + i,
+            weight=0.05,
+            subjective_timestamp=float(i),
+        )
+        for i in range(start, start + size)
+    ]
+
+
+def legacy_save(entries: List[MemoryEntry], archive_file: Path) -> None:
+    """Прежняя реализация ArchiveMemory.save_archive (полная перезапись)."""
+    data = {"entries": [asdict(entry) for entry in entries]}
+    with archive_file.open("w") as f:
+        json.dump(data, f, indent=2, default=str)
+
+
+def benchmark_segmented(total_entries: int, batch_size: int, checkpoints: int) -> List[Dict[str, Any]]:
+    """Измеряет время save_archive для сегментированного архива."""
+    results = []
+    report_every = max(1, (total_entries // batch_size) // checkpoints)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        archive = ArchiveMemory(archive_file=Path(tmpdir) / "memory_archive.json")
+        # Индекс архива не участвует в сохранении, пропускаем его ради чистоты замеров
+        archive._index_engine.add_entry = lambda entry: None
+
+        written = 0
+        batch_no = 0
+        while written < total_entries:
+            archive.add_entries(make_batch(written, batch_size))
+            start = time.perf_counter()
+            archive.save_archive()
+            elapsed = time.perf_counter() - start
+            written += batch_size
+            batch_no += 1
+
+            if batch_no % report_every == 0 or written >= total_entries:
+                results.append({"archive_size": written, "save_ms": elapsed * 1000})
+                logger.info(f"[segmented] size={written:>9} save={elapsed * 1000:8.2f} ms")
+
+        logger.info(f"[segmented] storage stats: {archive.get_storage_stats()}")
+    return results
+
+
+def benchmark_legacy(max_entries: int, batch_size: int, checkpoints: int) -> List[Dict[str, Any]]:
+    """Измеряет время полной перезаписи JSON (ограничено max_entries - растет линейно)."""
+    results = []
+    entries: List[MemoryEntry] = []
+    report_every = max(1, (max_entries // batch_size) // checkpoints)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        archive_file = Path(tmpdir) / "memory_archive.json"
+        batch_no = 0
+        while len(entries) < max_entries:
+            entries.extend(make_batch(len(entries), batch_size))
+            batch_no += 1
+            if batch_no % report_every != 0 and len(entries) < max_entries:
+                continue
+            start = time.perf_counter()
+            legacy_save(entries, archive_file)
+            elapsed = time.perf_counter() - start
+            results.append({"archive_size": len(entries), "save_ms": elapsed * 1000})
+            logger.info(f"[legacy]    size={len(entries):>9} save={elapsed * 1000:8.2f} ms")
+    return results
+
+
+def main():
+    """Основная функция для запуска benchmark'а."""
+    parser = argparse.ArgumentParser(description="Archive Storage Benchmark")
+    parser.add_argument("--total-entries", type=int, default=1_000_000,
+                       help="Final archive size for segmented storage (default: 1000000)")
+    parser.add_argument("--legacy-max-entries", type=int, default=100_000,
+                       help="Final archive size for legacy full rewrite (default: 100000)")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                       help="Entries archived per save (default: 1000)")
+    parser.add_argument("--checkpoints", type=int, default=10,
+                       help="Number of reported measurements (default: 10)")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                       help="Enable verbose logging")
+
+    args = parser.parse_args()
+
+    level = logging.DEBUG if args.verbose else logging.INFO
+    logging.basicConfig(level=level, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    legacy = benchmark_legacy(args.legacy_max_entries, args.batch_size, args.checkpoints)
+    segmented = benchmark_segmented(args.total_entries, args.batch_size, args.checkpoints)
+
+    first, last = segmented[0]["save_ms"], segmented[-1]["save_ms"]
+    logger.info(
+        f"Segmented save: {first:.2f} ms at {segmented[0]['archive_size']} entries, "
+        f"{last:.2f} ms at {segmented[-1]['archive_size']} entries"
+    )
+    logger.info(
+        f"Legacy save: {legacy[0]['save_ms']:.2f} ms at {legacy[0]['archive_size']} entries, "
+        f"{legacy[-1]['save_ms']:.2f} ms at {legacy[-1]['archive_size']} entries"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
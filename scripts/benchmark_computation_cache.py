@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark Computation Cache - стоимость ключа и попадания в ComputationCache.
+
+Сравнивает прежний путь ключа (round() каждого аргумента, str() кортежа и
+MD5 строки) с ключом из квантованных чисел пространства имен, затем полное
+попадание в кэш прежним и новым путем с вычислением без кэша. Чистая выгода -
+разница между вычислением без кэша и попаданием: при отрицательной кэш
+медленнее самого вычисления.
+
+Использование:
+    python scripts/benchmark_computation_cache.py [--number 200000] [--repeat 5]
+"""
+
+import argparse
+import hashlib
+import logging
+import sys
+import timeit
+from collections import OrderedDict
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.runtime.computation_cache import ComputationCache, cached_compute_subjective_dt
+from src.runtime.subjective_time import compute_subjective_dt
+
+logger = logging.getLogger(__name__)
+
+SUBJECTIVE_DT_PARAMS = {
+    "dt": 0.1,
+    "base_rate": 1.0,
+    "intensity": 0.37,
+    "stability": 0.82,
+    "energy": 64.5,
+    "intensity_coeff": 1.0,
+    "stability_coeff": 0.5,
+    "energy_coeff": 0.3,
+    "rate_min": 0.1,
+    "rate_max": 3.0,
+    "circadian_phase": 1.2,
+    "recovery_efficiency": 0.9,
+}
+SUBJECTIVE_DT_ARGS = tuple(SUBJECTIVE_DT_PARAMS.values())
+DECISION_ARGS = (7, 0.8312, "noise", 64.5, 0.82)
+VALIDATION_DATA = {"energy": 64.5, "stability": 0.82, "integrity": 0.95, "tags": ["a", "b"]}
+
+
+def legacy_key(*args, **kwargs) -> str:
+    """Прежний ComputationCache._make_cache_key."""
+    sorted_kwargs = sorted(kwargs.items())
+    cache_str = str(args) + str(sorted_kwargs)
+    return hashlib.md5(cache_str.encode()).hexdigest()
+
+
+def legacy_subjective_dt_key(*args) -> str:
+    return legacy_key("subjective_dt", tuple(round(arg, 6) for arg in args))
+
+
+def legacy_decision_key(count, significance, event_type, energy, stability) -> str:
+    return legacy_key(
+        "decision", (count, round(significance, 3), event_type, round(energy, 3),
+                     round(stability, 3))
+    )
+
+
+def make_legacy_cached_subjective_dt():
+    """Прежнее попадание: ключ MD5 и перестановка в конец OrderedDict через pop."""
+    cache = OrderedDict()
+    cache[legacy_subjective_dt_key(*SUBJECTIVE_DT_ARGS)] = compute_subjective_dt(
+        **SUBJECTIVE_DT_PARAMS
+    )
+
+    def cached(**params):
+        cache_key = legacy_subjective_dt_key(*params.values())
+        if cache_key in cache:
+            value = cache.pop(cache_key)
+            cache[cache_key] = value
+            return value
+        return compute_subjective_dt(**params)
+
+    return cached
+
+
+def best_ns(statement, number: int, repeat: int) -> float:
+    """Лучшее время одного вызова в наносекундах."""
+    return min(timeit.repeat(statement, number=number, repeat=repeat)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark computation cache keys")
+    parser.add_argument("--number", type=int, default=200000, help="Вызовов в одном замере")
+    parser.add_argument("--repeat", type=int, default=5, help="Замеров (берется лучший)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    cache = ComputationCache()
+    subjective_dt = cache.namespace("subjective_dt")
+    decision = cache.namespace("decision")
+    validation = cache.namespace("validation")
+
+    def measure(label, statement):
+        elapsed = best_ns(statement, args.number, args.repeat)
+        logger.info(f"  {label} {elapsed:10.1f} ns")
+        return elapsed
+
+    logger.info("=== Построение ключа ===")
+    for name, legacy, new in (
+        (
+            "subjective_dt (12 float)",
+            lambda: legacy_subjective_dt_key(*SUBJECTIVE_DT_ARGS),
+            lambda: subjective_dt.make_key(*SUBJECTIVE_DT_ARGS),
+        ),
+        (
+            "decision (5 аргументов)",
+            lambda: legacy_decision_key(*DECISION_ARGS),
+            lambda: decision.make_key(*DECISION_ARGS),
+        ),
+        (
+            "validation (dict)",
+            lambda: legacy_key("state", VALIDATION_DATA),
+            lambda: ("state", validation.freeze(VALIDATION_DATA)),
+        ),
+    ):
+        logger.info(f"--- {name} ---")
+        legacy_ns = measure("MD5 str(args):      ", legacy)
+        new_ns = measure("квантованный кортеж:", new)
+        logger.info(f"  ускорение: {legacy_ns / new_ns:.1f}x")
+
+    logger.info("=== cached_compute_subjective_dt: попадание против вычисления ===")
+    legacy_cached = make_legacy_cached_subjective_dt()
+    cached_compute_subjective_dt(**SUBJECTIVE_DT_PARAMS)  # Заполняем глобальный кэш
+    uncached_ns = measure(
+        "без кэша:           ", lambda: compute_subjective_dt(**SUBJECTIVE_DT_PARAMS)
+    )
+    legacy_hit_ns = measure("попадание, MD5:     ", lambda: legacy_cached(**SUBJECTIVE_DT_PARAMS))
+    hit_ns = measure(
+        "попадание, кортеж:  ", lambda: cached_compute_subjective_dt(**SUBJECTIVE_DT_PARAMS)
+    )
+    logger.info(
+        f"  чистая выгода попадания: MD5 {uncached_ns - legacy_hit_ns:+.1f} ns, "
+        f"кортеж {uncached_ns - hit_ns:+.1f} ns на вызов"
+    )
+
+
+if __name__ == "__main__":
+    main()
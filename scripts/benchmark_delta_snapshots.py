@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark Delta Snapshots - объем записи и стоимость восстановления дельта-снимков.
+
+Сравнивает:
+- full: save_snapshot (полный snapshot на каждом сохранении)
+- delta: save_delta_snapshot (база раз в --full-every снимков, между ними дельты)
+
+Измеряет байты на snapshot, время сохранения и время восстановления
+последнего тика (load_snapshot) в зависимости от длины цепочки дельт.
+
+Использование:
+    python scripts/benchmark_delta_snapshots.py [--snapshots 50] [--memory-entries 2000] [--full-every 10]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.state.self_state as self_state_module
+from src.memory.memory_types import MemoryEntry
+from src.state.self_state import (
+    SelfState,
+    create_initial_state,
+    load_snapshot,
+    save_delta_snapshot,
+    save_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+TICKS_PER_SNAPSHOT = 10
+NEW_ENTRIES_PER_SNAPSHOT = 5
+
+
+def make_state(memory_entries: int) -> SelfState:
+    """Создает состояние с заполненной памятью."""
+    state = create_initial_state()
+    for i in range(memory_entries):
+        state.memory.append(
+            MemoryEntry(
+                event_type=f"benchmark_event_{i % 20}",
+                meaning_significance=0.1 + (i % 10) * 0.09,
+                timestamp=1_700_000_000.0 + i,
+                weight=0.5,
+            )
+        )
+    return state
+
+
+def advance(state: SelfState, snapshot_index: int) -> None:
+    """Имитирует изменения состояния между снимками."""
+    state.ticks += TICKS_PER_SNAPSHOT
+    state.energy = max(0.0, state.energy - 0.1)
+    state.stability = max(0.0, state.stability - 0.05)
+    for i in range(NEW_ENTRIES_PER_SNAPSHOT):
+        state.memory.append(
+            MemoryEntry(
+                event_type="noise",
+                meaning_significance=0.3,
+                timestamp=1_800_000_000.0 + snapshot_index * NEW_ENTRIES_PER_SNAPSHOT + i,
+            )
+        )
+
+
+def run_mode(
+    name: str, saver: Callable[[SelfState], None], snapshots: int, memory_entries: int
+) -> Dict[str, Any]:
+    """Сохраняет серию снимков и измеряет объем, время сохранения и восстановления."""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        self_state_module.SNAPSHOT_DIR = directory
+        self_state_module._delta_chains.clear()
+
+        state = make_state(memory_entries)
+        save_times = []
+        for index in range(snapshots):
+            advance(state, index)
+            start = time.perf_counter()
+            saver(state)
+            save_times.append((time.perf_counter() - start) * 1000)
+
+        files = [p for p in directory.iterdir() if p.name.startswith("snapshot_") and p.is_file()]
+        total_bytes = sum(p.stat().st_size for p in files)
+
+        load_times = []
+        for _ in range(5):
+            start = time.perf_counter()
+            load_snapshot(state.ticks)
+            load_times.append((time.perf_counter() - start) * 1000)
+
+    result = {
+        "mode": name,
+        "bytes_per_snapshot": total_bytes / snapshots,
+        "save_ms_median": statistics.median(save_times),
+        "load_latest_ms_median": statistics.median(load_times),
+    }
+    logger.info(
+        f"{name:>6}: {result['bytes_per_snapshot'] / 1024:8.1f} KiB/snapshot, "
+        f"save {result['save_ms_median']:7.2f} ms, "
+        f"load latest {result['load_latest_ms_median']:7.2f} ms"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark delta snapshots")
+    parser.add_argument("--snapshots", type=int, default=50, help="Количество снимков")
+    parser.add_argument(
+        "--memory-entries", type=int, default=2000, help="Начальный размер памяти"
+    )
+    parser.add_argument("--full-every", type=int, default=10, help="Периодичность баз")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Логи сохранения/загрузки snapshot не нужны в выводе бенчмарка
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    original_dir = self_state_module.SNAPSHOT_DIR
+    try:
+        full = run_mode("full", save_snapshot, args.snapshots, args.memory_entries)
+        delta = run_mode(
+            "delta",
+            lambda s: save_delta_snapshot(s, full_every=args.full_every),
+            args.snapshots,
+            args.memory_entries,
+        )
+    finally:
+        self_state_module.SNAPSHOT_DIR = original_dir
+
+    ratio = full["bytes_per_snapshot"] / max(delta["bytes_per_snapshot"], 1)
+    logger.info(f"Сокращение объема записи: x{ratio:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark Event Ingest - событий в секунду через POST /event и POST /events.
+
+Поднимает LifeHandler на свободном порту и отправляет одинаковое количество
+событий по одному (POST /event на событие, как прежний generator_cli) и
+пакетами NDJSON через POST /events разных размеров. Очередь опустошается
+фоновым потоком, как это делает runtime loop.
+
+Использование:
+    python scripts/benchmark_event_ingest.py [--events 2000] [--batch-sizes 10,100,1000]
+"""
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+
+from src.environment.event_queue import EventQueue
+from src.environment.generator_cli import send_event, send_events
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+
+logger = logging.getLogger(__name__)
+
+
+def make_payloads(count: int) -> list:
+    return [
+        {"type": "noise", "intensity": 0.1, "timestamp": time.time(), "metadata": {"i": i}}
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark POST /event vs POST /events")
+    parser.add_argument("--events", type=int, default=2000, help="Событий на каждый прогон")
+    parser.add_argument("--batch-sizes", default="10,100,1000", help="Размеры пакетов через запятую")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    server = StoppableHTTPServer(("localhost", 0), LifeHandler)
+    server.event_queue = EventQueue(enable_silence_detection=False, capacity=args.events)
+    server.dev_mode = False
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    host, port = server.server_address[0], server.server_address[1]
+
+    received = [0]
+    stop = threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            received[0] += len(server.event_queue.pop_all())
+            time.sleep(0.01)
+
+    drain_thread = threading.Thread(target=drain, daemon=True)
+    drain_thread.start()
+
+    payloads = make_payloads(args.events)
+    results = []
+    try:
+        with requests.Session() as session:
+            start = time.perf_counter()
+            for payload in payloads:
+                send_event(host, port, payload, session=session)
+            results.append(("single", time.perf_counter() - start))
+
+            for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+                start = time.perf_counter()
+                for offset in range(0, len(payloads), batch_size):
+                    send_events(host, port, payloads[offset : offset + batch_size], session=session)
+                results.append((f"batch={batch_size}", time.perf_counter() - start))
+    finally:
+        time.sleep(0.05)
+        stop.set()
+        drain_thread.join(timeout=1.0)
+        received[0] += len(server.event_queue.pop_all())
+        server.shutdown()
+
+    single_rate = args.events / results[0][1]
+    for name, elapsed in results:
+        rate = args.events / elapsed
+        logger.info(f"{name:12s} {rate:10.0f} events/s  ({elapsed:6.3f} s, x{rate / single_rate:6.1f})")
+    logger.info(f"received {received[0]} / {args.events * len(results)} events")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from src.environment.event import Event
-from src.meaning.engine import MeaningEngine
+from src.meaning.engine import HAS_NUMPY, MeaningEngine, MeaningStateView
 from src.state.self_state import SelfState
 from src.runtime.adaptive_batch_sizer import AdaptiveBatchSizer
 
@@ -367,6 +367,54 @@ class EventProcessingBenchmark:
 
         logger.info(f"Benchmark plots saved to {output_dir}")
 
+    def benchmark_batch_appraisal(self,
+                                  batch_size: int,
+                                  events: List[Event],
+                                  runs: int = 5) -> Dict[str, float]:
+        """
+        Сравнивает пропускную способность MeaningEngine.process (по одному событию)
+        и MeaningEngine.process_batch на одних и тех же батчах.
+
+        Args:
+            batch_size: Размер батча
+            events: Список событий для обработки
+            runs: Количество прогонов (берется медиана)
+
+        Returns:
+            Dict с событиями в секунду для обоих путей
+        """
+        state = SelfState()
+        view = MeaningStateView(state)
+        batches = [events[i:i + batch_size] for i in range(0, len(events), batch_size)]
+
+        scalar_rates = []
+        batch_rates = []
+        for _ in range(runs):
+            engine = MeaningEngine()
+            start = time.perf_counter()
+            for batch in batches:
+                for event in batch:
+                    engine.process(event, view)
+            scalar_rates.append(len(events) / (time.perf_counter() - start))
+
+            engine = MeaningEngine()
+            start = time.perf_counter()
+            for batch in batches:
+                meanings = engine.process_batch(batch, view)
+                for index in range(len(batch)):
+                    meanings.meaning(index)
+            batch_rates.append(len(events) / (time.perf_counter() - start))
+
+        result = {
+            "batch_size": batch_size,
+            "scalar_events_per_sec": statistics.median(scalar_rates),
+            "batch_events_per_sec": statistics.median(batch_rates),
+        }
+        logger.info(f"Batch appraisal (batch_size={batch_size}, numpy={HAS_NUMPY}): "
+                   f"process {result['scalar_events_per_sec']:.0f} events/sec, "
+                   f"process_batch {result['batch_events_per_sec']:.0f} events/sec")
+        return result
+
     def test_adaptive_batching(self) -> Dict[str, Any]:
         """Тестирует работу адаптивного батчинга."""
         logger.info("Testing adaptive batch sizing...")
@@ -458,6 +506,12 @@ def main():
     # Создание графиков
     benchmark.plot_results(results)
 
+    # Сравнение скалярного и пакетного пути MeaningEngine
+    logger.info("Comparing MeaningEngine.process and process_batch...")
+    batch_events = benchmark.generate_test_events(10000, "mixed")
+    for batch_size in [25, 100, 500]:
+        benchmark.benchmark_batch_appraisal(batch_size, batch_events)
+
     # Тестирование адаптивного батчинга
     logger.info("Testing adaptive batch sizing...")
     adaptive_results = benchmark.test_adaptive_batching()
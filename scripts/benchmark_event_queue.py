@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark Event Queue - пропускная способность, задержка и потери EventQueue.
+
+Несколько производителей пушат события, потребитель раз в тик забирает их
+через pop_all (как runtime loop) и после остановки производителей дочитывает
+очередь до конца, включая выгруженные на диск события SPILL. Сравнивает
+прежнюю реализацию (queue.Queue(maxsize=100) + RLock, pop_all через
+get_nowait в цикле) с EventQueue для каждой политики переполнения.
+
+Использование:
+    python scripts/benchmark_event_queue.py [--producers 4] [--events 20000] [--capacity 100]
+"""
+
+import argparse
+import logging
+import queue
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.environment.event import Event
+from src.environment.event_queue import EventQueue, OverflowPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class LegacyEventQueue:
+    """Прежняя реализация EventQueue: queue.Queue + RLock на каждую операцию."""
+
+    def __init__(self, capacity: int):
+        self._queue = queue.Queue(maxsize=capacity)
+        self._lock = threading.RLock()
+        self._dropped = 0
+
+    def push(self, event: Event) -> None:
+        with self._lock:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                self._dropped += 1
+
+    def pop_all(self) -> list:
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def get_dropped_events_count(self) -> int:
+        return self._dropped
+
+
+def run(event_queue, producers: int, events: int, tick: float) -> dict:
+    """Прогон производителей и потребителя; возвращает пропускную способность и потери."""
+    per_producer = events // producers
+    consumed = [0]
+    latencies = []
+    done = threading.Event()
+
+    def produce():
+        for i in range(per_producer):
+            event_queue.push(Event(type="noise", intensity=0.1, timestamp=time.time(), metadata={"i": i}))
+
+    def consume():
+        while True:
+            finished = done.is_set()
+            now = time.time()
+            batch = event_queue.pop_all()
+            consumed[0] += len(batch)
+            latencies.extend(now - event.timestamp for event in batch)
+            if finished and not batch:
+                break
+            time.sleep(tick)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    start = time.perf_counter()
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    produce_time = time.perf_counter() - start
+    done.set()
+    consumer.join()
+
+    latencies.sort()
+    metrics = event_queue.get_metrics() if hasattr(event_queue, "get_metrics") else {}
+    return {
+        "throughput": producers * per_producer / produce_time,
+        "consumed": consumed[0],
+        "dropped": event_queue.get_dropped_events_count(),
+        "coalesced": metrics.get("coalesced", 0),
+        "p99_latency": latencies[int((len(latencies) - 1) * 0.99)] if latencies else 0.0,
+    }
+
+
+def report(name: str, result: dict, total: int) -> None:
+    logger.info(
+        f"{name:12s} push={result['throughput']:10.0f} ev/s  consumed={result['consumed']:6d}/{total}  "
+        f"dropped={result['dropped']:6d}  coalesced={result['coalesced']:6d}  "
+        f"p99 latency={result['p99_latency'] * 1000:8.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark EventQueue overflow policies")
+    parser.add_argument("--producers", type=int, default=4, help="Количество потоков-производителей")
+    parser.add_argument("--events", type=int, default=20000, help="Всего событий")
+    parser.add_argument("--capacity", type=int, default=100, help="Емкость очереди")
+    parser.add_argument("--tick", type=float, default=0.01, help="Период pop_all потребителя (сек)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src").setLevel(logging.ERROR)
+
+    total = args.events // args.producers * args.producers
+    report("legacy", run(LegacyEventQueue(args.capacity), args.producers, args.events, args.tick), total)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for policy in OverflowPolicy:
+            event_queue = EventQueue(
+                enable_silence_detection=False,
+                capacity=args.capacity,
+                overflow_policy=policy,
+                block_timeout=1.0,
+                spill_path=Path(tmp) / "spill.jsonl",
+            )
+            result = run(event_queue, args.producers, args.events, args.tick)
+            event_queue.close()
+            report(policy.value, result, total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark Load Sampling - задержка AdaptiveBatchSizer.get_optimal_batch_size.
+
+Сравнивает прежний синхронный замер нагрузки (psutil.cpu_percent(interval=0.1)
+на каждом тике с событиями) с чтением снимка фонового SystemLoadSampler.
+Регрессия: задержка вызова не должна включать интервал замера CPU.
+
+Использование:
+    python scripts/benchmark_load_sampling.py [--calls 200] [--legacy-calls 10]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import psutil
+
+from src.runtime.adaptive_batch_sizer import AdaptiveBatchSizer
+from src.runtime.system_load_sampler import SystemLoadSampler
+
+logger = logging.getLogger(__name__)
+
+# Интервал замера CPU в прежней реализации _collect_system_metrics
+LEGACY_CPU_INTERVAL = 0.1
+
+
+def legacy_collect_system_metrics():
+    """Прежний синхронный замер нагрузки (блокируется на LEGACY_CPU_INTERVAL)."""
+    return {
+        "cpu_percent": psutil.cpu_percent(interval=LEGACY_CPU_INTERVAL),
+        "memory_percent": psutil.virtual_memory().percent,
+        "load_avg": psutil.getloadavg(),
+        "timestamp": time.time(),
+    }
+
+
+def measure(sizer: AdaptiveBatchSizer, calls: int) -> list:
+    """Задержки get_optimal_batch_size в миллисекундах."""
+    latencies = []
+    for tick in range(calls):
+        start = time.perf_counter()
+        sizer.get_optimal_batch_size(current_tick=tick)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list) -> None:
+    logger.info(
+        f"{name:10s} median={statistics.median(latencies):8.3f} ms  "
+        f"max={max(latencies):8.3f} ms  calls={len(latencies)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark AdaptiveBatchSizer load sampling")
+    parser.add_argument("--calls", type=int, default=200, help="Вызовов с фоновым сэмплером")
+    parser.add_argument("--legacy-calls", type=int, default=10, help="Вызовов с синхронным замером")
+    parser.add_argument("--period", type=float, default=1.0, help="Период фонового сэмплера (сек)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    legacy_sizer = AdaptiveBatchSizer(adaptation_interval=1)
+    legacy_sizer._collect_system_metrics = legacy_collect_system_metrics
+    legacy = measure(legacy_sizer, args.legacy_calls)
+
+    sampler = SystemLoadSampler(period=args.period)
+    sampler.start()
+    try:
+        sampled = measure(AdaptiveBatchSizer(adaptation_interval=1, load_sampler=sampler), args.calls)
+    finally:
+        sampler.stop()
+
+    report("legacy", legacy)
+    report("sampler", sampled)
+
+    if max(sampled) >= LEGACY_CPU_INTERVAL * 1000:
+        logger.error("REGRESSION: задержка get_optimal_batch_size включает интервал замера CPU")
+        sys.exit(1)
+    logger.info("OK: задержка тика не включает интервал замера CPU")
+
+
+if __name__ == "__main__":
+    main()
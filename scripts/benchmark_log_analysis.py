@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark Log Analysis - полный разбор лога против инкрементального анализатора.
+
+Создает структурированный лог из N записей и моделирует периодический анализ
+ActiveRuntimeAnalysisEngine: между анализами в лог дописывается порция записей.
+Прежняя схема на каждом анализе разбирает весь файл тремя функциями
+log_analysis (get_performance_metrics, get_error_summary, analyze_logs),
+IncrementalLogAnalyzer - только дописанные строки.
+
+Использование:
+    python scripts/benchmark_log_analysis.py [--entries 200000] [--append 2000] [--rounds 5]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.observability import log_analysis
+from src.observability.incremental_log_analyzer import IncrementalLogAnalyzer
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("event", "meaning", "decision", "action", "feedback")
+
+
+def write_entries(path: Path, start: int, count: int) -> None:
+    """Дописывает count записей: тики, цепочки обработки событий и редкие ошибки."""
+    lines = []
+    for i in range(start, start + count):
+        timestamp = 1_000_000.0 + i * 0.01
+        kind = i % 10
+        if kind == 0:
+            lines.append({"timestamp": timestamp, "stage": "tick_start", "tick_number": i})
+        elif kind == 9:
+            lines.append({"timestamp": timestamp, "stage": "tick_end", "tick_number": i - 9})
+        elif i % 997 == 0:
+            lines.append({
+                "timestamp": timestamp,
+                "stage": "error_decision",
+                "correlation_id": "system_error",
+                "error_type": "ValueError",
+                "error_message": "synthetic",
+            })
+        else:
+            lines.append({
+                "timestamp": timestamp,
+                "stage": STAGES[kind % len(STAGES)],
+                "correlation_id": f"chain_{i // 10}",
+                "event_type": "noise",
+                "data": {"pattern": "ignore", "intensity": 0.5},
+            })
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(json.dumps(line) + "\n" for line in lines))
+
+
+def full_analysis(path: Path) -> None:
+    log_analysis.get_performance_metrics(str(path))
+    log_analysis.get_error_summary(str(path))
+    log_analysis.analyze_logs(str(path))
+
+
+def incremental_analysis(analyzer: IncrementalLogAnalyzer) -> None:
+    analyzer.update()
+    analyzer.get_performance_metrics()
+    analyzer.get_error_summary()
+    analyzer.get_log_analysis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark full vs incremental log analysis")
+    parser.add_argument("--entries", type=int, default=200000, help="Записей в исходном логе")
+    parser.add_argument("--append", type=int, default=2000, help="Записей между анализами")
+    parser.add_argument("--rounds", type=int, default=5, help="Количество анализов")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "structured_log.jsonl"
+        write_entries(path, 0, args.entries)
+        analyzer = IncrementalLogAnalyzer(str(path), max_bytes_per_update=None)
+
+        start = time.perf_counter()
+        incremental_analysis(analyzer)
+        initial = time.perf_counter() - start
+        size_mb = path.stat().st_size / (1024 * 1024)
+        logger.info(f"Лог: {args.entries} записей, {size_mb:.1f} МБ")
+        logger.info(f"Первичный разбор инкрементальным анализатором: {initial * 1000:.1f} ms")
+
+        full_times = []
+        incremental_times = []
+        written = args.entries
+        for _ in range(args.rounds):
+            write_entries(path, written, args.append)
+            written += args.append
+
+            start = time.perf_counter()
+            full_analysis(path)
+            full_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            incremental_analysis(analyzer)
+            incremental_times.append(time.perf_counter() - start)
+
+        full_avg = sum(full_times) / len(full_times)
+        incremental_avg = sum(incremental_times) / len(incremental_times)
+        logger.info(f"Анализ после дописывания {args.append} записей (среднее за {args.rounds}):")
+        logger.info(f"  полный разбор:     {full_avg * 1000:9.1f} ms")
+        logger.info(f"  инкрементальный:   {incremental_avg * 1000:9.1f} ms")
+        logger.info(f"  ускорение:         {full_avg / incremental_avg:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark Meaning Batch - пропускная способность _process_events_batch.
+
+Прогоняет батчи событий смешанных типов через _process_events_batch
+(MeaningEngine, Decision, Action, Memory) с заглушками логгера и sink'ов
+и измеряет количество событий в секунду. Отдельно измеряет
+MeaningEngine.appraisal на одном и том же состоянии.
+
+Использование:
+    python scripts/benchmark_meaning_batch.py [--batches 400] [--batch-size 25] [--repeats 5]
+"""
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.environment.event import Event
+from src.meaning.engine import MeaningEngine
+from src.runtime.loop import _process_events_batch
+from src.state.self_state import create_initial_state
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = (
+    "noise",
+    "decay",
+    "recovery",
+    "shock",
+    "idle",
+    "social_conflict",
+    "insight",
+    "joy",
+    "fear",
+    "boredom",
+)
+# Ограничение памяти, чтобы стоимость activate_memory не росла по ходу прогона
+MEMORY_LIMIT = 500
+
+
+class _NullSink:
+    """Заглушка StructuredLogger, PassiveDataSink и AsyncDataSink."""
+
+    def log_event(self, *args, **kwargs):
+        return "benchmark"
+
+    def log_meaning(self, *args, **kwargs):
+        pass
+
+    def log_decision(self, *args, **kwargs):
+        pass
+
+    def log_action(self, *args, **kwargs):
+        pass
+
+    def receive_data(self, *args, **kwargs):
+        pass
+
+
+def make_batches(batches: int, batch_size: int, seed: int = 42):
+    """Генерирует воспроизводимые батчи событий."""
+    rng = random.Random(seed)
+    return [
+        [
+            Event(type=rng.choice(EVENT_TYPES), intensity=rng.uniform(-1.0, 1.0), timestamp=0.0)
+            for _ in range(batch_size)
+        ]
+        for _ in range(batches)
+    ]
+
+
+def bench_process_batch(batches, repeats: int) -> float:
+    """События в секунду через _process_events_batch (медиана по повторам)."""
+    sink = _NullSink()
+    rates = []
+    for _ in range(repeats):
+        state = create_initial_state()
+        engine = MeaningEngine()
+        pending_actions = []
+        events = 0
+        start = time.perf_counter()
+        for batch in batches:
+            _process_events_batch(
+                batch, state, engine, sink, sink, sink, None, pending_actions, None
+            )
+            events += len(batch)
+            if len(state.memory) > MEMORY_LIMIT:
+                del state.memory[: len(state.memory) - MEMORY_LIMIT]
+            pending_actions.clear()
+            # Не даем состоянию деградировать до нуля за время прогона
+            state.energy = 80.0
+            state.stability = 0.6
+            state.integrity = 0.9
+        rates.append(events / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def bench_appraisal(batches, repeats: int) -> float:
+    """Вызовы MeaningEngine.appraisal в секунду на SelfState (медиана по повторам)."""
+    events = [event for batch in batches for event in batch]
+    state = create_initial_state()
+    engine = MeaningEngine()
+    rates = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for event in events:
+            engine.appraisal(event, state)
+        rates.append(len(events) / (time.perf_counter() - start))
+    return statistics.median(rates)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MeaningEngine batch processing")
+    parser.add_argument("--batches", type=int, default=400, help="Количество батчей")
+    parser.add_argument("--batch-size", type=int, default=25, help="Событий в батче")
+    parser.add_argument("--repeats", type=int, default=5, help="Повторов измерения")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Логи runtime не нужны в выводе бенчмарка
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    batches = make_batches(args.batches, args.batch_size)
+    batch_rate = bench_process_batch(batches, args.repeats)
+    appraisal_rate = bench_appraisal(batches, args.repeats)
+
+    logger.info(f"_process_events_batch: {batch_rate:10.0f} events/s")
+    logger.info(f"MeaningEngine.appraisal: {appraisal_rate:10.0f} calls/s")
+
+
+if __name__ == "__main__":
+    main()
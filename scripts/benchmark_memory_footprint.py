@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark Memory Footprint - память и проходы по архиву: list[MemoryEntry] против
+ColumnarEntryStore.
+
+Для N архивных записей измеряет (tracemalloc):
+- память списка объектов MemoryEntry и колоночного хранилища
+- память ArchiveMemory в колоночном режиме до построения индекса
+и время проходов:
+- статистики архива (сумма значимости, min/max времени) - ArchiveMemory.get_statistics
+- LearningEngine.process_statistics
+
+Использование:
+    python scripts/benchmark_memory_footprint.py [--entries 1000000] [--feedback-ratio 0.05]
+"""
+
+import argparse
+import gc
+import logging
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.learning.learning import LearningEngine
+from src.memory.columnar_store import HAS_NUMPY, ColumnarEntryStore
+from src.memory.memory import ArchiveMemory
+from src.memory.memory_types import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ["noise", "decay", "recovery", "shock", "idle", "memory_echo", "feedback"]
+
+
+def generate_entries(count: int, feedback_ratio: float, seed: int):
+    """Записи с разными значениями float (как в реальном архиве) и редким feedback_data."""
+    rng = random.Random(seed)
+    for i in range(count):
+        event_type = EVENT_TYPES[i % len(EVENT_TYPES)]
+        feedback_data = None
+        if event_type == "feedback" and rng.random() < feedback_ratio * len(EVENT_TYPES):
+            feedback_data = {"action_pattern": "dampen", "state_delta": {"energy": -0.01}}
+        yield MemoryEntry(
+            event_type=event_type,
+            meaning_significance=rng.random(),
+            timestamp=1_700_000_000.0 + i * 0.5,
+            weight=rng.random(),
+            feedback_data=feedback_data,
+            subjective_timestamp=1_700_000_000.0 + i * 0.4 if i % 2 else None,
+        )
+
+
+def measure(build):
+    """Строит объект и возвращает (объект, занятые байты, секунды построения)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def timed(func, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def list_statistics(entries):
+    """Проход ArchiveMemory.get_statistics для списка MemoryEntry."""
+    total_significance = sum(entry.meaning_significance for entry in entries)
+    timestamps = [entry.timestamp for entry in entries]
+    return total_significance / len(entries), min(timestamps), max(timestamps)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark archived entries memory footprint")
+    parser.add_argument("--entries", type=int, default=1000000, help="Архивных записей")
+    parser.add_argument(
+        "--feedback-ratio", type=float, default=0.05, help="Доля записей с feedback_data"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора данных")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src.memory.index_engine").setLevel(logging.WARNING)
+    count = args.entries
+    logger.info(f"Записей: {count:,}, numpy: {HAS_NUMPY}")
+
+    def generate():
+        return generate_entries(count, args.feedback_ratio, args.seed)
+
+    entries, list_bytes, list_time = measure(lambda: list(generate()))
+    store, store_bytes, store_time = measure(lambda: ColumnarEntryStore(generate()))
+    logger.info("Память:")
+    logger.info(
+        f"  list[MemoryEntry]:   {list_bytes / 2**20:8.1f} МБ  "
+        f"({list_bytes / count:6.1f} Б/запись, построение {list_time:.2f} s)"
+    )
+    logger.info(
+        f"  ColumnarEntryStore:  {store_bytes / 2**20:8.1f} МБ  "
+        f"({store_bytes / count:6.1f} Б/запись, построение {store_time:.2f} s)"
+    )
+    logger.info(f"  сокращение:          {list_bytes / store_bytes:8.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+
+        def build_archive():
+            archive = ArchiveMemory(archive_file=Path(tmp) / "archive.json", columnar=True)
+            archive.add_entries(generate())
+            return archive
+
+        archive, archive_bytes, archive_time = measure(build_archive)
+        logger.info(
+            f"  ArchiveMemory(columnar=True): {archive_bytes / 2**20:8.1f} МБ "
+            f"(add_entries {archive_time:.2f} s, до построения индекса)"
+        )
+
+        logger.info("Проходы (лучшее из 3):")
+        list_stats = timed(lambda: list_statistics(entries))
+        store_stats = timed(archive.get_statistics)
+        logger.info(f"  статистика архива, list:     {list_stats * 1000:9.1f} ms")
+        logger.info(f"  статистика архива, columnar: {store_stats * 1000:9.1f} ms")
+
+        engine = LearningEngine()
+        list_learning = timed(lambda: engine.process_statistics(entries))
+        store_learning = timed(lambda: engine.process_statistics(store))
+        logger.info(f"  process_statistics, list:     {list_learning * 1000:9.1f} ms")
+        logger.info(f"  process_statistics, columnar: {store_learning * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
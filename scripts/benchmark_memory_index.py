@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark Memory Index - пропускная способность MemoryIndexEngine.
+
+Для каждого размера индекса измеряет:
+- построение индекса (rebuild_indexes)
+- добавление записей (add_entry)
+- удаление случайных записей (remove_entry)
+- повторяющиеся запросы без кэша и с кэшем на фоне добавления записей
+  других типов (точечная инвалидация сохраняет закэшированные результаты)
+- план выборочного запроса (MemoryIndexEngine.explain)
+
+Использование:
+    python scripts/benchmark_memory_index.py [--sizes 10000 100000 1000000] [--ops 10000]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory.index_engine import HAS_SORTEDCONTAINERS, MemoryIndexEngine, MemoryQuery
+from src.memory.memory_types import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = [f"event_{i}" for i in range(20)]
+
+
+def make_entries(count: int, rng: random.Random, offset: int = 0):
+    """Записи с равномерно распределенными типами, значимостью, временем и весом."""
+    return [
+        MemoryEntry(
+            event_type=EVENT_TYPES[i % len(EVENT_TYPES)],
+            meaning_significance=rng.random(),
+            timestamp=1_000_000.0 + offset + i,
+            weight=rng.random(),
+        )
+        for i in range(count)
+    ]
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:12,.0f} ops/s  ({seconds / count * 1e6:8.2f} us/op)"
+
+
+def make_queries(size: int):
+    """Выборочные запросы: тип события + диапазоны значимости и времени."""
+    return [
+        MemoryQuery(
+            event_type=EVENT_TYPES[i],
+            min_significance=0.9,
+            start_timestamp=1_000_000.0 + size * 0.9,
+            limit=20,
+        )
+        for i in range(5)
+    ]
+
+
+def benchmark_size(size: int, ops: int, queries: int, seed: int) -> None:
+    rng = random.Random(seed)
+    entries = make_entries(size, rng)
+    logger.info(f"--- {size:,} записей ---")
+
+    engine = MemoryIndexEngine()
+    start = time.perf_counter()
+    engine.rebuild_indexes(entries)
+    logger.info(f"  rebuild_indexes:   {time.perf_counter() - start:8.2f} s")
+
+    # Добавление поверх индекса заданного размера
+    new_entries = make_entries(ops, rng, offset=size)
+    start = time.perf_counter()
+    for entry in new_entries:
+        engine.add_entry(entry)
+    logger.info(f"  add_entry:         {rate(ops, time.perf_counter() - start)}")
+
+    # Удаление случайных записей
+    to_remove = rng.sample(entries, min(ops, size))
+    start = time.perf_counter()
+    for entry in to_remove:
+        engine.remove_entry(entry)
+    logger.info(f"  remove_entry:      {rate(len(to_remove), time.perf_counter() - start)}")
+
+    query_set = make_queries(size)
+
+    # Запросы без кэша
+    uncached = MemoryIndexEngine(enable_query_cache=False)
+    uncached.rebuild_indexes(list(engine.entries_by_id.values()))
+    start = time.perf_counter()
+    for i in range(queries):
+        uncached.search(query_set[i % len(query_set)])
+    logger.info(f"  search (no cache): {rate(queries, time.perf_counter() - start)}")
+    plan = uncached.explain(query_set[0])
+    logger.info(
+        f"  план запроса: {plan['access_path']}, кандидатов {plan['candidates']:,} "
+        f"(пути: {plan['paths']}), найдено {plan['matched']:,}"
+    )
+    del uncached
+
+    # Запросы с кэшем; между запросами добавляются записи типа, не входящего в запросы
+    engine.clear_cache()
+    background = [
+        MemoryEntry("background", rng.random(), 2_000_000.0 + i, rng.random())
+        for i in range(queries)
+    ]
+    start = time.perf_counter()
+    for i in range(queries):
+        engine.add_entry(background[i])
+        engine.search(query_set[i % len(query_set)])
+    elapsed = time.perf_counter() - start
+    stats = engine.get_stats()
+    logger.info(
+        f"  add + search:      {rate(queries, elapsed)}  "
+        f"hit rate {stats['cache_hit_rate'] * 100:.1f}%"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MemoryIndexEngine throughput")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10000, 100000, 1000000],
+        help="Размеры индекса",
+    )
+    parser.add_argument("--ops", type=int, default=10000, help="Добавлений и удалений на размер")
+    parser.add_argument("--queries", type=int, default=2000, help="Запросов на размер")
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора данных")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src.memory.index_engine").setLevel(logging.WARNING)
+    backend = "sortedcontainers" if HAS_SORTEDCONTAINERS else "bisect"
+    logger.info(f"Упорядоченные индексы: {backend}")
+
+    for size in args.sizes:
+        benchmark_size(size, args.ops, args.queries, args.seed)
+
+
+if __name__ == "__main__":
+    main()
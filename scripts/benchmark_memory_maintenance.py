@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark Memory Maintenance - стоимость batch_memory_maintenance на вызов.
+
+Сравнивает прежний построчный проход (decay_weights + archive_old_entries,
+каждый со своим циклом по записям) с ядром maintenance_pass - векторным
+путем numpy и циклом Python. Перед каждым вызовом память восстанавливается
+в исходное состояние (вне замера). Прежняя архивация удаляет записи через
+list.remove (O(n) на запись), поэтому построчный проход замеряется только до
+--legacy-max-size записей. При массовой архивации новый путь помечает индекс
+устаревшим (перестройка - при следующем чтении), поэтому она в замер не входит.
+
+Использование:
+    python scripts/benchmark_memory_maintenance.py [--sizes 50 10000 1000000]
+        [--legacy-max-size 100000]
+"""
+
+import argparse
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.memory import maintenance_kernel
+from src.memory.memory import ArchiveMemory, Memory
+from src.memory.memory_types import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+PARAMS = {
+    "decay_factor": 0.99,
+    "min_weight": 0.1,
+    "max_age_seconds": 604800,
+    "archive_min_weight": 0.1,
+    "archive_min_significance": 0.0,
+}
+
+
+def legacy_maintenance(memory: Memory, decay_factor, min_weight, max_age_seconds,
+                       archive_min_weight, archive_min_significance):
+    """Прежний построчный проход: затухание, затем отдельный проход архивации."""
+    index_engine = memory._ensure_index()
+    current_time = time.time()
+    decay_factor_clamped = max(0.9, min(1.0, decay_factor))
+    for entry in memory:
+        entry.weight *= decay_factor_clamped
+        age = current_time - entry.timestamp
+        entry.weight *= 1.0 / (1.0 + age / 86400.0)
+        entry.weight *= 0.5 + 0.5 * entry.meaning_significance
+        if entry.weight < min_weight:
+            entry.weight = min_weight
+    index_engine.refresh_weights()
+
+    cutoff_time = time.time() - max_age_seconds
+    to_archive = [
+        entry
+        for entry in memory
+        if entry.timestamp < cutoff_time
+        or entry.weight < archive_min_weight
+        or entry.meaning_significance < archive_min_significance
+    ]
+    for entry in to_archive:
+        if entry in memory:
+            list.remove(memory, entry)
+            index_engine.remove_entry(entry)
+
+
+def make_values(count: int, rng: random.Random):
+    now = time.time()
+    return [
+        (rng.uniform(0.05, 1.0), now - rng.uniform(0.0, 10 * 86400.0), rng.random())
+        for _ in range(count)
+    ]
+
+
+def build_memory(values, archive: ArchiveMemory) -> Memory:
+    memory = Memory(archive=archive)
+    list.extend(
+        memory,
+        [
+            MemoryEntry("event", significance, timestamp, weight)
+            for weight, timestamp, significance in values
+        ],
+    )
+    memory._mark_index_stale()
+    memory._ensure_index()
+    return memory
+
+
+def measure(values, archive, run, repeat: int) -> float:
+    """Лучшее время вызова run(memory) на свежей копии памяти с построенным индексом."""
+    best = float("inf")
+    for _ in range(repeat):
+        memory = build_memory(values, archive)
+        start = time.perf_counter()
+        run(memory)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batch memory maintenance")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[50, 10000, 1000000], help="Записей в памяти"
+    )
+    parser.add_argument(
+        "--legacy-max-size",
+        type=int,
+        default=100000,
+        help="Максимальный размер для замера прежнего построчного прохода",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Seed генератора данных")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src.runtime.performance_metrics").setLevel(logging.WARNING)
+    logging.getLogger("src.memory.index_engine").setLevel(logging.WARNING)
+    logger.info(
+        f"numpy: {maintenance_kernel.HAS_NUMPY}, "
+        f"порог numpy: {maintenance_kernel.NUMPY_MIN_ENTRIES} записей"
+    )
+
+    has_numpy = maintenance_kernel.HAS_NUMPY
+    numpy_min_entries = maintenance_kernel.NUMPY_MIN_ENTRIES
+
+    def kernel(use_numpy: bool):
+        def run(memory):
+            maintenance_kernel.HAS_NUMPY = use_numpy and has_numpy
+            maintenance_kernel.NUMPY_MIN_ENTRIES = 0
+            try:
+                memory.batch_memory_maintenance(**PARAMS)
+            finally:
+                maintenance_kernel.HAS_NUMPY = has_numpy
+                maintenance_kernel.NUMPY_MIN_ENTRIES = numpy_min_entries
+
+        return run
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ArchiveMemory(archive_file=Path(tmp) / "archive.json")
+        for size in args.sizes:
+            values = make_values(size, random.Random(args.seed))
+            repeat = max(3, min(200, 20_000 // size))
+            logger.info(f"--- {size:,} записей ---")
+            legacy = None
+            if size <= args.legacy_max_size:
+                legacy = measure(
+                    values, archive, lambda m: legacy_maintenance(m, **PARAMS), repeat
+                )
+                logger.info(f"  построчный проход:   {legacy * 1e3:10.3f} ms")
+            else:
+                logger.info("  построчный проход:   пропущен (квадратичное удаление)")
+
+            variants = [("ядро, цикл Python:  ", kernel(False))]
+            if has_numpy:
+                variants.append(("ядро, numpy:        ", kernel(True)))
+            for label, run in variants:
+                elapsed = measure(values, archive, run, repeat)
+                speedup = f"  ({legacy / elapsed:6.1f}x)" if legacy else ""
+                logger.info(f"  {label} {elapsed * 1e3:10.3f} ms{speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark Metrics Registry - накладные расходы и память измерений.
+
+Сравнивает прежний measure_time (список всех длительностей и словарь начатых
+измерений) с гистограммами реестра метрик: время на одно измерение, время на
+запись готового значения и прирост памяти после N измерений.
+
+Использование:
+    python scripts/benchmark_metrics_registry.py [--observations 200000]
+"""
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.runtime.metrics_registry import MetricsRegistry
+from src.runtime.performance_metrics import PerformanceMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class LegacyPerformanceMetrics:
+    """Прежняя реализация: все длительности хранятся в списке."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.current_measurements = {}
+
+    def start_measurement(self, operation):
+        self.current_measurements[operation] = time.perf_counter()
+
+    def end_measurement(self, operation):
+        if operation not in self.current_measurements:
+            return 0.0
+        duration = time.perf_counter() - self.current_measurements.pop(operation)
+        self.metrics.setdefault(operation, []).append(duration)
+        return duration
+
+
+def legacy_measure_time(metrics):
+    @contextmanager
+    def measure_time(operation):
+        metrics.start_measurement(operation)
+        try:
+            yield
+        finally:
+            metrics.end_measurement(operation)
+
+    return measure_time
+
+
+def per_call_us(fn, count: int) -> float:
+    start = time.perf_counter()
+    fn(count)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def memory_kb(fn, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(count)  # Результат удерживается до замера
+    after = tracemalloc.get_traced_memory()[0]
+    del result
+    tracemalloc.stop()
+    return (after - before) / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark metrics registry vs list-based measure_time")
+    parser.add_argument("--observations", type=int, default=200000, help="Измерений на прогон")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    def run_legacy(count):
+        metrics = LegacyPerformanceMetrics()
+        measure_time = legacy_measure_time(metrics)
+        for _ in range(count):
+            with measure_time("memory_index_add_entry"):
+                pass
+        return metrics
+
+    def run_registry(count):
+        metrics = PerformanceMetrics(MetricsRegistry())
+        for _ in range(count):
+            with metrics.measure("memory_index_add_entry"):
+                pass
+        return metrics
+
+    def append_legacy(count):
+        durations = {}
+        for _ in range(count):
+            durations.setdefault("op", []).append(0.00123)
+        return durations
+
+    def observe_registry(count):
+        histogram = MetricsRegistry().histogram("op")
+        for _ in range(count):
+            histogram.observe(0.00123)
+        return histogram
+
+    def empty_loop(count):
+        for _ in range(count):
+            pass
+
+    count = args.observations
+    loop_us = per_call_us(empty_loop, count)
+    logger.info(f"{'':24s} {'us/call':>10s} {'memory KB':>12s}")
+    for name, fn in (
+        ("legacy measure_time", run_legacy),
+        ("registry measure", run_registry),
+        ("legacy list append", append_legacy),
+        ("registry observe", observe_registry),
+    ):
+        logger.info(f"{name:24s} {per_call_us(fn, count) - loop_us:10.3f} {memory_kb(fn, count):12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from src.observability.async_log_writer import AsyncLogWriter
+from src.observability.passive_data_sink import PassiveDataSink
 
 
 class ObservabilityOverheadBenchmark:
@@ -33,6 +34,7 @@ class ObservabilityOverheadBenchmark:
         self.benchmark_memory_buffering_overhead()
         self.benchmark_batch_writing_throughput()
         self.benchmark_end_to_end_simulation()
+        self.benchmark_passive_data_sink_tick_overhead()
 
         self.print_summary()
         return self.results
@@ -206,6 +208,70 @@ class ObservabilityOverheadBenchmark:
             if results["buffer_dropped_entries"] > 0:
                 print(f"  ⚠️  Buffer overflow: {results['buffer_dropped_entries']} entries dropped")
 
+    def benchmark_passive_data_sink_tick_overhead(self, buffered_entries=10000, ticks=500):
+        """Benchmark per-tick PassiveDataSink overhead with a large in-memory buffer."""
+        print("🗄️  Benchmarking PassiveDataSink per-tick overhead...")
+
+        # run_loop calls receive_data several times per tick (tick_start, events, tick_end)
+        calls_per_tick = 4
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sink = PassiveDataSink(
+                data_directory=temp_dir,
+                observations_file="passive_benchmark.jsonl",
+                max_entries=buffered_entries * 2,
+                enabled=True,
+                auto_flush=True
+            )
+
+            # Pre-fill the buffer the way a long-running instance would have it
+            for i in range(buffered_entries):
+                sink.receive_data("prefill", {"i": i}, "benchmark")
+            sink.flush()
+
+            tick_durations = []
+            for tick in range(ticks):
+                start = time.perf_counter()
+                for call in range(calls_per_tick):
+                    sink.receive_data("tick_end", {"tick": tick, "call": call}, "runtime_loop")
+                tick_durations.append(time.perf_counter() - start)
+
+            sink.stop()
+            stats = sink.get_stats()
+
+            with open(f"{temp_dir}/passive_benchmark.jsonl", encoding="utf-8") as f:
+                lines_on_disk = sum(1 for _ in f)
+
+            # Legacy behaviour: every receive_data appended the whole buffer to disk
+            legacy_ticks = 5
+            legacy_buffer = list(sink.get_recent_data())
+            legacy_start = time.perf_counter()
+            for _ in range(legacy_ticks * calls_per_tick):
+                with open(f"{temp_dir}/legacy.jsonl", "a", encoding="utf-8") as f:
+                    for observation in legacy_buffer:
+                        f.write(observation.to_json_line())
+            legacy_per_tick = (time.perf_counter() - legacy_start) / legacy_ticks
+
+        tick_durations.sort()
+        results = {
+            "buffered_entries": buffered_entries,
+            "ticks": ticks,
+            "calls_per_tick": calls_per_tick,
+            "mean_tick_overhead_us": sum(tick_durations) / ticks * 1e6,
+            "p99_tick_overhead_us": tick_durations[int(ticks * 0.99) - 1] * 1e6,
+            "legacy_per_tick_overhead_us": legacy_per_tick * 1e6,
+            "lines_on_disk": lines_on_disk,
+            "expected_lines": buffered_entries + ticks * calls_per_tick,
+            "pending_dropped": stats["pending_dropped"],
+            "batches_written": stats["batches_written"],
+        }
+        self.results["passive_data_sink"] = results
+
+        print(f"  Mean per-tick overhead: {results['mean_tick_overhead_us']:.1f} us "
+              f"(p99 {results['p99_tick_overhead_us']:.1f} us) at {buffered_entries} buffered entries")
+        print(f"  Legacy full-buffer flush: {results['legacy_per_tick_overhead_us']:.0f} us per tick")
+        print(f"  Lines on disk: {lines_on_disk} (expected {results['expected_lines']}, no duplicates)")
+
     def print_summary(self):
         """Print benchmark summary and verify requirements."""
         print("\n📋 Observability Overhead Benchmark Summary")
@@ -240,6 +306,16 @@ class ObservabilityOverheadBenchmark:
                 print(".3f")
                 success = False
 
+        # PassiveDataSink check (< 500us per tick, no duplicate records)
+        if "passive_data_sink" in self.results:
+            sink = self.results["passive_data_sink"]
+            if sink["p99_tick_overhead_us"] < 500 and sink["lines_on_disk"] == sink["expected_lines"]:
+                print(f"✅ PassiveDataSink p99 tick overhead: {sink['p99_tick_overhead_us']:.1f} us")
+            else:
+                print(f"❌ PassiveDataSink p99 tick overhead: {sink['p99_tick_overhead_us']:.1f} us, "
+                      f"{sink['lines_on_disk']}/{sink['expected_lines']} lines on disk")
+                success = False
+
         print("\n" + "=" * 50)
         if success:
             print("✅ ALL REQUIREMENTS MET: Observability overhead < 1%")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark Sampling Profiler - накладные расходы профилирования runtime loop.
+
+Поток выполняет фиксированный объем синтетической работы тика (вызовы
+функций, словари, списки - как фазы runtime loop) без профилирования, под
+сэмплирующим профилировщиком и под cProfile (как run_loop(enable_profiling=True)).
+Сравнивается время выполнения работы; для каждого режима берется медиана
+нескольких повторов.
+
+Использование:
+    python scripts/benchmark_sampling_profiler.py [--iterations 200000] [--repeats 5]
+        [--interval 0.01]
+"""
+
+import argparse
+import cProfile
+import logging
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.runtime.sampling_profiler import DEFAULT_SAMPLING_INTERVAL, SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+
+def appraise(event: dict, weights: dict) -> float:
+    return sum(event.get(key, 0.0) * weight for key, weight in weights.items())
+
+
+def update_state(state: dict, delta: float) -> None:
+    for key in state:
+        state[key] = max(0.0, min(1.0, state[key] + delta * 0.01))
+
+
+def tick_work(iterations: int) -> float:
+    """Синтетическая работа тика: оценка событий, обновление состояния, память."""
+    weights = {"energy": 0.3, "stability": 0.5, "integrity": 0.2}
+    state = {"energy": 0.5, "stability": 0.5, "integrity": 0.5}
+    memory = []
+    total = 0.0
+    for i in range(iterations):
+        event = {"energy": (i % 7) / 7, "stability": (i % 5) / 5, "integrity": (i % 3) / 3}
+        significance = appraise(event, weights)
+        update_state(state, significance - 0.5)
+        memory.append((i, significance))
+        if len(memory) > 50:
+            memory = sorted(memory, key=lambda entry: entry[1])[25:]
+        total += significance
+    return total
+
+
+def timed_run(iterations: int, mode: str, interval: float) -> tuple:
+    """Выполняет работу в отдельном потоке; возвращает (время, доля замеров профилировщика)."""
+    result = {}
+
+    def worker():
+        profiler = cProfile.Profile() if mode == "cprofile" else None
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        tick_work(iterations)
+        result["elapsed"] = time.perf_counter() - start
+        if profiler is not None:
+            profiler.disable()
+
+    thread = threading.Thread(target=worker)
+    sampler = None
+    if mode == "sampling":
+        sampler = SamplingProfiler(interval=interval)
+    thread.start()
+    if sampler is not None:
+        sampler.set_target_thread(thread.ident)
+        sampler.start()
+    thread.join()
+    overhead = 0.0
+    if sampler is not None:
+        sampler.stop()
+        overhead = sampler.get_stats()["overhead"]
+    return result["elapsed"], overhead
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sampling profiler overhead")
+    parser.add_argument("--iterations", type=int, default=200000, help="Итераций работы тика")
+    parser.add_argument("--repeats", type=int, default=5, help="Повторов каждого режима")
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_SAMPLING_INTERVAL, help="Интервал замеров (сек)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    timings = {"baseline": [], "sampling": [], "cprofile": []}
+    sampler_overhead = []
+    # Режимы чередуются, чтобы дрейф частоты CPU влиял на них одинаково
+    for _ in range(args.repeats):
+        for mode in timings:
+            elapsed, overhead = timed_run(args.iterations, mode, args.interval)
+            timings[mode].append(elapsed)
+            if mode == "sampling":
+                sampler_overhead.append(overhead)
+
+    baseline = statistics.median(timings["baseline"])
+    logger.info(f"Работа тика: {args.iterations} итераций, интервал замеров {args.interval} сек")
+    for mode, values in timings.items():
+        elapsed = statistics.median(values)
+        slowdown = (elapsed / baseline - 1) * 100
+        logger.info(f"{mode:10s} {elapsed * 1000:9.1f} ms  замедление {slowdown:+7.2f}%")
+    logger.info(
+        f"Время замеров сэмплирующего профилировщика: "
+        f"{statistics.median(sampler_overhead) * 100:.2f}% времени работы"
+    )
+
+
+if __name__ == "__main__":
+    main()
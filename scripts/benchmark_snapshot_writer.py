@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark Snapshot Writer - влияние сохранения снапшотов на длительность тика.
+
+Сравнивает:
+- sync: SnapshotManager вызывает save_snapshot на потоке тика
+- async: поток тика только захватывает копию состояния, запись выполняет
+  AsyncSnapshotWriter
+
+Имитирует runtime loop: каждый тик выполняет фиксированную работу и вызывает
+maybe_snapshot, между тиками - пауза tick_interval (как в run_loop).
+Отчет - p50/p99/max длительности тика (без паузы).
+
+Использование:
+    python scripts/benchmark_snapshot_writer.py [--ticks 2000] [--snapshot-period 10] [--tick-interval 0.005]
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.state.self_state as self_state_module
+from src.memory.memory_types import MemoryEntry
+from src.runtime.snapshot_manager import SnapshotManager
+from src.state.self_state import SelfState, create_initial_state, save_snapshot
+from src.state.snapshot_catalog import get_snapshot_catalog
+
+logger = logging.getLogger(__name__)
+
+
+def make_state(memory_entries: int) -> SelfState:
+    """Создает состояние с заполненной памятью и историей параметров."""
+    state = create_initial_state()
+    for i in range(memory_entries):
+        state.memory.append(
+            MemoryEntry(
+                event_type=f"benchmark_event_{i % 20}",
+                meaning_significance=0.1 + (i % 10) * 0.09,
+                timestamp=1_700_000_000.0 + i,
+                weight=0.5,
+                feedback_data={"index": i, "tags": ["a", "b", "c"]},
+            )
+        )
+    return state
+
+
+def simulate_tick_work(state: SelfState) -> None:
+    """Фиксированная нагрузка тика (не зависит от режима записи)."""
+    state.energy = max(0.0, state.energy - 0.001)
+    total = 0.0
+    for i in range(2000):
+        total += (i * 0.5) % 7
+    state.last_significance = total % 1.0
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_mode(name: str, async_write: bool, args: argparse.Namespace) -> Dict[str, Any]:
+    """Прогоняет тики и собирает длительности."""
+    with tempfile.TemporaryDirectory() as tmp:
+        self_state_module.SNAPSHOT_DIR = Path(tmp)
+        state = make_state(args.memory_entries)
+        manager = SnapshotManager(
+            period_ticks=args.snapshot_period, saver=save_snapshot, async_write=async_write
+        )
+
+        durations_ms = []
+        try:
+            for _ in range(args.ticks):
+                start = time.perf_counter()
+                state.ticks += 1
+                simulate_tick_work(state)
+                manager.maybe_snapshot(state)
+                durations_ms.append((time.perf_counter() - start) * 1000)
+                time.sleep(args.tick_interval)
+        finally:
+            manager.stop()
+
+        snapshot_files = get_snapshot_catalog(Path(tmp)).count()
+
+    result = {
+        "mode": name,
+        "p50_ms": statistics.median(durations_ms),
+        "p99_ms": percentile(durations_ms, 0.99),
+        "max_ms": max(durations_ms),
+        "snapshot_files": snapshot_files,
+    }
+    logger.info(
+        f"{name:>5}: p50 {result['p50_ms']:7.3f} ms, p99 {result['p99_ms']:7.3f} ms, "
+        f"max {result['max_ms']:7.3f} ms, snapshots written: {snapshot_files}"
+    )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark async snapshot writer")
+    parser.add_argument("--ticks", type=int, default=2000, help="Количество тиков")
+    parser.add_argument("--snapshot-period", type=int, default=10, help="Период снапшотов")
+    parser.add_argument(
+        "--tick-interval", type=float, default=0.005, help="Пауза между тиками (секунды)"
+    )
+    parser.add_argument(
+        "--memory-entries", type=int, default=5000, help="Размер памяти состояния"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # Логи сохранения snapshot не нужны в выводе бенчмарка
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    original_dir = self_state_module.SNAPSHOT_DIR
+    try:
+        sync = run_mode("sync", False, args)
+        async_ = run_mode("async", True, args)
+    finally:
+        self_state_module.SNAPSHOT_DIR = original_dir
+
+    logger.info(f"p99 тика: x{sync['p99_ms'] / max(async_['p99_ms'], 1e-9):.1f} быстрее с async")
+
+
+if __name__ == "__main__":
+    main()
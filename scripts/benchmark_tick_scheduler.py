@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark Tick Scheduler - перцентили длительности тика с TickScheduler и без него.
+
+Моделирует тик runtime loop с синтетическими фазами: базовая работа на каждом
+тике и периодические задачи с интервалами run_loop (learning, adaptation,
+consolidation, metrics). Без планировщика задачи запускаются по ticks % interval
+и совпадают на общих кратных; с планировщиком они разнесены по тикам и
+откладываются на тики со свободным бюджетом.
+
+Использование:
+    python scripts/benchmark_tick_scheduler.py [--ticks 600] [--tick-interval 0.02]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Добавляем src в путь для импорта
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.runtime.loop import (
+    ADAPTATION_INTERVAL,
+    LEARNING_INTERVAL,
+    MEMORY_CONSOLIDATION_INTERVAL,
+    METRICS_COLLECTION_INTERVAL,
+)
+from src.runtime.tick_scheduler import TickScheduler
+
+logger = logging.getLogger(__name__)
+
+# Доли tick_interval, которые занимает каждая фаза
+BASE_COST = 0.1
+TASKS = (
+    ("learning", LEARNING_INTERVAL, 0.3),
+    ("adaptation", ADAPTATION_INTERVAL, 0.4),
+    ("consolidation", MEMORY_CONSOLIDATION_INTERVAL, 0.2),
+    ("metrics", METRICS_COLLECTION_INTERVAL, 0.2),
+)
+
+
+def busy(seconds: float) -> None:
+    """Занимает поток на заданное время (без сна, как реальная работа фазы)."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def percentiles(durations: list) -> dict:
+    durations = sorted(durations)
+    last = len(durations) - 1
+    return {
+        "p50": durations[int(last * 0.50)],
+        "p99": durations[int(last * 0.99)],
+        "max": durations[last],
+    }
+
+
+def run_inline(ticks: int, tick_interval: float) -> list:
+    """Прежняя схема: все задачи по ticks % interval, сон tick_interval - elapsed."""
+    durations = []
+    for tick in range(1, ticks + 1):
+        start = time.perf_counter()
+        busy(tick_interval * BASE_COST)
+        for _, interval, cost in TASKS:
+            if tick % interval == 0:
+                busy(tick_interval * cost)
+        elapsed = time.perf_counter() - start
+        durations.append(elapsed)
+        time.sleep(max(0.0, tick_interval - elapsed))
+    return durations
+
+
+def run_scheduled(ticks: int, tick_interval: float) -> tuple:
+    """Схема с TickScheduler: разнесенные и отложенные задачи, сон до дедлайна."""
+    scheduler = TickScheduler(tick_interval=tick_interval)
+    for name, interval, cost in TASKS:
+        scheduler.register(name, interval, budget=tick_interval * cost * 1.5)
+    durations = []
+    for tick in range(1, ticks + 1):
+        start = time.perf_counter()
+        scheduler.begin_tick()
+        busy(tick_interval * BASE_COST)
+        scheduler.end_phase("base")
+        for name, _, cost in TASKS:
+            if scheduler.due(name, tick):
+                busy(tick_interval * cost)
+                scheduler.end_phase(name)
+        durations.append(time.perf_counter() - start)
+        time.sleep(scheduler.end_tick())
+    return durations, scheduler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TickScheduler tick duration percentiles")
+    parser.add_argument("--ticks", type=int, default=600, help="Количество тиков")
+    parser.add_argument("--tick-interval", type=float, default=0.02, help="Интервал тика (сек)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    inline = percentiles(run_inline(args.ticks, args.tick_interval))
+    scheduled_durations, scheduler = run_scheduled(args.ticks, args.tick_interval)
+    scheduled = percentiles(scheduled_durations)
+
+    for name, result in (("inline", inline), ("scheduled", scheduled)):
+        logger.info(
+            f"{name:10s} p50={result['p50'] * 1000:7.2f} ms  p99={result['p99'] * 1000:7.2f} ms  "
+            f"max={result['max'] * 1000:7.2f} ms"
+        )
+    logger.info(f"scheduler: {scheduler.format_summary()}")
+
+
+if __name__ == "__main__":
+    main()
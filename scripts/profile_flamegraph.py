@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Снятие профиля работающего экземпляра Life через сэмплирующий профилировщик.
+
+Запрашивает у API сервера (/profile) стеки потока runtime loop в формате
+collapsed stacks и сохраняет их в файл. С --duration профилировщик
+включается на заданное время (POST /profile) и выключается после замера,
+если до этого был выключен.
+
+Файл открывается в speedscope (https://www.speedscope.app) или
+преобразуется в SVG: flamegraph.pl profile.folded > profile.svg
+
+Использование:
+    python scripts/profile_flamegraph.py [--url http://localhost:8000] [--duration 30]
+        [--output data/profile.folded] [--top 15]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+def top_functions(collapsed: str, limit: int):
+    """Функции с наибольшим собственным временем по верхнему кадру стека."""
+    counts = {}
+    for line in collapsed.splitlines():
+        stack, _, count = line.rpartition(" ")
+        leaf = stack.rsplit(";", 1)[-1]
+        counts[leaf] = counts.get(leaf, 0) + int(count)
+    return sorted(counts.items(), key=lambda item: -item[1])[:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fetch a flamegraph profile of the runtime loop")
+    parser.add_argument("--url", default="http://localhost:8000", help="Адрес API сервера")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Включить профилировщик на N секунд (иначе - текущее окно профиля)",
+    )
+    parser.add_argument("--interval", type=float, default=None, help="Интервал замеров (сек)")
+    parser.add_argument("--output", default=None, help="Файл collapsed stacks")
+    parser.add_argument("--top", type=int, default=15, help="Показать N самых затратных функций")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    seconds = None
+    try:
+        if args.duration is not None:
+            status = requests.get(f"{args.url}/profile/status", timeout=10).json()
+            was_running = status["running"]
+            control = {"enabled": True, "reset": not was_running}
+            if args.interval is not None:
+                control["interval"] = args.interval
+            requests.post(f"{args.url}/profile", json=control, timeout=10).raise_for_status()
+            logger.info(f"Профилирование {args.duration} сек...")
+            time.sleep(args.duration)
+            seconds = args.duration
+            if not was_running:
+                requests.post(f"{args.url}/profile", json={"enabled": False}, timeout=10)
+
+        params = {"seconds": seconds} if seconds is not None else None
+        response = requests.get(f"{args.url}/profile", params=params, timeout=30)
+        response.raise_for_status()
+        stats = requests.get(f"{args.url}/profile/status", timeout=10).json()
+    except requests.RequestException as e:
+        logger.error(f"Не удалось получить профиль с {args.url}: {e}")
+        return 1
+
+    collapsed = response.text
+    if not collapsed:
+        logger.warning("Профиль пуст: профилировщик выключен или runtime loop не запущен")
+        return 1
+
+    output = Path(args.output or f"data/profile_{int(time.time())}.folded")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(collapsed, encoding="utf-8")
+
+    total = sum(int(line.rpartition(" ")[2]) for line in collapsed.splitlines())
+    logger.info(
+        f"Сохранено {total} замеров в {output} "
+        f"(накладные расходы профилировщика: {stats['overhead'] * 100:.2f}%)"
+    )
+    for function, count in top_functions(collapsed, args.top):
+        logger.info(f"{count / total * 100:6.2f}%  {function}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
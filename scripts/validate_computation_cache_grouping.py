@@ -166,15 +166,7 @@ class CacheGroupingValidator:
                 limit
             )
 
-            cache_key = cache._make_cache_key("activate_memory", rounded_args)
-            if cache_key in cache.memory_search_cache:
-                cache.memory_search_hits += 1
-                value = cache.memory_search_cache.pop(cache_key)
-                cache.memory_search_cache[cache_key] = value
-                return value
-            else:
-                cache.memory_search_misses += 1
-                return None
+            return cache.namespace("memory_search").get(("activate_memory",) + rounded_args)
 
         def cache_activate_memory_no_grouping(event_type: str, memory_size: int,
                                             subjective_time: float, age: float,
@@ -188,9 +180,7 @@ class CacheGroupingValidator:
                 limit
             )
 
-            cache_key = cache._make_cache_key("activate_memory", rounded_args)
-            cache.memory_search_cache[cache_key] = result
-            cache._evict_if_needed(cache.memory_search_cache)
+            cache.namespace("memory_search").put(("activate_memory",) + rounded_args, result)
 
         results = {
             "grouping_enabled": False,
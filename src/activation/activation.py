@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from src.memory.memory import MemoryEntry
+from src.memory.memory import Memory, MemoryEntry
 from src.state.self_state import SelfState
 
 
@@ -15,13 +15,14 @@ def activate_memory(
     отсортированных по significance (desc).
     Если нет совпадений — пустой список.
 
+    Для Memory топ-N берется из индекса по типу события и значимости за O(N),
+    для обычного списка - полным перебором. Записи с равной значимостью
+    возвращаются в порядке добавления.
+
     ИНТЕГРАЦИЯ: Использует субъективное время для динамического расчета лимита активации.
     При ускоренном восприятии времени активирует больше воспоминаний,
     при замедленном - меньше.
     """
-    matching = [entry for entry in memory if entry.event_type == current_event_type]
-    matching.sort(key=lambda e: e.meaning_significance, reverse=True)
-
     # Расчет лимита активации с учетом субъективного времени
     if limit is None and self_state is not None:
         # Динамический расчет лимита на основе субъективного времени
@@ -29,15 +30,20 @@ def activate_memory(
 
         if time_ratio >= 1.1:
             # Ускоренное восприятие времени - активировать больше воспоминаний (система внимательнее)
-            activation_limit = min(5, len(matching))
+            activation_limit = 5
         elif time_ratio <= 0.9:
             # Замедленное восприятие времени - активировать меньше воспоминаний (система рассеяннее)
-            activation_limit = min(2, len(matching))
+            activation_limit = 2
         else:
             # Нормальное восприятие времени - стандартный лимит
-            activation_limit = min(3, len(matching))
+            activation_limit = 3
     else:
         # Использовать переданный лимит или значение по умолчанию
-        activation_limit = limit if limit is not None else min(3, len(matching))
+        activation_limit = limit if limit is not None else 3
 
+    if isinstance(memory, Memory) and activation_limit >= 0:
+        return memory.get_top_by_significance(current_event_type, activation_limit)
+
+    matching = [entry for entry in memory if entry.event_type == current_event_type]
+    matching.sort(key=lambda e: e.meaning_significance, reverse=True)
     return matching[:activation_limit]
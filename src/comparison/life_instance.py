@@ -21,6 +21,8 @@ from typing import Dict, List, Optional, Any
 from pathlib import Path
 
 from src.logging_config import get_logger
+from src.state.snapshot_catalog import get_snapshot_catalog
+from src.state.snapshot_delta import read_snapshot_data, read_snapshot_vitals
 
 logger = get_logger(__name__)
 
@@ -231,20 +233,46 @@ class LifeInstance:
             Dict с данными snapshot или None если нет snapshots
         """
         try:
-            snapshot_files = list(self.snapshots_dir.glob("snapshot_*.json"))
-            if not snapshot_files:
+            if not self.snapshots_dir.exists():
                 return None
 
-            # Находим самый свежий snapshot
-            latest_snapshot = max(snapshot_files, key=lambda p: p.stat().st_mtime)
+            # Самый свежий snapshot ищется по каталогу, без сканирования директории
+            catalog = get_snapshot_catalog(self.snapshots_dir)
+            latest_snapshot = catalog.latest()
+            if latest_snapshot is None:
+                return None
 
-            with open(latest_snapshot, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return read_snapshot_data(catalog.path_for(latest_snapshot))
 
         except Exception as e:
             logger.error(f"Error reading snapshot for instance '{self.config.instance_id}': {e}")
             return None
 
+    def get_latest_vitals(self) -> Optional[Dict[str, Any]]:
+        """
+        Получает ticks и витальные показатели (energy, stability, integrity, ...)
+        последнего snapshot инстанса.
+
+        Для бинарных snapshot читается только заголовок файла.
+
+        Returns:
+            Dict с витальными показателями или None если нет snapshots
+        """
+        try:
+            if not self.snapshots_dir.exists():
+                return None
+
+            catalog = get_snapshot_catalog(self.snapshots_dir)
+            latest_snapshot = catalog.latest()
+            if latest_snapshot is None:
+                return None
+
+            return read_snapshot_vitals(catalog.path_for(latest_snapshot))
+
+        except Exception as e:
+            logger.error(f"Error reading vitals for instance '{self.config.instance_id}': {e}")
+            return None
+
     def get_structured_logs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Получает структурированные логи от инстанса.
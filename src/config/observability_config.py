@@ -8,7 +8,7 @@
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -55,8 +55,8 @@ class ObservabilityConfig:
     data_directory: str = "data"
 
     # Компонентные конфигурации
-    structured_logging: StructuredLoggingConfig = StructuredLoggingConfig()
-    semantic_monitor: SemanticMonitorConfig = SemanticMonitorConfig()
+    structured_logging: StructuredLoggingConfig = field(default_factory=StructuredLoggingConfig)
+    semantic_monitor: SemanticMonitorConfig = field(default_factory=SemanticMonitorConfig)
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> 'ObservabilityConfig':
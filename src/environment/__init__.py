@@ -1,5 +1,5 @@
 from .event import Event
-from .event_queue import EventQueue
+from .event_queue import EventQueue, OverflowPolicy
 from .generator import EventGenerator
 
-__all__ = ["Event", "EventQueue", "EventGenerator"]
+__all__ = ["Event", "EventQueue", "OverflowPolicy", "EventGenerator"]
@@ -0,0 +1,158 @@
+"""
+Пакетный прием внешних событий (POST /events).
+
+Разбирает тело запроса - JSON массив или NDJSON (по одному JSON объекту в
+строке), проверяет каждый элемент и ставит корректные события в EventQueue
+порциями через push_batch (одна операция очереди на порцию). Для каждого
+элемента возвращается результат: принят, отброшен очередью или некорректен.
+
+NDJSON обрабатывается потоково: строки читаются из итератора, поэтому тело
+запроса не нужно держать в памяти целиком.
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .event import Event
+from .event_queue import EventQueue
+
+DEFAULT_CHUNK_SIZE = 500  # Событий на одну операцию очереди
+MAX_BATCH_EVENTS = 10000  # Максимум элементов в одном запросе
+
+STATUS_ACCEPTED = "accepted"
+STATUS_DROPPED = "dropped"
+STATUS_INVALID = "invalid"
+STATUS_VALID = "valid"  # Проверено, но не поставлено в очередь (FastAPI API)
+
+
+class BatchTooLargeError(ValueError):
+    """Запрос содержит больше MAX_BATCH_EVENTS элементов."""
+
+
+def event_from_payload(payload: Any) -> Event:
+    """
+    Создает Event из JSON объекта запроса.
+
+    Правила совпадают с POST /event: 'type' обязателен, intensity и timestamp
+    приводятся к float, metadata - словарь.
+
+    Raises:
+        ValueError: если элемент некорректен
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("event must be a JSON object")
+
+    event_type = payload.get("type")
+    if not isinstance(event_type, str):
+        raise ValueError("'type' is required")
+
+    try:
+        intensity = float(payload.get("intensity", 0.0))
+        timestamp = float(payload.get("timestamp", time.time()))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid number: {e}") from e
+
+    metadata = payload.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        raise ValueError("'metadata' must be an object")
+
+    return Event(type=event_type, intensity=intensity, timestamp=timestamp, metadata=metadata)
+
+
+def iter_ndjson(lines: Iterable[bytes]) -> Iterator[Tuple[Optional[Any], Optional[str]]]:
+    """
+    Разбирает NDJSON построчно.
+
+    Yields:
+        (объект, None) для корректной строки или (None, ошибка) для некорректной;
+        пустые строки пропускаются
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line), None
+        except ValueError as e:
+            yield None, f"invalid JSON: {e}"
+
+
+def iter_json_array(raw: bytes) -> Iterator[Tuple[Optional[Any], Optional[str]]]:
+    """
+    Разбирает тело-массив JSON.
+
+    Raises:
+        ValueError: если тело не является JSON массивом
+    """
+    items = json.loads(raw.decode("utf-8"))
+    if not isinstance(items, list):
+        raise ValueError("body must be a JSON array")
+    if len(items) > MAX_BATCH_EVENTS:
+        raise BatchTooLargeError(f"batch exceeds {MAX_BATCH_EVENTS} events")
+    return ((item, None) for item in items)
+
+
+def ingest_events(
+    event_queue: EventQueue,
+    items: Iterable[Tuple[Optional[Any], Optional[str]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Проверяет элементы и ставит корректные события в очередь порциями.
+
+    Args:
+        event_queue: EventQueue, принимающая события
+        items: пары (объект, ошибка разбора) от iter_ndjson/iter_json_array
+        chunk_size: количество событий на одну операцию push_batch
+
+    Returns:
+        {"accepted": int, "dropped": int, "invalid": int,
+         "results": [{"index": int, "status": str, "error": str?}, ...]}
+
+    Raises:
+        BatchTooLargeError: если элементов больше MAX_BATCH_EVENTS
+            (элементы, полученные до превышения, уже поставлены в очередь)
+    """
+    results: List[Dict[str, Any]] = []
+    pending: List[Event] = []
+    pending_indexes: List[int] = []
+    counts = {STATUS_ACCEPTED: 0, STATUS_DROPPED: 0, STATUS_INVALID: 0}
+
+    def flush() -> None:
+        for index, accepted in zip(pending_indexes, event_queue.push_batch(pending)):
+            status = STATUS_ACCEPTED if accepted else STATUS_DROPPED
+            results[index]["status"] = status
+            counts[status] += 1
+        pending.clear()
+        pending_indexes.clear()
+
+    for index, (payload, error) in enumerate(items):
+        if index >= MAX_BATCH_EVENTS:
+            flush()
+            raise BatchTooLargeError(f"batch exceeds {MAX_BATCH_EVENTS} events")
+        if error is None:
+            try:
+                event = event_from_payload(payload)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            results.append({"index": index, "status": STATUS_INVALID, "error": error})
+            counts[STATUS_INVALID] += 1
+            continue
+
+        results.append({"index": index, "status": STATUS_ACCEPTED})
+        pending.append(event)
+        pending_indexes.append(index)
+        if len(pending) >= chunk_size:
+            flush()
+
+    if pending:
+        flush()
+
+    return {
+        "accepted": counts[STATUS_ACCEPTED],
+        "dropped": counts[STATUS_DROPPED],
+        "invalid": counts[STATUS_INVALID],
+        "results": results,
+    }
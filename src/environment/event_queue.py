@@ -1,24 +1,127 @@
+import json
 import logging
-import queue
 import threading
 import time
-from typing import Optional, Dict, Any, List
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Iterable, Union, BinaryIO, Deque, Tuple, cast
 
 from .event import Event
 from .silence_detector import SilenceDetector
-from ..contracts.serialization_contract import SerializationContract, SerializationError, ThreadSafeSerializable
+from ..contracts.serialization_contract import SerializationContract, ThreadSafeSerializable
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CAPACITY = 100
+DEFAULT_BLOCK_TIMEOUT = 0.1  # секунды ожидания места при политике BLOCK
+DEFAULT_SPILL_PATH = Path("data/event_queue_spill.jsonl")
+
+INTERNAL_LANE = "internal"
+EXTERNAL_LANE = "external"
+
+
+class OverflowPolicy(Enum):
+    """Поведение EventQueue при заполненной полосе."""
+
+    DROP_NEWEST = "drop_newest"  # Отбросить новое событие (прежнее поведение)
+    BLOCK = "block"  # Ждать места до block_timeout, затем отбросить новое
+    DROP_OLDEST = "drop_oldest"  # Вытеснить самое старое событие полосы
+    COALESCE = "coalesce"  # Слить с ожидающим событием того же типа, иначе отбросить новое
+    SPILL = "spill"  # Дописать в файл на диске и вернуть при следующем извлечении (только внешние события)
+
+
+class _Lane:
+    """
+    Полоса очереди: deque записей [время постановки, событие].
+
+    Записи - изменяемые списки, чтобы COALESCE мог заменить событие на месте,
+    сохранив позицию и время постановки.
+    """
+
+    __slots__ = ("name", "capacity", "entries", "by_type", "dropped")
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self.entries: Deque[List[Any]] = deque()
+        self.by_type: Dict[str, List[Any]] = {}  # Последняя ожидающая запись каждого типа (для COALESCE)
+        self.dropped = 0
+
+    def is_full(self) -> bool:
+        return len(self.entries) >= self.capacity
+
 
 class EventQueue(SerializationContract, ThreadSafeSerializable):
-    def __init__(self, enable_silence_detection: bool = True):
-        self._queue = queue.Queue(maxsize=100)
+    """
+    Очередь событий Environment -> runtime loop.
+
+    Две полосы с собственной емкостью: внутренние события (поставленные
+    runtime loop с internal=True) и внешние. Полосу выбирает производитель, а не
+    тип события, поэтому внешний POST с типом memory_echo или silence все равно
+    попадает во внешнюю полосу. Извлечение отдает сначала внутренние, затем внешние события, каждую
+    полосу в FIFO порядке, поэтому поток внешних событий не может задержать или
+    вытеснить внутренние. При заполнении полосы действует overflow_policy.
+
+    Все операции выполняются под одной блокировкой; pop_all забирает полосы
+    целиком заменой deque за O(1) под блокировкой.
+    """
+
+    def __init__(
+        self,
+        enable_silence_detection: bool = True,
+        capacity: int = DEFAULT_CAPACITY,
+        overflow_policy: Union[OverflowPolicy, str] = OverflowPolicy.DROP_NEWEST,
+        internal_capacity: Optional[int] = None,
+        block_timeout: float = DEFAULT_BLOCK_TIMEOUT,
+        spill_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            enable_silence_detection: Включить систему осознания тишины
+            capacity: Емкость полосы внешних событий
+            overflow_policy: Поведение при заполненной полосе (OverflowPolicy или его значение)
+            internal_capacity: Емкость полосы внутренних событий (None - как capacity)
+            block_timeout: Максимальное ожидание места при политике BLOCK (сек)
+            spill_path: Файл для политики SPILL (None - DEFAULT_SPILL_PATH). События,
+                оставшиеся в файле от прошлого процесса, возвращаются первыми
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity должен быть положительным: {capacity}")
+        self.capacity = capacity
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+
+        self._external = _Lane(EXTERNAL_LANE, capacity)
+        self._internal = _Lane(INTERNAL_LANE, internal_capacity or capacity)
         self._dropped_events_count = 0  # Счетчик потерянных событий
 
+        # Одна блокировка на все операции; условие будит производителей при политике BLOCK
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+
         # Version-based concurrency control для обеспечения консистентности
         self._version = 0  # Версия состояния очереди
-        self._version_lock = threading.RLock()  # Защита для версии
+
+        # Метрики очереди
+        self._pushed_count = 0
+        self._popped_count = 0
+        self._coalesced_count = 0
+        self._evicted_count = 0
+        self._blocked_count = 0
+        self._max_depth = 0
+        self._latency_total = 0.0
+        self._latency_count = 0
+        self._latency_max = 0.0
+
+        # Политика SPILL: внешние события сверх емкости во файле JSON lines
+        self._spill_path = Path(spill_path) if spill_path is not None else DEFAULT_SPILL_PATH
+        self._spill_file: Optional[BinaryIO] = None
+        self._spill_read_offset = 0
+        self._spilled_pending = 0
+        self._spilled_count = 0
+        if self.overflow_policy is OverflowPolicy.SPILL:
+            self._recover_spill()
 
         # Система осознания тишины
         self.silence_detector = SilenceDetector() if enable_silence_detection else None
@@ -27,69 +130,324 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
         self._serialization_lock = threading.RLock()
         self._serialization_timeout = 5.0  # 5 секунд максимум на сериализацию
 
-    def push(self, event: Event) -> None:
-        with self._version_lock:
-            try:
-                self._queue.put_nowait(event)
-                self._version += 1  # Инкремент версии при изменении состояния
+    # === Производители ===
+
+    def push(self, event: Event, internal: bool = False) -> bool:
+        """
+        Поставить событие в очередь.
+
+        Args:
+            event: Событие
+            internal: True для событий, порожденных самим runtime loop (эхо памяти,
+                моменты ясности, тишина); внешние источники оставляют False
+
+        Returns:
+            True если событие принято (в том числе слито с ожидающим или выгружено на диск),
+            False если отброшено
+        """
+        with self._lock:
+            accepted = self._push_locked(event, time.monotonic(), internal)
+
+        if accepted and self.silence_detector is not None:
+            # Уведомляем детектор тишины о новом событии
+            self.silence_detector.update_last_event_time(event.timestamp)
+        return accepted
 
-                # Уведомляем детектор тишины о новом событии
-                if self.silence_detector is not None:
-                    self.silence_detector.update_last_event_time(event.timestamp)
+    # Совместимость с интерфейсом queue.Queue, которым пользуются runtime loop и API
+    put_nowait = push
 
-            except queue.Full:
+    def push_many(self, events: Iterable[Event], internal: bool = False) -> int:
+        """
+        Поставить несколько событий за одно взятие блокировки.
+
+        Политика BLOCK ожидает места для каждого события не дольше block_timeout.
+
+        Returns:
+            Количество принятых событий
+        """
+        return sum(self.push_batch(events, internal))
+
+    def push_batch(self, events: Iterable[Event], internal: bool = False) -> List[bool]:
+        """
+        Как push_many, но с результатом для каждого события.
+
+        Returns:
+            Список флагов принятия в порядке событий
+        """
+        results: List[bool] = []
+        last_timestamp = None
+        with self._lock:
+            now = time.monotonic()
+            for event in events:
+                accepted = self._push_locked(event, now, internal)
+                results.append(accepted)
+                if accepted:
+                    last_timestamp = event.timestamp
+
+        if last_timestamp is not None and self.silence_detector is not None:
+            self.silence_detector.update_last_event_time(last_timestamp)
+        return results
+
+    def _push_locked(self, event: Event, now: float, internal: bool) -> bool:
+        """Ставит событие в полосу производителя; вызывается под блокировкой."""
+        lane = self._internal if internal else self._external
+        self._version += 1  # Версия изменяется даже при потере события
+
+        # Пока на диске есть выгруженные события, новые внешние идут туда же (сохраняем FIFO)
+        if lane is self._external and self._spilled_pending:
+            return self._spill_locked(event)
+
+        if lane.is_full():
+            policy = self.overflow_policy
+            if policy is OverflowPolicy.BLOCK:
+                deadline = now + self.block_timeout
+                while lane.is_full():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._blocked_count += 1
+                    self._not_full.wait(remaining)
+            elif policy is OverflowPolicy.DROP_OLDEST:
+                evicted = lane.entries.popleft()
+                self._remove_entry(lane, evicted)
+                self._evicted_count += 1
+                self._record_drop(lane, evicted[1], "evicted oldest")
+            elif policy is OverflowPolicy.COALESCE:
+                entry = lane.by_type.get(event.type)
+                if entry is not None:
+                    entry[1] = self._coalesce(entry[1], event)
+                    self._coalesced_count += 1
+                    return True
+            elif policy is OverflowPolicy.SPILL and lane is self._external:
+                return self._spill_locked(event)
+
+            if lane.is_full():
                 # Логируем потерю события вместо молчаливого игнорирования
-                self._dropped_events_count += 1
-                self._version += 1  # Версия изменяется даже при потере события
-                logger.warning(
-                    f"EventQueue full, event dropped (type: {event.type}, count: {self._dropped_events_count})"
-                )
+                self._record_drop(lane, event, "event dropped")
+                return False
+
+        entry = [now, event]
+        lane.entries.append(entry)
+        if self.overflow_policy is OverflowPolicy.COALESCE:
+            lane.by_type[event.type] = entry
+        self._pushed_count += 1
+
+        depth = len(self._external.entries) + len(self._internal.entries)
+        if depth > self._max_depth:
+            self._max_depth = depth
+        return True
+
+    def _record_drop(self, lane: _Lane, event: Event, reason: str) -> None:
+        self._dropped_events_count += 1
+        lane.dropped += 1
+        logger.warning(
+            f"EventQueue {lane.name} lane full, {reason} "
+            f"(type: {event.type}, count: {self._dropped_events_count})"
+        )
+
+    @staticmethod
+    def _coalesce(queued: Event, incoming: Event) -> Event:
+        """
+        Сливает новое событие с ожидающим событием того же типа.
 
-    def pop(self) -> Event | None:
-        with self._version_lock:
+        Интенсивность - наибольшая по модулю, время и метаданные - нового
+        события, metadata["coalesced"] - количество слитых событий.
+        """
+        intensity = incoming.intensity if abs(incoming.intensity) >= abs(queued.intensity) else queued.intensity
+        metadata = dict(incoming.metadata or {})
+        metadata["coalesced"] = (queued.metadata or {}).get("coalesced", 1) + 1
+        return Event(
+            type=incoming.type,
+            intensity=intensity,
+            timestamp=incoming.timestamp,
+            metadata=metadata,
+            source=incoming.source,
+        )
+
+    # === Выгрузка на диск (SPILL) ===
+
+    def _recover_spill(self) -> None:
+        """
+        Подхватывает события, выгруженные прошлым процессом и не прочитанные им.
+
+        Недописанная последняя строка (обрыв записи) отрезается, чтобы новые
+        события дописывались с начала строки.
+        """
+        try:
+            if not self._spill_path.exists() or self._spill_path.stat().st_size == 0:
+                return
+            spill_file = open(self._spill_path, "a+b")
+            spill_file.seek(0)
+            data = spill_file.read()
+            complete = data.rfind(b"\n") + 1
+            if complete < len(data):
+                spill_file.truncate(complete)
+            pending = data.count(b"\n", 0, complete)
+        except OSError as e:
+            logger.warning(f"EventQueue: cannot recover spilled events from {self._spill_path}: {e}")
+            return
+        self._spill_file = spill_file
+        self._spill_read_offset = 0
+        self._spilled_pending = pending
+        if pending:
+            logger.info(f"EventQueue: recovered {pending} spilled events from {self._spill_path}")
+
+    def _spill_locked(self, event: Event) -> bool:
+        try:
+            if self._spill_file is None:
+                # Файл мог остаться после close(): его события идут первыми
+                self._recover_spill()
+            if self._spill_file is None:
+                self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self._spill_path, "a+b")
+                self._spill_read_offset = 0
+            record = {
+                "type": event.type,
+                "intensity": event.intensity,
+                "timestamp": event.timestamp,
+                "metadata": event.metadata or {},
+                "source": event.source,
+            }
+            self._spill_file.seek(0, 2)
+            self._spill_file.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._spill_file.flush()
+        except (OSError, TypeError, ValueError) as e:
+            self._record_drop(self._external, event, f"spill failed ({e})")
+            return False
+        self._spilled_pending += 1
+        self._spilled_count += 1
+        self._pushed_count += 1
+        return True
+
+    def _read_spilled_locked(self, limit: int) -> List[Event]:
+        """Читает до limit выгруженных событий в порядке выгрузки."""
+        events: List[Event] = []
+        spill_file = self._spill_file
+        if spill_file is None:
+            return events
+        spill_file.seek(self._spill_read_offset)
+        while len(events) < limit and self._spilled_pending:
+            line = spill_file.readline()
+            if not line:
+                break
+            self._spilled_pending -= 1
             try:
-                event = self._queue.get_nowait()
-                self._version += 1  # Инкремент версии при изменении состояния
-                return event
-            except queue.Empty:
-                return None
+                record = json.loads(line)
+                events.append(
+                    Event(
+                        type=record["type"],
+                        intensity=record["intensity"],
+                        timestamp=record["timestamp"],
+                        metadata=record.get("metadata") or {},
+                        source=record.get("source"),
+                    )
+                )
+            except (ValueError, KeyError) as e:
+                logger.warning(f"EventQueue: skipped corrupted spilled event: {e}")
+        self._spill_read_offset = spill_file.tell()
+        if not self._spilled_pending:
+            # Все выгруженные события прочитаны - файл начинается заново
+            spill_file.seek(0)
+            spill_file.truncate()
+            self._spill_read_offset = 0
+        return events
 
-    def is_empty(self) -> bool:
-        return self._queue.empty()
+    # === Потребители ===
 
-    def size(self) -> int:
-        return self._queue.qsize()
+    def pop(self) -> Event | None:
+        with self._lock:
+            lane = self._internal if self._internal.entries else self._external
+            if not lane.entries and self._spilled_pending:
+                self._refill_from_spill_locked()
+            if not lane.entries:
+                return None
+            entry = lane.entries.popleft()
+            self._remove_entry(lane, entry)
+            self._version += 1  # Инкремент версии при изменении состояния
+            self._popped_count += 1
+            self._record_latency(time.monotonic() - entry[0])
+            self._not_full.notify_all()
+            return cast(Event, entry[1])
 
     def pop_all(self) -> list[Event]:
         """
         Извлечь все события из очереди атомарно.
 
-        Исправляет race condition: вместо проверки empty() + get_nowait()
-        используем цикл с обработкой исключения Empty, что устраняет
-        проблему между проверкой и извлечением.
+        Полосы забираются целиком под одной блокировкой: сначала внутренние,
+        затем внешние события, каждая полоса в FIFO порядке. При политике SPILL
+        дополнительно возвращается до capacity событий, выгруженных на диск.
 
         Returns:
-            list[Event]: список всех событий из очереди (FIFO порядок)
+            list[Event]: список извлеченных событий
         """
-        events = []
-        # Используем цикл с обработкой Empty вместо проверки empty()
-        # Это устраняет race condition между проверкой и извлечением
-        while True:
-            try:
-                event = self._queue.get_nowait()
+        with self._lock:
+            internal = self._internal.entries
+            external = self._external.entries
+            spilled = self._read_spilled_locked(self.capacity) if self._spilled_pending else []
+            if not internal and not external and not spilled:
+                return []
+            self._internal.entries = deque()
+            self._external.entries = deque()
+            self._internal.by_type.clear()
+            self._external.by_type.clear()
+            self._version += 1  # Инкремент версии при изменении состояния
+            self._not_full.notify_all()
+
+            now = time.monotonic()
+            events = []
+            latency_max = 0.0
+            for enqueued_at, event in internal:
                 events.append(event)
-            except queue.Empty:
-                # Очередь пуста, выходим из цикла
-                break
+                latency = now - enqueued_at
+                self._latency_total += latency
+                if latency > latency_max:
+                    latency_max = latency
+            for enqueued_at, event in external:
+                events.append(event)
+                latency = now - enqueued_at
+                self._latency_total += latency
+                if latency > latency_max:
+                    latency_max = latency
+            self._latency_count += len(events)
+            events.extend(spilled)
+            self._popped_count += len(events)
+            if latency_max > self._latency_max:
+                self._latency_max = latency_max
 
         # Если извлекли события, уведомляем детектор тишины
-        if events and self.silence_detector is not None:
+        if self.silence_detector is not None:
             # Используем время последнего извлеченного события
             last_event_time = max(event.timestamp for event in events)
             self.silence_detector.update_last_event_time(last_event_time)
 
         return events
 
+    def _refill_from_spill_locked(self) -> None:
+        for event in self._read_spilled_locked(self._external.capacity):
+            self._external.entries.append([time.monotonic(), event])
+
+    @staticmethod
+    def _remove_entry(lane: _Lane, entry: List[Any]) -> None:
+        if lane.by_type.get(entry[1].type) is entry:
+            del lane.by_type[entry[1].type]
+
+    def _record_latency(self, latency: float) -> None:
+        self._latency_total += latency
+        self._latency_count += 1
+        if latency > self._latency_max:
+            self._latency_max = latency
+
+    def is_empty(self) -> bool:
+        return not self._internal.entries and not self._external.entries and not self._spilled_pending
+
+    def size(self) -> int:
+        return len(self._internal.entries) + len(self._external.entries) + self._spilled_pending
+
+    # Совместимость с интерфейсом queue.Queue
+    qsize = size
+
+    # === Метрики ===
+
     def get_dropped_events_count(self) -> int:
         """
         Получить количество потерянных событий.
@@ -103,6 +461,46 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
         """Сбросить счетчик потерянных событий."""
         self._dropped_events_count = 0
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Метрики очереди: глубина, потери по полосам, слияния, выгрузка и задержка в очереди.
+
+        Returns:
+            Dict с метриками
+        """
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "internal_capacity": self._internal.capacity,
+                "overflow_policy": self.overflow_policy.value,
+                "size": self.size(),
+                "internal_size": len(self._internal.entries),
+                "external_size": len(self._external.entries),
+                "max_depth": self._max_depth,
+                "pushed": self._pushed_count,
+                "popped": self._popped_count,
+                "dropped": self._dropped_events_count,
+                "dropped_internal": self._internal.dropped,
+                "dropped_external": self._external.dropped,
+                "evicted": self._evicted_count,
+                "coalesced": self._coalesced_count,
+                "blocked_waits": self._blocked_count,
+                "spilled": self._spilled_count,
+                "spilled_pending": self._spilled_pending,
+                "avg_latency": self._latency_total / self._latency_count if self._latency_count else 0.0,
+                "max_latency": self._latency_max,
+            }
+
+    def close(self) -> None:
+        """Закрывает файл выгрузки SPILL (невозвращенные события остаются в файле)."""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+                self._spilled_pending = 0
+
+    # === Тишина ===
+
     def check_and_generate_silence(self) -> Optional[Event]:
         """
         Проверить состояние тишины и сгенерировать событие silence если нужно.
@@ -140,19 +538,19 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
 
     def to_dict(self) -> Dict[str, Any]:
         """
-        Thread-safe атомарная сериализация EventQueue с timeout.
+        Thread-safe атомарная сериализация EventQueue.
 
         Архитектурный контракт:
-        - Thread-safe: Полная синхронизация операции сериализации
-        - Атомарность: Захват консистентного состояния очереди
-        - Отказоустойчивость: Timeout и graceful degradation при ошибках
+        - Thread-safe: Снимок событий копируется под блокировкой очереди
+        - Атомарность: Захват консистентного состояния очереди без извлечения событий
+        - Отказоустойчивость: graceful degradation при ошибках
         - Эффективность: Без кэширования для гарантии актуальности данных
 
         Returns:
             Dict[str, Any]: Стандартизированная структура сериализации:
             {
                 "metadata": {
-                    "version": "3.0",
+                    "version": "4.0",
                     "timestamp": float,
                     "component_type": "EventQueue",
                     "event_count": int,
@@ -164,17 +562,12 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
                     "silence_detection_enabled": bool
                 }
             }
-
-        Raises:
-            SerializationError: При критических ошибках сериализации
         """
         start_time = time.time()
 
         try:
-            # Атомарная сериализация с timeout
             with self._serialization_lock:
-                # Создаем snapshot с timeout
-                events_snapshot = self._create_events_snapshot_atomic()
+                events_snapshot, state_version, spilled_pending = self._create_events_snapshot_atomic()
 
                 serialization_duration = time.time() - start_time
 
@@ -185,10 +578,13 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
                     "component_type": "EventQueue",
                     "event_count": len(events_snapshot),
                     "dropped_events": self._dropped_events_count,
+                    "spilled_pending": spilled_pending,
+                    "capacity": self.capacity,
+                    "overflow_policy": self.overflow_policy.value,
                     "silence_detection_enabled": self.silence_detector is not None,
                     "serialization_duration": serialization_duration,
                     "serialization_timeout": self._serialization_timeout,
-                    "state_version": self._version,  # Version-based concurrency control
+                    "state_version": state_version,  # Version-based concurrency control
                     "thread_safe": True  # Подтверждение thread-safety
                 }
 
@@ -210,7 +606,7 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
             # Graceful degradation - возвращаем минимальную структуру
             return {
                 "metadata": {
-                    "version": "3.0",
+                    "version": "4.0",
                     "timestamp": start_time,
                     "component_type": "EventQueue",
                     "error": f"Serialization failed: {str(e)}",
@@ -223,95 +619,36 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
                 }
             }
 
-    def _create_events_snapshot_atomic(self) -> List[Dict[str, Any]]:
+    def _create_events_snapshot_atomic(self) -> Tuple[List[Dict[str, Any]], int, int]:
         """
-        Создает атомарный snapshot всех событий в очереди с timeout.
+        Создает атомарный snapshot событий в памяти.
 
-        Thread-safety гарантируется за счет:
-        1. Полной синхронизации операции извлечения/восстановления
-        2. Timeout на все блокирующие операции
-        3. Graceful degradation при проблемах
+        Ссылки на события копируются под блокировкой очереди (события не
+        извлекаются и не восстанавливаются, поэтому сериализация не может их
+        потерять), а словари строятся уже вне блокировки. События, выгруженные
+        на диск политикой SPILL, в snapshot не входят - только их количество.
 
         Returns:
-            List[Dict[str, Any]]: Список сериализованных событий
-
-        Raises:
-            SerializationError: При timeout или критических ошибках
+            (список сериализованных событий в порядке извлечения, версия состояния,
+            количество выгруженных событий)
         """
-        snapshot_events = []
-        extracted_events = []
-        start_time = time.time()
-
-        try:
-            # Фаза 1: Атомарное извлечение всех доступных событий с timeout
-            extraction_deadline = start_time + self._serialization_timeout * 0.7  # 70% времени на извлечение
-
-            while time.time() < extraction_deadline:
-                try:
-                    # Используем get_nowait для избежания блокировки
-                    event = self._queue.get_nowait()
-                    extracted_events.append(event)
-                    snapshot_events.append({
-                        "type": event.type,
-                        "intensity": event.intensity,
-                        "timestamp": event.timestamp,
-                        "metadata": event.metadata.copy() if event.metadata else {},
-                        "source": event.source
-                    })
-                except queue.Empty:
-                    # Очередь пуста, завершаем извлечение
-                    break
-
-            # Фаза 2: Гарантированное восстановление событий с timeout
-            restoration_deadline = start_time + self._serialization_timeout
-            restoration_errors = []
-
-            for event in extracted_events:
-                if time.time() >= restoration_deadline:
-                    restoration_errors.append(f"Timeout during restoration of event {event.type}")
-                    break
-
-                try:
-                    # Используем timeout для предотвращения deadlock
-                    self._queue.put(event, timeout=0.5)
-                except queue.Full:
-                    restoration_errors.append(f"Queue full during restoration of event {event.type}")
-
-            # Логируем проблемы восстановления
-            if restoration_errors:
-                logger.warning(
-                    f"Serialization restoration issues: {len(restoration_errors)} events not restored. "
-                    f"Snapshot may be incomplete. Errors: {restoration_errors[:3]}"  # Логируем только первые 3 ошибки
-                )
-
-                # Если не удалось восстановить более 50% событий, считаем это критической ошибкой
-                if len(restoration_errors) > len(extracted_events) // 2:
-                    raise SerializationError(
-                        f"Critical restoration failure: {len(restoration_errors)}/{len(extracted_events)} events not restored"
-                    )
-
-            return snapshot_events
-
-        except SerializationError:
-            # Перебрасываем serialization errors
-            raise
-        except Exception as e:
-            elapsed = time.time() - start_time
-            logger.error(f"Failed to create atomic events snapshot after {elapsed:.3f}s: {e}")
+        with self._lock:
+            events = [entry[1] for entry in self._internal.entries]
+            events.extend(entry[1] for entry in self._external.entries)
+            state_version = self._version
+            spilled_pending = self._spilled_pending
 
-            # В экстренном случае пытаемся восстановить события
-            emergency_restoration_errors = []
-            for event in extracted_events:
-                try:
-                    self._queue.put_nowait(event)
-                except queue.Full:
-                    emergency_restoration_errors.append(f"Emergency restoration failed for {event.type}")
-
-            if emergency_restoration_errors:
-                logger.critical(f"EMERGENCY restoration failed: {emergency_restoration_errors}")
-
-            # Возвращаем частичный snapshot вместо пустого
-            return snapshot_events
+        snapshot_events = [
+            {
+                "type": event.type,
+                "intensity": event.intensity,
+                "timestamp": event.timestamp,
+                "metadata": event.metadata.copy() if event.metadata else {},
+                "source": event.source
+            }
+            for event in events
+        ]
+        return snapshot_events, state_version, spilled_pending
 
     def get_serialization_metadata(self) -> Dict[str, Any]:
         """
@@ -320,7 +657,7 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
         Returns:
             Dict[str, Any]: Метаданные с информацией о состоянии сериализации
         """
-        with self._version_lock:
+        with self._lock:
             current_version = self._version
 
         return {
@@ -334,4 +671,3 @@ class EventQueue(SerializationContract, ThreadSafeSerializable):
             "version_based_concurrency": True,  # Новые гарантии консистентности
             "current_state_version": current_version  # Текущая версия состояния
         }
-
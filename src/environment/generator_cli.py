@@ -3,9 +3,13 @@ CLI для генерации событий и отправки их на API 
 
 Пример:
     python -m environment.generator_cli --interval 5 --host localhost --port 8000
+
+Пакетный режим (--batch-size N > 1) копит N событий и отправляет их одним
+запросом POST /events в формате NDJSON.
 """
 
 import argparse
+import json
 import time
 
 import requests
@@ -16,10 +20,12 @@ from src.logging_config import get_logger, setup_logging
 logger = get_logger(__name__)
 
 
-def send_event(host: str, port: int, payload: dict) -> tuple[bool, int | None, str, str]:
+def send_event(
+    host: str, port: int, payload: dict, session: requests.Session | None = None
+) -> tuple[bool, int | None, str, str]:
     url = f"http://{host}:{port}/event"
     try:
-        resp = requests.post(url, json=payload, timeout=5)
+        resp = (session or requests).post(url, json=payload, timeout=5)
         code = resp.status_code
         body = resp.text
         return True, code, "", body
@@ -29,6 +35,26 @@ def send_event(host: str, port: int, payload: dict) -> tuple[bool, int | None, s
         return False, None, str(e), ""
 
 
+def send_events(
+    host: str, port: int, payloads: list[dict], session: requests.Session | None = None
+) -> tuple[bool, int | None, str, str]:
+    """Отправляет пакет событий одним запросом POST /events (NDJSON)."""
+    url = f"http://{host}:{port}/events"
+    body = "".join(json.dumps(payload) + "\n" for payload in payloads)
+    try:
+        resp = (session or requests).post(
+            url,
+            data=body.encode("utf-8"),
+            headers={"Content-Type": "application/x-ndjson"},
+            timeout=5,
+        )
+        return True, resp.status_code, "", resp.text
+    except requests.exceptions.RequestException as e:
+        return False, 0, str(e), ""
+    except Exception as e:
+        return False, None, str(e), ""
+
+
 def main():
     parser = argparse.ArgumentParser(description="Environment Event Generator CLI")
     parser.add_argument(
@@ -43,6 +69,12 @@ def main():
         default=5.0,
         help="Интервал генерации событий, сек (по умолчанию 5)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Событий в одном запросе POST /events (по умолчанию 1 - POST /event на событие)",
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -56,8 +88,13 @@ def main():
 
     generator = EventGenerator()
 
+    # Одно соединение на все запросы вместо нового TCP соединения на событие
+    session = requests.Session()
+    batch: list[dict] = []
+
     logger.info(
-        f"[GeneratorCLI] start: host={args.host} port={args.port} interval={args.interval}s"
+        f"[GeneratorCLI] start: host={args.host} port={args.port} interval={args.interval}s "
+        f"batch_size={args.batch_size}"
     )
     logger.info("[GeneratorCLI] Нажмите Ctrl+C для остановки")
 
@@ -70,19 +107,39 @@ def main():
                 "timestamp": event.timestamp,
                 "metadata": event.metadata,
             }
-            success, code, reason, body = send_event(args.host, args.port, payload)
-            if success:
-                logger.debug(
-                    f"[GeneratorCLI] Sent event: {payload} | Code: {code} | Body: '{body}'"
-                )
+            if args.batch_size > 1:
+                batch.append(payload)
+                if len(batch) >= args.batch_size:
+                    success, code, reason, body = send_events(
+                        args.host, args.port, batch, session=session
+                    )
+                    if success:
+                        logger.debug(f"[GeneratorCLI] Sent batch: {len(batch)} events | Code: {code}")
+                    else:
+                        logger.warning(
+                            f"[GeneratorCLI] Failed batch: code={code} reason='{reason}' body='{body}'"
+                        )
+                    batch = []
             else:
-                logger.warning(
-                    f"[GeneratorCLI] Failed: code={code} reason='{reason}' body='{body}'"
+                success, code, reason, body = send_event(
+                    args.host, args.port, payload, session=session
                 )
+                if success:
+                    logger.debug(
+                        f"[GeneratorCLI] Sent event: {payload} | Code: {code} | Body: '{body}'"
+                    )
+                else:
+                    logger.warning(
+                        f"[GeneratorCLI] Failed: code={code} reason='{reason}' body='{body}'"
+                    )
 
             time.sleep(args.interval)
     except KeyboardInterrupt:
+        if batch:
+            send_events(args.host, args.port, batch, session=session)
         logger.info("\n[GeneratorCLI] Stopped")
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":  # pragma: no cover
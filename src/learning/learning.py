@@ -19,6 +19,7 @@ import threading
 import time
 from typing import TYPE_CHECKING, Dict, List
 
+from src.memory.columnar_store import ColumnarEntryStore
 from src.memory.memory import MemoryEntry
 
 if TYPE_CHECKING:
@@ -116,6 +117,10 @@ class LearningEngine:
             "memory_entries": memory,  # Передаем записи для анализа весов и паттернов
         }
 
+        if isinstance(memory, ColumnarEntryStore):
+            self._collect_columnar_statistics(memory, statistics)
+            return statistics
+
         for entry in memory:
             # Статистика по типам событий
             if entry.event_type != "feedback":
@@ -146,6 +151,34 @@ class LearningEngine:
 
         return statistics
 
+    def _collect_columnar_statistics(self, memory: ColumnarEntryStore, statistics: Dict) -> None:
+        """
+        Заполняет статистику process_statistics по колонкам ColumnarEntryStore.
+
+        Счетчики и суммы значимости по типам считаются одним проходом по колонкам
+        кодов типов и значимости, feedback_data читается только у записей, где он есть.
+        Результат совпадает с построчным проходом.
+        """
+        for event_type, (count, total_significance) in memory.event_type_summary().items():
+            if event_type == "feedback":
+                statistics["feedback_entries"] = count
+                continue
+            statistics["event_type_counts"][event_type] = count
+            statistics["event_type_total_significance"][event_type] = total_significance
+
+        for event_type, feedback_data in memory.feedback_items():
+            if event_type != "feedback" or not feedback_data:
+                continue
+            pattern = feedback_data.get("action_pattern", "")
+            if pattern:
+                statistics["feedback_pattern_counts"][pattern] = (
+                    statistics["feedback_pattern_counts"].get(pattern, 0) + 1
+                )
+            state_delta = feedback_data.get("state_delta", {})
+            for key in ["energy", "stability", "integrity"]:
+                if key in state_delta:
+                    statistics["feedback_state_deltas"][key].append(state_delta[key])
+
     def calculate_adaptive_thresholds(self, statistics: Dict) -> Dict[str, float]:
         """
         Рассчитывает адаптивные пороги на основе расширенной статистики Memory.
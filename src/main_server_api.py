@@ -1,23 +1,44 @@
 import argparse
-import glob
 import importlib
 import json
 import os
+import select
+import selectors
+import socket
 import sys
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, HTTPServer
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from colorama import Fore, Style, init
 
-from src.environment import Event, EventQueue
+from src.environment import Event, EventQueue, OverflowPolicy
+from src.environment.event_ingest import (
+    BatchTooLargeError,
+    ingest_events,
+    iter_json_array,
+    iter_ndjson,
+)
+from src.environment.event_queue import DEFAULT_CAPACITY
 from src.logging_config import get_logger, setup_logging
 from src.monitor.console import monitor
 from src.monitor.semantic_monitor import SemanticMonitor
 from src.runtime.loop import run_loop
+from src.runtime import openmetrics
+from src.runtime.sampling_profiler import get_sampling_profiler
+from src.runtime.metrics_registry import get_metrics_registry
+from src.runtime.status_publisher import (
+    StatusFileReader,
+    get_published_status,
+    get_status_publisher,
+)
+import src.state.self_state as self_state_module
 from src.state.self_state import SelfState
+from src.state.snapshot_catalog import get_snapshot_catalog
 
 init()
 
@@ -29,35 +50,321 @@ logger = get_logger(__name__)
 HOST = "localhost"
 PORT = 8000
 
+DEFAULT_API_WORKERS = 8  # Потоков обработки запросов
+DEFAULT_REQUEST_TIMEOUT = 10.0  # Таймаут сокета во время обработки запроса (сек)
+DEFAULT_KEEP_ALIVE_TIMEOUT = 5.0  # Простой keep-alive соединения между запросами (сек)
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0  # Ожидание начатых запросов при остановке (сек)
+
+# Читатель файла живого статуса (если runtime loop работает в другом процессе)
+_status_file_reader = StatusFileReader()
+
+
+def clear_runtime_data() -> None:
+    """
+    Удаляет лог тиков, все snapshot и опубликованный статус (/clear-data, --clear-data).
+
+    Snapshot удаляются во всех форматах (.json, .json.gz, .bin, .delta.json) вместе
+    с записями каталога, иначе load_latest_snapshot() восстановил бы очищенное состояние.
+    """
+    snapshot_dir = self_state_module.SNAPSHOT_DIR
+    os.makedirs(snapshot_dir, exist_ok=True)
+    log_file = "data/tick_log.jsonl"
+    if os.path.exists(log_file):
+        os.remove(log_file)
+    get_snapshot_catalog(snapshot_dir).clear()
+    # Опубликованный статус очищенной жизни больше не отдается
+    get_status_publisher().clear()
 
 
 class StoppableHTTPServer(HTTPServer):
-    def __init__(self, *args, **kwargs):
+    """
+    HTTP сервер API с ограниченным пулом обработчиков.
+
+    Принимающий цикл только принимает соединения и передает их в пул из
+    max_workers потоков, поэтому медленный запрос (например, /status с чтением
+    snapshot) не задерживает прием событий. Соединения сверх max_pending
+    (обрабатываемые и ожидающие в пуле) получают 503.
+
+    Простаивающее keep-alive соединение не занимает обработчик: после ответа
+    оно возвращается в селектор принимающего цикла и снова попадает в пул,
+    когда клиент присылает следующий запрос. Такие соединения закрываются
+    после keep_alive_timeout секунд бездействия (не больше max_pending штук,
+    лишние закрываются начиная со старейших). request_timeout - таймаут
+    сокета во время обработки запроса. shutdown() ждет завершения начатых
+    запросов не дольше shutdown_timeout.
+    """
+
+    def __init__(
+        self,
+        *args,
+        max_workers: int = DEFAULT_API_WORKERS,
+        max_pending: int | None = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        keep_alive_timeout: float = DEFAULT_KEEP_ALIVE_TIMEOUT,
+        shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         # API читает состояние из snapshots для полной изоляции от runtime
         self.event_queue: EventQueue | None = None
         self.stopped = False
         self.dev_mode = False
 
+        self.max_workers = max_workers
+        self.max_pending = max_pending if max_pending is not None else max_workers * 8
+        self.request_timeout = request_timeout
+        self.keep_alive_timeout = keep_alive_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="life-api")
+        self._inflight = 0
+        self._inflight_cond = threading.Condition()
+        self._queued: dict = {}  # Future -> соединение, еще не взятое обработчиком
+        self._serving = threading.Event()
+        self._served_count = 0
+        self._rejected_count = 0
+
+        # Простаивающие keep-alive соединения: обработчики передают их принимающему
+        # циклу через _parked_incoming и будят его записью в _wakeup_w
+        self._parked: OrderedDict = OrderedDict()  # сокет -> (адрес, срок простоя)
+        self._parked_incoming: list = []
+        self._parking_closed = False
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+
     def serve_forever(self, poll_interval=0.5):
-        self.timeout = poll_interval
-        while not self.stopped:
-            self.handle_request()
+        self._serving.set()
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.socket, selectors.EVENT_READ)
+                selector.register(self._wakeup_r, selectors.EVENT_READ)
+                while not self.stopped:
+                    for key, _ in selector.select(poll_interval):
+                        if key.fileobj is self.socket:
+                            self._handle_request_noblock()
+                        elif key.fileobj is self._wakeup_r:
+                            self._register_parked(selector)
+                        else:
+                            # Клиент прислал следующий запрос по keep-alive соединению
+                            selector.unregister(key.fileobj)
+                            client_address, _ = self._parked.pop(key.fileobj)
+                            self.process_request(key.fileobj, client_address)
+                    self._expire_parked(selector)
+        finally:
+            self._close_parked()
+            self._serving.clear()
+
+    def process_request(self, request, client_address):
+        """Передает соединение в пул обработчиков (вызывается принимающим циклом)."""
+        with self._inflight_cond:
+            overloaded = self._inflight >= self.max_pending
+            if not overloaded:
+                self._inflight += 1
+        if overloaded:
+            self._reject_request(request)
+            return
+        try:
+            future = self._executor.submit(self._process_request_worker, request, client_address)
+        except RuntimeError:
+            # Пул уже остановлен
+            self._finish_inflight()
+            self.shutdown_request(request)
+            return
+        with self._inflight_cond:
+            self._queued[future] = request
+        future.add_done_callback(self._forget_future)
+
+    def _forget_future(self, future):
+        with self._inflight_cond:
+            self._queued.pop(future, None)
+
+    def finish_request(self, request, client_address):
+        return self.RequestHandlerClass(request, client_address, self)
+
+    def _process_request_worker(self, request, client_address):
+        handler = None
+        try:
+            handler = self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            if getattr(handler, "idle_keep_alive", False):
+                self._park(request, client_address)
+            else:
+                self.shutdown_request(request)
+            self._finish_inflight()
+
+    def _park(self, request, client_address):
+        """Возвращает простаивающее keep-alive соединение принимающему циклу."""
+        with self._inflight_cond:
+            if not self._parking_closed:
+                self._parked_incoming.append((request, client_address))
+                request = None
+        if request is not None:
+            self.shutdown_request(request)
+            return
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            pass  # Буфер пробуждения полон: цикл и так проснется
+
+    def _register_parked(self, selector):
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except OSError:
+            pass
+        with self._inflight_cond:
+            incoming, self._parked_incoming = self._parked_incoming, []
+        deadline = time.monotonic() + self.keep_alive_timeout
+        for request, client_address in incoming:
+            if len(self._parked) >= self.max_pending:
+                oldest, _ = self._parked.popitem(last=False)
+                selector.unregister(oldest)
+                self.shutdown_request(oldest)
+            self._parked[request] = (client_address, deadline)
+            selector.register(request, selectors.EVENT_READ)
+
+    def _expire_parked(self, selector):
+        now = time.monotonic()
+        while self._parked:
+            request, (_, deadline) = next(iter(self._parked.items()))
+            if deadline > now:
+                break
+            del self._parked[request]
+            selector.unregister(request)
+            self.shutdown_request(request)
+
+    def _close_parked(self):
+        with self._inflight_cond:
+            self._parking_closed = True
+            incoming, self._parked_incoming = self._parked_incoming, []
+            parked = [request for request, _ in incoming] + list(self._parked)
+            self._parked.clear()
+        for request in parked:
+            self.shutdown_request(request)
+
+    def _finish_inflight(self):
+        with self._inflight_cond:
+            self._inflight -= 1
+            self._served_count += 1
+            self._inflight_cond.notify_all()
+
+    def _reject_request(self, request):
+        self._rejected_count += 1
+        try:
+            request.sendall(
+                b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\nConnection: close\r\n\r\n"
+            )
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def get_stats(self) -> dict:
+        """Статистика пула: обрабатываемые, обработанные, отклоненные и простаивающие соединения."""
+        with self._inflight_cond:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "inflight": self._inflight,
+                "served": self._served_count,
+                "rejected": self._rejected_count,
+                "idle": len(self._parked) + len(self._parked_incoming),
+            }
 
     def shutdown(self):
         self.stopped = True
+        # Ждем выхода принимающего цикла (он проверяет флаг раз в poll_interval)
+        deadline = time.monotonic() + self.shutdown_timeout
+        while self._serving.is_set() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # Завершаем начатые запросы, новые соединения больше не принимаются
+        with self._inflight_cond:
+            while self._inflight > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"API server shutdown: {self._inflight} requests still in progress")
+                    break
+                self._inflight_cond.wait(remaining)
+            queued = list(self._queued.items())
+        # Соединения, не дождавшиеся обработчика, закрываем сами: отмененная задача их не закроет
+        for future, request in queued:
+            if future.cancel():
+                self.shutdown_request(request)
+                with self._inflight_cond:
+                    self._inflight -= 1
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._close_parked()
         self.server_close()
 
+    def server_close(self):
+        super().server_close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
 
 class LifeHandler(BaseHTTPRequestHandler):
     server: Any  # Добавляем, чтобы IDE знала, что у server могут быть кастомные атрибуты
 
+    # Keep-alive: клиенты (generator_cli, мониторы /status) переиспользуют соединение
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело уходят отдельными send: без TCP_NODELAY ответ keep-alive ждет delayed ACK
+    disable_nagle_algorithm = True
+
+    # Период проверки остановки сервера при ожидании следующего запроса keep-alive
+    KEEP_ALIVE_POLL = 0.1
+
+    def setup(self):
+        # Таймаут сокета: медленные клиенты не держат обработчик дольше request_timeout
+        self.timeout = getattr(self.server, "request_timeout", None)
+        # True - соединение живо, но следующего запроса еще нет (сервер вернет его в селектор)
+        self.idle_keep_alive = False
+        super().setup()
+
+    def handle(self):
+        """
+        Обрабатывает запросы соединения, пока клиент держит keep-alive.
+
+        Уже присланные запросы обрабатываются подряд. Если следующего запроса
+        еще нет, StoppableHTTPServer получает соединение обратно (idle_keep_alive)
+        и освобождает обработчик; с другими серверами обработчик ждет запрос не
+        дольше keep_alive_timeout и завершается сразу при остановке сервера.
+        """
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self._request_pending():
+                if isinstance(self.server, StoppableHTTPServer):
+                    self.idle_keep_alive = True
+                    return
+                if not self._wait_for_next_request():
+                    return
+            self.handle_one_request()
+
+    def _request_pending(self) -> bool:
+        """Получены ли уже данные следующего запроса (в буфере rfile или в сокете)."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def _wait_for_next_request(self) -> bool:
+        timeout = getattr(self.server, "keep_alive_timeout", DEFAULT_KEEP_ALIVE_TIMEOUT)
+        deadline = time.monotonic() + timeout
+        while not getattr(self.server, "stopped", False):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self.connection], [], [], min(remaining, self.KEEP_ALIVE_POLL))
+            if readable:
+                return True
+        return False
+
     def do_GET(self):
         if self.path.startswith("/status"):
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-
             # Парсим query-параметры для ограничения больших полей
             from urllib.parse import parse_qs, urlparse
 
@@ -97,62 +404,128 @@ class LifeHandler(BaseHTTPRequestHandler):
                     pass
 
             # Получаем текущее состояние
-            # Сначала пробуем взять из сервера (для тестов), иначе из snapshot
+            # Сначала пробуем взять из сервера (для тестов), затем опубликованное
+            # runtime loop состояние, и только при холодном старте (или memory_limit
+            # больше опубликованного) - из snapshot
             if hasattr(self.server, "self_state") and self.server.self_state is not None:
-                self_state = self.server.self_state
-            else:
-                try:
-                    self_state = SelfState().load_latest_snapshot()
-                except FileNotFoundError:
-                    self_state = SelfState()
+                safe_status = self.server.self_state.get_safe_status_dict(limits=limits)
+                self._send_status(json.dumps(safe_status).encode())
+                return
+
+            published = get_published_status(_status_file_reader, limits)
+            if published is not None:
+                # Лимиты применяются к опубликованному документу (представление кэшируется)
+                published = published.view(limits)
+                if published.matches(self.headers.get("If-None-Match")):
+                    self.send_response(304)
+                    self.send_header("ETag", published.etag)
+                    self.end_headers()
+                    return
+                self._send_status(published.body, etag=published.etag)
+                return
+
+            try:
+                self_state = SelfState().load_latest_snapshot()
+            except FileNotFoundError:
+                self_state = SelfState()
 
             safe_status = self_state.get_safe_status_dict(limits=limits)
-            self.wfile.write(json.dumps(safe_status).encode())
+            self._send_status(json.dumps(safe_status).encode())
         elif self.path == "/refresh-cache":
             # В текущей реализации состояние читается из snapshots при каждом запросе,
             # поэтому кэширование не требуется. Просто возвращаем успех.
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.end_headers()
-            self.wfile.write(b'{"message": "Cache refreshed (no-op in current implementation)"}')
+            self._send_body(
+                200,
+                b'{"message": "Cache refreshed (no-op in current implementation)"}',
+                content_type="application/json",
+            )
+        elif self.path == "/performance":
+            # Снимок реестра метрик: перцентили операций, тиков и фаз, счетчики и gauge
+            self._send_body(
+                200, json.dumps(get_metrics_registry().snapshot()).encode(), content_type="application/json"
+            )
+        elif self.path.split("?", 1)[0] == "/metrics":
+            # Экспозиция для Prometheus: OpenMetrics, если скрапер его принимает
+            use_openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            body = openmetrics.render(get_metrics_registry(), openmetrics=use_openmetrics).encode()
+            content_type = (
+                openmetrics.OPENMETRICS_CONTENT_TYPE
+                if use_openmetrics
+                else openmetrics.PROMETHEUS_CONTENT_TYPE
+            )
+            self._send_body(200, body, content_type=content_type)
+        elif self.path == "/profile/status":
+            stats = get_sampling_profiler().get_stats()
+            self._send_body(200, json.dumps(stats).encode(), content_type="application/json")
+        elif self.path.split("?", 1)[0] == "/profile":
+            # Collapsed stacks сэмплирующего профилировщика (flamegraph.pl, speedscope)
+            from urllib.parse import parse_qs, urlparse
+
+            query_params = parse_qs(urlparse(self.path).query)
+            try:
+                seconds = float(query_params["seconds"][0]) if "seconds" in query_params else None
+            except ValueError:
+                self._send_body(400, b"Invalid 'seconds'")
+                return
+            body = get_sampling_profiler().collapsed(seconds).encode("utf-8")
+            self._send_body(200, body, content_type="text/plain; charset=utf-8")
         elif self.path == "/clear-data":
-            os.makedirs("data/snapshots", exist_ok=True)
-            log_file = "data/tick_log.jsonl"
-            snapshots = glob.glob("data/snapshots/*.json")
-            if os.path.exists(log_file):
-                os.remove(log_file)
-            for f in snapshots:
-                if os.path.exists(f):
-                    os.remove(f)
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b"Data cleared")
+            clear_runtime_data()
+            self._send_body(200, b"Data cleared")
 
 
         else:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b"Unknown endpoint")
+            self._send_body(404, b"Unknown endpoint")
+
+    def _send_body(self, code: int, body: bytes, content_type: str | None = None) -> None:
+        """
+        Отправляет ответ с Content-Length (обязателен для keep-alive).
+
+        После ответа с ошибкой соединение закрывается: тело запроса могло быть
+        прочитано не полностью.
+        """
+        self.send_response(code)
+        if content_type is not None:
+            self.send_header("Content-type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if code >= 400:
+            self.close_connection = True
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_status(self, body: bytes, etag: str | None = None) -> None:
+        """Отправляет JSON-документ статуса (с ETag, если он известен)."""
+        self.send_response(200)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
 
     def do_POST(self):
         """
         Поддерживаемые эндпоинты (минимальный набор для полной изоляции от runtime):
         /event — добавить одиночное событие (внешнее воздействие на систему)
+        /events — добавить пакет событий (JSON массив или NDJSON)
+        /profile — включить/выключить сэмплирующий профилировщик
         """
         # POST /event — одиночное событие (существующий эндпоинт)
         if self.path == "/event":
             self._handle_single_event()
+        elif self.path == "/events":
+            self._handle_event_batch()
+        elif self.path == "/profile":
+            self._handle_profile_control()
         else:
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b"Unknown endpoint")
+            self._send_body(404, b"Unknown endpoint")
 
     def _handle_single_event(self):
         """Обработка POST /event"""
         if not self.server.event_queue:
-            self.send_response(500)
-            self.end_headers()
-            self.wfile.write(b"No event queue configured")
+            self._send_body(500, b"No event queue configured")
             return
 
         content_length = int(self.headers.get("Content-Length", 0))
@@ -160,16 +533,12 @@ class LifeHandler(BaseHTTPRequestHandler):
         try:
             payload = json.loads(raw.decode("utf-8"))
         except Exception:
-            self.send_response(400)
-            self.end_headers()
-            self.wfile.write(b"Invalid JSON")
+            self._send_body(400, b"Invalid JSON")
             return
 
         event_type = payload.get("type")
         if not isinstance(event_type, str):
-            self.send_response(400)
-            self.end_headers()
-            self.wfile.write(b"'type' is required")
+            self._send_body(400, b"'type' is required")
             return
 
         intensity = float(payload.get("intensity", 0.0))
@@ -186,18 +555,120 @@ class LifeHandler(BaseHTTPRequestHandler):
             )
             self.server.event_queue.push(event)
             logger.debug(f"Event PUSHED to queue. Size now: {self.server.event_queue.qsize()}")
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b"Event accepted")
+            self._send_body(200, b"Event accepted")
         except Exception as exc:
-            self.send_response(400)
-            self.end_headers()
-            self.wfile.write(f"Invalid event: {exc}".encode("utf-8"))
+            self._send_body(400, f"Invalid event: {exc}".encode("utf-8"))
+
+    def _handle_profile_control(self):
+        """
+        Обработка POST /profile.
+
+        Тело - JSON {"enabled": bool, "interval": сек, "reset": bool}, все поля
+        необязательны. Ответ - статистика профилировщика после изменения.
+        """
+        content_length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(content_length) if content_length > 0 else b"{}"
+        try:
+            payload = json.loads(raw.decode("utf-8"))
+        except Exception:
+            self._send_body(400, b"Invalid JSON")
+            return
+        if not isinstance(payload, dict):
+            self._send_body(400, b"Expected JSON object")
+            return
 
+        profiler = get_sampling_profiler()
+        try:
+            interval = payload.get("interval")
+            interval = float(interval) if interval is not None else None
+            if payload.get("reset"):
+                profiler.reset()
+            enabled = payload.get("enabled")
+            if enabled is True:
+                profiler.start(interval=interval)
+            elif enabled is False:
+                profiler.stop()
+            elif interval is not None:
+                if interval <= 0:
+                    raise ValueError(f"interval должен быть положительным: {interval}")
+                profiler.interval = interval
+        except (TypeError, ValueError) as exc:
+            self._send_body(400, f"Invalid profiler settings: {exc}".encode("utf-8"))
+            return
+        stats = profiler.get_stats()
+        self._send_body(200, json.dumps(stats).encode(), content_type="application/json")
+
+    def _handle_event_batch(self):
+        """
+        Обработка POST /events.
 
+        Тело - JSON массив событий или NDJSON (Content-Type application/x-ndjson,
+        по одному событию в строке; допускается Transfer-Encoding: chunked).
+        NDJSON читается потоково, события ставятся в очередь порциями.
+        Ответ - JSON с результатом для каждого элемента.
+        """
+        if not self.server.event_queue:
+            self._send_body(500, b"No event queue configured")
+            return
 
+        content_type = self.headers.get("Content-Type", "").lower()
+        try:
+            if "ndjson" in content_type or "jsonl" in content_type:
+                items = iter_ndjson(self._iter_body_lines())
+            else:
+                raw = b"".join(self._iter_body_lines()).strip()
+                if raw.startswith(b"["):
+                    items = iter_json_array(raw)
+                else:
+                    items = iter_ndjson(raw.splitlines())
+            result = ingest_events(self.server.event_queue, items)
+        except BatchTooLargeError as exc:
+            self._send_body(413, str(exc).encode("utf-8"))
+            return
+        except ValueError as exc:
+            self._send_body(400, f"Invalid batch: {exc}".encode("utf-8"))
+            return
 
+        logger.debug(
+            f"Получен POST /events: accepted={result['accepted']}, dropped={result['dropped']}, "
+            f"invalid={result['invalid']}"
+        )
+        self._send_body(200, json.dumps(result).encode("utf-8"), content_type="application/json")
+
+    def _iter_body_lines(self):
+        """Строки тела запроса по Content-Length или Transfer-Encoding: chunked."""
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            buffer = b""
+            for chunk in self._iter_body_chunks():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    yield line + b"\n"
+            if buffer:
+                yield buffer
+            return
 
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining > 0:
+            line = self.rfile.readline(remaining)
+            if not line:
+                break
+            remaining -= len(line)
+            yield line
+
+    def _iter_body_chunks(self):
+        """Данные тела запроса в кодировке chunked."""
+        while True:
+            size_line = self.rfile.readline()
+            size = int(size_line.split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # Пропускаем trailer до пустой строки
+                while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            data = self.rfile.read(size)
+            self.rfile.readline()  # CRLF после данных чанка
+            yield data
 
     def log_request(self, code, size=-1):  # pragma: no cover
         if self.server.dev_mode:
@@ -227,15 +698,15 @@ class LifeHandler(BaseHTTPRequestHandler):
             sys.stdout.flush()
 
 
-def start_api_server(event_queue, dev_mode):
+def start_api_server(event_queue, dev_mode, max_workers=DEFAULT_API_WORKERS):
     global server
-    server = StoppableHTTPServer((HOST, PORT), LifeHandler)
+    server = StoppableHTTPServer((HOST, PORT), LifeHandler, max_workers=max_workers)
     # self_state больше не передается - API читает из snapshots
     server.event_queue = event_queue
     server.dev_mode = dev_mode
 
 
-    logger.info(f"API server running on http://{HOST}:{PORT}")
+    logger.info(f"API server running on http://{HOST}:{PORT} (workers={max_workers})")
     server.serve_forever()
 
 
@@ -326,7 +797,7 @@ def reloader_thread():  # pragma: no cover
             # Перезапуск API сервера
             api_thread = threading.Thread(
                 target=start_api_server,
-                args=(event_queue, True),
+                args=(event_queue, True, args.api_workers),
                 daemon=True,
             )
             api_thread.start()
@@ -357,6 +828,10 @@ def reloader_thread():  # pragma: no cover
                     config["enable_profiling"],
                     semantic_monitor,  # SemanticMonitor для пассивного мониторинга
                 ),
+                kwargs={
+                    "enable_sampling_profiler": config["enable_sampling_profiler"],
+                    "async_snapshots": config["async_snapshots"],
+                },
                 daemon=True,
             )
             loop_thread.start()
@@ -376,6 +851,34 @@ if __name__ == "__main__":  # pragma: no cover
         action="store_true",
         help="Enable runtime loop profiling with cProfile",
     )
+    parser.add_argument(
+        "--sampling-profiler",
+        action="store_true",
+        help="Start the low-overhead sampling profiler (can be toggled via POST /profile)",
+    )
+    parser.add_argument(
+        "--async-snapshots",
+        action="store_true",
+        help="Serialize and write snapshots in a background thread",
+    )
+    parser.add_argument(
+        "--event-queue-capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Capacity of the event queue lanes",
+    )
+    parser.add_argument(
+        "--event-queue-overflow",
+        choices=[policy.value for policy in OverflowPolicy],
+        default=OverflowPolicy.DROP_NEWEST.value,
+        help="Event queue overflow policy",
+    )
+    parser.add_argument(
+        "--api-workers",
+        type=int,
+        default=DEFAULT_API_WORKERS,
+        help="Number of API request worker threads",
+    )
     args = parser.parse_args()
     dev_mode = args.dev
 
@@ -386,17 +889,13 @@ if __name__ == "__main__":  # pragma: no cover
         "tick_interval": args.tick_interval,
         "snapshot_period": args.snapshot_period,
         "enable_profiling": args.profile,
+        "enable_sampling_profiler": args.sampling_profiler,
+        "async_snapshots": args.async_snapshots,
     }
 
     if args.clear_data.lower() == "yes":
         logger.info("Очистка данных при старте...")
-        log_file = "data/tick_log.jsonl"
-        snapshots = glob.glob("data/snapshots/*.json")
-        if os.path.exists(log_file):
-            os.remove(log_file)
-        for f in snapshots:
-            if os.path.exists(f):
-                os.remove(f)
+        clear_runtime_data()
 
     try:
         self_state = SelfState().load_latest_snapshot()
@@ -411,7 +910,9 @@ if __name__ == "__main__":  # pragma: no cover
     api_thread = None
 
     # Инициализация Environment
-    event_queue = EventQueue()
+    event_queue = EventQueue(
+        capacity=args.event_queue_capacity, overflow_policy=args.event_queue_overflow
+    )
 
     if args.dev:
         logger.info("--dev mode enabled, starting reloader")
@@ -419,7 +920,7 @@ if __name__ == "__main__":  # pragma: no cover
 
     # Start API thread
     api_thread = threading.Thread(
-        target=start_api_server, args=(event_queue, dev_mode), daemon=True
+        target=start_api_server, args=(event_queue, dev_mode, args.api_workers), daemon=True
     )
     api_thread.start()
 
@@ -445,6 +946,10 @@ if __name__ == "__main__":  # pragma: no cover
             config["enable_profiling"],
             semantic_monitor,  # SemanticMonitor для пассивного мониторинга
         ),
+        kwargs={
+            "enable_sampling_profiler": config["enable_sampling_profiler"],
+            "async_snapshots": config["async_snapshots"],
+        },
         daemon=True,
     )
     loop_thread.start()
@@ -1,4 +1,4 @@
-from .engine import MeaningEngine
+from .engine import MeaningEngine, MeaningStateView
 from .meaning import Meaning
 
-__all__ = ["Meaning", "MeaningEngine"]
+__all__ = ["Meaning", "MeaningEngine", "MeaningStateView"]
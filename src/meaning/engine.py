@@ -1,5 +1,13 @@
 import logging
-from typing import Dict, Union
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
 
 from src.environment.event import Event
 from src.state.self_state import SelfState
@@ -8,6 +16,9 @@ from .meaning import Meaning
 
 logger = logging.getLogger(__name__)
 
+# Параметры состояния, на которые влияет событие (порядок ключей impact)
+IMPACT_KEYS = ("energy", "stability", "integrity")
+
 
 class MeaningEngine:
     """
@@ -39,13 +50,147 @@ class MeaningEngine:
     # Применяется когда integrity < LOW_INTEGRITY_THRESHOLD
     LOW_INTEGRITY_SIGNIFICANCE_MULTIPLIER = 1.5
 
-    def __init__(self):
+    # Веса значимости по типам событий (неизвестные типы - 1.0)
+    TYPE_WEIGHTS: Dict[str, float] = {
+        "shock": 1.5,  # Шоки всегда значимы
+        "noise": 0.5,  # Шум часто игнорируется
+        "recovery": 1.0,  # Восстановление нормально
+        "decay": 1.0,  # Распад нормален
+        "idle": 0.2,  # Бездействие почти не значимо
+        "memory_echo": 0.8,  # Внутренние воспоминания умеренно значимы
+        # Новые социальные события
+        "social_presence": 0.9,  # Присутствие других умеренно значимо
+        "social_conflict": 1.2,  # Конфликт вызывает стресс
+        "social_harmony": 1.1,  # Гармония значима позитивно
+        # Новые когнитивные события
+        "cognitive_doubt": 0.8,  # Сомнение умеренно значимо
+        "cognitive_clarity": 1.0,  # Ясность нормально значима
+        "cognitive_confusion": 0.7,  # Путаница менее значима чем шок
+        # Новые экзистенциальные события
+        "existential_void": 1.3,  # Пустота очень значима
+        "existential_purpose": 1.4,  # Цель крайне значима
+        "existential_finitude": 1.1,  # Конечность значима
+        # Новые социально-эмоциональные события
+        "connection": 1.1,  # Связь с другими значима
+        "isolation": 1.0,  # Изоляция значима
+        # Новые когнитивные события
+        "insight": 1.2,  # Озарение очень значимо
+        "confusion": 0.8,  # Замешательство умеренно значимо
+        "curiosity": 0.7,  # Любопытство мало значимо
+        # Новые экзистенциальные события
+        "meaning_found": 1.4,  # Нахождение смысла крайне значимо
+        "void": 1.3,  # Пустота очень значима
+        "acceptance": 0.9,  # Принятие умеренно значимо
+        # События осознания тишины
+        "silence": 0.8,  # Тишина умеренно значима (осознание отсутствия)
+        # Новые эмоциональные события
+        "joy": 1.1,  # Радость значима позитивно
+        "sadness": 0.9,  # Грусть умеренно значима
+        "fear": 1.2,  # Страх очень значим
+        "calm": 0.8,  # Спокойствие умеренно значимо
+        # Новые физические события
+        "discomfort": 0.7,  # Дискомфорт мало значим
+        "comfort": 0.8,  # Комфорт умеренно значим
+        "fatigue": 0.9,  # Усталость умеренно значима
+        # Новые временные события
+        "anticipation": 0.7,  # Ожидание мало значимо
+        "boredom": 0.6,  # Скука незначима
+        # Новые креативные события
+        "inspiration": 1.3,  # Вдохновение очень значимо
+        "creative_dissonance": 0.8,  # Творческий тупик умеренно значим
+    }
+
+    # Базовые паттерны воздействия по типам событий
+    BASE_IMPACTS: Dict[str, Dict[str, float]] = {
+        "shock": {"energy": -1.5, "stability": -0.10, "integrity": -0.05},
+        "noise": {"energy": -0.3, "stability": -0.02, "integrity": 0.0},
+        "recovery": {"energy": +1.0, "stability": +0.05, "integrity": +0.02},
+        "decay": {"energy": -0.5, "stability": -0.01, "integrity": -0.01},
+        "idle": {"energy": -0.1, "stability": 0.0, "integrity": 0.0},
+        "memory_echo": {
+            "energy": -0.05,
+            "stability": +0.02,
+            "integrity": +0.01,
+        },  # Рефлексивное влияние
+        # Новые социальные события
+        "social_presence": {"energy": -0.1, "stability": -0.03, "integrity": 0.0},
+        "social_conflict": {"energy": -0.8, "stability": -0.08, "integrity": -0.03},
+        "social_harmony": {"energy": +0.6, "stability": +0.06, "integrity": +0.02},
+        # Новые когнитивные события
+        "cognitive_doubt": {"energy": 0.0, "stability": -0.04, "integrity": -0.02},
+        "cognitive_clarity": {
+            "energy": +0.1,
+            "stability": +0.05,
+            "integrity": +0.03,
+        },
+        "cognitive_confusion": {
+            "energy": -0.2,
+            "stability": -0.06,
+            "integrity": -0.01,
+        },
+        # Новые экзистенциальные события
+        "existential_void": {
+            "energy": -1.0,
+            "stability": -0.05,
+            "integrity": -0.04,
+        },
+        "existential_purpose": {
+            "energy": +0.8,
+            "stability": +0.08,
+            "integrity": +0.05,
+        },
+        "existential_finitude": {
+            "energy": -0.3,
+            "stability": -0.07,
+            "integrity": -0.03,
+        },
+        # Новые социально-эмоциональные события
+        "connection": {"energy": +0.7, "stability": +0.08, "integrity": +0.03},
+        "isolation": {"energy": -0.6, "stability": -0.09, "integrity": -0.02},
+        # Новые когнитивные события
+        "insight": {"energy": +0.2, "stability": +0.06, "integrity": +0.04},
+        "confusion": {"energy": -0.1, "stability": -0.07, "integrity": -0.02},
+        "curiosity": {"energy": -0.1, "stability": -0.03, "integrity": 0.0},
+        # Новые экзистенциальные события
+        "meaning_found": {"energy": +0.9, "stability": +0.09, "integrity": +0.06},
+        "void": {"energy": -1.1, "stability": -0.06, "integrity": -0.05},
+        "acceptance": {"energy": +0.1, "stability": +0.04, "integrity": +0.02},
+        # События осознания тишины
+        "silence": {
+            "energy": +0.2,
+            "stability": +0.03,
+            "integrity": +0.01,
+        },  # Осознание тишины способствует покою
+        # Новые эмоциональные события
+        "joy": {"energy": +0.5, "stability": +0.06, "integrity": +0.03},  # Радость повышает энергию и стабильность
+        "sadness": {"energy": -0.4, "stability": -0.05, "integrity": -0.02},  # Грусть снижает энергию
+        "fear": {"energy": -0.6, "stability": -0.08, "integrity": -0.04},  # Страх сильно дестабилизирует
+        "calm": {"energy": +0.1, "stability": +0.04, "integrity": +0.02},  # Спокойствие стабилизирует
+        # Новые физические события
+        "discomfort": {"energy": -0.3, "stability": -0.04, "integrity": -0.01},  # Дискомфорт снижает энергию
+        "comfort": {"energy": +0.3, "stability": +0.03, "integrity": +0.02},  # Комфорт повышает энергию
+        "fatigue": {"energy": -0.4, "stability": -0.02, "integrity": -0.01},  # Усталость снижает энергию
+        # Новые временные события
+        "anticipation": {"energy": -0.1, "stability": -0.03, "integrity": 0.0},  # Ожидание немного дестабилизирует
+        "boredom": {"energy": -0.2, "stability": -0.02, "integrity": -0.01},  # Скука снижает энергию
+        # Новые креативные события
+        "inspiration": {"energy": +0.4, "stability": +0.05, "integrity": +0.04},  # Вдохновение сильно повышает энергию
+        "creative_dissonance": {"energy": -0.2, "stability": -0.03, "integrity": -0.02},  # Творческий тупик дестабилизирует
+    }
+    DEFAULT_IMPACT: Dict[str, float] = {"energy": 0.0, "stability": 0.0, "integrity": 0.0}
+
+    def __init__(self) -> None:
         """Инициализация движка с базовыми настройками"""
         self.base_significance_threshold = 0.1
 
+        # Скомпилированная таблица коэффициентов appraisal по типам событий
+        self._appraisal_table: Dict[str, Tuple[float, float]] = {}
+        self._compiled_event_sensitivity: Dict[str, Any] = {}
+        self._compiled_behavior_sensitivity: Dict[str, Any] = {}
+
     def _get_learning_and_adaptation_params(
-        self, self_state: Union[SelfState, Dict]
-    ) -> tuple[Dict, Dict]:
+        self, self_state: Union[SelfState, Dict[str, Any]]
+    ) -> tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Получить learning_params и adaptation_params из self_state.
 
@@ -85,100 +230,58 @@ class MeaningEngine:
 
         return learning_params, adaptation_params
 
-    def appraisal(self, event: Event, self_state: Union[SelfState, Dict]) -> float:
+    def _appraisal_coefficients(
+        self, event_type: str, learning_params: Dict[str, Any], adaptation_params: Dict[str, Any]
+    ) -> Tuple[float, float]:
         """
-        Первичная оценка: насколько это событие важно?
+        Коэффициенты оценки значимости для типа события из скомпилированной таблицы.
 
-        Логика:
-        - Учитывает тип события
-        - Учитывает интенсивность
-        - Учитывает текущее состояние Life
-        - Использует learning_params.event_type_sensitivity для модификации чувствительности
-        - Использует adaptation_params.behavior_sensitivity для дополнительной модификации
+        Таблица (вес типа, модификатор чувствительности) строится по мере
+        появления типов и сбрасывается только при изменении
+        learning_params.event_type_sensitivity или adaptation_params.behavior_sensitivity.
+
+        Args:
+            event_type: тип события
+            learning_params: learning_params состояния
+            adaptation_params: adaptation_params состояния
 
         Returns:
-            significance (float): [0.0, 1.0]
+            Tuple[float, float]: (вес типа события, модификатор чувствительности)
         """
-        # Базовая значимость из интенсивности события
-        base_significance = abs(event.intensity)
-
-        # Модификация на основе типа события
-        type_weight = {
-            "shock": 1.5,  # Шоки всегда значимы
-            "noise": 0.5,  # Шум часто игнорируется
-            "recovery": 1.0,  # Восстановление нормально
-            "decay": 1.0,  # Распад нормален
-            "idle": 0.2,  # Бездействие почти не значимо
-            "memory_echo": 0.8,  # Внутренние воспоминания умеренно значимы
-            # Новые социальные события
-            "social_presence": 0.9,  # Присутствие других умеренно значимо
-            "social_conflict": 1.2,  # Конфликт вызывает стресс
-            "social_harmony": 1.1,  # Гармония значима позитивно
-            # Новые когнитивные события
-            "cognitive_doubt": 0.8,  # Сомнение умеренно значимо
-            "cognitive_clarity": 1.0,  # Ясность нормально значима
-            "cognitive_confusion": 0.7,  # Путаница менее значима чем шок
-            # Новые экзистенциальные события
-            "existential_void": 1.3,  # Пустота очень значима
-            "existential_purpose": 1.4,  # Цель крайне значима
-            "existential_finitude": 1.1,  # Конечность значима
-            # Новые социально-эмоциональные события
-            "connection": 1.1,  # Связь с другими значима
-            "isolation": 1.0,  # Изоляция значима
-            # Новые когнитивные события
-            "insight": 1.2,  # Озарение очень значимо
-            "confusion": 0.8,  # Замешательство умеренно значимо
-            "curiosity": 0.7,  # Любопытство мало значимо
-            # Новые экзистенциальные события
-            "meaning_found": 1.4,  # Нахождение смысла крайне значимо
-            "void": 1.3,  # Пустота очень значима
-            "acceptance": 0.9,  # Принятие умеренно значимо
-            # События осознания тишины
-            "silence": 0.8,  # Тишина умеренно значима (осознание отсутствия)
-            # Новые эмоциональные события
-            "joy": 1.1,  # Радость значима позитивно
-            "sadness": 0.9,  # Грусть умеренно значима
-            "fear": 1.2,  # Страх очень значим
-            "calm": 0.8,  # Спокойствие умеренно значимо
-            # Новые физические события
-            "discomfort": 0.7,  # Дискомфорт мало значим
-            "comfort": 0.8,  # Комфорт умеренно значим
-            "fatigue": 0.9,  # Усталость умеренно значима
-            # Новые временные события
-            "anticipation": 0.7,  # Ожидание мало значимо
-            "boredom": 0.6,  # Скука незначима
-            # Новые креативные события
-            "inspiration": 1.3,  # Вдохновение очень значимо
-            "creative_dissonance": 0.8,  # Творческий тупик умеренно значим
-        }
+        event_sensitivity = learning_params.get("event_type_sensitivity", {})
+        behavior_sensitivity = adaptation_params.get("behavior_sensitivity", {})
 
-        weight = type_weight.get(event.type, 1.0)
-        significance = base_significance * weight
+        # Сравнение с копиями ловит и замену словарей, и их изменение на месте
+        if (
+            event_sensitivity != self._compiled_event_sensitivity
+            or behavior_sensitivity != self._compiled_behavior_sensitivity
+        ):
+            self._appraisal_table = {}
+            self._compiled_event_sensitivity = dict(event_sensitivity)
+            self._compiled_behavior_sensitivity = dict(behavior_sensitivity)
+
+        coefficients = self._appraisal_table.get(event_type)
+        if coefficients is not None:
+            return coefficients
 
         # ИНТЕГРАЦИЯ: Используем learning_params.event_type_sensitivity
         # ВАЖНО: Используем среднее значение для избежания квадратичного эффекта
         # и соблюдения принципа медленного изменения
-        learning_params, adaptation_params = self._get_learning_and_adaptation_params(self_state)
-
-        event_sensitivity = learning_params.get("event_type_sensitivity", {})
-        behavior_sensitivity = adaptation_params.get("behavior_sensitivity", {})
-
-        # Вычисляем модификаторы чувствительности
         learning_modifier = 1.0
         adaptation_modifier = 1.0
 
-        if event.type in event_sensitivity:
+        if event_type in event_sensitivity:
             # Модифицируем значимость на основе обученной чувствительности
             # Используем линейную интерполяцию вместо умножения для мягкого эффекта
-            sensitivity = event_sensitivity[event.type]
+            sensitivity = event_sensitivity[event_type]
             learning_modifier = (
                 self.SENSITIVITY_INTERPOLATION_BASE
                 + sensitivity * self.SENSITIVITY_INTERPOLATION_RANGE
             )  # Диапазон [0.5, 1.0]
 
-        if event.type in behavior_sensitivity:
+        if event_type in behavior_sensitivity:
             # Дополнительная модификация на основе адаптированной чувствительности
-            behavior_sens = behavior_sensitivity[event.type]
+            behavior_sens = behavior_sensitivity[event_type]
             adaptation_modifier = (
                 self.SENSITIVITY_INTERPOLATION_BASE
                 + behavior_sens * self.SENSITIVITY_INTERPOLATION_RANGE
@@ -194,8 +297,47 @@ class MeaningEngine:
         # Максимальное изменение не должно превышать MAX_SIGNIFICANCE_MODIFIER от исходной значимости
         combined_modifier = min(combined_modifier, self.MAX_SIGNIFICANCE_MODIFIER)
 
+        coefficients = (self.TYPE_WEIGHTS.get(event_type, 1.0), combined_modifier)
+        self._appraisal_table[event_type] = coefficients
+        return coefficients
+
+    def appraisal(self, event: Event, self_state: Union[SelfState, Dict[str, Any]]) -> float:
+        """
+        Первичная оценка: насколько это событие важно?
+
+        Логика:
+        - Учитывает тип события
+        - Учитывает интенсивность
+        - Учитывает текущее состояние Life
+        - Использует learning_params.event_type_sensitivity для модификации чувствительности
+        - Использует adaptation_params.behavior_sensitivity для дополнительной модификации
+
+        Returns:
+            significance (float): [0.0, 1.0]
+        """
+        learning_params, adaptation_params = self._get_learning_and_adaptation_params(self_state)
+        return self._appraise(event, self_state, learning_params, adaptation_params)
+
+    def _appraise(
+        self,
+        event: Event,
+        self_state: Union[SelfState, Dict[str, Any]],
+        learning_params: Dict[str, Any],
+        adaptation_params: Dict[str, Any],
+    ) -> float:
+        """Оценка значимости с уже полученными learning/adaptation параметрами."""
+        # Базовая значимость из интенсивности события, вес типа и модификатор чувствительности
+        weight, combined_modifier = self._appraisal_coefficients(
+            event.type, learning_params, adaptation_params
+        )
+        significance = abs(event.intensity) * weight
         significance *= combined_modifier
+        return self._apply_state_context(significance, self_state)
 
+    def _apply_state_context(
+        self, significance: float, self_state: Union[SelfState, Dict[str, Any]]
+    ) -> float:
+        """Контекстуальная модификация значимости по текущему состоянию и ограничение диапазона."""
         # Контекстуальная модификация на основе состояния
         # Если integrity низкая — даже малые события становятся важнее
         integrity = self_state.get("integrity", 1.0) if isinstance(self_state, dict) else getattr(self_state, "integrity", 1.0)
@@ -230,7 +372,7 @@ class MeaningEngine:
         return max(0.0, min(1.0, significance))
 
     def impact_model(
-        self, event: Event, self_state: Union[SelfState, Dict], significance: float
+        self, event: Event, self_state: Union[SelfState, Dict[str, Any]], significance: float
     ) -> Dict[str, float]:
         """
         Расчёт влияния: как это событие изменит состояние?
@@ -244,87 +386,7 @@ class MeaningEngine:
         Returns:
             impact (Dict[str, float]): {"energy": delta, "stability": delta, "integrity": delta}
         """
-        # Базовые паттерны воздействия по типам событий
-        base_impacts = {
-            "shock": {"energy": -1.5, "stability": -0.10, "integrity": -0.05},
-            "noise": {"energy": -0.3, "stability": -0.02, "integrity": 0.0},
-            "recovery": {"energy": +1.0, "stability": +0.05, "integrity": +0.02},
-            "decay": {"energy": -0.5, "stability": -0.01, "integrity": -0.01},
-            "idle": {"energy": -0.1, "stability": 0.0, "integrity": 0.0},
-            "memory_echo": {
-                "energy": -0.05,
-                "stability": +0.02,
-                "integrity": +0.01,
-            },  # Рефлексивное влияние
-            # Новые социальные события
-            "social_presence": {"energy": -0.1, "stability": -0.03, "integrity": 0.0},
-            "social_conflict": {"energy": -0.8, "stability": -0.08, "integrity": -0.03},
-            "social_harmony": {"energy": +0.6, "stability": +0.06, "integrity": +0.02},
-            # Новые когнитивные события
-            "cognitive_doubt": {"energy": 0.0, "stability": -0.04, "integrity": -0.02},
-            "cognitive_clarity": {
-                "energy": +0.1,
-                "stability": +0.05,
-                "integrity": +0.03,
-            },
-            "cognitive_confusion": {
-                "energy": -0.2,
-                "stability": -0.06,
-                "integrity": -0.01,
-            },
-            # Новые экзистенциальные события
-            "existential_void": {
-                "energy": -1.0,
-                "stability": -0.05,
-                "integrity": -0.04,
-            },
-            "existential_purpose": {
-                "energy": +0.8,
-                "stability": +0.08,
-                "integrity": +0.05,
-            },
-            "existential_finitude": {
-                "energy": -0.3,
-                "stability": -0.07,
-                "integrity": -0.03,
-            },
-            # Новые социально-эмоциональные события
-            "connection": {"energy": +0.7, "stability": +0.08, "integrity": +0.03},
-            "isolation": {"energy": -0.6, "stability": -0.09, "integrity": -0.02},
-            # Новые когнитивные события
-            "insight": {"energy": +0.2, "stability": +0.06, "integrity": +0.04},
-            "confusion": {"energy": -0.1, "stability": -0.07, "integrity": -0.02},
-            "curiosity": {"energy": -0.1, "stability": -0.03, "integrity": 0.0},
-            # Новые экзистенциальные события
-            "meaning_found": {"energy": +0.9, "stability": +0.09, "integrity": +0.06},
-            "void": {"energy": -1.1, "stability": -0.06, "integrity": -0.05},
-            "acceptance": {"energy": +0.1, "stability": +0.04, "integrity": +0.02},
-            # События осознания тишины
-            "silence": {
-                "energy": +0.2,
-                "stability": +0.03,
-                "integrity": +0.01,
-            },  # Осознание тишины способствует покою
-            # Новые эмоциональные события
-            "joy": {"energy": +0.5, "stability": +0.06, "integrity": +0.03},  # Радость повышает энергию и стабильность
-            "sadness": {"energy": -0.4, "stability": -0.05, "integrity": -0.02},  # Грусть снижает энергию
-            "fear": {"energy": -0.6, "stability": -0.08, "integrity": -0.04},  # Страх сильно дестабилизирует
-            "calm": {"energy": +0.1, "stability": +0.04, "integrity": +0.02},  # Спокойствие стабилизирует
-            # Новые физические события
-            "discomfort": {"energy": -0.3, "stability": -0.04, "integrity": -0.01},  # Дискомфорт снижает энергию
-            "comfort": {"energy": +0.3, "stability": +0.03, "integrity": +0.02},  # Комфорт повышает энергию
-            "fatigue": {"energy": -0.4, "stability": -0.02, "integrity": -0.01},  # Усталость снижает энергию
-            # Новые временные события
-            "anticipation": {"energy": -0.1, "stability": -0.03, "integrity": 0.0},  # Ожидание немного дестабилизирует
-            "boredom": {"energy": -0.2, "stability": -0.02, "integrity": -0.01},  # Скука снижает энергию
-            # Новые креативные события
-            "inspiration": {"energy": +0.4, "stability": +0.05, "integrity": +0.04},  # Вдохновение сильно повышает энергию
-            "creative_dissonance": {"energy": -0.2, "stability": -0.03, "integrity": -0.02},  # Творческий тупик дестабилизирует
-        }
-
-        base_impact = base_impacts.get(
-            event.type, {"energy": 0.0, "stability": 0.0, "integrity": 0.0}
-        )
+        base_impact = self.BASE_IMPACTS.get(event.type, self.DEFAULT_IMPACT)
 
         # Масштабирование на интенсивность и significance
         scaled_impact = {}
@@ -333,7 +395,7 @@ class MeaningEngine:
             scaled_impact[param] = scaled_delta
 
         # Специальная обработка memory_echo с конкретными воспоминаниями
-        if event.type == "memory_echo" and "original_memory" in event.metadata:
+        if event.type == "memory_echo" and "original_memory" in (event.metadata or {}):
             scaled_impact = self._apply_memory_echo_emotional_impact(
                 event, scaled_impact, self_state
             )
@@ -345,7 +407,7 @@ class MeaningEngine:
         return scaled_impact
 
     def response_pattern(
-        self, event: Event, self_state: Union[SelfState, Dict], significance: float
+        self, event: Event, self_state: Union[SelfState, Dict[str, Any]], significance: float
     ) -> str:
         """
         Определение паттерна реакции.
@@ -362,19 +424,47 @@ class MeaningEngine:
         Returns:
             pattern (str): название паттерна
         """
-        # ИНТЕГРАЦИЯ: Используем learning_params.significance_thresholds
         learning_params, adaptation_params = self._get_learning_and_adaptation_params(self_state)
+        return self._response_pattern(
+            event, self_state, significance, learning_params, adaptation_params
+        )
 
+    def _response_pattern(
+        self,
+        event: Event,
+        self_state: Union[SelfState, Dict[str, Any]],
+        significance: float,
+        learning_params: Dict[str, Any],
+        adaptation_params: Dict[str, Any],
+    ) -> str:
+        """Паттерн реакции с уже полученными learning/adaptation параметрами."""
+        effective_threshold = self._effective_threshold(
+            event.type, learning_params, adaptation_params
+        )
+        return self._select_pattern(significance, effective_threshold, self_state)
+
+    def _effective_threshold(
+        self, event_type: str, learning_params: Dict[str, Any], adaptation_params: Dict[str, Any]
+    ) -> float:
+        """Порог значимости типа события с учетом learning и adaptation параметров."""
+        # ИНТЕГРАЦИЯ: Используем learning_params.significance_thresholds
         significance_thresholds = learning_params.get("significance_thresholds", {})
-        event_threshold = significance_thresholds.get(event.type, self.base_significance_threshold)
+        event_threshold = significance_thresholds.get(event_type, self.base_significance_threshold)
 
         # ИНТЕГРАЦИЯ: Используем adaptation_params.behavior_thresholds
         behavior_thresholds = adaptation_params.get("behavior_thresholds", {})
-        behavior_threshold = behavior_thresholds.get(event.type, event_threshold)
+        behavior_threshold = behavior_thresholds.get(event_type, event_threshold)
 
         # Используем адаптированный порог
-        effective_threshold = behavior_threshold
+        return float(behavior_threshold)
 
+    def _select_pattern(
+        self,
+        significance: float,
+        effective_threshold: float,
+        self_state: Union[SelfState, Dict[str, Any]],
+    ) -> str:
+        """Выбор паттерна реакции по значимости, порогу и текущей стабильности."""
         if significance < effective_threshold:
             return "ignore"
 
@@ -390,7 +480,7 @@ class MeaningEngine:
         # По умолчанию — нормальное поглощение
         return "absorb"
 
-    def process(self, event: Event, self_state: Union[SelfState, Dict]) -> Meaning:
+    def process(self, event: Event, self_state: Union[SelfState, Dict[str, Any]]) -> Meaning:
         """
         Основной метод обработки события.
 
@@ -407,49 +497,131 @@ class MeaningEngine:
         Returns:
             Meaning: интерпретированное значение
         """
+        # Параметры получаются один раз на событие для всех этапов
+        learning_params, adaptation_params = self._get_learning_and_adaptation_params(self_state)
+
         # 1. Оценка значимости
-        significance = self.appraisal(event, self_state)
+        significance = self._appraise(event, self_state, learning_params, adaptation_params)
 
         # 2. Расчёт базового влияния
         base_impact = self.impact_model(event, self_state, significance)
 
         # 3. Определение паттерна реакции
-        pattern = self.response_pattern(event, self_state, significance)
+        pattern = self._response_pattern(
+            event, self_state, significance, learning_params, adaptation_params
+        )
 
         # 4. Модификация impact на основе паттерна
-        # ИНТЕГРАЦИЯ: Используем learning_params.response_coefficients и adaptation_params.behavior_coefficients
-        learning_params, adaptation_params = self._get_learning_and_adaptation_params(self_state)
-
-        response_coefficients = learning_params.get("response_coefficients", {})
-        behavior_coefficients = adaptation_params.get("behavior_coefficients", {})
+        pattern_coefficients = self._pattern_coefficients(learning_params, adaptation_params)
 
         final_impact = base_impact.copy()
         if pattern == "ignore":
             final_impact = {k: 0.0 for k in final_impact}
-        elif pattern == "dampen":
-            # Используем коэффициент из параметров, если доступен
-            coefficient = behavior_coefficients.get(
-                "dampen", response_coefficients.get("dampen", 0.5)
-            )
-            final_impact = {k: v * coefficient for k, v in final_impact.items()}
-        elif pattern == "amplify":
-            # Используем коэффициент из параметров, если доступен
-            coefficient = behavior_coefficients.get(
-                "amplify", response_coefficients.get("amplify", 1.5)
-            )
-            final_impact = {k: v * coefficient for k, v in final_impact.items()}
-        elif pattern == "absorb":
-            # Используем коэффициент из параметров, если доступен
-            coefficient = behavior_coefficients.get(
-                "absorb", response_coefficients.get("absorb", 1.0)
-            )
+        elif pattern in pattern_coefficients:
+            coefficient = pattern_coefficients[pattern]
             final_impact = {k: v * coefficient for k, v in final_impact.items()}
 
         # 5. Создание Meaning
         return Meaning(event_id=str(id(event)), significance=significance, impact=final_impact)
 
+    def _pattern_coefficients(
+        self, learning_params: Dict[str, Any], adaptation_params: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Коэффициенты масштабирования impact для паттернов dampen/amplify/absorb.
+
+        ИНТЕГРАЦИЯ: adaptation_params.behavior_coefficients имеют приоритет над
+        learning_params.response_coefficients, затем значения по умолчанию.
+        """
+        response_coefficients = learning_params.get("response_coefficients", {})
+        behavior_coefficients = adaptation_params.get("behavior_coefficients", {})
+        return {
+            pattern: behavior_coefficients.get(
+                pattern, response_coefficients.get(pattern, default)
+            )
+            for pattern, default in (("dampen", 0.5), ("amplify", 1.5), ("absorb", 1.0))
+        }
+
+    def process_batch(
+        self, events: List[Event], self_state: Union[SelfState, Dict[str, Any]]
+    ) -> "MeaningBatch":
+        """
+        Пакетная обработка событий.
+
+        Не зависящие от состояния части оценки вычисляются сразу для всего батча
+        (с NumPy, если доступен): |intensity| x вес типа x модификатор чувствительности,
+        базовое влияние и порог значимости каждого события. Контекст состояния
+        (integrity, stability, субъективное время, ясность) применяется в
+        MeaningBatch.meaning(i) по текущему состоянию в момент обращения, поэтому
+        результат совпадает с последовательными вызовами process, между которыми
+        изменения применяются к состоянию.
+
+        learning/adaptation параметры фиксируются на момент вызова.
+
+        Args:
+            events: события батча
+            self_state: текущее состояние Life (SelfState, словарь или MeaningStateView)
+
+        Returns:
+            MeaningBatch: значения событий в порядке батча
+        """
+        learning_params, adaptation_params = self._get_learning_and_adaptation_params(self_state)
+
+        # Таблицы коэффициентов по уникальным типам батча
+        type_index: Dict[str, int] = {}
+        event_types = [type_index.setdefault(event.type, len(type_index)) for event in events]
+        weights = []
+        modifiers = []
+        thresholds = []
+        impacts = []
+        for event_type in type_index:
+            weight, modifier = self._appraisal_coefficients(
+                event_type, learning_params, adaptation_params
+            )
+            weights.append(weight)
+            modifiers.append(modifier)
+            thresholds.append(
+                self._effective_threshold(event_type, learning_params, adaptation_params)
+            )
+            base_impact = self.BASE_IMPACTS.get(event_type, self.DEFAULT_IMPACT)
+            impacts.append([base_impact[key] for key in IMPACT_KEYS])
+
+        if HAS_NUMPY and events:
+            types = np.fromiter(event_types, dtype=np.intp, count=len(events))
+            intensities = np.abs(
+                np.fromiter((event.intensity for event in events), dtype=float, count=len(events))
+            )
+            base_significance = (
+                intensities * np.asarray(weights)[types] * np.asarray(modifiers)[types]
+            ).tolist()
+            impact_units = (np.asarray(impacts)[types] * intensities[:, None]).tolist()
+            event_thresholds = np.asarray(thresholds)[types].tolist()
+        else:
+            intensities = [abs(event.intensity) for event in events]
+            base_significance = [
+                intensity * weights[t] * modifiers[t] for intensity, t in zip(intensities, event_types)
+            ]
+            impact_units = [
+                [delta * intensity for delta in impacts[t]]
+                for intensity, t in zip(intensities, event_types)
+            ]
+            event_thresholds = [thresholds[t] for t in event_types]
+
+        return MeaningBatch(
+            self,
+            events,
+            self_state,
+            base_significance,
+            impact_units,
+            event_thresholds,
+            self._pattern_coefficients(learning_params, adaptation_params),
+        )
+
     def _apply_memory_echo_emotional_impact(
-        self, event: Event, base_impact: Dict[str, float], self_state: Union[SelfState, Dict]
+        self,
+        event: Event,
+        base_impact: Dict[str, float],
+        self_state: Union[SelfState, Dict[str, Any]],
     ) -> Dict[str, float]:
         """
         Применяет эмоциональное влияние конкретного воспоминания к базовому impact'у memory_echo.
@@ -462,10 +634,11 @@ class MeaningEngine:
         Returns:
             Модифицированный impact с учетом эмоционального влияния
         """
-        if "original_memory" not in event.metadata:
+        metadata = event.metadata or {}
+        if "original_memory" not in metadata:
             return base_impact
 
-        original_memory = event.metadata["original_memory"]
+        original_memory = metadata["original_memory"]
         emotional_impact = original_memory.get("emotional_impact", "neutral")
         original_event_type = original_memory.get("event_type", "unknown")
 
@@ -507,7 +680,9 @@ class MeaningEngine:
 
         return modified_impact
 
-    def _get_memory_echo_context_modifier(self, emotional_impact: str, self_state: Union[SelfState, Dict]) -> float:
+    def _get_memory_echo_context_modifier(
+        self, emotional_impact: str, self_state: Union[SelfState, Dict[str, Any]]
+    ) -> float:
         """
         Вычисляет контекстуальный модификатор для memory_echo на основе текущего состояния.
 
@@ -553,3 +728,112 @@ class MeaningEngine:
 
         # Ограничиваем диапазон
         return max(0.5, min(2.0, base_modifier))
+
+
+class MeaningStateView:
+    """
+    Легкое представление SelfState для MeaningEngine.process.
+
+    Читает витальные показатели напрямую из SelfState вместо построения словаря
+    get_safe_status_dict на каждое событие. Набор полей совпадает с тем, что движок
+    получал из словаря состояния (include_optional=False): energy, integrity,
+    stability, fatigue. learning/adaptation параметры и моменты ясности не передаются.
+    """
+
+    __slots__ = ("_state",)
+
+    def __init__(self, self_state: SelfState):
+        self._state = self_state
+
+    @property
+    def energy(self) -> float:
+        return self._state.energy
+
+    @property
+    def integrity(self) -> float:
+        return self._state.integrity
+
+    @property
+    def stability(self) -> float:
+        return self._state.stability
+
+    @property
+    def fatigue(self) -> float:
+        return self._state.fatigue
+
+
+class MeaningBatch:
+    """
+    Результат MeaningEngine.process_batch.
+
+    Хранит предвычисленные для батча значимость без контекста состояния,
+    единичное влияние и порог каждого события. Meaning события строится при
+    обращении к meaning(i) по текущему состоянию.
+    """
+
+    __slots__ = (
+        "_engine",
+        "_events",
+        "_state",
+        "_base_significance",
+        "_impact_units",
+        "_thresholds",
+        "_pattern_coefficients",
+    )
+
+    def __init__(
+        self,
+        engine: MeaningEngine,
+        events: List[Event],
+        self_state: Union[SelfState, Dict[str, Any]],
+        base_significance: List[float],
+        impact_units: List[List[float]],
+        thresholds: List[float],
+        pattern_coefficients: Dict[str, float],
+    ):
+        self._engine = engine
+        self._events = events
+        self._state = self_state
+        self._base_significance = base_significance
+        self._impact_units = impact_units
+        self._thresholds = thresholds
+        self._pattern_coefficients = pattern_coefficients
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def meaning(self, index: int) -> Meaning:
+        """
+        Meaning события батча по текущему состоянию.
+
+        Args:
+            index: индекс события в батче
+
+        Returns:
+            Meaning: то же значение, что вернул бы MeaningEngine.process для события
+        """
+        event = self._events[index]
+        engine = self._engine
+        state = self._state
+
+        # memory_echo с конкретным воспоминанием зависит от состояния и в impact
+        if event.type == "memory_echo" and "original_memory" in (event.metadata or {}):
+            return engine.process(event, state)
+
+        significance = engine._apply_state_context(self._base_significance[index], state)
+        pattern = engine._select_pattern(significance, self._thresholds[index], state)
+
+        if pattern == "ignore":
+            impact = {key: 0.0 for key in IMPACT_KEYS}
+        else:
+            coefficient = self._pattern_coefficients[pattern]
+            impact = {
+                key: unit * significance * coefficient
+                for key, unit in zip(IMPACT_KEYS, self._impact_units[index])
+            }
+
+        return Meaning(event_id=str(id(event)), significance=significance, impact=impact)
+
+    def __iter__(self) -> Iterator[Meaning]:
+        for index in range(len(self._events)):
+            yield self.meaning(index)
@@ -5,6 +5,8 @@
 а также унифицированные интерфейсы для работы с ними.
 """
 
+from .archive_storage import SegmentedArchiveStorage
+from .columnar_store import ColumnarEntryStore, MemoryEntryView
 from .memory import ArchiveMemory, Memory
 from .memory_types import MemoryEntry
 from .memory_interface import (
@@ -17,11 +19,14 @@ from .memory_interface import (
 
 __all__ = [
     "ArchiveMemory",
+    "ColumnarEntryStore",
     "Memory",
     "MemoryEntry",
+    "MemoryEntryView",
     "MemoryInterface",
     "EpisodicMemoryInterface",
     "SemanticMemoryInterface",
     "ProceduralMemoryInterface",
     "MemoryStatistics",
+    "SegmentedArchiveStorage",
 ]
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+Сегментированное append-only хранилище архивной памяти.
+
+Вместо полной перезаписи JSON-файла архива при каждом сохранении записи
+дописываются в JSONL-сегменты. Небольшой манифест фиксирует границы
+сегментов (количество записей и байтов), поэтому стоимость сохранения
+пропорциональна числу новых записей, а не размеру всего архива.
+
+Формат на диске (для archive_file = data/archive/memory_archive.json):
+
+    data/archive/memory_archive.segments/
+        manifest.json            - манифест (атомарная замена через rename)
+        segment_000001.jsonl     - запечатанный сегмент
+        segment_000002.jsonl     - активный сегмент (дописывается)
+
+Гарантии при сбоях: данные сегмента сначала дописываются и fsync'ятся,
+затем манифест атомарно заменяется. Байты за зафиксированной в манифесте
+границей считаются незавершенной записью и отбрасываются при следующем
+открытии.
+"""
+
+import json
+import logging
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .memory_types import MemoryEntry
+
+logger = logging.getLogger(__name__)
+
+# Константы
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "manifest.json"
+SEGMENTS_DIR_SUFFIX = ".segments"
+DEFAULT_SEGMENT_MAX_ENTRIES = 50000
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Синхронизирует каталог, чтобы rename пережил сбой (если ОС поддерживает)."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class SegmentedArchiveStorage:
+    """
+    Append-only хранилище записей архива в JSONL-сегментах с манифестом.
+
+    Основные операции:
+    - append_entries: дописывает только новые записи в активный сегмент
+    - load_entries: читает все зафиксированные записи (с миграцией legacy JSON)
+    - rewrite: полностью заменяет содержимое (после удаления записей)
+    - compact: явная компактизация полной перезаписью (не на пути сохранения)
+    """
+
+    def __init__(
+        self,
+        archive_file: Path,
+        segment_max_entries: int = DEFAULT_SEGMENT_MAX_ENTRIES,
+        fsync: bool = True,
+    ):
+        """
+        Инициализация хранилища.
+
+        Args:
+            archive_file: Путь к legacy JSON-файлу архива. Каталог сегментов
+                располагается рядом с суффиксом .segments.
+            segment_max_entries: Максимальное количество записей в одном сегменте
+            fsync: Выполнять ли fsync данных и манифеста
+        """
+        if segment_max_entries <= 0:
+            raise ValueError("segment_max_entries должен быть положительным")
+        self.archive_file = Path(archive_file)
+        self.segments_dir = self.archive_file.with_suffix(SEGMENTS_DIR_SUFFIX)
+        self.manifest_file = self.segments_dir / MANIFEST_FILENAME
+        self.segment_max_entries = segment_max_entries
+        self.fsync = fsync
+        self._manifest: Optional[Dict[str, Any]] = None
+
+        # Статистика операций
+        self._stats = {
+            "appends": 0,
+            "entries_written": 0,
+            "bytes_written": 0,
+            "rewrites": 0,
+            "compactions": 0,
+            "torn_tails_truncated": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Манифест
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        """Есть ли на диске сегментированный архив."""
+        return self.manifest_file.exists()
+
+    def _empty_manifest(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "format": "jsonl",
+            "next_segment_id": 1,
+            "total_entries": 0,
+            "segments": [],
+        }
+
+    def _get_manifest(self) -> Dict[str, Any]:
+        """Возвращает манифест, загружая его с диска при первом обращении."""
+        if self._manifest is None:
+            if self.manifest_file.exists():
+                try:
+                    with self.manifest_file.open("r", encoding="utf-8") as f:
+                        self._manifest = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    logger.error(f"Поврежден манифест архива {self.manifest_file}: {e}")
+                    self._manifest = self._empty_manifest()
+            else:
+                self._manifest = self._empty_manifest()
+        return self._manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Атомарно записывает манифест: tmp-файл, fsync, rename."""
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        manifest["total_entries"] = sum(s["entries"] for s in manifest["segments"])
+        tmp_file = self.manifest_file.with_suffix(".json.tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_file, self.manifest_file)
+        if self.fsync:
+            _fsync_directory(self.segments_dir)
+        self._manifest = manifest
+
+    def entry_count(self) -> int:
+        """Количество зафиксированных записей без загрузки сегментов."""
+        return int(self._get_manifest().get("total_entries", 0))
+
+    # ------------------------------------------------------------------
+    # Запись
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _encode(entry: MemoryEntry) -> bytes:
+        return (
+            json.dumps(asdict(entry), default=str, separators=(",", ":")) + "\n"
+        ).encode("utf-8")
+
+    def _new_segment(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        segment_id = manifest["next_segment_id"]
+        manifest["next_segment_id"] = segment_id + 1
+        segment = {"name": f"segment_{segment_id:06d}.jsonl", "entries": 0, "bytes": 0}
+        manifest["segments"].append(segment)
+        return segment
+
+    def _append_to_segment(self, segment: Dict[str, Any], lines: List[bytes]) -> None:
+        """Дописывает строки в сегмент, предварительно отрезая незафиксированный хвост."""
+        path = self.segments_dir / segment["name"]
+        mode = "r+b" if path.exists() else "wb"
+        with path.open(mode) as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() != segment["bytes"]:
+                # Хвост от прерванной записи - отбрасываем
+                f.truncate(segment["bytes"])
+                f.seek(segment["bytes"])
+                self._stats["torn_tails_truncated"] += 1
+            data = b"".join(lines)
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        segment["entries"] += len(lines)
+        segment["bytes"] += len(data)
+        self._stats["bytes_written"] += len(data)
+
+    def append_entries(self, entries: Iterable[MemoryEntry]) -> int:
+        """
+        Дописывает записи в конец архива.
+
+        Args:
+            entries: Новые записи (ранее не сохраненные)
+
+        Returns:
+            Количество записанных записей
+        """
+        lines = [self._encode(entry) for entry in entries]
+        if not lines:
+            return 0
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        manifest = dict(self._get_manifest())
+        manifest["segments"] = [dict(s) for s in manifest["segments"]]
+
+        position = 0
+        while position < len(lines):
+            segment = manifest["segments"][-1] if manifest["segments"] else None
+            if segment is None or segment["entries"] >= self.segment_max_entries:
+                segment = self._new_segment(manifest)
+            free = self.segment_max_entries - segment["entries"]
+            chunk = lines[position : position + free]
+            self._append_to_segment(segment, chunk)
+            position += len(chunk)
+
+        self._write_manifest(manifest)
+        self._stats["appends"] += 1
+        self._stats["entries_written"] += len(lines)
+        return len(lines)
+
+    def rewrite(self, entries: List[MemoryEntry]) -> None:
+        """
+        Полностью заменяет содержимое архива.
+
+        Новые сегменты пишутся под новыми именами, затем атомарно
+        подменяется манифест и только после этого удаляются старые файлы.
+        """
+        old_manifest = self._get_manifest()
+        old_names = [s["name"] for s in old_manifest["segments"]]
+
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._empty_manifest()
+        manifest["next_segment_id"] = old_manifest.get("next_segment_id", 1)
+
+        lines = [self._encode(entry) for entry in entries]
+        for start in range(0, len(lines), self.segment_max_entries):
+            segment = self._new_segment(manifest)
+            tmp_path = self.segments_dir / (segment["name"] + ".tmp")
+            chunk = lines[start : start + self.segment_max_entries]
+            data = b"".join(chunk)
+            with tmp_path.open("wb") as f:
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.segments_dir / segment["name"])
+            segment["entries"] = len(chunk)
+            segment["bytes"] = len(data)
+            self._stats["bytes_written"] += len(data)
+
+        self._write_manifest(manifest)
+        self._stats["rewrites"] += 1
+
+        for name in old_names:
+            try:
+                (self.segments_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    def compact(self) -> None:
+        """
+        Объединяет сегменты в минимальное число заполненных сегментов.
+
+        Перезаписывает весь архив (O(размер архива)), поэтому автоматически не
+        запускается: append_entries заполняет последний сегмент до открытия
+        нового, а rewrite оставляет недозаполненным только последний, так что
+        недозаполненные сегменты при сохранении не накапливаются. Нужна после
+        смены segment_max_entries.
+        """
+        self.rewrite(self.load_entries())
+        self._stats["compactions"] += 1
+
+    # ------------------------------------------------------------------
+    # Чтение
+    # ------------------------------------------------------------------
+
+    def _read_segment(self, segment: Dict[str, Any]) -> List[MemoryEntry]:
+        path = self.segments_dir / segment["name"]
+        with path.open("rb") as f:
+            data = f.read(segment["bytes"])
+        entries = []
+        for line in data.splitlines():
+            if line:
+                entries.append(MemoryEntry(**json.loads(line)))
+        return entries
+
+    def load_entries(self) -> List[MemoryEntry]:
+        """
+        Загружает все зафиксированные записи.
+
+        Если сегментированного архива нет, но есть legacy JSON-файл,
+        выполняется миграция: записи переносятся в сегменты, исходный
+        файл остается нетронутым.
+        """
+        if not self.exists():
+            return self._migrate_legacy()
+
+        entries: List[MemoryEntry] = []
+        for segment in self._get_manifest()["segments"]:
+            try:
+                entries.extend(self._read_segment(segment))
+            except (OSError, json.JSONDecodeError, TypeError) as e:
+                logger.error(f"Не удалось прочитать сегмент архива {segment['name']}: {e}")
+        return entries
+
+    def _migrate_legacy(self) -> List[MemoryEntry]:
+        """Переносит записи из legacy JSON-архива в сегменты."""
+        if not self.archive_file.exists():
+            return []
+        try:
+            with self.archive_file.open("r") as f:
+                data = json.load(f)
+            entries = [MemoryEntry(**entry) for entry in data.get("entries", [])]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            # Поврежденный legacy-файл - начинаем с пустого архива
+            return []
+
+        self.rewrite(entries)
+        logger.info(
+            f"Архив {self.archive_file} мигрирован в сегментированный формат "
+            f"({len(entries)} записей)"
+        )
+        return entries
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика хранилища."""
+        manifest = self._get_manifest()
+        return {
+            **self._stats,
+            "segments": len(manifest["segments"]),
+            "total_entries": manifest.get("total_entries", 0),
+            "segment_max_entries": self.segment_max_entries,
+        }
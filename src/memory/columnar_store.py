@@ -0,0 +1,434 @@
+"""
+Колоночное хранилище записей памяти.
+
+ColumnarEntryStore хранит записи не объектами MemoryEntry, а параллельными
+колонками array('d') для timestamp, weight, meaning_significance и
+subjective_timestamp и колонкой кодов интернированных типов событий
+array('I'). feedback_data хранится разреженно - только у записей, где он есть.
+Запись занимает ~44 байта вместо ~230 байт объекта MemoryEntry с упакованными
+float, а проходы по колонкам (статистика, агрегаты по типам) не разыменовывают
+объекты.
+
+Хранилище реализует MutableSequence: индексирование возвращает
+MemoryEntryView - легковесное представление строки с атрибутами MemoryEntry,
+поэтому код, работающий со списком записей, продолжает работать.
+"""
+
+import math
+from array import array
+from collections.abc import MutableSequence
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
+
+from .memory_types import MemoryEntry
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+# subjective_timestamp = None хранится как NaN
+_MISSING = math.nan
+
+_FLOAT_COLUMNS = ("timestamp", "weight", "meaning_significance", "subjective_timestamp")
+
+# Имя колонки -> атрибут ColumnarEntryStore (порядок совпадает с присваиванием в copy())
+_COLUMN_NAMES = {
+    "codes": "_codes",
+    "meaning_significance": "_significance",
+    "timestamp": "_timestamps",
+    "weight": "_weights",
+    "subjective_timestamp": "_subjective",
+}
+
+
+class MemoryEntryView:
+    """
+    Представление строки ColumnarEntryStore, совместимое с MemoryEntry.
+
+    Атрибуты читаются из колонок и записываются в них. Представление ссылается
+    на слот хранилища, а не на позицию, поэтому остается действительным после
+    вставок, удалений и сортировки других записей; удаленная запись сохраняет
+    последние значения до compact().
+
+    dataclasses.asdict/fields работают с представлением как с MemoryEntry;
+    copy/deepcopy/pickle создают самостоятельный MemoryEntry.
+    """
+
+    __slots__ = ("_store", "_slot")
+
+    # Поля MemoryEntry - для dataclasses.asdict() и fields()
+    __dataclass_fields__ = MemoryEntry.__dataclass_fields__
+
+    def __init__(self, store: "ColumnarEntryStore", slot: int):
+        self._store = store
+        self._slot = slot
+
+    @property
+    def event_type(self) -> str:
+        store = self._store
+        return store._event_types[store._codes[self._slot]]
+
+    @event_type.setter
+    def event_type(self, value: str) -> None:
+        self._store._codes[self._slot] = self._store._intern(value)
+
+    @property
+    def meaning_significance(self) -> float:
+        return self._store._significance[self._slot]
+
+    @meaning_significance.setter
+    def meaning_significance(self, value: float) -> None:
+        self._store._significance[self._slot] = value
+
+    @property
+    def timestamp(self) -> float:
+        return self._store._timestamps[self._slot]
+
+    @timestamp.setter
+    def timestamp(self, value: float) -> None:
+        self._store._timestamps[self._slot] = value
+
+    @property
+    def weight(self) -> float:
+        return self._store._weights[self._slot]
+
+    @weight.setter
+    def weight(self, value: float) -> None:
+        self._store._weights[self._slot] = value
+
+    @property
+    def feedback_data(self) -> Optional[Dict[str, Any]]:
+        return self._store._feedback.get(self._slot)
+
+    @feedback_data.setter
+    def feedback_data(self, value: Optional[Dict[str, Any]]) -> None:
+        if value is None:
+            self._store._feedback.pop(self._slot, None)
+        else:
+            self._store._feedback[self._slot] = value
+
+    @property
+    def subjective_timestamp(self) -> Optional[float]:
+        value = self._store._subjective[self._slot]
+        return None if value != value else value
+
+    @subjective_timestamp.setter
+    def subjective_timestamp(self, value: Optional[float]) -> None:
+        self._store._subjective[self._slot] = _MISSING if value is None else value
+
+    def to_entry(self) -> MemoryEntry:
+        """Создает самостоятельный MemoryEntry с текущими значениями."""
+        return MemoryEntry(*_entry_values(self))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (MemoryEntry, MemoryEntryView)):
+            return _entry_values(self) == _entry_values(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        values = ", ".join(
+            f"{name}={value!r}" for name, value in zip(MemoryEntry.__dataclass_fields__,
+                                                      _entry_values(self))
+        )
+        return f"MemoryEntryView({values})"
+
+    def __copy__(self) -> MemoryEntry:
+        return self.to_entry()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> MemoryEntry:
+        entry = self.to_entry()
+        if entry.feedback_data is not None:
+            import copy
+
+            entry.feedback_data = copy.deepcopy(entry.feedback_data, memo)
+        return entry
+
+    def __reduce__(self) -> Tuple[Type[MemoryEntry], Tuple[Any, ...]]:
+        return (MemoryEntry, _entry_values(self))
+
+
+# Запись, которую принимает хранилище: MemoryEntry или представление строки
+EntryLike = Union[MemoryEntry, MemoryEntryView]
+
+
+def _entry_values(entry: EntryLike) -> Tuple[Any, ...]:
+    """Значения полей записи в порядке полей MemoryEntry."""
+    return (
+        entry.event_type,
+        entry.meaning_significance,
+        entry.timestamp,
+        entry.weight,
+        entry.feedback_data,
+        entry.subjective_timestamp,
+    )
+
+
+class ColumnarEntryStore(MutableSequence[MemoryEntryView]):
+    """
+    Последовательность записей памяти в колоночном представлении.
+
+    Значения хранятся в слотах колонок; порядок записей задает колонка слотов
+    _order. Добавление дописывает слот, удаление и вставка меняют только
+    _order - освобожденные слоты переиспользуются после compact().
+    Добавляемые записи копируются: хранилище не удерживает исходные объекты.
+    """
+
+    def __init__(self, entries: Iterable[EntryLike] = ()):
+        """
+        Args:
+            entries: Начальные записи (MemoryEntry или совместимые объекты)
+        """
+        self._event_types: List[str] = []
+        self._event_codes: Dict[str, int] = {}
+        self._codes = array("I")
+        self._significance = array("d")
+        self._timestamps = array("d")
+        self._weights = array("d")
+        self._subjective = array("d")
+        self._feedback: Dict[int, Dict[str, Any]] = {}  # slot -> feedback_data
+        self._order = array("I")  # позиция -> slot
+        # Порядок совпадает со слотами (только добавления) - колонки читаются без перестановки
+        self._sequential = True
+        self.extend(entries)
+
+    # --- MutableSequence -------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @overload
+    def __getitem__(self, index: int) -> MemoryEntryView: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[MemoryEntryView]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[MemoryEntryView, List[MemoryEntryView]]:
+        if isinstance(index, slice):
+            return [MemoryEntryView(self, slot) for slot in self._order[index]]
+        return MemoryEntryView(self, self._order[index])
+
+    @overload
+    def __setitem__(self, index: int, value: EntryLike) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[EntryLike]) -> None: ...
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            order = self._order.tolist()
+            order[index] = [self._append_slot(entry) for entry in value]
+            self._order = array("I", order)
+        else:
+            self._order[index] = self._append_slot(value)
+        self._sequential = False
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        del self._order[index]
+        self._sequential = False
+
+    def __iter__(self) -> Iterator[MemoryEntryView]:
+        for slot in self._order:
+            yield MemoryEntryView(self, slot)
+
+    def insert(self, index: int, value: EntryLike) -> None:
+        slot = self._append_slot(value)
+        self._order.insert(index, slot)
+        self._sequential = False
+
+    def append(self, value: EntryLike) -> None:
+        self._order.append(self._append_slot(value))
+        if self._sequential and self._order[-1] != len(self._order) - 1:
+            self._sequential = False
+
+    def extend(self, values: Iterable[EntryLike]) -> None:
+        if isinstance(values, ColumnarEntryStore):
+            values = list(values)
+        for value in values:
+            self.append(value)
+
+    def clear(self) -> None:
+        """Удаляет все записи. Существующие представления становятся недействительными."""
+        ColumnarEntryStore.__init__(self)
+
+    def copy(self) -> "ColumnarEntryStore":
+        """Копия хранилища с записями в текущем порядке (без удаленных слотов)."""
+        result = ColumnarEntryStore()
+        result._event_types = list(self._event_types)
+        result._event_codes = dict(self._event_codes)
+        (
+            result._codes,
+            result._significance,
+            result._timestamps,
+            result._weights,
+            result._subjective,
+        ) = (array(column.typecode, column) for column in self._live_columns(*_COLUMN_NAMES))
+        if self._sequential:
+            result._feedback = dict(self._feedback)
+        else:
+            result._feedback = {
+                position: self._feedback[slot]
+                for position, slot in enumerate(self._order)
+                if slot in self._feedback
+            }
+        result._order = array("I", range(len(self._order)))
+        return result
+
+    def sort(
+        self, key: Optional[Callable[[MemoryEntryView], Any]] = None, reverse: bool = False
+    ) -> None:
+        """Сортирует записи на месте (как list.sort) по ключу от представления."""
+        if key is None:
+            raise TypeError("ColumnarEntryStore.sort() требует key")
+        order = sorted(self._order, key=lambda slot: key(MemoryEntryView(self, slot)),
+                       reverse=reverse)
+        self._order = array("I", order)
+        self._sequential = False
+
+    # --- Колонки ---------------------------------------------------------
+
+    def column(self, name: str) -> "array[Any]":
+        """
+        Колонка значений в порядке записей (копия).
+
+        Args:
+            name: timestamp, weight, meaning_significance, subjective_timestamp
+                или event_code
+
+        Returns:
+            array('d') (NaN для subjective_timestamp = None) или array('I')
+        """
+        if name == "event_code":
+            return array("I", self._live_columns("codes")[0])
+        if name not in _FLOAT_COLUMNS:
+            raise ValueError(f"Неизвестная колонка: {name}")
+        return array("d", self._live_columns(name)[0])
+
+    def event_type_codes(self) -> List[str]:
+        """Типы событий по коду (индекс списка - значение колонки event_code)."""
+        return list(self._event_types)
+
+    def event_type_summary(self) -> Dict[str, Tuple[int, float]]:
+        """
+        Количество записей и сумма значимости по типам событий за один проход.
+
+        Returns:
+            {event_type: (count, total_significance)} в порядке первого появления типа
+        """
+        codes, significance = self._live_columns("codes", "meaning_significance")
+        type_count = len(self._event_types)
+        if HAS_NUMPY and codes:
+            code_array = np.frombuffer(codes, dtype=np.uint32)
+            counts = np.bincount(code_array, minlength=type_count).tolist()
+            sums = np.bincount(
+                code_array, weights=np.frombuffer(significance, dtype=np.float64),
+                minlength=type_count,
+            ).tolist()
+        else:
+            counts = [0] * type_count
+            sums = [0.0] * type_count
+            for code, value in zip(codes, significance):
+                counts[code] += 1
+                sums[code] += value
+        return {
+            event_type: (counts[code], sums[code])
+            for code, event_type in enumerate(self._event_types)
+            if counts[code]
+        }
+
+    def feedback_items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Пары (event_type, feedback_data) записей с feedback_data в порядке записей."""
+        if not self._feedback:
+            return
+        slots = self._order if not self._sequential else sorted(self._feedback)
+        for slot in slots:
+            data = self._feedback.get(slot)
+            if data is not None:
+                yield self._event_types[self._codes[slot]], data
+
+    def compact(self) -> None:
+        """
+        Освобождает слоты удаленных записей, переписывая колонки в текущем порядке.
+
+        Представления, полученные до compact(), становятся недействительными.
+        """
+        compacted = self.copy()
+        self.__dict__.update(compacted.__dict__)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Размер хранилища: записи, слоты и байты колонок."""
+        column_bytes = sum(
+            column.itemsize * len(column)
+            for column in (
+                self._codes,
+                self._significance,
+                self._timestamps,
+                self._weights,
+                self._subjective,
+                self._order,
+            )
+        )
+        return {
+            "entries": len(self._order),
+            "slots": len(self._codes),
+            "event_types": len(self._event_types),
+            "feedback_entries": len(self._feedback),
+            "column_bytes": column_bytes,
+        }
+
+    # --- Внутреннее ------------------------------------------------------
+
+    def _intern(self, event_type: str) -> int:
+        code = self._event_codes.get(event_type)
+        if code is None:
+            code = len(self._event_types)
+            self._event_types.append(event_type)
+            self._event_codes[event_type] = code
+        return code
+
+    def _append_slot(self, entry: EntryLike) -> int:
+        """Копирует значения записи в новый слот колонок."""
+        slot = len(self._codes)
+        self._codes.append(self._intern(entry.event_type))
+        self._significance.append(entry.meaning_significance)
+        self._timestamps.append(entry.timestamp)
+        self._weights.append(entry.weight)
+        subjective = entry.subjective_timestamp
+        self._subjective.append(_MISSING if subjective is None else subjective)
+        if entry.feedback_data is not None:
+            self._feedback[slot] = entry.feedback_data
+        return slot
+
+    def _live_columns(self, *names: str) -> List["array[Any]"]:
+        """
+        Колонки в порядке записей.
+
+        Пока записи только добавлялись, возвращаются сами колонки (без копии),
+        иначе - колонки, переставленные по _order.
+        """
+        columns: List["array[Any]"] = []
+        for name in names:
+            column = getattr(self, _COLUMN_NAMES[name])
+            if self._sequential:
+                columns.append(column)
+            else:
+                columns.append(array(column.typecode, [column[slot] for slot in self._order]))
+        return columns
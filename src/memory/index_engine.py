@@ -4,14 +4,38 @@
 Реализует multi-level индексацию MemoryEntry с LRU кэшированием.
 """
 
+import bisect
 import hashlib
+import itertools
 import logging
+import math
 from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    cast,
+)
 
 from .memory_types import MemoryEntry
 
+try:
+    from sortedcontainers import SortedList
+
+    HAS_SORTEDCONTAINERS = True
+except ImportError:
+    SortedList = None
+    HAS_SORTEDCONTAINERS = False
+
 try:
     from ..runtime.performance_metrics import measure_time
 except ImportError:
@@ -29,6 +53,8 @@ logger = logging.getLogger(__name__)
 # Константы
 DEFAULT_MAX_CACHE_SIZE = 1000
 DEFAULT_INDEX_UPDATE_BATCH_SIZE = 100
+# Путь доступа присоединяется к кандидатам, если больше их не более чем во столько раз
+PLAN_JOIN_FACTOR = 8
 
 
 @dataclass
@@ -66,6 +92,94 @@ class MemoryQuery:
         query_str = f"{self.event_type}|{self.min_significance}|{self.max_significance}|{self.start_timestamp}|{self.end_timestamp}|{self.min_weight}|{self.max_weight}|{self.limit}|{self.sort_by}|{self.sort_order}"
         return hashlib.md5(query_str.encode()).hexdigest()
 
+    def depends_on_weight(self) -> bool:
+        """Зависит ли результат запроса от весов записей (фильтр или сортировка)."""
+        if self.min_weight is not None or self.max_weight is not None:
+            return True
+        return self.sort_by == "weight"
+
+
+# Элемент упорядоченного индекса (ключ, -entry_id) и граница поиска по нему
+IndexItem = Tuple[float, int]
+IndexBound = Tuple[float, ...]
+# Путь доступа плана запроса: (имя, число кандидатов, получение id кандидатов)
+AccessPath = Tuple[str, int, Callable[[], Collection[int]]]
+
+
+class _SortedIndex(Protocol):
+    """Подмножество интерфейса SortedList, которым пользуется движок."""
+
+    def add(self, value: IndexItem) -> None: ...
+
+    def discard(self, value: IndexItem) -> None: ...
+
+    def bisect_left(self, value: IndexBound) -> int: ...
+
+    def bisect_right(self, value: IndexBound) -> int: ...
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[IndexItem]: ...
+
+    def __getitem__(self, index: slice) -> List[IndexItem]: ...
+
+
+class _BisectSortedList(List[IndexItem]):
+    """
+    Сортированный список на bisect - запасной вариант без sortedcontainers.
+
+    Поиск позиции O(log n), вставка и удаление сдвигают хвост списка.
+    Реализует используемое движком подмножество интерфейса SortedList.
+    """
+
+    def __init__(self, iterable: Iterable[IndexItem] = ()):
+        super().__init__(sorted(iterable))
+
+    def add(self, value: IndexItem) -> None:
+        bisect.insort(self, value)
+
+    def discard(self, value: IndexItem) -> None:
+        index = bisect.bisect_left(self, value)
+        if index < len(self) and self[index] == value:
+            del self[index]
+
+    def bisect_left(self, value: IndexBound) -> int:
+        return bisect.bisect_left(self, value)
+
+    def bisect_right(self, value: IndexBound) -> int:
+        return bisect.bisect_right(self, value)
+
+
+def _new_sorted_index(items: Iterable[IndexItem] = ()) -> _SortedIndex:
+    """Создает упорядоченный индекс: SortedList, если доступен, иначе список на bisect."""
+    if HAS_SORTEDCONTAINERS:
+        return cast(_SortedIndex, SortedList(items))
+    return _BisectSortedList(items)
+
+
+def _index_item(key: float, entry_id: int) -> IndexItem:
+    """
+    Элемент упорядоченного индекса (key, -entry_id).
+
+    При равных ключах более новые записи стоят левее - тот же порядок,
+    что давала вставка через бинарный поиск левой границы.
+    """
+    return (key, -entry_id)
+
+
+def _item_entry_id(item: IndexItem) -> int:
+    """Id записи по элементу упорядоченного индекса."""
+    return -item[1]
+
+
+@dataclass
+class _CachedQuery:
+    """Закэшированный результат запроса с данными для точечной инвалидации."""
+
+    query: MemoryQuery
+    results: List[MemoryEntry]
+    entry_ids: Set[int]
+
 
 class MemoryIndexEngine:
     """
@@ -75,6 +189,16 @@ class MemoryIndexEngine:
     - Уровень 1: Primary indexes (прямой доступ)
     - Уровень 2: Composite indexes (составные индексы)
     - Уровень 3: Query cache (LRU кэш результатов)
+
+    Записи получают стабильные id при индексации. Упорядоченные индексы
+    хранят пары (ключ, id) в SortedList (или в списке на bisect без
+    sortedcontainers), поэтому добавление и удаление записи не перестраивают
+    индексы. Ключи фиксируются при индексации: после изменения весов на месте
+    нужно вызвать refresh_weights().
+
+    Кэш запросов инвалидируется точечно: добавление записи удаляет только
+    запросы, предикатам которых она соответствует, удаление - только
+    запросы, в результат которых она входила.
     """
 
     def __init__(
@@ -91,136 +215,188 @@ class MemoryIndexEngine:
             enable_composite_indexes: Включить составные индексы
             enable_query_cache: Включить кэш результатов запросов
         """
+        self._next_entry_id = itertools.count(1)
+        # id(entry) -> стабильный id; запись удерживается в entries_by_id, пока индексирована
+        self._entry_ids: Dict[int, int] = {}
+        # entry_id -> (event_type, timestamp, significance, weight) на момент индексации
+        self._indexed_keys: Dict[int, Tuple[str, float, float, float]] = {}
+
         # Primary indexes (Уровень 1)
         self.event_type_index: Dict[str, Set[int]] = defaultdict(
             set
         )  # event_type -> set of entry ids
         self.entries_by_id: Dict[int, MemoryEntry] = {}  # entry_id -> entry
-        self.timestamp_entries: List[Tuple[float, MemoryEntry]] = []  # sorted by timestamp
-        self.significance_entries: List[Tuple[float, MemoryEntry]] = []  # sorted by significance
-        self.weight_entries: List[Tuple[float, MemoryEntry]] = []  # sorted by weight
+        self.timestamp_entries = _new_sorted_index()  # (timestamp, -entry_id)
+        self.significance_entries = _new_sorted_index()  # (significance, -entry_id)
+        self.weight_entries = _new_sorted_index()  # (weight, -entry_id)
 
         # Composite indexes (Уровень 2) - для сложных запросов
         self.composite_indexes_enabled = enable_composite_indexes
         if enable_composite_indexes:
-            # event_type + time_range: dict[event_type, sorted_timestamps]
-            self.event_type_timestamp_index: Dict[str, List[Tuple[float, MemoryEntry]]] = (
-                defaultdict(list)
+            # event_type + time_range: dict[event_type, sorted (timestamp, -entry_id)]
+            self.event_type_timestamp_index: Dict[str, _SortedIndex] = defaultdict(
+                _new_sorted_index
             )
-            # event_type + significance: dict[event_type, sorted_significance]
-            self.event_type_significance_index: Dict[str, List[Tuple[float, MemoryEntry]]] = (
-                defaultdict(list)
+            # event_type + significance: dict[event_type, sorted (significance, -entry_id)]
+            self.event_type_significance_index: Dict[str, _SortedIndex] = defaultdict(
+                _new_sorted_index
             )
 
         # Query cache (Уровень 3) - LRU кэш результатов
         self.query_cache_enabled = enable_query_cache
-        self.query_cache: OrderedDict[str, List[MemoryEntry]] = OrderedDict()
+        self.query_cache: OrderedDict[str, _CachedQuery] = OrderedDict()
         self.max_cache_size = max_cache_size
+        # event_type запроса (None - без фильтра) -> ключи кэша
+        self._cache_keys_by_event_type: Dict[Optional[str], Set[str]] = defaultdict(set)
 
         # Статистика для мониторинга
         self.stats = {
             "total_entries": 0,
             "cache_hits": 0,
             "cache_misses": 0,
+            "cache_invalidations": 0,
             "index_updates": 0,
             "query_count": 0,
         }
 
     def add_entry(self, entry: MemoryEntry):
         """
-        Добавляет запись в индексы.
+        Добавляет запись в индексы за O(log n).
+
+        Повторное добавление уже индексированной записи ничего не меняет.
+        Присвоенный записи id возвращает get_entry_id().
 
         Args:
             entry: Запись памяти для индексации
         """
         with measure_time("memory_index_add_entry"):
-            entry_id = id(entry)
+            if self.get_entry_id(entry) is not None:
+                return
 
-            # Сохраняем ссылку на запись
+            entry_id = next(self._next_entry_id)
+            self._entry_ids[id(entry)] = entry_id
             self.entries_by_id[entry_id] = entry
+            self._index_keys(entry_id, entry)
 
-            # Уровень 1: Primary indexes
-            self.event_type_index[entry.event_type].add(entry_id)
+            self.stats["total_entries"] += 1
+            self.stats["index_updates"] += 1
 
-        # Добавляем в сортированные списки (используем insertion sort для поддержания порядка)
-        self._insert_sorted(self.timestamp_entries, (entry.timestamp, entry), key=lambda x: x[0])
-        self._insert_sorted(
-            self.significance_entries, (entry.meaning_significance, entry), key=lambda x: x[0]
-        )
-        self._insert_sorted(self.weight_entries, (entry.weight, entry), key=lambda x: x[0])
+            if self.query_cache_enabled:
+                self._invalidate_for_added(entry)
+
+    def remove_entry(self, entry: MemoryEntry):
+        """
+        Удаляет запись из индексов за O(log n).
+
+        Записи удаляются по ключам, зафиксированным при индексации.
+
+        Args:
+            entry: Запись памяти для удаления из индексов
+        """
+        entry_id = self.get_entry_id(entry)
+        if entry_id is None:
+            return
+
+        del self._entry_ids[id(entry)]
+        del self.entries_by_id[entry_id]
+        event_type, timestamp, significance, weight = self._indexed_keys.pop(entry_id)
+
+        # Уровень 1: Primary indexes
+        type_ids = self.event_type_index.get(event_type)
+        if type_ids is not None:
+            type_ids.discard(entry_id)
+            if not type_ids:
+                del self.event_type_index[event_type]
+
+        self.timestamp_entries.discard(_index_item(timestamp, entry_id))
+        self.significance_entries.discard(_index_item(significance, entry_id))
+        self.weight_entries.discard(_index_item(weight, entry_id))
 
         # Уровень 2: Composite indexes
         if self.composite_indexes_enabled:
-            self._insert_sorted(
-                self.event_type_timestamp_index[entry.event_type],
-                (entry.timestamp, entry),
-                key=lambda x: x[0],
+            self._discard_composite(
+                self.event_type_timestamp_index, event_type, timestamp, entry_id
             )
-            self._insert_sorted(
-                self.event_type_significance_index[entry.event_type],
-                (entry.meaning_significance, entry),
-                key=lambda x: x[0],
+            self._discard_composite(
+                self.event_type_significance_index, event_type, significance, entry_id
             )
 
-        self.stats["total_entries"] += 1
+        self.stats["total_entries"] -= 1
         self.stats["index_updates"] += 1
 
-        # Инвалидируем кэш запросов (слишком грубо, но безопасно)
         if self.query_cache_enabled:
-            self.query_cache.clear()
+            self._invalidate_for_removed(entry_id, event_type)
 
-    def remove_entry(self, entry: MemoryEntry):
+    def get_entry_id(self, entry: MemoryEntry) -> Optional[int]:
         """
-        Удаляет запись из индексов.
+        Возвращает стабильный id индексированной записи.
 
         Args:
-            entry: Запись памяти для удаления из индексов
-        """
-        entry_id = id(entry)
+            entry: Запись памяти
+
+        Returns:
+            Id записи или None, если запись не индексирована
+        """
+        entry_id = self._entry_ids.get(id(entry))
+        if entry_id is not None and self.entries_by_id.get(entry_id) is entry:
+            return entry_id
+        return None
+
+    def _index_keys(self, entry_id: int, entry: MemoryEntry) -> None:
+        """Добавляет ключи записи в упорядоченные и составные индексы."""
+        self._indexed_keys[entry_id] = (
+            entry.event_type,
+            entry.timestamp,
+            entry.meaning_significance,
+            entry.weight,
+        )
 
         # Уровень 1: Primary indexes
-        if entry.event_type in self.event_type_index:
-            self.event_type_index[entry.event_type].discard(entry_id)
-            if not self.event_type_index[entry.event_type]:
-                del self.event_type_index[entry.event_type]
-
-        # Удаляем из сортированных списков
-        self.timestamp_entries = [(ts, e) for ts, e in self.timestamp_entries if e is not entry]
-        self.significance_entries = [
-            (sig, e) for sig, e in self.significance_entries if e is not entry
-        ]
-        self.weight_entries = [(w, e) for w, e in self.weight_entries if e is not entry]
+        self.event_type_index[entry.event_type].add(entry_id)
+        self.timestamp_entries.add(_index_item(entry.timestamp, entry_id))
+        self.significance_entries.add(_index_item(entry.meaning_significance, entry_id))
+        self.weight_entries.add(_index_item(entry.weight, entry_id))
 
         # Уровень 2: Composite indexes
         if self.composite_indexes_enabled:
-            if entry.event_type in self.event_type_timestamp_index:
-                self.event_type_timestamp_index[entry.event_type] = [
-                    (ts, e)
-                    for ts, e in self.event_type_timestamp_index[entry.event_type]
-                    if e is not entry
-                ]
-                if not self.event_type_timestamp_index[entry.event_type]:
-                    del self.event_type_timestamp_index[entry.event_type]
-
-            if entry.event_type in self.event_type_significance_index:
-                self.event_type_significance_index[entry.event_type] = [
-                    (sig, e)
-                    for sig, e in self.event_type_significance_index[entry.event_type]
-                    if e is not entry
-                ]
-                if not self.event_type_significance_index[entry.event_type]:
-                    del self.event_type_significance_index[entry.event_type]
-
-        # Удаляем из словаря записей
-        if entry_id in self.entries_by_id:
-            del self.entries_by_id[entry_id]
+            self.event_type_timestamp_index[entry.event_type].add(
+                _index_item(entry.timestamp, entry_id)
+            )
+            self.event_type_significance_index[entry.event_type].add(
+                _index_item(entry.meaning_significance, entry_id)
+            )
 
-        self.stats["total_entries"] -= 1
+    @staticmethod
+    def _discard_composite(
+        index: Dict[str, _SortedIndex], event_type: str, key: float, entry_id: int
+    ) -> None:
+        """Удаляет элемент из составного индекса и пустой список типа события."""
+        sorted_entries = index.get(event_type)
+        if sorted_entries is None:
+            return
+        sorted_entries.discard(_index_item(key, entry_id))
+        if not sorted_entries:
+            del index[event_type]
+
+    def refresh_weights(self) -> None:
+        """
+        Переиндексирует веса после их изменения на месте (затухание весов).
+
+        Перестраивает weight-индекс по текущим весам записей и удаляет из кэша
+        запросы, результат которых зависит от веса.
+        """
+        items = []
+        for entry_id, entry in self.entries_by_id.items():
+            event_type, timestamp, significance, _ = self._indexed_keys[entry_id]
+            self._indexed_keys[entry_id] = (event_type, timestamp, significance, entry.weight)
+            items.append(_index_item(entry.weight, entry_id))
+        self.weight_entries = _new_sorted_index(items)
         self.stats["index_updates"] += 1
 
-        # Инвалидируем кэш запросов
-        if self.query_cache_enabled:
-            self.query_cache.clear()
+        if self.query_cache:
+            for cache_key, cached in list(self.query_cache.items()):
+                if cached.query.depends_on_weight():
+                    self._drop_cached(cache_key)
 
     def search(self, query: MemoryQuery) -> List[MemoryEntry]:
         """
@@ -238,12 +414,12 @@ class MemoryIndexEngine:
             # Уровень 3: Проверяем кэш запросов
             if self.query_cache_enabled:
                 cache_key = query.get_hash()
-                if cache_key in self.query_cache:
+                cached = self.query_cache.get(cache_key)
+                if cached is not None:
                     self.stats["cache_hits"] += 1
                     # Перемещаем в конец для LRU
-                    result = self.query_cache.pop(cache_key)
-                    self.query_cache[cache_key] = result
-                    return result.copy()
+                    self.query_cache.move_to_end(cache_key)
+                    return cached.results.copy()
                 self.stats["cache_misses"] += 1
 
             # Уровень 1-2: Выполняем поиск через индексы
@@ -264,7 +440,7 @@ class MemoryIndexEngine:
 
             # Кэшируем результат
             if self.query_cache_enabled:
-                self._cache_result(query.get_hash(), results.copy())
+                self._cache_result(cache_key, query, results.copy())
 
             return results
 
@@ -272,51 +448,184 @@ class MemoryIndexEngine:
         """
         Находит кандидатов для поиска через индексы (быстрый этап).
 
+        Кандидаты берутся из самого селективного пути доступа и пересекаются
+        по множествам id с остальными сопоставимыми по размеру путями
+        (см. _candidate_ids). Остальные предикаты проверяет _matches_query -
+        стоимость линейна по наименьшему набору кандидатов, а не по
+        произведению размеров списков.
+
         Returns:
             Список потенциально подходящих записей
         """
-        candidates = []
+        _, _, candidate_ids = self._candidate_ids(query)
+        return self._entries_by_ids(candidate_ids)
+
+    def _entries_by_ids(self, candidate_ids: Optional[Collection[int]]) -> List[MemoryEntry]:
+        """Записи кандидатов плана; None - все записи (полный перебор)."""
+        if candidate_ids is None:
+            return list(self.entries_by_id.values())
+
+        entries_by_id = self.entries_by_id
+        return [entries_by_id[eid] for eid in candidate_ids if eid in entries_by_id]
+
+    def _candidate_ids(
+        self, query: MemoryQuery
+    ) -> Tuple[List[AccessPath], List[Tuple[str, int]], Optional[Collection[int]]]:
+        """
+        Выполняет план запроса над индексами, не обращаясь к самим записям.
+
+        Путь доступа присоединяется к кандидатам, если он не больше их числа
+        в PLAN_JOIN_FACTOR раз; иначе его предикат дешевле проверить фильтром.
+        Множество id типа события присоединяется проверкой принадлежности,
+        если кандидаты получены не из составного индекса этого типа.
+
+        Args:
+            query: Поисковый запрос
+
+        Returns:
+            (пути доступа, шаги плана [(путь, кандидатов после шага)],
+            id кандидатов или None для полного перебора)
+        """
+        paths = self._plan_query(query)
+        path, count, fetch_ids = paths[0]
+        steps = [(path, count)]
+        if path == "full_scan":
+            return paths, steps, None
+        if not count:
+            return paths, steps, []
+
+        candidate_ids: Collection[int] = fetch_ids()
+        for path, count, fetch_ids in paths[1:]:
+            if path == "event_type":
+                if steps[0][0].startswith("event_type"):
+                    continue
+                type_ids = fetch_ids()
+                candidate_ids = [eid for eid in candidate_ids if eid in type_ids]
+            elif count <= PLAN_JOIN_FACTOR * len(candidate_ids):
+                joined = set(candidate_ids)
+                candidate_ids = [eid for eid in fetch_ids() if eid in joined]
+            else:
+                continue
+            steps.append((path, len(candidate_ids)))
+            if not candidate_ids:
+                break
+        return paths, steps, candidate_ids
+
+    def _plan_query(self, query: MemoryQuery) -> List[AccessPath]:
+        """
+        Строит пути доступа запроса и упорядочивает их по числу кандидатов.
+
+        Число кандидатов каждого пути известно без материализации: размер
+        множества id типа события или два бинарных поиска по упорядоченному
+        индексу. Вес меняется на месте, поэтому weight-индекс путем доступа
+        не служит - фильтр по весу проверяется только для кандидатов.
+
+        Args:
+            query: Поисковый запрос
+
+        Returns:
+            Список (путь, число кандидатов, функция получения id кандидатов),
+            первым - самый селективный путь
+        """
+        has_time = query.start_timestamp is not None or query.end_timestamp is not None
+        has_significance = (
+            query.min_significance is not None or query.max_significance is not None
+        )
+        paths: List[AccessPath] = []
 
-        # Если указан event_type, используем индекс
         if query.event_type:
-            if query.event_type in self.event_type_index:
-                # Получаем записи по их id
-                entry_ids = self.event_type_index[query.event_type].copy()
-                candidates = [
-                    self.entries_by_id[eid] for eid in entry_ids if eid in self.entries_by_id
-                ]
-
-                # Оптимизация: используем composite индексы для event_type + другие критерии
-                if self.composite_indexes_enabled:
-                    if query.start_timestamp is not None or query.end_timestamp is not None:
-                        # Используем event_type_timestamp_index для быстрого фильтра по времени
-                        time_candidates = self._filter_by_timestamp_range(
-                            self.event_type_timestamp_index[query.event_type],
+            type_ids = self.event_type_index.get(query.event_type, ())
+            paths.append(("event_type", len(type_ids), lambda: type_ids))
+            if self.composite_indexes_enabled:
+                # Составные индексы селективнее глобальных при фильтре по типу
+                if has_time:
+                    paths.append(
+                        self._range_path(
+                            "event_type_timestamp",
+                            self.event_type_timestamp_index.get(query.event_type),
                             query.start_timestamp,
                             query.end_timestamp,
                         )
-                        time_entries = [entry for _, entry in time_candidates]
-                        # Пересечение списков
-                        candidates = [c for c in candidates if c in time_entries]
-
-                    if query.min_significance is not None or query.max_significance is not None:
-                        # Используем event_type_significance_index
-                        sig_candidates = self._filter_by_significance_range(
-                            self.event_type_significance_index[query.event_type],
+                    )
+                if has_significance:
+                    paths.append(
+                        self._range_path(
+                            "event_type_significance",
+                            self.event_type_significance_index.get(query.event_type),
                             query.min_significance,
                             query.max_significance,
                         )
-                        sig_entries = [entry for _, entry in sig_candidates]
-                        # Пересечение списков
-                        candidates = [c for c in candidates if c in sig_entries]
-            else:
-                # Нет записей с таким event_type
-                return []
-        else:
-            # Нет фильтра по event_type - берем все записи
-            candidates = list(self.entries_by_id.values())
+                    )
+                return sorted(paths, key=lambda path: path[1])
+
+        if has_time:
+            paths.append(
+                self._range_path(
+                    "timestamp", self.timestamp_entries, query.start_timestamp, query.end_timestamp
+                )
+            )
+        if has_significance:
+            paths.append(
+                self._range_path(
+                    "significance",
+                    self.significance_entries,
+                    query.min_significance,
+                    query.max_significance,
+                )
+            )
+        if not paths:
+            paths.append(("full_scan", len(self.entries_by_id), self.entries_by_id.keys))
+        return sorted(paths, key=lambda path: path[1])
 
-        return candidates
+    def _range_path(
+        self,
+        name: str,
+        sorted_entries: Optional[_SortedIndex],
+        low: Optional[float],
+        high: Optional[float],
+    ) -> AccessPath:
+        """Путь доступа по диапазону упорядоченного индекса."""
+        if not sorted_entries:
+            return (name, 0, tuple)
+        start_idx, end_idx = self._range_bounds(sorted_entries, low, high)
+        return (
+            name,
+            end_idx - start_idx,
+            # Элемент индекса - (key, -entry_id), см. _index_item
+            lambda: [-order for _, order in sorted_entries[start_idx:end_idx]],
+        )
+
+    def explain(self, query: MemoryQuery) -> Dict[str, Any]:
+        """
+        Описывает выполнение запроса: выбранный путь доступа, соединения и
+        число кандидатов на каждом шаге.
+
+        Запрос выполняется через индексы без обращения к кэшу и без изменения
+        статистики.
+
+        Args:
+            query: Поисковый запрос
+
+        Returns:
+            Словарь: access_path - начальный путь доступа, joins - присоединенные
+            пути, steps - число кандидатов после каждого шага, paths - число
+            кандидатов каждого пути, candidates - итоговые кандидаты, matched -
+            записи, прошедшие все фильтры, returned - с учетом limit, cached -
+            есть ли результат в кэше запросов
+        """
+        paths, steps, candidate_ids = self._candidate_ids(query)
+        candidates = self._entries_by_ids(candidate_ids)
+        matched = sum(1 for entry in candidates if self._matches_query(entry, query))
+        return {
+            "access_path": steps[0][0],
+            "joins": [path for path, _ in steps[1:]],
+            "steps": [{"path": path, "candidates": count} for path, count in steps],
+            "paths": {path: count for path, count, _ in paths},
+            "candidates": len(candidates),
+            "matched": matched,
+            "returned": min(matched, query.limit),
+            "cached": self.query_cache_enabled and query.get_hash() in self.query_cache,
+        }
 
     def get_entries_by_weight_range(self, min_weight: Optional[float] = None,
                                    max_weight: Optional[float] = None) -> List[MemoryEntry]:
@@ -330,23 +639,7 @@ class MemoryIndexEngine:
         Returns:
             Список записей в указанном диапазоне веса
         """
-        if not self.weight_entries:
-            return []
-
-        start_idx = 0
-        end_idx = len(self.weight_entries)
-
-        # Находим левую границу
-        if min_weight is not None:
-            start_idx = self._binary_search_left(self.weight_entries, min_weight,
-                                                key=lambda x: x[0])
-
-        # Находим правую границу
-        if max_weight is not None:
-            end_idx = self._binary_search_right(self.weight_entries, max_weight,
-                                               key=lambda x: x[0])
-
-        return [entry for _, entry in self.weight_entries[start_idx:end_idx]]
+        return self._entries_for(self._range_slice(self.weight_entries, min_weight, max_weight))
 
     def get_entries_by_significance_range(self, min_sig: Optional[float] = None,
                                          max_sig: Optional[float] = None) -> List[MemoryEntry]:
@@ -360,23 +653,9 @@ class MemoryIndexEngine:
         Returns:
             Список записей в указанном диапазоне значимости
         """
-        if not self.significance_entries:
-            return []
-
-        start_idx = 0
-        end_idx = len(self.significance_entries)
-
-        # Находим левую границу
-        if min_sig is not None:
-            start_idx = self._binary_search_left(self.significance_entries, min_sig,
-                                                key=lambda x: x[0])
-
-        # Находим правую границу
-        if max_sig is not None:
-            end_idx = self._binary_search_right(self.significance_entries, max_sig,
-                                               key=lambda x: x[0])
-
-        return [entry for _, entry in self.significance_entries[start_idx:end_idx]]
+        return self._entries_for(
+            self._range_slice(self.significance_entries, min_sig, max_sig)
+        )
 
     def get_entries_by_timestamp_range(self, start_ts: Optional[float] = None,
                                       end_ts: Optional[float] = None) -> List[MemoryEntry]:
@@ -390,23 +669,45 @@ class MemoryIndexEngine:
         Returns:
             Список записей в указанном диапазоне времени
         """
-        if not self.timestamp_entries:
-            return []
+        return self._entries_for(self._range_slice(self.timestamp_entries, start_ts, end_ts))
+
+    def get_top_by_significance(self, event_type: str, limit: int) -> List[MemoryEntry]:
+        """
+        Топ-N записей типа события по значимости (desc) за O(N).
 
-        start_idx = 0
-        end_idx = len(self.timestamp_entries)
+        Использует event_type_significance_index. Записи с равной значимостью
+        возвращаются в порядке индексации.
 
-        # Находим левую границу
-        if start_ts is not None:
-            start_idx = self._binary_search_left(self.timestamp_entries, start_ts,
-                                                key=lambda x: x[0])
+        Args:
+            event_type: Тип события
+            limit: Максимальное количество записей (неотрицательное)
 
-        # Находим правую границу
-        if end_ts is not None:
-            end_idx = self._binary_search_right(self.timestamp_entries, end_ts,
-                                               key=lambda x: x[0])
+        Returns:
+            Список записей, отсортированный по значимости по убыванию
+        """
+        if limit <= 0:
+            return []
+
+        if not self.composite_indexes_enabled:
+            # Без составных индексов сортируем записи типа события
+            entries = [
+                self.entries_by_id[eid]
+                for eid in sorted(self.event_type_index.get(event_type, ()))
+                if eid in self.entries_by_id
+            ]
+            entries.sort(key=lambda e: e.meaning_significance, reverse=True)
+            return entries[:limit]
+
+        sorted_entries = self.event_type_significance_index.get(event_type)
+        if not sorted_entries:
+            return []
+        # Индекс отсортирован по возрастанию, равные значения новее - левее
+        return self._entries_for(reversed(sorted_entries[-limit:]))
 
-        return [entry for _, entry in self.timestamp_entries[start_idx:end_idx]]
+    def _entries_for(self, items: Iterable[IndexItem]) -> List[MemoryEntry]:
+        """Записи по элементам упорядоченного индекса."""
+        entries_by_id = self.entries_by_id
+        return [entries_by_id[_item_entry_id(item)] for item in items]
 
     def _matches_query(self, entry: MemoryEntry, query: MemoryQuery) -> bool:
         """
@@ -474,154 +775,137 @@ class MemoryIndexEngine:
 
         return results
 
+
     def _filter_by_timestamp_range(
         self,
-        sorted_entries: List[Tuple[float, MemoryEntry]],
+        sorted_entries: _SortedIndex,
         start_ts: Optional[float],
         end_ts: Optional[float],
-    ) -> List[Tuple[float, MemoryEntry]]:
+    ) -> List[IndexItem]:
         """
-        Фильтрует сортированный список записей по диапазону timestamp.
+        Фильтрует упорядоченный индекс по диапазону timestamp.
         Использует бинарный поиск для эффективности.
 
         Args:
-            sorted_entries: Список (timestamp, entry), отсортированный по timestamp
+            sorted_entries: Индекс (timestamp, -entry_id), отсортированный по timestamp
             start_ts: Минимальный timestamp
             end_ts: Максимальный timestamp
 
         Returns:
-            Отфильтрованный список
+            Элементы индекса в диапазоне
         """
-        if not sorted_entries:
-            return []
-
-        # Находим границы с помощью бинарного поиска
-        start_idx = 0
-        end_idx = len(sorted_entries)
-
-        if start_ts is not None:
-            # Ищем первый элемент >= start_ts
-            start_idx = self._binary_search_left(sorted_entries, start_ts, key=lambda x: x[0])
-
-        if end_ts is not None:
-            # Ищем первый элемент > end_ts
-            end_idx = self._binary_search_right(sorted_entries, end_ts, key=lambda x: x[0])
-
-        return sorted_entries[start_idx:end_idx]
+        return self._range_slice(sorted_entries, start_ts, end_ts)
 
     def _filter_by_significance_range(
         self,
-        sorted_entries: List[Tuple[float, MemoryEntry]],
+        sorted_entries: _SortedIndex,
         min_sig: Optional[float],
         max_sig: Optional[float],
-    ) -> List[Tuple[float, MemoryEntry]]:
+    ) -> List[IndexItem]:
         """
-        Фильтрует сортированный список записей по диапазону significance.
+        Фильтрует упорядоченный индекс по диапазону significance.
 
         Args:
-            sorted_entries: Список (significance, entry), отсортированный по significance
+            sorted_entries: Индекс (significance, -entry_id), отсортированный по significance
             min_sig: Минимальная significance
             max_sig: Максимальная significance
 
         Returns:
-            Отфильтрованный список
-        """
-        if not sorted_entries:
-            return []
-
-        start_idx = 0
-        end_idx = len(sorted_entries)
-
-        if min_sig is not None:
-            start_idx = self._binary_search_left(sorted_entries, min_sig, key=lambda x: x[0])
-
-        if max_sig is not None:
-            end_idx = self._binary_search_right(sorted_entries, max_sig, key=lambda x: x[0])
-
-        return sorted_entries[start_idx:end_idx]
-
-    def _insert_sorted(self, sorted_list: list, item, key=lambda x: x):
+            Элементы индекса в диапазоне
         """
-        Вставляет элемент в сортированный список, сохраняя порядок.
-
-        Args:
-            sorted_list: Сортированный список
-            item: Элемент для вставки
-            key: Функция для получения ключа сортировки
-        """
-        # Используем бинарный поиск для нахождения позиции вставки
-        left, right = 0, len(sorted_list)
-        item_key = key(item)
-
-        while left < right:
-            mid = (left + right) // 2
-            if key(sorted_list[mid]) < item_key:
-                left = mid + 1
-            else:
-                right = mid
+        return self._range_slice(sorted_entries, min_sig, max_sig)
 
-        sorted_list.insert(left, item)
-
-    def _binary_search_left(self, sorted_list: list, target, key=lambda x: x) -> int:
+    @staticmethod
+    def _range_slice(
+        sorted_entries: _SortedIndex, low: Optional[float], high: Optional[float]
+    ) -> List[IndexItem]:
         """
-        Бинарный поиск левой границы (первый элемент >= target).
+        Срез упорядоченного индекса с ключами в [low, high] за O(log n + k).
 
         Args:
-            sorted_list: Отсортированный список
-            target: Целевое значение
-            key: Функция для получения ключа
+            sorted_entries: SortedList или список на bisect из пар (ключ, -entry_id)
+            low: Нижняя граница ключа (включительно), None - без границы
+            high: Верхняя граница ключа (включительно), None - без границы
 
         Returns:
-            Индекс первого элемента >= target
-        """
-        left, right = 0, len(sorted_list)
-        while left < right:
-            mid = (left + right) // 2
-            if key(sorted_list[mid]) < target:
-                left = mid + 1
-            else:
-                right = mid
-        return left
-
-    def _binary_search_right(self, sorted_list: list, target, key=lambda x: x) -> int:
+            Элементы индекса в диапазоне
         """
-        Бинарный поиск правой границы (первый элемент > target).
-
-        Args:
-            sorted_list: Отсортированный список
-            target: Целевое значение
-            key: Функция для получения ключа
+        if not sorted_entries:
+            return []
+        start_idx, end_idx = MemoryIndexEngine._range_bounds(sorted_entries, low, high)
+        return sorted_entries[start_idx:end_idx]
 
-        Returns:
-            Индекс первого элемента > target
-        """
-        left, right = 0, len(sorted_list)
-        while left < right:
-            mid = (left + right) // 2
-            if key(sorted_list[mid]) <= target:
-                left = mid + 1
-            else:
-                right = mid
-        return left
+    @staticmethod
+    def _range_bounds(
+        sorted_entries: _SortedIndex, low: Optional[float], high: Optional[float]
+    ) -> Tuple[int, int]:
+        """Границы [start, end) элементов упорядоченного индекса с ключами в [low, high]."""
+        # (low,) меньше любой пары с ключом low, (high, inf) - больше любой пары с ключом high
+        start_idx = 0 if low is None else sorted_entries.bisect_left((low,))
+        end_idx = len(sorted_entries)
+        if high is not None:
+            end_idx = sorted_entries.bisect_right((high, math.inf))
+        return start_idx, max(start_idx, end_idx)
 
-    def _cache_result(self, cache_key: str, result: List[MemoryEntry]):
+    def _cache_result(self, cache_key: str, query: MemoryQuery, results: List[MemoryEntry]) -> None:
         """
         Кэширует результат запроса с LRU eviction.
 
         Args:
             cache_key: Ключ кэша
-            result: Результат для кэширования
+            query: Запрос (предикаты нужны для точечной инвалидации)
+            results: Результат для кэширования
         """
         # Проверяем лимит кэша
         if len(self.query_cache) >= self.max_cache_size:
-            # Удаляем самый старый элемент (FIFO)
-            self.query_cache.popitem(last=False)
-
-        self.query_cache[cache_key] = result
+            # Удаляем самый давно использованный элемент
+            self._drop_cached(next(iter(self.query_cache)))
+
+        entry_ids = {self._entry_ids[id(entry)] for entry in results}
+        self.query_cache[cache_key] = _CachedQuery(query, results, entry_ids)
+        self._cache_keys_by_event_type[query.event_type or None].add(cache_key)
+
+    def _drop_cached(self, cache_key: str) -> None:
+        """Удаляет запрос из кэша и из индекса ключей кэша по event_type."""
+        cached = self.query_cache.pop(cache_key, None)
+        if cached is None:
+            return
+        event_type = cached.query.event_type or None
+        keys = self._cache_keys_by_event_type.get(event_type)
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del self._cache_keys_by_event_type[event_type]
+        self.stats["cache_invalidations"] += 1
+
+    def _cached_keys_for(self, event_type: str) -> List[str]:
+        """Ключи кэша запросов, которые могут затрагивать записи данного типа."""
+        keys = list(self._cache_keys_by_event_type.get(event_type, ()))
+        keys.extend(self._cache_keys_by_event_type.get(None, ()))
+        return keys
+
+    def _invalidate_for_added(self, entry: MemoryEntry) -> None:
+        """Удаляет из кэша запросы, предикатам которых соответствует новая запись."""
+        if not self.query_cache:
+            return
+        for cache_key in self._cached_keys_for(entry.event_type):
+            cached = self.query_cache.get(cache_key)
+            if cached is not None and self._matches_query(entry, cached.query):
+                self._drop_cached(cache_key)
+
+    def _invalidate_for_removed(self, entry_id: int, event_type: str) -> None:
+        """Удаляет из кэша запросы, в результат которых входила удаленная запись."""
+        if not self.query_cache:
+            return
+        for cache_key in self._cached_keys_for(event_type):
+            cached = self.query_cache.get(cache_key)
+            if cached is not None and entry_id in cached.entry_ids:
+                self._drop_cached(cache_key)
 
     def clear_cache(self):
         """Очищает кэш запросов."""
         self.query_cache.clear()
+        self._cache_keys_by_event_type.clear()
         self.stats["cache_hits"] = 0
         self.stats["cache_misses"] = 0
 
@@ -644,10 +928,12 @@ class MemoryIndexEngine:
             "cache_hit_rate": cache_hit_rate,
             "cache_hits": self.stats["cache_hits"],
             "cache_misses": self.stats["cache_misses"],
+            "cache_invalidations": self.stats["cache_invalidations"],
             "index_updates": self.stats["index_updates"],
             "query_count": self.stats["query_count"],
             "composite_indexes_enabled": self.composite_indexes_enabled,
             "query_cache_enabled": self.query_cache_enabled,
+            "sorted_backend": "sortedcontainers" if HAS_SORTEDCONTAINERS else "bisect",
             "event_types_count": len(self.event_type_index),
         }
 
@@ -656,25 +942,68 @@ class MemoryIndexEngine:
         Полностью перестраивает индексы из списка записей.
         Используется при загрузке данных или восстановлении.
 
+        Записи, уже индексированные движком, сохраняют свои id. Упорядоченные
+        индексы строятся одной сортировкой, а не поэлементной вставкой.
+
         Args:
             entries: Список всех записей для индексации
         """
         with measure_time("memory_index_rebuild"):
-            # Очищаем текущие индексы
-            self.event_type_index.clear()
-            self.entries_by_id.clear()
-            self.timestamp_entries.clear()
-            self.significance_entries.clear()
-            self.weight_entries.clear()
-
-            if self.composite_indexes_enabled:
-                self.event_type_timestamp_index.clear()
-                self.event_type_significance_index.clear()
+            previous_ids = self._entry_ids
+            previous_entries = self.entries_by_id
 
+            # Очищаем текущие индексы
+            self._entry_ids = {}
+            self._indexed_keys = {}
+            self.event_type_index = defaultdict(set)
+            self.entries_by_id = {}
             self.query_cache.clear()
+            self._cache_keys_by_event_type.clear()
+
+            timestamp_items = []
+            significance_items = []
+            weight_items = []
+            by_type_timestamp = defaultdict(list)
+            by_type_significance = defaultdict(list)
 
-            # Перестраиваем индексы
             for entry in entries:
-                self.add_entry(entry)
+                if id(entry) in self._entry_ids:
+                    continue
+                entry_id = previous_ids.get(id(entry))
+                if entry_id is None or previous_entries.get(entry_id) is not entry:
+                    entry_id = next(self._next_entry_id)
+
+                self._entry_ids[id(entry)] = entry_id
+                self.entries_by_id[entry_id] = entry
+                self._indexed_keys[entry_id] = (
+                    entry.event_type,
+                    entry.timestamp,
+                    entry.meaning_significance,
+                    entry.weight,
+                )
+                self.event_type_index[entry.event_type].add(entry_id)
+
+                timestamp_item = _index_item(entry.timestamp, entry_id)
+                significance_item = _index_item(entry.meaning_significance, entry_id)
+                timestamp_items.append(timestamp_item)
+                significance_items.append(significance_item)
+                weight_items.append(_index_item(entry.weight, entry_id))
+                by_type_timestamp[entry.event_type].append(timestamp_item)
+                by_type_significance[entry.event_type].append(significance_item)
+
+            self.timestamp_entries = _new_sorted_index(timestamp_items)
+            self.significance_entries = _new_sorted_index(significance_items)
+            self.weight_entries = _new_sorted_index(weight_items)
+
+            if self.composite_indexes_enabled:
+                self.event_type_timestamp_index = defaultdict(_new_sorted_index)
+                for event_type, items in by_type_timestamp.items():
+                    self.event_type_timestamp_index[event_type] = _new_sorted_index(items)
+                self.event_type_significance_index = defaultdict(_new_sorted_index)
+                for event_type, items in by_type_significance.items():
+                    self.event_type_significance_index[event_type] = _new_sorted_index(items)
+
+            self.stats["total_entries"] = len(self.entries_by_id)
+            self.stats["index_updates"] += len(self.entries_by_id)
 
             logger.info(f"Перестроены индексы для {len(entries)} записей")
@@ -0,0 +1,152 @@
+"""
+Ядро обслуживания активной памяти.
+
+Затухание весов, отбор записей для архивации и порядок ограничения размера
+считаются над колонками значений (веса, время, значимость), а не над
+объектами MemoryEntry. С numpy колонки обрабатываются векторно, без numpy -
+циклом Python. Оба пути выполняют одни и те же операции с плавающей точкой в
+том же порядке, что и построчный проход Memory, поэтому дают те же веса и те
+же записи.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+# Ниже этого числа записей преобразование в массивы numpy дороже цикла Python
+NUMPY_MIN_ENTRIES = 64
+
+# Возраст, за который дополнительное затухание по возрасту уменьшает вес вдвое
+AGE_HALF_LIFE_SECONDS = 86400.0
+
+
+@dataclass
+class MaintenanceResult:
+    """Результат прохода обслуживания в порядке записей."""
+
+    weights: List[float]  # Веса после затухания
+    min_weight_count: int  # Количество весов, ограниченных снизу min_weight
+    archive_positions: List[int]  # Позиции записей для архивации (по возрастанию)
+
+
+def _use_numpy(count: int) -> bool:
+    return HAS_NUMPY and count >= NUMPY_MIN_ENTRIES
+
+
+def maintenance_pass(
+    weights: Sequence[float],
+    timestamps: Sequence[float],
+    significances: Sequence[float],
+    current_time: float,
+    decay_factor: float,
+    min_weight: float,
+    cutoff_time: Optional[float] = None,
+    archive_min_weight: float = 0.0,
+    archive_min_significance: float = 0.0,
+) -> MaintenanceResult:
+    """
+    Затухание весов и отбор записей для архивации за один проход.
+
+    Вес записи: weight * decay_factor * 1 / (1 + age / 86400) * (0.5 + 0.5 * significance),
+    ограниченный снизу min_weight. Запись архивируется, если после затухания
+    timestamp < cutoff_time, weight < archive_min_weight или
+    significance < archive_min_significance.
+
+    Args:
+        weights: Веса записей
+        timestamps: Временные метки записей
+        significances: Значимость записей
+        current_time: Текущее время для расчета возраста
+        decay_factor: Коэффициент затухания (уже ограниченный вызывающим кодом)
+        min_weight: Минимальный вес после затухания
+        cutoff_time: Граница возраста для архивации. None - архивация не выполняется
+        archive_min_weight: Минимальный вес, ниже которого запись архивируется
+        archive_min_significance: Минимальная значимость, ниже которой запись архивируется
+
+    Returns:
+        MaintenanceResult с новыми весами, счетчиком и позициями для архивации
+    """
+    count = len(weights)
+    if _use_numpy(count):
+        weight_array = np.fromiter(weights, dtype=float, count=count)
+        timestamp_array = np.fromiter(timestamps, dtype=float, count=count)
+        significance_array = np.fromiter(significances, dtype=float, count=count)
+
+        weight_array *= decay_factor
+        weight_array *= 1.0 / (1.0 + (current_time - timestamp_array) / AGE_HALF_LIFE_SECONDS)
+        weight_array *= 0.5 + 0.5 * significance_array
+        clamped = weight_array < min_weight
+        weight_array[clamped] = min_weight
+        min_weight_count = int(np.count_nonzero(clamped))
+
+        archive_positions: List[int] = []
+        if cutoff_time is not None:
+            archive_mask = (
+                (timestamp_array < cutoff_time)
+                | (weight_array < archive_min_weight)
+                | (significance_array < archive_min_significance)
+            )
+            archive_positions = np.flatnonzero(archive_mask).tolist()
+        return MaintenanceResult(weight_array.tolist(), min_weight_count, archive_positions)
+
+    new_weights = []
+    min_weight_count = 0
+    archive_positions = []
+    for position, (weight, timestamp, significance) in enumerate(
+        zip(weights, timestamps, significances)
+    ):
+        weight *= decay_factor
+        weight *= 1.0 / (1.0 + (current_time - timestamp) / AGE_HALF_LIFE_SECONDS)
+        weight *= 0.5 + 0.5 * significance
+        if weight < min_weight:
+            weight = min_weight
+            min_weight_count += 1
+        new_weights.append(weight)
+        if cutoff_time is not None and (
+            timestamp < cutoff_time
+            or weight < archive_min_weight
+            or significance < archive_min_significance
+        ):
+            archive_positions.append(position)
+    return MaintenanceResult(new_weights, min_weight_count, archive_positions)
+
+
+def clamp_order(weights: Sequence[float], min_weight: float, max_size: int) -> List[int]:
+    """
+    Позиции записей, остающихся после ограничения размера, в итоговом порядке.
+
+    Записи с весом ниже min_weight отбрасываются. Если оставшихся больше
+    max_size, они упорядочиваются по весу (устойчиво, как list.sort) и
+    отбрасываются записи с наименьшим весом; иначе порядок не меняется.
+    Веса предполагаются конечными (без NaN).
+
+    Args:
+        weights: Веса записей
+        min_weight: Порог веса
+        max_size: Максимальное количество записей
+
+    Returns:
+        Позиции оставшихся записей
+    """
+    count = len(weights)
+    if _use_numpy(count):
+        weight_array = np.fromiter(weights, dtype=float, count=count)
+        keep = np.flatnonzero(weight_array >= min_weight)
+        if len(keep) > max_size:
+            keep = keep[np.argsort(weight_array[keep], kind="stable")][len(keep) - max_size:]
+        positions: List[int] = keep.tolist()
+        return positions
+
+    positions = [position for position, weight in enumerate(weights) if weight >= min_weight]
+    if len(positions) > max_size:
+        positions.sort(key=weights.__getitem__)
+        positions = positions[len(positions) - max_size:]
+    return positions
+
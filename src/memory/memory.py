@@ -1,9 +1,11 @@
-import json
-from dataclasses import asdict
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, SupportsIndex, Union
 
+from .archive_storage import DEFAULT_SEGMENT_MAX_ENTRIES, SegmentedArchiveStorage
+from .columnar_store import ColumnarEntryStore
 from .index_engine import MemoryIndexEngine, MemoryQuery
+from .maintenance_kernel import clamp_order, maintenance_pass
 from .memory_types import MemoryEntry
 from .memory_interface import EpisodicMemoryInterface, MemoryStatistics
 
@@ -11,11 +13,23 @@ from .memory_interface import EpisodicMemoryInterface, MemoryStatistics
 ARCHIVE_DIR = Path("data/archive")
 ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
 
+# Доля архивируемых записей, начиная с которой индекс не правится по записи,
+# а помечается устаревшим и перестраивается целиком при следующем чтении
+BULK_ARCHIVE_REINDEX_RATIO = 0.1
+
+_get_weight = attrgetter("weight")
+_get_timestamp = attrgetter("timestamp")
+_get_significance = attrgetter("meaning_significance")
+
 
 class ArchiveMemory(EpisodicMemoryInterface):
     """
     Архивная память для долгосрочного хранения записей.
     Хранит записи, которые были перенесены из активной памяти.
+
+    Данные на диске хранятся в SegmentedArchiveStorage (append-only сегменты).
+    В колоночном режиме записи в памяти хранятся в ColumnarEntryStore, а
+    наружу выдаются совместимые с MemoryEntry представления (MemoryEntryView).
     """
 
     def __init__(
@@ -23,36 +37,90 @@ class ArchiveMemory(EpisodicMemoryInterface):
         archive_file: Optional[Path] = None,
         load_existing: bool = False,
         ignore_existing_file: bool = False,
+        segment_max_entries: int = DEFAULT_SEGMENT_MAX_ENTRIES,
+        columnar: bool = False,
     ):
         """
         Инициализация архивной памяти.
 
+        Существующий архив загружается лениво - при первом обращении к записям.
+        До этого известно только количество записей из манифеста.
+
         Args:
             archive_file: Путь к файлу архива. Если None, используется дефолтный.
             load_existing: Загружать ли существующие данные из файла. По умолчанию False.
             ignore_existing_file: Игнорировать существующий файл, даже если load_existing=True. По умолчанию False.
+            segment_max_entries: Максимальное количество записей в одном сегменте хранилища
+            columnar: Хранить записи в колоночном хранилище (в несколько раз меньше
+                памяти на запись). Индекс в этом режиме строится при первом поиске.
         """
         if archive_file is None:
             archive_file = ARCHIVE_DIR / "memory_archive.json"
         self.archive_file = archive_file
-        self._entries: List[MemoryEntry] = []
+        self.columnar = columnar
+        self._entries = self._new_entries()
         self._index_engine = MemoryIndexEngine()  # Индекс для архивных записей
-        if load_existing and not ignore_existing_file:
-            self._load_archive()
+        # Индекс не содержит часть записей и перестраивается при первом поиске
+        self._index_stale = columnar
+        self._storage = SegmentedArchiveStorage(
+            archive_file, segment_max_entries=segment_max_entries
+        )
+        # Количество записей, добавленных после последнего сохранения. Такие записи
+        # всегда составляют хвост _entries и дописываются в хранилище
+        self._unsaved_count = 0
+        # Без загрузки существующих данных первое сохранение заменяет архив целиком
+        self._loaded = not load_existing or ignore_existing_file
+        self._rewrite_required = self._loaded
+
+    def _new_entries(self):
+        """Пустой контейнер записей: список или колоночное хранилище."""
+        return ColumnarEntryStore() if self.columnar else []
+
+    def _store_entry(self, entry: MemoryEntry) -> None:
+        """
+        Добавляет запись в архив и индекс.
+
+        В индекс попадает хранимая запись: сам entry или его представление
+        в колоночном хранилище.
+        """
+        self._entries.append(entry)
+        self._unsaved_count += 1
+        if not self._index_stale:
+            self._index_engine.add_entry(self._entries[-1])
+
+    def _ensure_index(self) -> MemoryIndexEngine:
+        """Перестраивает индекс, если он не содержит все записи архива."""
+        if self._index_stale:
+            self._index_engine.rebuild_indexes(list(self._entries))
+            self._index_stale = False
+        return self._index_engine
+
+    def _ensure_loaded(self) -> None:
+        """Загружает сохраненные записи при первом обращении к архиву."""
+        if self._loaded:
+            return
+        self._loaded = True
+        persisted = self._storage.load_entries()
+        # Записи, добавленные и сохраненные до загрузки, уже есть в памяти
+        already_in_memory = len(self._entries) - self._unsaved_count
+        if already_in_memory:
+            persisted = persisted[: len(persisted) - already_in_memory]
+        if persisted:
+            # Сохраненные записи идут раньше добавленных до загрузки
+            if self._entries:
+                self._entries[:0] = persisted
+            else:
+                self._entries.extend(persisted)
+            if self.columnar:
+                self._index_stale = True
+            elif not self._index_stale:
+                for entry in persisted:
+                    self._index_engine.add_entry(entry)
 
     def _load_archive(self):
-        """Загружает архив из файла, если он существует."""
-        if self.archive_file.exists():
-            try:
-                with self.archive_file.open("r") as f:
-                    data = json.load(f)
-                    self._entries = [MemoryEntry(**entry) for entry in data.get("entries", [])]
-                    # Индексируем загруженные записи
-                    for entry in self._entries:
-                        self._index_engine.add_entry(entry)
-            except (json.JSONDecodeError, KeyError, TypeError):
-                # Если файл поврежден, начинаем с пустого архива
-                self._entries = []
+        """Загружает архив из хранилища (с миграцией legacy JSON-файла)."""
+        self._loaded = False
+        self._ensure_loaded()
 
     def add_entry(self, entry: Optional[MemoryEntry] = None, event_type: Optional[str] = None,
                   meaning_significance: Optional[float] = None, timestamp: Optional[float] = None,
@@ -72,8 +140,7 @@ class ArchiveMemory(EpisodicMemoryInterface):
         """
         if entry is not None:
             # Используем переданную запись
-            self._entries.append(entry)
-            self._index_engine.add_entry(entry)
+            self._store_entry(entry)
         elif event_type is not None and meaning_significance is not None and timestamp is not None:
             # Создаем новую запись из параметров
             from src.memory.memory_types import MemoryEntry
@@ -85,8 +152,7 @@ class ArchiveMemory(EpisodicMemoryInterface):
                 feedback_data=feedback_data,
                 subjective_timestamp=subjective_timestamp
             )
-            self._entries.append(new_entry)
-            self._index_engine.add_entry(new_entry)
+            self._store_entry(new_entry)
         else:
             raise ValueError("Either entry or (event_type, meaning_significance, timestamp) must be provided")
 
@@ -97,9 +163,8 @@ class ArchiveMemory(EpisodicMemoryInterface):
         Args:
             entries: Список записей памяти для архивации
         """
-        self._entries.extend(entries)
         for entry in entries:
-            self._index_engine.add_entry(entry)
+            self._store_entry(entry)
 
     def get_entries(
         self,
@@ -121,6 +186,7 @@ class ArchiveMemory(EpisodicMemoryInterface):
         Returns:
             Список отфильтрованных записей
         """
+        self._ensure_loaded()
         # Используем оптимизированный поиск через индексы
         query = MemoryQuery(
             event_type=event_type,
@@ -128,7 +194,7 @@ class ArchiveMemory(EpisodicMemoryInterface):
             start_timestamp=start_timestamp,
             end_timestamp=end_timestamp,
         )
-        results = self._index_engine.search(query)
+        results = self._ensure_index().search(query)
 
         # Применяем ограничение по количеству
         if limit is not None:
@@ -137,7 +203,13 @@ class ArchiveMemory(EpisodicMemoryInterface):
         return results
 
     def get_all_entries(self) -> List[MemoryEntry]:
-        """Возвращает все записи из архива."""
+        """
+        Возвращает все записи из архива.
+
+        В колоночном режиме возвращается копия ColumnarEntryStore - последовательность
+        представлений записей, а не список MemoryEntry.
+        """
+        self._ensure_loaded()
         return self._entries.copy()
 
     def search_entries(self, query: MemoryQuery) -> List[MemoryEntry]:
@@ -150,7 +222,8 @@ class ArchiveMemory(EpisodicMemoryInterface):
         Returns:
             Список найденных записей, отсортированный по запросу
         """
-        return self._index_engine.search(query)
+        self._ensure_loaded()
+        return self._ensure_index().search(query)
 
     def search_by_type(self, event_type: str) -> List[MemoryEntry]:
         """
@@ -166,6 +239,12 @@ class ArchiveMemory(EpisodicMemoryInterface):
 
     def size(self) -> int:
         """Возвращает количество записей в архиве."""
+        if not self._loaded:
+            if self._storage.exists():
+                already_saved = len(self._entries) - self._unsaved_count
+                return self._storage.entry_count() + len(self._entries) - already_saved
+            # Legacy-архив без манифеста - загружаем с миграцией
+            self._ensure_loaded()
         return len(self._entries)
 
     def get_statistics(self) -> MemoryStatistics:
@@ -175,14 +254,20 @@ class ArchiveMemory(EpisodicMemoryInterface):
         Returns:
             MemoryStatistics: Статистика использования
         """
+        self._ensure_loaded()
         if not self._entries:
             return MemoryStatistics(
                 total_entries=0,
                 memory_type="archive"
             )
 
-        total_significance = sum(entry.meaning_significance for entry in self._entries)
-        timestamps = [entry.timestamp for entry in self._entries]
+        if self.columnar:
+            # Проход по колонкам без создания представлений записей
+            total_significance = sum(self._entries.column("meaning_significance"))
+            timestamps = self._entries.column("timestamp")
+        else:
+            total_significance = sum(entry.meaning_significance for entry in self._entries)
+            timestamps = [entry.timestamp for entry in self._entries]
 
         return MemoryStatistics(
             total_entries=len(self._entries),
@@ -200,6 +285,7 @@ class ArchiveMemory(EpisodicMemoryInterface):
         Returns:
             bool: True если данные корректны
         """
+        self._ensure_loaded()
         try:
             # Проверяем, что все записи имеют правильную структуру
             for entry in self._entries:
@@ -213,11 +299,6 @@ class ArchiveMemory(EpisodicMemoryInterface):
         except Exception:
             return False
 
-    def clear(self) -> None:
-        """Очистить архив (используется с осторожностью)."""
-        self._entries = []
-        self._index_engine = MemoryIndexEngine()
-
     def is_empty(self) -> bool:
         """
         Проверить, пуст ли архив.
@@ -225,7 +306,7 @@ class ArchiveMemory(EpisodicMemoryInterface):
         Returns:
             bool: True если архив пуст
         """
-        return len(self._entries) == 0
+        return self.size() == 0
 
     def archive_old_entries(
         self,
@@ -244,15 +325,40 @@ class ArchiveMemory(EpisodicMemoryInterface):
         return 0
 
     def save_archive(self):
-        """Сохраняет архив в файл."""
-        data = {"entries": [asdict(entry) for entry in self._entries]}
-        with self.archive_file.open("w") as f:
-            json.dump(data, f, indent=2, default=str)
+        """
+        Сохраняет архив на диск.
+
+        В хранилище дописываются только записи, добавленные после предыдущего
+        сохранения, поэтому стоимость не зависит от размера архива. Полная
+        перезапись выполняется только после clear() или при первом сохранении
+        архива, созданного без загрузки существующих данных.
+        """
+        if self._rewrite_required:
+            self._ensure_loaded()
+            self._storage.rewrite(self._entries)
+            self._rewrite_required = False
+        else:
+            self._storage.append_entries(self._entries[len(self._entries) - self._unsaved_count:])
+        self._unsaved_count = 0
+
+    def compact_archive(self) -> None:
+        """Компактизирует сегменты архива на диске."""
+        self.save_archive()
+        self._storage.compact()
+
+    def get_storage_stats(self) -> Dict:
+        """Возвращает статистику сегментированного хранилища архива."""
+        return self._storage.get_stats()
 
     def clear(self):
         """Очищает архив (используется с осторожностью)."""
-        self._entries = []
+        self._entries = self._new_entries()
+        self._unsaved_count = 0
         self._index_engine = MemoryIndexEngine()  # Создаем новый индекс
+        self._index_stale = self.columnar
+        # Сохраненные данные больше не относятся к архиву
+        self._loaded = True
+        self._rewrite_required = True
 
 
 class Memory(list, EpisodicMemoryInterface):
@@ -265,6 +371,7 @@ class Memory(list, EpisodicMemoryInterface):
         archive: Optional[ArchiveMemory] = None,
         load_existing_archive: bool = False,
         ignore_existing_archive_file: bool = False,
+        columnar_archive: bool = False,
     ):
         """
         Инициализация памяти.
@@ -273,12 +380,14 @@ class Memory(list, EpisodicMemoryInterface):
             archive: Экземпляр ArchiveMemory для архивации. Если None, создается новый.
             load_existing_archive: Загружать ли существующие данные архива. По умолчанию False.
             ignore_existing_archive_file: Игнорировать существующий файл архива. По умолчанию False.
+            columnar_archive: Создать архив в колоночном режиме (если archive не передан).
         """
         super().__init__()
         if archive is None:
             archive = ArchiveMemory(
                 load_existing=load_existing_archive,
                 ignore_existing_file=ignore_existing_archive_file,
+                columnar=columnar_archive,
             )
         self.archive = archive
         self._max_size = 50  # Максимальный размер активной памяти
@@ -287,14 +396,79 @@ class Memory(list, EpisodicMemoryInterface):
 
         # Индексный движок для быстрого поиска
         self._index_engine = MemoryIndexEngine()
+        # Индекс устарел после изменения списка в обход append/clamp_size/архивации
+        self._index_stale = False
 
-    def append(self, item):
+    def append(self, item: MemoryEntry) -> None:
         super().append(item)
         self._invalidate_cache()
         self._index_engine.add_entry(item)
         self.clamp_size()
 
-    def _invalidate_cache(self):
+    # Прочие изменения списка помечают индекс устаревшим; он перестраивается при чтении
+
+    def extend(self, items: Iterable[MemoryEntry]) -> None:
+        super().extend(items)
+        self._mark_index_stale()
+
+    def __iadd__(  # type: ignore[misc, override]
+        self, items: Iterable[MemoryEntry]
+    ) -> "Memory":
+        result = super().__iadd__(items)
+        self._mark_index_stale()
+        return result
+
+    def insert(self, index: SupportsIndex, item: MemoryEntry) -> None:
+        super().insert(index, item)
+        self._mark_index_stale()
+
+    def remove(self, item: MemoryEntry) -> None:
+        super().remove(item)
+        self._mark_index_stale()
+
+    def pop(self, index: SupportsIndex = -1) -> MemoryEntry:
+        item: MemoryEntry = super().pop(index)
+        self._mark_index_stale()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._mark_index_stale()
+
+    def __setitem__(self, index: Union[SupportsIndex, slice], value: Any) -> None:
+        super().__setitem__(index, value)
+        self._mark_index_stale()
+
+    def __delitem__(self, index: Union[SupportsIndex, slice]) -> None:
+        super().__delitem__(index)
+        self._mark_index_stale()
+
+    def _mark_index_stale(self) -> None:
+        """Помечает индекс устаревшим после изменения списка в обход индексации."""
+        self._invalidate_cache()
+        self._index_stale = True
+
+    def _ensure_index(self) -> MemoryIndexEngine:
+        """Возвращает индекс, перестраивая его, если список менялся в обход индексации."""
+        if self._index_stale:
+            self._index_stale = False
+            self._index_engine.rebuild_indexes(list(self))
+        return self._index_engine
+
+    def get_top_by_significance(self, event_type: str, limit: int) -> List[MemoryEntry]:
+        """
+        Топ-N записей типа события по значимости (desc) из индекса за O(N).
+
+        Args:
+            event_type: Тип события
+            limit: Максимальное количество записей (неотрицательное)
+
+        Returns:
+            Список записей, отсортированный по значимости по убыванию
+        """
+        return self._ensure_index().get_top_by_significance(event_type, limit)
+
+    def _invalidate_cache(self) -> None:
         """Инвалидирует кэш сериализованных данных при изменении памяти."""
         self._serialized_cache = None
 
@@ -337,25 +511,27 @@ class Memory(list, EpisodicMemoryInterface):
         Returns:
             Список найденных записей, отсортированный по запросу
         """
-        return self._index_engine.search(query)
+        return self._ensure_index().search(query)
+
+    def get_index_stats(self) -> Dict:
+        """Статистика индексного движка активной памяти (без перестройки индекса)."""
+        return self._index_engine.get_stats()
 
-    def clamp_size(self):
+    def clamp_size(self) -> None:
         """Ограничивает размер памяти, удаляя записи с наименьшим весом и ниже порога."""
         self._invalidate_cache()  # Инвалидируем кэш перед изменениями
-
-        # Сначала удаляем записи с весом ниже порога
-        self[:] = [entry for entry in self if entry.weight >= self._min_weight_threshold]
-
-        # Затем ограничиваем размер, удаляя записи с наименьшим весом
-        if len(self) > self._max_size:
-            # Оптимизация: сортируем один раз вместо поиска минимума на каждой итерации
-            self.sort(key=lambda x: x.weight)
-            # Удаляем записи с наименьшими весами из индекса
-            entries_to_remove = self[: len(self) - self._max_size]
-            for entry in entries_to_remove:
-                self._index_engine.remove_entry(entry)
-            # Удаляем записи с наименьшими весами
-            del self[: len(self) - self._max_size]
+        index_engine = self._ensure_index()
+
+        # Записи ниже порога отбрасываются; при превышении размера оставшиеся
+        # упорядочиваются по весу и отбрасываются записи с наименьшим весом
+        keep = clamp_order(list(map(_get_weight, self)), self._min_weight_threshold, self._max_size)
+        if len(keep) == len(self):
+            return
+        kept = set(keep)
+        for position, entry in enumerate(self):
+            if position not in kept:
+                index_engine.remove_entry(entry)
+        list.__setitem__(self, slice(None), [self[position] for position in keep])
 
     def archive_old_entries(
         self,
@@ -449,9 +625,10 @@ class Memory(list, EpisodicMemoryInterface):
                     entries_to_archive.append(entry)
 
             # Оптимизация: удаляем все записи за один проход
+            index_engine = self._ensure_index()
             for entry in entries_to_archive:
-                self.remove(entry)
-                self._index_engine.remove_entry(entry)
+                list.remove(self, entry)
+                index_engine.remove_entry(entry)
 
             # Добавляем записи в архив
             if entries_to_archive:
@@ -488,38 +665,58 @@ class Memory(list, EpisodicMemoryInterface):
 
             import time
 
-            current_time = time.time()
-            min_weight_count = 0
-
             self._invalidate_cache()  # Инвалидируем кэш перед изменениями
+            result = self._maintenance_pass(time.time(), decay_factor, min_weight)
+            self._apply_weights(result.weights)
+            return result.min_weight_count
 
-            # Оптимизация: прекалькулируем общие значения
-            decay_factor_clamped = max(0.9, min(1.0, decay_factor))  # Ограничиваем для стабильности
-
-            for entry in self:
-                # Базовое затухание с оптимизацией
-                old_weight = entry.weight
-                entry.weight *= decay_factor_clamped
-
-                # Учитываем возраст записи (старые записи забываются быстрее)
-                age = current_time - entry.timestamp
-                age_factor = 1.0 / (
-                    1.0 + age / 86400.0
-                )  # Дополнительное затухание для записей старше дня
-                entry.weight *= age_factor
-
-                # Учитываем значимость (более значимые записи забываются медленнее)
-                significance_factor = 0.5 + 0.5 * entry.meaning_significance  # От 0.5 до 1.0
-                entry.weight *= significance_factor
-
-                # Ограничиваем минимальным весом
-                if entry.weight < min_weight:
-                    entry.weight = min_weight
-                    min_weight_count += 1
+    def _maintenance_pass(self, current_time: float, decay_factor: float, min_weight: float,
+                          **archive_criteria):
+        """
+        Проход ядра обслуживания по колонкам весов, времени и значимости записей.
 
-            return min_weight_count
+        Вес умножается на коэффициент затухания (ограниченный диапазоном 0.9-1.0
+        для стабильности), на возрастной множитель 1 / (1 + age / 86400) - старые
+        записи забываются быстрее - и на 0.5 + 0.5 * significance - значимые
+        записи забываются медленнее. Веса ниже min_weight устанавливаются в min_weight.
 
+        Args:
+            current_time: Текущее время для расчета возраста
+            decay_factor: Коэффициент затухания
+            min_weight: Минимальный вес после затухания
+            **archive_criteria: cutoff_time, archive_min_weight, archive_min_significance
+                для отбора записей на архивацию (см. maintenance_pass)
+        """
+        return maintenance_pass(
+            list(map(_get_weight, self)),
+            list(map(_get_timestamp, self)),
+            list(map(_get_significance, self)),
+            current_time,
+            max(0.9, min(1.0, decay_factor)),
+            min_weight,
+            **archive_criteria,
+        )
 
+    def _apply_weights(self, weights: List[float], refresh_index: bool = True) -> None:
+        """Записывает веса в записи и обновляет индекс весов."""
+        for entry, weight in zip(self, weights):
+            entry.weight = weight
+        # Веса изменены на месте - переиндексируем их (устаревший индекс перестроится сам)
+        if refresh_index and not self._index_stale:
+            self._index_engine.refresh_weights()
+
+    def _remove_positions(self, positions: List[int]) -> List[MemoryEntry]:
+        """Удаляет записи на указанных позициях (без индекса) и возвращает их."""
+        removed_positions = set(positions)
+        kept = []
+        removed = []
+        for position, entry in enumerate(self):
+            if position in removed_positions:
+                removed.append(entry)
+            else:
+                kept.append(entry)
+        list.__setitem__(self, slice(None), kept)
+        return removed
 
     def archive_old_entries(self, max_age_seconds: float = 604800, min_weight: float = 0.1,
                            min_significance: float = 0.0) -> int:
@@ -556,9 +753,11 @@ class Memory(list, EpisodicMemoryInterface):
                 archived_count += 1
 
         # Bulk архивация
+        index_engine = self._ensure_index()
         for entry in entries_to_archive:
             if entry in self:
-                self.remove(entry)
+                list.remove(self, entry)
+                index_engine.remove_entry(entry)
 
         return archived_count
 
@@ -569,7 +768,9 @@ class Memory(list, EpisodicMemoryInterface):
         Batch операция для обслуживания памяти с разделением ответственности.
 
         Выполняет комплексное обслуживание памяти: decay weights, age adjustment и archive.
-        Каждая операция выполняется отдельно для лучшего разделения ответственности.
+        Затухание и отбор записей для архивации считаются одним проходом ядра
+        maintenance_pass по колонкам весов, времени и значимости; результат совпадает
+        с последовательными decay_weights() и archive_old_entries().
 
         Args:
             decay_factor: Коэффициент затухания весов
@@ -587,16 +788,35 @@ class Memory(list, EpisodicMemoryInterface):
             if not self:
                 return {"decayed_count": 0, "archived_count": 0, "total_processed": 0}
 
-            self._invalidate_cache()  # Инвалидируем кэш перед изменениями
+            import time
 
-            # 1. Применяем комплексный decay (включает age factors)
-            decayed_count = self.decay_weights(decay_factor, min_weight)
+            self._invalidate_cache()  # Инвалидируем кэш перед изменениями
 
-            # 2. Архивируем старые записи (отдельная операция)
-            archived_count = self.archive_old_entries(max_age_seconds, archive_min_weight, archive_min_significance)
+            # Затухание и отбор записей для архивации за один проход ядра
+            current_time = time.time()
+            result = self._maintenance_pass(
+                current_time,
+                decay_factor,
+                min_weight,
+                cutoff_time=current_time - max_age_seconds,
+                archive_min_weight=archive_min_weight,
+                archive_min_significance=archive_min_significance,
+            )
+            archived_count = len(result.archive_positions)
+            if archived_count > len(self) * BULK_ARCHIVE_REINDEX_RATIO:
+                # Массовая архивация: перестроить индекс дешевле, чем удалять записи по одной
+                self._apply_weights(result.weights, refresh_index=False)
+                self._remove_positions(result.archive_positions)
+                self._mark_index_stale()
+            else:
+                self._apply_weights(result.weights)
+                if archived_count:
+                    index_engine = self._ensure_index()
+                    for entry in self._remove_positions(result.archive_positions):
+                        index_engine.remove_entry(entry)
 
             return {
-                "decayed_count": decayed_count,
+                "decayed_count": result.min_weight_count,
                 "archived_count": archived_count,
                 "total_processed": len(self) + archived_count  # Учитываем удаленные записи
             }
@@ -0,0 +1,491 @@
+"""
+Incremental Log Analyzer - инкрементальный анализ структурированных логов Life.
+
+Функции log_analysis (analyze_logs, get_performance_metrics, get_error_summary)
+при каждом вызове читают и разбирают весь JSONL файл с начала; по мере роста
+лога анализ становится самой дорогой операцией runtime loop.
+
+IncrementalLogAnalyzer запоминает устройство/inode файла и смещение прочитанной
+части, при update() разбирает только дописанные строки и поддерживает текущие
+агрегаты: счетчики стадий и событий, гистограмму длительностей тиков, сводку
+ошибок и цепочки correlation_id. Незавершенная строка в конце файла (запись
+еще идет) откладывается до следующего update().
+
+Ротация: AsyncLogWriter переименовывает файл (structured_log.<ts>.jsonl) и
+начинает новый. При смене inode анализатор дочитывает хвост переименованного
+файла (ищет его среди соседних файлов по inode), затем читает новый файл с
+начала. Усечение файла (размер меньше смещения) - чтение с начала.
+
+Цепочки correlation_id хранятся, пока по ним приходят записи: цепочка, не
+обновлявшаяся chain_ttl секунд времени лога, закрывается и учитывается только
+в сводных агрегатах.
+
+Анализатор не потокобезопасен для конкурентных update(): ActiveRuntimeAnalysisEngine
+вызывает его из одного фонового потока.
+"""
+
+import json
+import logging
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHAIN_TTL = 300.0  # секунды времени лога
+DEFAULT_MAX_ACTIVE_CHAINS = 10000
+DEFAULT_MAX_PENDING_TICKS = 10000
+DEFAULT_MAX_BYTES_PER_UPDATE = 64 * 1024 * 1024
+DEFAULT_RECENT_ERRORS = 10
+DEFAULT_CHAIN_HISTORY = 10000
+
+# Стадии полной цепочки обработки (как в analyze_correlation_chains)
+CHAIN_STAGES = ("event", "meaning", "decision", "action", "feedback")
+COMPLETE_CHAIN_THRESHOLD = 0.8
+
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+class _Chain:
+    """Состояние открытой цепочки correlation_id."""
+
+    __slots__ = ("start", "end", "entry_count", "stages", "event_type", "last_seen")
+
+    def __init__(self, timestamp: float):
+        self.start = timestamp
+        self.end = timestamp
+        self.entry_count = 0
+        self.stages: Set[str] = set()
+        self.event_type = "unknown"
+        self.last_seen = timestamp
+
+    @property
+    def completeness(self) -> float:
+        return len(self.stages.intersection(CHAIN_STAGES)) / len(CHAIN_STAGES)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class IncrementalLogAnalyzer:
+    """
+    Инкрементальный анализатор JSONL лога StructuredLogger.
+
+    Результаты get_log_analysis(), get_performance_metrics() и
+    get_error_summary() имеют формат одноименных функций log_analysis.
+    Медиана и p95 длительности тика оцениваются по лог-линейной гистограмме
+    (погрешность не больше ~6%), остальные показатели точные.
+    """
+
+    def __init__(
+        self,
+        log_path: str = "data/structured_log.jsonl",
+        chain_ttl: float = DEFAULT_CHAIN_TTL,
+        max_active_chains: int = DEFAULT_MAX_ACTIVE_CHAINS,
+        max_pending_ticks: int = DEFAULT_MAX_PENDING_TICKS,
+        max_bytes_per_update: Optional[int] = DEFAULT_MAX_BYTES_PER_UPDATE,
+        recent_errors: int = DEFAULT_RECENT_ERRORS,
+    ):
+        """
+        Args:
+            log_path: Путь к файлу структурированных логов
+            chain_ttl: Время лога без новых записей, после которого цепочка закрывается (сек)
+            max_active_chains: Максимум открытых цепочек (старейшие закрываются)
+            max_pending_ticks: Максимум tick_start без парного tick_end
+            max_bytes_per_update: Максимум байт, читаемых за один update()
+                (None - до конца файла); большой лог дочитывается за несколько вызовов
+            recent_errors: Количество хранимых последних ошибок
+        """
+        from src.runtime.metrics_registry import Histogram
+
+        self.log_path = log_path
+        self.chain_ttl = chain_ttl
+        self.max_active_chains = max_active_chains
+        self.max_pending_ticks = max_pending_ticks
+        self.max_bytes_per_update = max_bytes_per_update
+        self.recent_errors_limit = recent_errors
+
+        # Позиция в файле: (st_dev, st_ino) и смещение начала непрочитанной строки
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+
+        self._histogram_class = Histogram
+        self._reset_aggregates()
+
+        self._stats = {
+            "updates": 0,
+            "bytes_read": 0,
+            "lines_parsed": 0,
+            "parse_errors": 0,
+            "rotations": 0,
+            "truncations": 0,
+        }
+
+    def _reset_aggregates(self) -> None:
+        self._total_entries = 0
+        self._stages: Counter[str] = Counter()
+        self._event_types: Counter[str] = Counter()
+        self._decision_patterns: Counter[str] = Counter()
+        self._error_count = 0
+        self._correlation_ids_seen = 0
+
+        self._tick_starts: Dict[Any, float] = {}
+        self._tick_durations = self._histogram_class("log.tick_duration")
+        self._slow_ticks_50ms = 0
+        self._slow_ticks_100ms = 0
+
+        self._error_types: Counter[str] = Counter()
+        self._recent_errors: Deque[Dict[str, Any]] = deque(maxlen=self.recent_errors_limit)
+
+        self._active_chains: Dict[Any, _Chain] = {}
+        self._latest_timestamp = 0.0
+        self._closed_chains = 0
+        self._closed_complete = 0
+        self._closed_completeness_sum = 0.0
+        self._closed_duration_count = 0
+        self._closed_duration_sum = 0.0
+        self._closed_duration_min = float("inf")
+        self._closed_duration_max = 0.0
+        self._closed_durations: Deque[float] = deque(maxlen=DEFAULT_CHAIN_HISTORY)
+
+    def reset(self) -> None:
+        """Сбрасывает агрегаты и позицию: следующий update() читает файл с начала."""
+        self._file_id = None
+        self._offset = 0
+        self._reset_aggregates()
+
+    # ------------------------------------------------------------------
+    # Чтение файла
+    # ------------------------------------------------------------------
+
+    def update(self) -> int:
+        """
+        Разбирает строки, дописанные с прошлого вызова.
+
+        Returns:
+            Количество разобранных записей
+        """
+        self._stats["updates"] += 1
+        path = Path(self.log_path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stat = None
+        except OSError as e:
+            logger.error(f"Ошибка чтения файла логов: {e}")
+            return 0
+
+        file_id = (stat.st_dev, stat.st_ino) if stat is not None else None
+        budget = self.max_bytes_per_update
+        parsed = 0
+
+        if self._file_id is not None and file_id != self._file_id:
+            # Файл ротирован: дочитываем хвост прежнего файла, если он найден
+            rotated = self._find_rotated_file(path)
+            if rotated is not None:
+                count, read_bytes, complete = self._read_from(rotated, budget)
+                parsed += count
+                if not complete:
+                    # Бюджет исчерпан - продолжим с прежнего файла в следующий раз
+                    self._after_update()
+                    return parsed
+                if budget is not None:
+                    budget = max(0, budget - read_bytes)
+            else:
+                logger.warning(f"Ротированный файл логов не найден, хвост пропущен: {path}")
+            self._stats["rotations"] += 1
+            self._file_id = None
+            self._offset = 0
+
+        if stat is None:
+            self._after_update()
+            return parsed
+
+        if self._file_id is None:
+            self._file_id = file_id
+            self._offset = 0
+        elif stat.st_size < self._offset:
+            self._stats["truncations"] += 1
+            self._offset = 0
+
+        if stat.st_size > self._offset and (budget is None or budget > 0):
+            count, _, _ = self._read_from(path, budget)
+            parsed += count
+
+        self._after_update()
+        return parsed
+
+    def _find_rotated_file(self, path: Path) -> Optional[Path]:
+        """Ищет переименованный файл с прежним inode среди соседних файлов."""
+        try:
+            candidates = list(path.parent.glob(f"{path.stem}*"))
+        except OSError:
+            return None
+        for candidate in candidates:
+            try:
+                stat = candidate.stat()
+            except OSError:
+                continue
+            if (stat.st_dev, stat.st_ino) == self._file_id:
+                return candidate
+        return None
+
+    def _read_from(self, path: Path, budget: Optional[int]) -> Tuple[int, int, bool]:
+        """
+        Читает и разбирает полные строки файла с текущего смещения.
+
+        Returns:
+            (разобрано записей, прочитано байт, прочитан ли файл до конца)
+        """
+        parsed = 0
+        read_bytes = 0
+        complete = False
+        try:
+            with open(path, "rb") as f:
+                f.seek(self._offset)
+                remainder = b""
+                while True:
+                    size = _READ_CHUNK_SIZE
+                    if budget is not None:
+                        size = min(size, budget - read_bytes)
+                        if size <= 0:
+                            break
+                    chunk = f.read(size)
+                    if not chunk:
+                        complete = True
+                        break
+                    read_bytes += len(chunk)
+                    data = remainder + chunk
+                    end = data.rfind(b"\n")
+                    if end < 0:
+                        remainder = data
+                        continue
+                    for line in data[: end + 1].splitlines():
+                        if self._process_line(line):
+                            parsed += 1
+                    self._offset += end + 1
+                    remainder = data[end + 1 :]
+                    if len(remainder) > _READ_CHUNK_SIZE * 16:
+                        # Строка без перевода длиннее 16 МБ - пропускаем ее
+                        self._offset += len(remainder)
+                        self._stats["parse_errors"] += 1
+                        remainder = b""
+        except OSError as e:
+            logger.error(f"Ошибка чтения файла логов: {e}")
+        self._stats["bytes_read"] += read_bytes
+        return parsed, read_bytes, complete
+
+    def _process_line(self, line: bytes) -> bool:
+        line = line.strip()
+        if not line:
+            return False
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            self._stats["parse_errors"] += 1
+            return False
+        if not isinstance(entry, dict):
+            self._stats["parse_errors"] += 1
+            return False
+        self._stats["lines_parsed"] += 1
+        self._process_entry(entry)
+        return True
+
+    # ------------------------------------------------------------------
+    # Агрегаты
+    # ------------------------------------------------------------------
+
+    def _process_entry(self, entry: Dict[str, Any]) -> None:
+        self._total_entries += 1
+        stage = entry.get("stage", "unknown")
+        if not isinstance(stage, str):
+            stage = str(stage)
+        self._stages[stage] += 1
+
+        timestamp = entry.get("timestamp")
+        if not isinstance(timestamp, (int, float)):
+            timestamp = None
+        elif timestamp > self._latest_timestamp:
+            self._latest_timestamp = timestamp
+
+        if stage == "event":
+            self._event_types[entry.get("event_type", "unknown")] += 1
+        elif stage == "decision" and isinstance(entry.get("data"), dict):
+            pattern = entry["data"].get("pattern")
+            if pattern:
+                self._decision_patterns[pattern] += 1
+        elif stage == "tick_start":
+            tick_number = entry.get("tick_number")
+            if tick_number is not None and timestamp is not None:
+                if len(self._tick_starts) >= self.max_pending_ticks:
+                    # Вытесняем старейший tick_start без пары
+                    del self._tick_starts[next(iter(self._tick_starts))]
+                self._tick_starts[tick_number] = timestamp
+        elif stage == "tick_end":
+            start = self._tick_starts.pop(entry.get("tick_number"), None)
+            if start is not None and timestamp is not None:
+                duration = timestamp - start
+                self._tick_durations.observe(duration)
+                if duration > 0.050:
+                    self._slow_ticks_50ms += 1
+                if duration > 0.100:
+                    self._slow_ticks_100ms += 1
+        elif stage.startswith("error_"):
+            self._error_count += 1
+            error_type = entry.get("error_type", "unknown")
+            self._error_types[error_type] += 1
+            self._recent_errors.append({
+                "timestamp": timestamp,
+                "stage": stage,
+                "error_type": error_type,
+                "error_message": entry.get("error_message", ""),
+                "correlation_id": entry.get("correlation_id"),
+            })
+
+        correlation_id = entry.get("correlation_id")
+        if correlation_id is not None and timestamp is not None:
+            self._update_chain(correlation_id, stage, timestamp, entry)
+
+    def _update_chain(
+        self, correlation_id: Any, stage: str, timestamp: float, entry: Dict[str, Any]
+    ) -> None:
+        chain = self._active_chains.get(correlation_id)
+        if chain is None:
+            if len(self._active_chains) >= self.max_active_chains:
+                oldest = next(iter(self._active_chains))
+                self._close_chain(self._active_chains.pop(oldest))
+            chain = _Chain(timestamp)
+            self._active_chains[correlation_id] = chain
+            self._correlation_ids_seen += 1
+        chain.entry_count += 1
+        chain.stages.add(stage)
+        if timestamp < chain.start:
+            chain.start = timestamp
+        if timestamp > chain.end:
+            chain.end = timestamp
+        chain.last_seen = max(chain.last_seen, timestamp)
+        if stage == "event" and chain.event_type == "unknown":
+            chain.event_type = entry.get("event_type", "unknown")
+
+    def _close_chain(self, chain: _Chain) -> None:
+        self._closed_chains += 1
+        completeness = chain.completeness
+        self._closed_completeness_sum += completeness
+        if completeness >= COMPLETE_CHAIN_THRESHOLD:
+            self._closed_complete += 1
+        duration = chain.duration
+        if duration > 0:
+            self._closed_duration_count += 1
+            self._closed_duration_sum += duration
+            self._closed_duration_min = min(self._closed_duration_min, duration)
+            self._closed_duration_max = max(self._closed_duration_max, duration)
+            self._closed_durations.append(duration)
+
+    def _after_update(self) -> None:
+        """Закрывает цепочки, не обновлявшиеся chain_ttl секунд времени лога."""
+        deadline = self._latest_timestamp - self.chain_ttl
+        expired = [cid for cid, chain in self._active_chains.items() if chain.last_seen < deadline]
+        for correlation_id in expired:
+            self._close_chain(self._active_chains.pop(correlation_id))
+
+    # ------------------------------------------------------------------
+    # Результаты
+    # ------------------------------------------------------------------
+
+    def get_log_analysis(self) -> Dict[str, Any]:
+        """Сводка лога в формате log_analysis.analyze_logs."""
+        return {
+            "total_entries": self._total_entries,
+            "stages": dict(self._stages),
+            "total_correlations": self._correlation_ids_seen,
+            "event_types": dict(self._event_types),
+            "decision_patterns": dict(self._decision_patterns),
+            "error_count": self._error_count,
+            "file_path": str(self.log_path),
+            "analysis_timestamp": self._latest_timestamp or None,
+        }
+
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """Метрики тиков в формате log_analysis.get_performance_metrics."""
+        summary = self._tick_durations.snapshot()
+        return {
+            "total_ticks": summary["count"],
+            "avg_tick_duration": summary["mean"],
+            "median_tick_duration": summary["p50"],
+            "min_tick_duration": summary["min"],
+            "max_tick_duration": summary["max"],
+            "p95_tick_duration": summary["p95"],
+            "slow_ticks_50ms": self._slow_ticks_50ms,
+            "slow_ticks_100ms": self._slow_ticks_100ms,
+        }
+
+    def get_error_summary(self) -> Dict[str, Any]:
+        """Сводка ошибок в формате log_analysis.get_error_summary (последние ошибки сверху)."""
+        recent_errors = sorted(
+            self._recent_errors, key=lambda error: error["timestamp"] or 0, reverse=True
+        )
+        return {
+            "total_errors": sum(self._error_types.values()),
+            "error_types": dict(self._error_types),
+            "recent_errors": recent_errors,
+        }
+
+    def get_correlation_summary(self) -> Dict[str, Any]:
+        """
+        Сводка цепочек в формате summary из log_analysis.analyze_correlation_chains.
+
+        Учитывает закрытые и открытые цепочки; медиана длительности считается
+        по последним закрытым и открытым цепочкам.
+        """
+        total = self._closed_chains + len(self._active_chains)
+        completeness_sum = self._closed_completeness_sum
+        complete = self._closed_complete
+        duration_count = self._closed_duration_count
+        duration_sum = self._closed_duration_sum
+        duration_min = self._closed_duration_min
+        duration_max = self._closed_duration_max
+        recent_durations: List[float] = list(self._closed_durations)
+
+        for chain in self._active_chains.values():
+            completeness = chain.completeness
+            completeness_sum += completeness
+            if completeness >= COMPLETE_CHAIN_THRESHOLD:
+                complete += 1
+            duration = chain.duration
+            if duration > 0:
+                duration_count += 1
+                duration_sum += duration
+                duration_min = min(duration_min, duration)
+                duration_max = max(duration_max, duration)
+                recent_durations.append(duration)
+
+        median = 0.0
+        if recent_durations:
+            recent_durations.sort()
+            middle = len(recent_durations) // 2
+            median = (
+                recent_durations[middle]
+                if len(recent_durations) % 2
+                else (recent_durations[middle - 1] + recent_durations[middle]) / 2
+            )
+        return {
+            "total_chains": total,
+            "active_chains": len(self._active_chains),
+            "avg_duration": duration_sum / duration_count if duration_count else 0,
+            "median_duration": median,
+            "min_duration": duration_min if duration_count else 0,
+            "max_duration": duration_max if duration_count else 0,
+            "avg_completeness": completeness_sum / total if total else 0,
+            "complete_chains": complete,
+            "incomplete_chains": total - complete,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика чтения: обновления, прочитанные байты, ротации, смещение."""
+        return {
+            **self._stats,
+            "offset": self._offset,
+            "active_chains": len(self._active_chains),
+            "pending_ticks": len(self._tick_starts),
+        }
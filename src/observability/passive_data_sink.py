@@ -3,10 +3,15 @@ Passive Data Sink - Компонент пассивного сбора данн
 
 Предоставляет интерфейс для сбора, хранения и доступа к данным наблюдений
 из различных источников системы Life.
+
+Запись на диск инкрементальная: receive_data только помещает наблюдение в
+ограниченную очередь незаписанных данных, а фоновый поток дописывает в файл
+пакеты новых наблюдений (по количеству или по интервалу времени).
 """
 
 import json
 import logging
+import threading
 import time
 from collections import deque
 from pathlib import Path
@@ -17,6 +22,9 @@ from .raw_data_access import ObservationData
 
 logger = logging.getLogger(__name__)
 
+# Ротация файла наблюдений (макс 100MB)
+MAX_OBSERVATIONS_FILE_SIZE = 100 * 1024 * 1024
+
 
 class PassiveDataSink:
     """
@@ -24,6 +32,11 @@ class PassiveDataSink:
 
     Собирает данные из различных источников, хранит их в памяти и на диске,
     предоставляет интерфейс для доступа к историческим данным.
+
+    На диск попадают только еще не записанные наблюдения: очередь _pending
+    играет роль курсора записи и ограничена max_pending (при переполнении
+    отбрасываются самые старые незаписанные наблюдения, что отражается в
+    статистике pending_dropped).
     """
 
     def __init__(
@@ -32,7 +45,10 @@ class PassiveDataSink:
         observations_file: str = "observations.jsonl",
         max_entries: int = 10000,
         enabled: bool = True,
-        auto_flush: bool = True
+        auto_flush: bool = True,
+        flush_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 50000
     ):
         """
         Инициализация PassiveDataSink.
@@ -42,13 +58,20 @@ class PassiveDataSink:
             observations_file: Имя файла для хранения наблюдений
             max_entries: Максимальное количество записей в памяти
             enabled: Включен ли сбор данных
-            auto_flush: Автоматическая запись на диск
+            auto_flush: Автоматическая запись на диск фоновым потоком
+            flush_batch_size: Количество незаписанных наблюдений, при котором
+                фоновый поток выполняет запись не дожидаясь интервала
+            flush_interval: Максимальный интервал между записями (секунды)
+            max_pending: Максимальный размер очереди незаписанных наблюдений
         """
         self.data_directory = Path(data_directory)
         self.observations_file = observations_file
         self.max_entries = max_entries
         self.enabled = enabled
         self.auto_flush = auto_flush
+        self.flush_batch_size = max(1, flush_batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
 
         # Создаем директорию если не существует
         self.data_directory.mkdir(parents=True, exist_ok=True)
@@ -56,15 +79,33 @@ class PassiveDataSink:
         # Буфер в памяти (без maxlen, чтобы не терять данные)
         self._buffer: deque[ObservationData] = deque()
 
+        # Наблюдения, еще не записанные на диск
+        self._pending: deque[ObservationData] = deque()
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Сериализует запись в файл
+        self._flush_requested = threading.Event()
+        self._stop_event = threading.Event()
+        self._writer_thread: Optional[threading.Thread] = None
+
         # Статистика
-        self._stats = {
+        self._stats: Dict[str, Any] = {
             "enabled": enabled,
             "total_entries": 0,
             "buffer_size": 0,
             "data_directory": str(data_directory),
-            "observations_file": observations_file
+            "observations_file": observations_file,
+            "pending_size": 0,
+            "max_pending": self.max_pending,
+            "pending_dropped": 0,
+            "entries_written": 0,
+            "batches_written": 0,
+            "flush_errors": 0,
+            "last_flush_duration_ms": 0.0,
         }
 
+        if self.enabled and self.auto_flush:
+            self._start_writer_thread()
+
         logger.info(f"PassiveDataSink initialized: {data_directory}/{observations_file}")
 
     def receive_data(
@@ -104,13 +145,21 @@ class PassiveDataSink:
         # Добавляем в буфер
         self._buffer.append(observation)
 
+        # Ставим в очередь на запись (O(1), без I/O на вызывающем потоке)
+        with self._pending_lock:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self._stats["pending_dropped"] += 1
+            self._pending.append(observation)
+            pending_size = len(self._pending)
+
         # Обновляем статистику
         self._stats["total_entries"] += 1
         self._stats["buffer_size"] = len(self._buffer)
 
-        # Автоматическая запись на диск если включено
-        if self.auto_flush:
-            self._flush_to_disk()
+        # Будим фоновый поток, если накопился полный пакет
+        if self.auto_flush and pending_size >= self.flush_batch_size:
+            self._flush_requested.set()
 
         return True
 
@@ -137,7 +186,13 @@ class PassiveDataSink:
         Returns:
             Словарь со статистикой
         """
-        return self._stats.copy()
+        with self._pending_lock:
+            self._stats["pending_size"] = len(self._pending)
+            stats = self._stats.copy()
+        stats["writer_thread_alive"] = (
+            self._writer_thread.is_alive() if self._writer_thread else False
+        )
+        return stats
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -169,28 +224,105 @@ class PassiveDataSink:
         self._stats["buffer_size"] = len(self._buffer)
         return removed_count
 
-    def _flush_to_disk(self) -> None:
+    def flush(self) -> int:
+        """
+        Синхронно записать на диск все незаписанные наблюдения.
+
+        Returns:
+            Количество записанных наблюдений
         """
-        Записать данные на диск с ротацией логов.
+        written = 0
+        while True:
+            batch_written = self._flush_to_disk()
+            if batch_written == 0:
+                return written
+            written += batch_written
+
+    def stop(self, timeout: float = 2.0) -> None:
         """
-        try:
-            file_path = self.data_directory / self.observations_file
+        Остановить фоновый поток записи и сбросить оставшиеся данные.
 
-            # Проверяем размер файла перед записью (макс 100MB)
-            max_file_size = 100 * 1024 * 1024  # 100MB
-            if file_path.exists() and file_path.stat().st_size > max_file_size:
-                # Ротируем файл
-                timestamp = int(time.time())
-                rotated_path = file_path.with_suffix(f".{timestamp}.jsonl")
-                file_path.rename(rotated_path)
-                logger.info(f"Rotated log file to {rotated_path}")
+        Args:
+            timeout: Максимальное время ожидания завершения потока (секунды)
+        """
+        self._stop_event.set()
+        self._flush_requested.set()
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._writer_thread.join(timeout=timeout)
+        self.flush()
+
+    def _start_writer_thread(self) -> None:
+        """Запустить фоновый поток записи."""
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="PassiveDataSinkWriter",
+            daemon=True
+        )
+        self._writer_thread.start()
+
+    def _writer_loop(self) -> None:
+        """Цикл фонового потока: запись по заполнению пакета или по интервалу."""
+        while not self._stop_event.is_set():
+            self._flush_requested.wait(timeout=self.flush_interval)
+            self._flush_requested.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error in PassiveDataSink writer loop: {e}")
+
+    def _flush_to_disk(self) -> int:
+        """
+        Записать на диск очередной пакет незаписанных наблюдений с ротацией файла.
 
-            with open(file_path, 'a', encoding='utf-8') as f:
-                # Записываем только последние записи из буфера
-                for observation in self._buffer:
-                    f.write(observation.to_json_line())
-        except Exception as e:
-            logger.error(f"Failed to flush data to disk: {e}")
+        Returns:
+            Количество записанных наблюдений
+        """
+        with self._write_lock:
+            with self._pending_lock:
+                batch_size = min(len(self._pending), self.flush_batch_size)
+                batch = [self._pending.popleft() for _ in range(batch_size)]
+
+            if not batch:
+                return 0
+
+            start = time.perf_counter()
+            try:
+                file_path = self.data_directory / self.observations_file
+
+                # Проверяем размер файла перед записью
+                if file_path.exists() and file_path.stat().st_size > MAX_OBSERVATIONS_FILE_SIZE:
+                    # Ротируем файл
+                    timestamp = int(time.time())
+                    rotated_path = file_path.with_suffix(f".{timestamp}.jsonl")
+                    file_path.rename(rotated_path)
+                    logger.info(f"Rotated log file to {rotated_path}")
+
+                lines = "".join(observation.to_json_line() for observation in batch)
+                with open(file_path, 'a', encoding='utf-8') as f:
+                    f.write(lines)
+            except Exception as e:
+                logger.error(f"Failed to flush data to disk: {e}")
+                self._stats["flush_errors"] += 1
+                self._requeue(batch)
+                return 0
+
+            self._stats["entries_written"] += len(batch)
+            self._stats["batches_written"] += 1
+            self._stats["last_flush_duration_ms"] = (time.perf_counter() - start) * 1000
+            return len(batch)
+
+    def _requeue(self, batch: List[ObservationData]) -> None:
+        """
+        Вернуть незаписанный пакет в начало очереди для повторной записи.
+
+        Порядок наблюдений сохраняется; сверх max_pending отбрасываются самые
+        старые, как и при приеме новых данных.
+        """
+        with self._pending_lock:
+            self._pending.extendleft(reversed(batch))
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self._stats["pending_dropped"] += 1
 
     def __len__(self) -> int:
         """Количество записей в буфере."""
@@ -11,7 +11,7 @@ import logging
 from typing import Dict, Any, Optional, Callable, List
 from collections import deque
 
-from .log_analysis import analyze_logs, get_performance_metrics, get_error_summary
+from .incremental_log_analyzer import IncrementalLogAnalyzer
 from .structured_logger import StructuredLogger
 
 logger = logging.getLogger(__name__)
@@ -47,6 +47,9 @@ class ActiveRuntimeAnalysisEngine:
     - Анализ трендов и аномалий
     - Интеграцию результатов анализа в принятие решений
 
+    Логи читаются инкрементально (IncrementalLogAnalyzer): каждый анализ
+    разбирает только строки, дописанные с прошлого анализа.
+
     Note: Переименован из RuntimeAnalysisEngine для отражения активной природы
     анализа без фоновых потоков.
     """
@@ -72,6 +75,10 @@ class ActiveRuntimeAnalysisEngine:
         self.analysis_interval = analysis_interval
         self.max_history_size = max_history_size
 
+        # Инкрементальный разбор лога: смещение, ротация и текущие агрегаты
+        self._log_analyzer = IncrementalLogAnalyzer(log_path)
+        self._log_analyzer_lock = threading.Lock()
+
         # История результатов анализа
         self._analysis_history: Dict[str, deque] = {
             'performance': deque(maxlen=max_history_size),
@@ -166,14 +173,21 @@ class ActiveRuntimeAnalysisEngine:
         """
         results = {}
 
-        if analysis_type in ("performance", "all"):
-            results["performance"] = self._analyze_performance()
+        with self._log_analyzer_lock:
+            # Дочитываем новые строки лога один раз для всех типов анализа
+            try:
+                self._log_analyzer.update()
+            except Exception as e:
+                logger.error(f"Error reading structured log: {e}")
+
+            if analysis_type in ("performance", "all"):
+                results["performance"] = self._analyze_performance()
 
-        if analysis_type in ("errors", "all"):
-            results["errors"] = self._analyze_errors()
+            if analysis_type in ("errors", "all"):
+                results["errors"] = self._analyze_errors()
 
-        if analysis_type in ("trends", "all"):
-            results["trends"] = self._analyze_trends()
+            if analysis_type in ("trends", "all"):
+                results["trends"] = self._analyze_trends()
 
         # Обновить текущие результаты
         with self._lock:
@@ -203,7 +217,7 @@ class ActiveRuntimeAnalysisEngine:
     def _analyze_performance(self) -> Dict[str, Any]:
         """Анализ производительности."""
         try:
-            metrics = get_performance_metrics(self.log_path)
+            metrics = self._log_analyzer.get_performance_metrics()
 
             # Дополнительные расчеты трендов
             history = self.get_analysis_history('performance', limit=10)
@@ -237,7 +251,7 @@ class ActiveRuntimeAnalysisEngine:
     def _analyze_errors(self) -> Dict[str, Any]:
         """Анализ ошибок."""
         try:
-            error_summary = get_error_summary(self.log_path)
+            error_summary = self._log_analyzer.get_error_summary()
 
             # Дополнительные расчеты трендов ошибок
             history = self.get_analysis_history('errors', limit=10)
@@ -274,7 +288,7 @@ class ActiveRuntimeAnalysisEngine:
         """Анализ трендов."""
         try:
             # Анализ основных логов
-            log_analysis = analyze_logs(self.log_path)
+            log_analysis = self._log_analyzer.get_log_analysis()
 
             # Вычисление трендов
             trends = {
@@ -283,6 +297,7 @@ class ActiveRuntimeAnalysisEngine:
                 'correlation_completeness': log_analysis.get('total_correlations', 0),
                 'event_diversity': len(log_analysis.get('event_types', {})),
                 'decision_consistency': len(log_analysis.get('decision_patterns', {})),
+                'chains': self._log_analyzer.get_correlation_summary(),
             }
 
             # Анализ трендов по истории
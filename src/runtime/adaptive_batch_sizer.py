@@ -7,11 +7,12 @@ AdaptiveBatchSizer - класс для динамического определ
 
 import logging
 import time
-import psutil
 from typing import Dict, List, Optional, Tuple, Any
 from collections import deque
 import statistics
 
+from src.runtime.system_load_sampler import SystemLoadSampler, get_system_load
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,13 +32,16 @@ class AdaptiveBatchSizer:
                  max_batch_size: int = 100,
                  default_batch_size: int = 25,
                  adaptation_interval: int = 50,  # тиков между адаптациями
-                 history_window: int = 20):  # размер окна истории для анализа
+                 history_window: int = 20,  # размер окна истории для анализа
+                 load_sampler: Optional[SystemLoadSampler] = None):  # источник нагрузки системы
 
         # Основные параметры
         self.min_batch_size = min_batch_size
         self.max_batch_size = max_batch_size
         self.default_batch_size = default_batch_size
         self.adaptation_interval = adaptation_interval
+        # None - глобальный SystemLoadSampler
+        self.load_sampler = load_sampler
 
         # История для анализа паттернов
         self.batch_performance_history = deque(maxlen=history_window)
@@ -46,6 +50,7 @@ class AdaptiveBatchSizer:
 
         # Текущие метрики
         self.current_batch_size = default_batch_size
+        self._last_load_timestamp = 0.0
         self.last_adaptation_tick = 0
         self.ticks_since_adaptation = 0
 
@@ -127,35 +132,22 @@ class AdaptiveBatchSizer:
 
     def _collect_system_metrics(self) -> Dict[str, Any]:
         """
-        Собирает метрики текущей нагрузки системы.
+        Возвращает метрики текущей нагрузки системы.
+
+        Метрики берутся из последнего снимка SystemLoadSampler без ожидания
+        замера; если поток сэмплера не запущен - неблокирующим замером.
 
         Returns:
             Dict с метриками системы
         """
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-
-            # Memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-
-            # System load (if available)
-            load_avg = None
-            try:
-                load_avg = psutil.getloadavg()
-            except (AttributeError, OSError):
-                # getloadavg not available on Windows
-                load_avg = (cpu_percent / 100.0, cpu_percent / 100.0, cpu_percent / 100.0)
-
-            metrics = {
-                'cpu_percent': cpu_percent,
-                'memory_percent': memory_percent,
-                'load_avg': load_avg,
-                'timestamp': time.time()
-            }
+            load = get_system_load(self.load_sampler)
+            metrics = load.to_dict()
 
-            self.system_load_history.append(metrics)
+            # В историю попадает каждый снимок один раз
+            if load.timestamp != self._last_load_timestamp:
+                self._last_load_timestamp = load.timestamp
+                self.system_load_history.append(metrics)
 
             return metrics
 
@@ -1,19 +1,213 @@
 """
 LRU кэш для вычислений runtime loop.
 Кэширует дорогостоящие вычисления для оптимизации производительности.
+
+Кэш разделен на пространства имен (subjective_dt, validation, memory_search,
+meaning_appraisal, decision). У каждого свои емкость, TTL, квант округления
+числовых аргументов и счетчики попаданий, промахов и вытеснений. Ключ - кортеж
+аргументов, в котором числа заменены номером кванта (floor(value / quantum)):
+без преобразования в строку и хэширования MD5.
 """
 
-import hashlib
 import logging
+import math
+import time
 from collections import OrderedDict
-from functools import lru_cache
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple, Union, cast
 
 from src.runtime.subjective_time import compute_subjective_dt
 from src.activation.activation import activate_memory as _activate_memory
+from src.memory.memory import Memory
 
 logger = logging.getLogger(__name__)
 
+# Значение-маркер промаха (None может быть закэшированным значением)
+_MISSING = object()
+
+# Квантуемые типы: int тоже, иначе int 50 и float 5e-05 дали бы один номер кванта
+_NUMBER_TYPES = (float, int)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Политика пространства имен кэша."""
+
+    capacity: Optional[int] = None  # Максимум записей (None - max_size кэша)
+    ttl: Optional[float] = None  # Время жизни записи в секундах (None - без ограничения)
+    quantum: Optional[float] = None  # Квант округления числовых аргументов (None - без округления)
+
+
+# Политики по умолчанию: кванты соответствуют прежнему округлению аргументов
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    "subjective_dt": CachePolicy(quantum=1e-6),
+    "validation": CachePolicy(),
+    "memory_search": CachePolicy(),
+    "meaning_appraisal": CachePolicy(quantum=1e-3),
+    "decision": CachePolicy(quantum=1e-3),
+}
+
+
+def _quantize(value: float, scale: float) -> Union[int, float]:
+    """Номер кванта числа; значения, для которых он не определен (inf, NaN), - как есть."""
+    try:
+        scaled = value * scale
+    except OverflowError:
+        # int за пределами диапазона float
+        return value
+    if math.isfinite(scaled):
+        return math.floor(scaled)
+    return value
+
+
+def _freeze(value: Any, scale: Optional[float]) -> Hashable:
+    """
+    Хэшируемое представление структурированных данных для ключа.
+
+    dict -> (dict, кортеж отсортированных пар), list/tuple -> кортеж, set -> frozenset;
+    числа квантуются. Прочие нехэшируемые значения представляются repr().
+    """
+    value_type = type(value)
+    if value_type in _NUMBER_TYPES:
+        return cast(Hashable, value) if scale is None else _quantize(value, scale)
+    if value_type is str or value_type is bool or value is None:
+        return cast(Hashable, value)
+    if isinstance(value, dict):
+        pairs = [(key, _freeze(item, scale)) for key, item in value.items()]
+        try:
+            # Ключи словаря уникальны, поэтому сравниваются только они
+            pairs.sort()
+        except TypeError:
+            # Ключи разных типов несравнимы
+            pairs.sort(key=repr)
+        # Метка типа отличает dict от списка пар
+        return dict, tuple(pairs)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item, scale) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item, scale) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return cast(Hashable, value)
+
+
+class CacheNamespace:
+    """
+    Пространство имен кэша: LRU-словарь с емкостью, TTL и счетчиками.
+    """
+
+    def __init__(self, name: str, capacity: int, ttl: Optional[float] = None,
+                 quantum: Optional[float] = None):
+        """
+        Args:
+            name: Имя пространства имен
+            capacity: Максимальное количество записей
+            ttl: Время жизни записи в секундах (None - без ограничения)
+            quantum: Квант округления числовых аргументов ключа (None - без округления)
+        """
+        if quantum is not None and quantum <= 0:
+            raise ValueError(f"quantum должен быть положительным: {quantum}")
+        self.name = name
+        self.capacity = capacity
+        self.ttl = ttl
+        self.quantum = quantum
+        self._scale = None if quantum is None else 1.0 / quantum
+        # Ключ -> значение; при заданном TTL - (значение, момент истечения)
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # Вытеснено при переполнении
+        self.expirations = 0  # Удалено по истечении TTL
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(self, *parts: Any) -> Tuple[Hashable, ...]:
+        """
+        Ключ из аргументов: числа заменяются номером кванта, остальное - как есть.
+
+        Args:
+            *parts: Хэшируемые аргументы вычисления
+
+        Returns:
+            Кортеж-ключ
+        """
+        scale = self._scale
+        if scale is None:
+            return parts
+        floor = math.floor
+        try:
+            return tuple(
+                [floor(part * scale) if type(part) in _NUMBER_TYPES else part for part in parts]
+            )
+        except (OverflowError, ValueError):
+            # inf/NaN (и переполнение при масштабировании) не квантуются
+            return tuple(
+                [_quantize(part, scale) if type(part) in _NUMBER_TYPES else part for part in parts]
+            )
+
+    def freeze(self, value: Any) -> Hashable:
+        """Хэшируемое представление структурированных данных (dict, list) для ключа."""
+        return _freeze(value, self._scale)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Значение по ключу (с отметкой использования) или default при промахе.
+        """
+        entries = self._entries
+        item = entries.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return default
+        if self.ttl is not None:
+            value, expires_at = item
+            if time.monotonic() >= expires_at:
+                del entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            item = value
+        entries.move_to_end(key)
+        self.hits += 1
+        return item
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Сохраняет значение, вытесняя давно не использованные записи при переполнении."""
+        entries = self._entries
+        if self.ttl is not None:
+            value = (value, time.monotonic() + self.ttl)
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Удаляет записи и сбрасывает счетчики."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Счетчики, размер и политика пространства имен."""
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / max(1, requests)) * 100,
+            "size": len(self._entries),
+            "efficiency": len(self._entries) / max(1, requests) * 100,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "capacity": self.capacity,
+            "ttl": self.ttl,
+            "quantum": self.quantum,
+        }
+
 
 class ComputationCache:
     """
@@ -23,63 +217,37 @@ class ComputationCache:
     - compute_subjective_dt с одинаковыми параметрами
     - Валидацию состояний
     - Результаты поиска в памяти
+    - Оценки Meaning Engine и решения Decision Engine
     """
 
-    def __init__(self, max_size: int = 1000):
+    def __init__(self, max_size: int = 1000, policies: Optional[Dict[str, CachePolicy]] = None):
         """
         Инициализация кэша вычислений.
 
         Args:
-            max_size: Максимальный размер кэша
+            max_size: Емкость пространства имен, если в политике она не задана
+            policies: Политики пространств имен поверх DEFAULT_POLICIES
         """
         self.max_size = max_size
-
-        # Кэш для compute_subjective_dt
-        self.subjective_dt_cache: OrderedDict[str, float] = OrderedDict()
-        self.subjective_dt_hits = 0
-        self.subjective_dt_misses = 0
-
-        # Кэш для валидации состояний
-        self.validation_cache: OrderedDict[str, bool] = OrderedDict()
-        self.validation_hits = 0
-        self.validation_misses = 0
-
-        # Кэш для поиска в памяти
-        self.memory_search_cache: OrderedDict[str, Any] = OrderedDict()
-        self.memory_search_hits = 0
-        self.memory_search_misses = 0
-
-        # Кэш для Meaning Engine appraisal
-        self.meaning_appraisal_cache: OrderedDict[str, Any] = OrderedDict()
-        self.meaning_appraisal_hits = 0
-        self.meaning_appraisal_misses = 0
-
-        # Кэш для Decision Engine
-        self.decision_cache: OrderedDict[str, Any] = OrderedDict()
-        self.decision_hits = 0
-        self.decision_misses = 0
-
-    def _make_cache_key(self, *args, **kwargs) -> str:
+        self.namespaces: Dict[str, CacheNamespace] = {}
+        for name, policy in {**DEFAULT_POLICIES, **(policies or {})}.items():
+            capacity = max_size if policy.capacity is None else policy.capacity
+            self.namespaces[name] = CacheNamespace(name, capacity, policy.ttl, policy.quantum)
+
+        self._subjective_dt = self.namespaces["subjective_dt"]
+        self._validation = self.namespaces["validation"]
+        self._memory_search = self.namespaces["memory_search"]
+        self._meaning_appraisal = self.namespaces["meaning_appraisal"]
+        self._decision = self.namespaces["decision"]
+
+    def namespace(self, name: str) -> CacheNamespace:
         """
-        Создает ключ кэша из аргументов.
+        Пространство имен кэша по имени.
 
-        Args:
-            *args: Позиционные аргументы
-            **kwargs: Именованные аргументы
-
-        Returns:
-            str: Хэшированный ключ кэша
+        Raises:
+            KeyError: Если пространство имен не существует
         """
-        # Сортируем kwargs для детерминированного хэширования
-        sorted_kwargs = sorted(kwargs.items())
-        cache_str = str(args) + str(sorted_kwargs)
-        return hashlib.md5(cache_str.encode()).hexdigest()
-
-    def _evict_if_needed(self, cache_dict: OrderedDict):
-        """Удаляет старые записи если кэш переполнен."""
-        if len(cache_dict) > self.max_size:
-            # Удаляем самый старый элемент (LRU)
-            cache_dict.popitem(last=False)
+        return self.namespaces[name]
 
     def get_cached_subjective_dt(self, dt: float, base_rate: float, intensity: float,
                                 stability: float, energy: float, intensity_coeff: float,
@@ -106,32 +274,11 @@ class ComputationCache:
         Returns:
             Optional[float]: Кэшированное значение или None
         """
-        # Округляем float значения для лучшего кэширования
-        rounded_args = (
-            round(dt, 6),
-            round(base_rate, 6),
-            round(intensity, 6),
-            round(stability, 6),
-            round(energy, 6),
-            round(intensity_coeff, 6),
-            round(stability_coeff, 6),
-            round(energy_coeff, 6),
-            round(rate_min, 6),
-            round(rate_max, 6),
-            round(circadian_phase, 6),
-            round(recovery_efficiency, 6)
-        )
-
-        cache_key = self._make_cache_key(*rounded_args)
-        if cache_key in self.subjective_dt_cache:
-            self.subjective_dt_hits += 1
-            # Перемещаем в конец (MRU)
-            value = self.subjective_dt_cache.pop(cache_key)
-            self.subjective_dt_cache[cache_key] = value
-            return value
-        else:
-            self.subjective_dt_misses += 1
-            return None
+        namespace = self._subjective_dt
+        return cast(Optional[float], namespace.get(namespace.make_key(
+            dt, base_rate, intensity, stability, energy, intensity_coeff, stability_coeff,
+            energy_coeff, rate_min, rate_max, circadian_phase, recovery_efficiency
+        )))
 
     def cache_subjective_dt(self, dt: float, base_rate: float, intensity: float,
                            stability: float, energy: float, intensity_coeff: float,
@@ -156,24 +303,11 @@ class ComputationCache:
             recovery_efficiency: Эффективность восстановления
             value: Значение для кэширования
         """
-        rounded_args = (
-            round(dt, 6),
-            round(base_rate, 6),
-            round(intensity, 6),
-            round(stability, 6),
-            round(energy, 6),
-            round(intensity_coeff, 6),
-            round(stability_coeff, 6),
-            round(energy_coeff, 6),
-            round(rate_min, 6),
-            round(rate_max, 6),
-            round(circadian_phase, 6),
-            round(recovery_efficiency, 6)
-        )
-
-        cache_key = self._make_cache_key(*rounded_args)
-        self.subjective_dt_cache[cache_key] = value
-        self._evict_if_needed(self.subjective_dt_cache)
+        namespace = self._subjective_dt
+        namespace.put(namespace.make_key(
+            dt, base_rate, intensity, stability, energy, intensity_coeff, stability_coeff,
+            energy_coeff, rate_min, rate_max, circadian_phase, recovery_efficiency
+        ), value)
 
     def get_cached_validation(self, validation_type: str, data: Any) -> Optional[bool]:
         """
@@ -186,16 +320,8 @@ class ComputationCache:
         Returns:
             Optional[bool]: Кэшированный результат или None
         """
-        cache_key = self._make_cache_key(validation_type, data)
-        if cache_key in self.validation_cache:
-            self.validation_hits += 1
-            # Перемещаем в конец (MRU)
-            value = self.validation_cache.pop(cache_key)
-            self.validation_cache[cache_key] = value
-            return value
-        else:
-            self.validation_misses += 1
-            return None
+        namespace = self._validation
+        return cast(Optional[bool], namespace.get((validation_type, namespace.freeze(data))))
 
     def cache_validation(self, validation_type: str, data: Any, result: bool) -> None:
         """
@@ -206,9 +332,8 @@ class ComputationCache:
             data: Данные для валидации
             result: Результат валидации
         """
-        cache_key = self._make_cache_key(validation_type, data)
-        self.validation_cache[cache_key] = result
-        self._evict_if_needed(self.validation_cache)
+        namespace = self._validation
+        namespace.put((validation_type, namespace.freeze(data)), result)
 
     def get_cached_memory_search(self, search_type: str, query_params: Dict[str, Any]) -> Optional[Any]:
         """
@@ -221,16 +346,8 @@ class ComputationCache:
         Returns:
             Optional[Any]: Кэшированный результат или None
         """
-        cache_key = self._make_cache_key(search_type, query_params)
-        if cache_key in self.memory_search_cache:
-            self.memory_search_hits += 1
-            # Перемещаем в конец (MRU)
-            value = self.memory_search_cache.pop(cache_key)
-            self.memory_search_cache[cache_key] = value
-            return value
-        else:
-            self.memory_search_misses += 1
-            return None
+        namespace = self._memory_search
+        return namespace.get((search_type, namespace.freeze(query_params)))
 
     def cache_memory_search(self, search_type: str, query_params: Dict[str, Any], result: Any) -> None:
         """
@@ -241,9 +358,22 @@ class ComputationCache:
             query_params: Параметры запроса
             result: Результат поиска
         """
-        cache_key = self._make_cache_key(search_type, query_params)
-        self.memory_search_cache[cache_key] = result
-        self._evict_if_needed(self.memory_search_cache)
+        namespace = self._memory_search
+        namespace.put((search_type, namespace.freeze(query_params)), result)
+
+    @staticmethod
+    def _activate_memory_key(event_type: str, memory_size: int, subjective_time: float,
+                             age: float, limit: Optional[int]) -> Tuple[Hashable, ...]:
+        # Группируем параметры для более эффективного кэширования
+        # Округляем до ближайших 10 для memory_size, 100 для времени
+        return (
+            "activate_memory",
+            event_type,
+            (memory_size // 10) * 10,  # Группа размеров памяти
+            (int(subjective_time) // 100) * 100,  # Группа времени
+            (int(age) // 100) * 100,  # Группа возраста
+            limit,
+        )
 
     def get_cached_activate_memory(self, event_type: str, memory_size: int,
                                   subjective_time: float, age: float,
@@ -267,31 +397,10 @@ class ComputationCache:
         Returns:
             Optional[Any]: Кэшированный результат или None
         """
-        # Группируем параметры для более эффективного кэширования
-        # Округляем до ближайших 10 для memory_size, 100 для времени
-        memory_size_group = (memory_size // 10) * 10
-        time_group = (int(subjective_time) // 100) * 100
-        age_group = (int(age) // 100) * 100
-
-        rounded_args = (
-            event_type,
-            memory_size_group,  # Группа размеров памяти
-            time_group,         # Группа времени
-            age_group,          # Группа возраста
-            limit
+        return self._memory_search.get(
+            self._activate_memory_key(event_type, memory_size, subjective_time, age, limit)
         )
 
-        cache_key = self._make_cache_key("activate_memory", rounded_args)
-        if cache_key in self.memory_search_cache:
-            self.memory_search_hits += 1
-            # Перемещаем в конец (MRU)
-            value = self.memory_search_cache.pop(cache_key)
-            self.memory_search_cache[cache_key] = value
-            return value
-        else:
-            self.memory_search_misses += 1
-            return None
-
     def cache_activate_memory(self, event_type: str, memory_size: int,
                              subjective_time: float, age: float,
                              limit: Optional[int], result: Any) -> None:
@@ -308,23 +417,11 @@ class ComputationCache:
             limit: Лимит активации
             result: Результат для кэширования
         """
-        # Группируем параметры для более эффективного кэширования
-        memory_size_group = (memory_size // 10) * 10
-        time_group = (int(subjective_time) // 100) * 100
-        age_group = (int(age) // 100) * 100
-
-        rounded_args = (
-            event_type,
-            memory_size_group,
-            time_group,
-            age_group,
-            limit
+        self._memory_search.put(
+            self._activate_memory_key(event_type, memory_size, subjective_time, age, limit),
+            result,
         )
 
-        cache_key = self._make_cache_key("activate_memory", rounded_args)
-        self.memory_search_cache[cache_key] = result
-        self._evict_if_needed(self.memory_search_cache)
-
     def get_cached_meaning_appraisal(self, event_type: str, intensity: float,
                                     state_energy: float, state_stability: float,
                                     state_integrity: float) -> Optional[Any]:
@@ -341,25 +438,10 @@ class ComputationCache:
         Returns:
             Optional[Any]: Кэшированный результат или None
         """
-        # Округляем значения для лучшего кэширования
-        rounded_args = (
-            event_type,
-            round(intensity, 3),
-            round(state_energy, 3),
-            round(state_stability, 3),
-            round(state_integrity, 3)
-        )
-
-        cache_key = self._make_cache_key("meaning_appraisal", rounded_args)
-        if cache_key in self.meaning_appraisal_cache:
-            self.meaning_appraisal_hits += 1
-            # Перемещаем в конец (MRU)
-            value = self.meaning_appraisal_cache.pop(cache_key)
-            self.meaning_appraisal_cache[cache_key] = value
-            return value
-        else:
-            self.meaning_appraisal_misses += 1
-            return None
+        namespace = self._meaning_appraisal
+        return namespace.get(namespace.make_key(
+            event_type, intensity, state_energy, state_stability, state_integrity
+        ))
 
     def cache_meaning_appraisal(self, event_type: str, intensity: float,
                                state_energy: float, state_stability: float,
@@ -375,17 +457,10 @@ class ComputationCache:
             state_integrity: Целостность состояния
             result: Результат для кэширования
         """
-        rounded_args = (
-            event_type,
-            round(intensity, 3),
-            round(state_energy, 3),
-            round(state_stability, 3),
-            round(state_integrity, 3)
-        )
-
-        cache_key = self._make_cache_key("meaning_appraisal", rounded_args)
-        self.meaning_appraisal_cache[cache_key] = result
-        self._evict_if_needed(self.meaning_appraisal_cache)
+        namespace = self._meaning_appraisal
+        namespace.put(namespace.make_key(
+            event_type, intensity, state_energy, state_stability, state_integrity
+        ), result)
 
     def get_cached_decision(self, activated_memory_count: int, top_significance: float,
                            event_type: str, current_energy: float, current_stability: float) -> Optional[Any]:
@@ -402,24 +477,11 @@ class ComputationCache:
         Returns:
             Optional[Any]: Кэшированное решение или None
         """
-        rounded_args = (
-            activated_memory_count,
-            round(top_significance, 3),
-            event_type,
-            round(current_energy, 3),
-            round(current_stability, 3)
-        )
-
-        cache_key = self._make_cache_key("decision", rounded_args)
-        if cache_key in self.decision_cache:
-            self.decision_hits += 1
-            # Перемещаем в конец (MRU)
-            value = self.decision_cache.pop(cache_key)
-            self.decision_cache[cache_key] = value
-            return value
-        else:
-            self.decision_misses += 1
-            return None
+        namespace = self._decision
+        return namespace.get(namespace.make_key(
+            activated_memory_count, top_significance, event_type, current_energy,
+            current_stability
+        ))
 
     def cache_decision(self, activated_memory_count: int, top_significance: float,
                       event_type: str, current_energy: float, current_stability: float,
@@ -435,85 +497,27 @@ class ComputationCache:
             current_stability: Текущая стабильность
             result: Результат для кэширования
         """
-        rounded_args = (
-            activated_memory_count,
-            round(top_significance, 3),
-            event_type,
-            round(current_energy, 3),
-            round(current_stability, 3)
-        )
+        namespace = self._decision
+        namespace.put(namespace.make_key(
+            activated_memory_count, top_significance, event_type, current_energy,
+            current_stability
+        ), result)
 
-        cache_key = self._make_cache_key("decision", rounded_args)
-        self.decision_cache[cache_key] = result
-        self._evict_if_needed(self.decision_cache)
-
-    def get_stats(self) -> Dict[str, Dict[str, float]]:
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
         """
         Получает статистику использования кэша.
 
         Returns:
-            Dict[str, Dict[str, float]]: Статистика по типам кэша с hit rate в процентах
+            Dict[str, Dict[str, Any]]: Статистика по пространствам имен: hits, misses,
+            hit_rate (в процентах), size, efficiency, evictions, expirations и политика
+            (capacity, ttl, quantum)
         """
-        total_subjective_requests = self.subjective_dt_hits + self.subjective_dt_misses
-        total_validation_requests = self.validation_hits + self.validation_misses
-        total_memory_requests = self.memory_search_hits + self.memory_search_misses
-        total_meaning_requests = self.meaning_appraisal_hits + self.meaning_appraisal_misses
-        total_decision_requests = self.decision_hits + self.decision_misses
+        return {name: namespace.get_stats() for name, namespace in self.namespaces.items()}
 
-        return {
-            "subjective_dt": {
-                "hits": self.subjective_dt_hits,
-                "misses": self.subjective_dt_misses,
-                "hit_rate": (self.subjective_dt_hits / max(1, total_subjective_requests)) * 100,
-                "size": len(self.subjective_dt_cache),
-                "efficiency": len(self.subjective_dt_cache) / max(1, total_subjective_requests) * 100
-            },
-            "validation": {
-                "hits": self.validation_hits,
-                "misses": self.validation_misses,
-                "hit_rate": (self.validation_hits / max(1, total_validation_requests)) * 100,
-                "size": len(self.validation_cache),
-                "efficiency": len(self.validation_cache) / max(1, total_validation_requests) * 100
-            },
-            "memory_search": {
-                "hits": self.memory_search_hits,
-                "misses": self.memory_search_misses,
-                "hit_rate": (self.memory_search_hits / max(1, total_memory_requests)) * 100,
-                "size": len(self.memory_search_cache),
-                "efficiency": len(self.memory_search_cache) / max(1, total_memory_requests) * 100
-            },
-            "meaning_appraisal": {
-                "hits": self.meaning_appraisal_hits,
-                "misses": self.meaning_appraisal_misses,
-                "hit_rate": (self.meaning_appraisal_hits / max(1, total_meaning_requests)) * 100,
-                "size": len(self.meaning_appraisal_cache),
-                "efficiency": len(self.meaning_appraisal_cache) / max(1, total_meaning_requests) * 100
-            },
-            "decision": {
-                "hits": self.decision_hits,
-                "misses": self.decision_misses,
-                "hit_rate": (self.decision_hits / max(1, total_decision_requests)) * 100,
-                "size": len(self.decision_cache),
-                "efficiency": len(self.decision_cache) / max(1, total_decision_requests) * 100
-            }
-        }
-
-    def clear(self):
+    def clear(self) -> None:
         """Очищает все кэши."""
-        self.subjective_dt_cache.clear()
-        self.validation_cache.clear()
-        self.memory_search_cache.clear()
-        self.subjective_dt_hits = 0
-        self.subjective_dt_misses = 0
-        self.validation_hits = 0
-        self.validation_misses = 0
-        self.memory_search_hits = 0
-        self.memory_search_misses = 0
-        self.meaning_appraisal_hits = 0
-        self.meaning_appraisal_misses = 0
-        self.decision_hits = 0
-        self.decision_misses = 0
-
+        for namespace in self.namespaces.values():
+            namespace.clear()
 
 # Глобальный экземпляр кэша
 _computation_cache = None
@@ -579,6 +583,11 @@ def cached_activate_memory(current_event_type: str, memory: Any, limit: Optional
     Returns:
         List[MemoryEntry]: Активированные записи памяти
     """
+    # Memory отвечает из индекса по типу события за O(limit) - кэш не нужен
+    # и только возвращал бы устаревший результат при неизменном размере памяти
+    if isinstance(memory, Memory):
+        return _activate_memory(current_event_type, memory, limit, self_state)
+
     cache = get_computation_cache()
 
     # Подготавливаем параметры для кэширования
@@ -601,4 +610,4 @@ def cached_activate_memory(current_event_type: str, memory: Any, limit: Optional
         current_event_type, memory_size, subjective_time, age, limit, result
     )
 
-    return result
\ No newline at end of file
+    return result
\ No newline at end of file
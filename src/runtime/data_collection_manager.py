@@ -12,6 +12,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from src.runtime.async_data_queue import AsyncDataQueue, DataOperation, DataOperationType
+from src.runtime.system_load_sampler import SystemLoadSampler, get_system_load
 
 logger = logging.getLogger(__name__)
 
@@ -85,14 +86,20 @@ class DataCollectionManager:
     и выполняет запись через асинхронную очередь.
     """
 
-    def __init__(self, config: Optional[DataCollectionConfig] = None):
+    def __init__(
+        self,
+        config: Optional[DataCollectionConfig] = None,
+        load_sampler: Optional[SystemLoadSampler] = None,
+    ):
         """
         Инициализация менеджера сбора данных.
 
         Args:
             config: Конфигурация менеджера
+            load_sampler: Источник нагрузки системы (None - глобальный SystemLoadSampler)
         """
         self.config = config or DataCollectionConfig()
+        self._load_sampler = load_sampler
 
         # Асинхронная очередь операций
         self._queue = AsyncDataQueue(
@@ -363,6 +370,15 @@ class DataCollectionManager:
 
         return success
 
+    def get_system_load(self) -> Dict[str, Any]:
+        """
+        Получить последний снимок нагрузки системы (CPU, память, loadavg).
+
+        Returns:
+            Словарь метрик SystemLoad.to_dict()
+        """
+        return get_system_load(self._load_sampler).to_dict()
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Получить статистику менеджера.
@@ -382,6 +398,7 @@ class DataCollectionManager:
                 "should_flush": buffer.should_flush(),
             }
         stats["buffers"] = buffer_info
+        stats["system_load"] = self.get_system_load()
 
         return stats
 
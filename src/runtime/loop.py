@@ -1,6 +1,8 @@
 import copy
 import cProfile
+import functools
 import logging
+import threading
 import time
 from typing import Dict, Any
 
@@ -17,17 +19,24 @@ from src.config import feature_flags
 from src.feedback import observe_consequences, register_action
 from src.intelligence.intelligence import process_information
 from src.learning.learning import LearningEngine
-from src.meaning.engine import MeaningEngine
+from src.meaning.engine import MeaningEngine, MeaningStateView
 from src.memory.memory import MemoryEntry
 from src.planning.planning import record_potential_sequences
 from src.runtime.log_manager import FlushPolicy, LogManager
 from src.runtime.snapshot_manager import SnapshotManager
+from src.runtime.status_publisher import get_status_publisher
 from src.runtime.subjective_time import compute_subjective_dt
 from src.runtime.computation_cache import cached_compute_subjective_dt, cached_activate_memory, get_computation_cache
 from src.runtime.data_collection_manager import DataCollectionManager
 from src.runtime.adaptive_batch_sizer import AdaptiveBatchSizer
+from src.runtime.system_load_sampler import SystemLoadSampler
+from src.runtime.tick_scheduler import DEFAULT_TICK_BUDGET_FRACTION, TickScheduler
 from src.runtime.performance_monitor import performance_monitor
-from src.state.self_state import SelfState, save_snapshot
+from src.runtime.metrics_registry import get_metrics_registry
+from src.runtime.sampling_profiler import DEFAULT_SAMPLING_INTERVAL, get_sampling_profiler
+from src.runtime.runtime_metrics import register_runtime_metrics, unregister_runtime_metrics
+from src.state.self_state import SelfState, save_delta_snapshot, save_snapshot
+from src.state.snapshot_catalog import RetentionPolicy
 from src.contracts.contract_manager import contract_manager
 from src.monitor.semantic_monitor import SemanticMonitor
 from src.observability.semantic_analysis_engine import SemanticAnalysisEngine
@@ -63,6 +72,23 @@ IMPACT_REDUCTION_COEFFICIENT = 0.5
 # Константы для батчинга обработки событий
 EVENT_BATCH_SIZE = 25  # Размер батча для обработки событий (оптимально 10-50)
 
+# Бюджеты фаз тика (доли tick_interval) для TickScheduler
+TICK_PHASE_BUDGETS = {
+    "state_update": 0.05,
+    "metrics": 0.05,
+    "adaptive_processing": 0.05,
+    "feedback": 0.05,
+    "events": 0.3,
+    "memory_echo": 0.05,
+    "learning": 0.1,
+    "maintenance": 0.1,
+    "consolidation": 0.1,
+    "adaptation": 0.1,
+    "monitor": 0.05,
+    "snapshot": 0.1,
+    "publish": 0.02,
+}
+
 
 def _get_default_learning_params() -> dict:
     """
@@ -285,6 +311,13 @@ def _process_events_batch(events_batch, self_state, engine, structured_logger, p
             metadata={"external": True, "batch_processing": True}
         )
 
+    # Представление состояния для MeaningEngine создается один раз на батч
+    # и читает актуальные значения SelfState при каждом событии
+    state_view = MeaningStateView(self_state)
+    # Не зависящая от состояния часть оценки считается сразу для всего батча;
+    # контекст состояния применяется при получении Meaning каждого события
+    batch_meanings = engine.process_batch(events_batch, state_view)
+
     # Batch обработка событий
     for event_index, event in enumerate(events_batch):
         correlation_id = correlation_ids[event_index] if event_index < len(correlation_ids) else None
@@ -292,10 +325,7 @@ def _process_events_batch(events_batch, self_state, engine, structured_logger, p
         logger.debug(
             f"[LOOP] Interpreting event: type={event.type}, intensity={event.intensity}"
         )
-        meaning = engine.process(
-            event,
-            self_state.get_safe_status_dict(include_optional=False),
-        )
+        meaning = batch_meanings.meaning(event_index)
 
         # Log meaning
         if correlation_id:
@@ -427,7 +457,13 @@ def run_loop(
     log_flush_period_ticks=10,
     enable_profiling=False,
     structured_logger=None,  # StructuredLogger для активного логирования ключевых этапов
-    semantic_monitor=None  # SemanticMonitor для пассивного семантического мониторинга
+    semantic_monitor=None,  # SemanticMonitor для пассивного семантического мониторинга
+    snapshot_full_every=1,
+    async_snapshots=False,
+    load_sample_period=1.0,
+    tick_budget_fraction=DEFAULT_TICK_BUDGET_FRACTION,
+    enable_sampling_profiler=False,
+    sampling_interval=DEFAULT_SAMPLING_INTERVAL,
 ):
     """
     Runtime Loop с интеграцией Environment (этап 07)
@@ -450,6 +486,17 @@ def run_loop(
         enable_silence_detection: Включить систему осознания тишины
         log_flush_period_ticks: Период сброса логов в тиках
         enable_profiling: Включить профилирование runtime loop с cProfile
+        snapshot_full_every: Периодичность полных snapshot; при значении > 1 между ними
+            сохраняются дельты (save_delta_snapshot)
+        async_snapshots: Сериализовать и записывать snapshot в фоновом потоке
+            (на потоке тика выполняется только захват копии состояния); по умолчанию
+            snapshot записываются синхронно на потоке тика
+        load_sample_period: Период фонового замера нагрузки системы (сек)
+        tick_budget_fraction: Доля tick_interval, доступная фазам тика; некритичные
+            периодические задачи откладываются на тики со свободным бюджетом
+        enable_sampling_profiler: Запустить сэмплирующий профилировщик потока цикла
+            (включается и выключается во время работы через API /profile)
+        sampling_interval: Интервал замеров сэмплирующего профилировщика (сек)
     """
     # Активный мониторинг: система Life требует активного вмешательства в runtime для observability
     # Это НЕ пассивное наблюдение, а активный мониторинг с интеграцией в каждый тик
@@ -698,7 +745,17 @@ def run_loop(
 
 
     # Менеджеры для управления снапшотами, логами и политикой
-    snapshot_manager = SnapshotManager(period_ticks=snapshot_period, saver=save_snapshot)
+    if snapshot_full_every > 1:
+        snapshot_saver = functools.partial(save_delta_snapshot, full_every=snapshot_full_every)
+    else:
+        snapshot_saver = save_snapshot
+    snapshot_manager = SnapshotManager(
+        period_ticks=snapshot_period,
+        saver=snapshot_saver,
+        retention_policy=RetentionPolicy(),
+        async_write=async_snapshots,
+    )
+    status_publisher = get_status_publisher()  # Канал живого состояния для API
     flush_policy = FlushPolicy(
         flush_period_ticks=log_flush_period_ticks,
         flush_before_snapshot=True,
@@ -710,7 +767,10 @@ def run_loop(
         flush_fn=self_state._flush_log_buffer,
     )
     # Логика слабости теперь встроена напрямую (упрощение)
-    data_collection_manager = DataCollectionManager()  # Менеджер сбора данных
+    # Нагрузка системы замеряется в фоновом потоке, тик читает готовый снимок
+    load_sampler = SystemLoadSampler(period=load_sample_period)
+    load_sampler.start()
+    data_collection_manager = DataCollectionManager(load_sampler=load_sampler)  # Менеджер сбора данных
     data_collection_manager.start()  # Запускаем менеджер сбора данных
 
     # Инициализация кэша вычислений для оптимизации производительности
@@ -723,7 +783,42 @@ def run_loop(
         max_batch_size=100,
         default_batch_size=EVENT_BATCH_SIZE,
         adaptation_interval=50,  # адаптация каждые 50 тиков
-        history_window=20
+        history_window=20,
+        load_sampler=load_sampler,
+    )
+
+    # Планировщик тика: дедлайны, бюджеты фаз, разнесенные и отложенные периодические задачи
+    metrics_registry = get_metrics_registry()
+    tick_scheduler = TickScheduler(
+        tick_interval=tick_interval, tick_budget_fraction=tick_budget_fraction, registry=metrics_registry
+    )
+    for phase_name, budget_fraction in TICK_PHASE_BUDGETS.items():
+        tick_scheduler.set_phase_budget(phase_name, tick_interval * budget_fraction)
+    # Порядок регистрации задает приоритет при выборе смещений
+    tick_scheduler.register("learning", LEARNING_INTERVAL, budget=tick_interval * TICK_PHASE_BUDGETS["learning"])
+    tick_scheduler.register("adaptation", ADAPTATION_INTERVAL, budget=tick_interval * TICK_PHASE_BUDGETS["adaptation"])
+    tick_scheduler.register(
+        "consolidation", MEMORY_CONSOLIDATION_INTERVAL, budget=tick_interval * TICK_PHASE_BUDGETS["consolidation"]
+    )
+    tick_scheduler.register("metrics", METRICS_COLLECTION_INTERVAL, budget=tick_interval * TICK_PHASE_BUDGETS["metrics"])
+    # Обслуживание памяти запускается по накопленным счетчикам (admit), смещение не используется
+    tick_scheduler.register(
+        "maintenance", MEMORY_DECAY_LAZY_THRESHOLD, budget=tick_interval * TICK_PHASE_BUDGETS["maintenance"], offset=0
+    )
+
+    # Метрики компонентов для /metrics и /performance: читаются из их статистики
+    # в потоке API при опросе, поток тика в сборе не участвует
+    runtime_metric_refs = register_runtime_metrics(
+        metrics_registry,
+        self_state=self_state,
+        tick_scheduler=tick_scheduler,
+        event_queue=event_queue,
+        computation_cache=computation_cache,
+        snapshot_manager=snapshot_manager,
+        async_data_queue=async_data_queue,
+        passive_data_sink=passive_data_sink,
+        structured_logger=structured_logger,
+        data_collection_manager=data_collection_manager,
     )
 
     # Счетчики ошибок для отслеживания проблем
@@ -798,6 +893,7 @@ def run_loop(
             try:
                 tick_start_time = time.time()
                 current_time = tick_start_time
+                tick_scheduler.begin_tick()
 
                 # Безопасный расчет dt с обработкой первого тика
                 if 'last_time' not in locals() or last_time is None:
@@ -889,7 +985,7 @@ def run_loop(
                                 }
                             }
                             # Добавляем в очередь событий
-                            event_queue.put_nowait(clarity_event)
+                            event_queue.push(clarity_event, internal=True)
 
                             # Записываем в историю моментов ясности
                             clarity_record = {
@@ -912,9 +1008,15 @@ def run_loop(
                 if clarity_moments:
                     clarity_moments.update_clarity_state(self_state)
 
+                tick_scheduler.end_phase("state_update")
+
                 # Технический мониторинг: сбор метрик через регулярные интервалы (асинхронно)
+                # Откладывается планировщиком на тик со свободным бюджетом
                 ticks_since_last_metrics_collection += 1
-                if ticks_since_last_metrics_collection >= METRICS_COLLECTION_INTERVAL:
+                if (
+                    ticks_since_last_metrics_collection >= METRICS_COLLECTION_INTERVAL
+                    and tick_scheduler.admit("metrics", self_state.ticks)
+                ):
                     try:
                         # Ставим операцию сбора метрик в асинхронную очередь
                         success = data_collection_manager.collect_technical_metrics(
@@ -939,7 +1041,9 @@ def run_loop(
                             decide_response_metrics = decision_metrics.get("DecisionEngine.decide_response", {})
                             if decide_response_metrics.get("avg_time", 0) > 0.01:  # > 10ms
                                 logger.warning(
-                                    ".3f"
+                                    f"DecisionEngine.decide_response is slow: "
+                                    f"avg={decide_response_metrics['avg_time'] * 1000:.1f}ms, "
+                                    f"p99={decide_response_metrics['p99_time'] * 1000:.1f}ms, "
                                     f"calls={decide_response_metrics.get('total_calls', 0)}"
                                 )
                         else:
@@ -955,17 +1059,22 @@ def run_loop(
                                   f"memory_search(hit_rate={cache_stats['memory_search']['hit_rate']:.1f}%, "
                                   f"size={cache_stats['memory_search']['size']})")
 
-                        # Запускаем анализ логов для получения рекомендаций (активный анализ по запросу)
-                        try:
-                            analysis_engine.perform_analysis()
-                            logger.debug("Active runtime analysis completed")
-                        except Exception as e:
-                            logger.warning(f"Failed to run active runtime analysis: {e}")
+                        # Статистика планировщика тика: перцентили и перерасход бюджетов фаз
+                        logger.info(f"[SCHEDULER] {tick_scheduler.format_summary()}")
+
+                        # Перцентили измеряемых операций из реестра метрик
+                        logger.info(f"[METRICS] {metrics_registry.format_summary()}")
+
+                        # Запускаем анализ логов для получения рекомендаций в фоновом потоке
+                        # (анализ читает только логи и не обращается к SelfState)
+                        if not tick_scheduler.run_in_background("analysis", analysis_engine.perform_analysis):
+                            logger.debug("Active runtime analysis is still running, skipped")
 
                     except Exception as e:
                         logger.warning(f"Failed to queue technical metrics collection: {e}")
                     finally:
                         ticks_since_last_metrics_collection = 0
+                        tick_scheduler.end_phase("metrics")
 
                 # Async passive observation: данные собираются в фоне без влияния на runtime
 
@@ -1007,6 +1116,7 @@ def run_loop(
                     except Exception as e:
                         logger.warning(f"Adaptive processing update failed: {e}")
                         # Продолжаем работу даже при ошибке в экспериментальном компоненте
+                tick_scheduler.end_phase("adaptive_processing")
 
                 # Наблюдаем последствия прошлых действий (Feedback)
                 feedback_records = observe_consequences(self_state, pending_actions, event_queue)
@@ -1033,6 +1143,7 @@ def run_loop(
                         },
                     )
                     self_state.memory.append(feedback_entry)
+                tick_scheduler.end_phase("feedback")
 
                 # === ШАГ 1: Получить события из среды ===
                 if event_queue and not event_queue.is_empty():
@@ -1156,6 +1267,8 @@ def run_loop(
                     record_potential_sequences(self_state)
                     process_information(self_state)
 
+                tick_scheduler.end_phase("events")
+
                 # === ШАГ 1.5: Генерация внутренних событий (Memory Echoes) ===
                 # Генерируем спонтанные внутренние события после обработки внешних
                 memory_stats = (
@@ -1176,7 +1289,7 @@ def run_loop(
                         logger.debug(f"[LOOP] Generated internal event: {internal_event.type}")
                         # Добавляем внутреннее событие в очередь для обработки на следующем тике
                         if event_queue:
-                            event_queue.push(internal_event)
+                            event_queue.push(internal_event, internal=True)
                             ticks_since_last_memory_echo = 0
                             # Логируем внутреннее событие
                             correlation_id = structured_logger.log_event(internal_event)
@@ -1205,14 +1318,13 @@ def run_loop(
                     # No events this tick -> gradually decay intensity signal using smoothing
                     alpha = self_state.subjective_time_intensity_smoothing
                     self_state.last_event_intensity = (1 - alpha) * self_state.last_event_intensity
+                tick_scheduler.end_phase("memory_echo")
 
                 # Learning (Этап 14) - медленное изменение внутренних параметров
                 # Вызывается раз в LEARNING_INTERVAL тиков, после Feedback, перед Planning/Intelligence
-                if (
-                    not disable_learning
-                    and self_state.ticks > 0
-                    and self_state.ticks % LEARNING_INTERVAL == 0
-                ):
+                # (TickScheduler разносит его с другими периодическими задачами и откладывает
+                # на тик со свободным бюджетом)
+                if not disable_learning and tick_scheduler.due("learning", self_state.ticks):
                     try:
                         # Проверяем инициализацию параметров
                         if (
@@ -1281,6 +1393,7 @@ def run_loop(
                                 f"Обнаружено {learning_errors} ошибок в Learning. "
                                 "Возможна деградация функциональности."
                             )
+                    tick_scheduler.end_phase("learning")
 
                 # Оптимизация: batch memory maintenance (decay + archive в одном проходе)
                 # Накопление счетчиков для отложенного выполнения
@@ -1293,7 +1406,7 @@ def run_loop(
                     ticks_since_last_memory_archive >= MEMORY_ARCHIVE_LAZY_THRESHOLD
                 )
 
-                if maintenance_needed:
+                if maintenance_needed and tick_scheduler.admit("maintenance", self_state.ticks):
                     try:
                         maintenance_result = self_state.memory.batch_memory_maintenance(
                             decay_factor=MEMORY_DECAY_FACTOR,
@@ -1314,14 +1427,11 @@ def run_loop(
 
                     except Exception as e:
                         logger.error(f"Ошибка в batch_memory_maintenance: {e}", exc_info=True)
+                    tick_scheduler.end_phase("maintenance")
 
                 # Консолидация экспериментальной памяти
                 # Вызывается раз в MEMORY_CONSOLIDATION_INTERVAL тиков
-                if (
-                    memory_hierarchy
-                    and self_state.ticks > 0
-                    and self_state.ticks % MEMORY_CONSOLIDATION_INTERVAL == 0
-                ):
+                if memory_hierarchy and tick_scheduler.due("consolidation", self_state.ticks):
                     try:
                         consolidation_stats = memory_hierarchy.consolidate_memory(self_state)
                         if (
@@ -1336,14 +1446,11 @@ def run_loop(
                         logger.error(
                             f"Ошибка в консолидации экспериментальной памяти: {e}", exc_info=True
                         )
+                    tick_scheduler.end_phase("consolidation")
 
                 # Adaptation (Этап 15) - медленная перестройка поведения на основе статистики Learning
                 # Вызывается раз в ADAPTATION_INTERVAL тиков, после Learning, перед Planning/Intelligence
-                if (
-                    not disable_adaptation
-                    and self_state.ticks > 0
-                    and self_state.ticks % ADAPTATION_INTERVAL == 0
-                ):
+                if not disable_adaptation and tick_scheduler.due("adaptation", self_state.ticks):
                     try:
                         # Проверяем инициализацию параметров
                         if (
@@ -1483,6 +1590,7 @@ def run_loop(
                         # При неожиданных ошибках пропускаем только блок Adaptation,
                         # но продолжаем выполнение остальных частей итерации
                         pass
+                    tick_scheduler.end_phase("adaptation")
 
                 # Philosophical Analysis REMOVED: violates architecture principles
                 # Философский анализ теперь является внешним инструментом наблюдения
@@ -1547,6 +1655,7 @@ def run_loop(
 
                 except Exception as e:
                     logger.error(f"Ошибка в семантическом мониторинге: {e}", exc_info=True)
+                tick_scheduler.end_phase("monitor")
 
                 # Периодическое обслуживание DataCollectionManager теперь выполняется асинхронно
                 # в фоновом потоке AsyncDataQueue
@@ -1566,6 +1675,14 @@ def run_loop(
                 # Примечание: flush после снапшота обрабатывается только в фазе "after_snapshot" выше,
                 # чтобы избежать двойного flush.
                 log_manager.maybe_flush(self_state, phase="tick")
+                tick_scheduler.end_phase("snapshot")
+
+                # Публикация живого состояния для /status API (без чтения snapshot-файлов)
+                try:
+                    status_publisher.maybe_publish(self_state)
+                except Exception as e:
+                    logger.error(f"Ошибка публикации статуса: {e}", exc_info=True)
+                tick_scheduler.end_phase("publish")
 
 
                 # Поддержка постоянного интервала тиков
@@ -1580,8 +1697,8 @@ def run_loop(
                     metadata={"performance": True}
                 )
 
-                # Рассчитываем длительность сна перед логированием
-                sleep_duration = max(0.0, tick_interval - elapsed_tick)
+                # Рассчитываем длительность сна до дедлайна следующего тика перед логированием
+                sleep_duration = tick_scheduler.end_tick()
 
                 # Async data collection: performance metrics
                 async_data_sink.log_event(
@@ -1672,6 +1789,12 @@ def run_loop(
                 # Остановка происходит только по внешнему сигналу (stop_event)
 
 
+    # Сэмплирующий профилировщик снимает стек этого потока; может быть включен позже через API
+    sampling_profiler = get_sampling_profiler()
+    sampling_profiler.set_target_thread(threading.get_ident())
+    if enable_sampling_profiler:
+        sampling_profiler.start(interval=sampling_interval)
+
     try:
         # Запуск основного цикла с профилированием или без
         if enable_profiling:
@@ -1708,6 +1831,25 @@ def run_loop(
         else:
             run_main_loop()
     finally:
+        # Финализация PassiveDataSink: дописываем ожидающие наблюдения и останавливаем писатель
+        try:
+            passive_data_sink.stop()
+        except Exception as e:
+            logger.error(f"[DATA_SINK] Error stopping PassiveDataSink: {e}")
+
+        # Дописываем захваченные снапшоты и останавливаем фоновый писатель
+        try:
+            snapshot_manager.stop()
+        except Exception as e:
+            logger.error(f"Error stopping snapshot writer: {e}")
+
+        # Останавливаем сэмплер нагрузки системы и фоновый поток планировщика тика
+        load_sampler.stop()
+        tick_scheduler.stop()
+        unregister_runtime_metrics(metrics_registry, runtime_metric_refs)
+        sampling_profiler.stop()
+        sampling_profiler.set_target_thread(None)
+
         # Корректное завершение StructuredLogger при окончании работы
         if 'structured_logger' in locals() and structured_logger is not None:
             structured_logger.shutdown()
@@ -0,0 +1,547 @@
+"""
+Реестр метрик runtime: гистограммы, счетчики и gauge с фиксированной памятью.
+
+Гистограммы лог-линейные: SUB_BUCKETS корзин на каждую степень двойки в
+диапазоне [2^MIN_EXPONENT, 2^MAX_EXPONENT) (для секунд - от ~1 мкс до ~68 мин),
+относительная погрешность перцентилей не больше 1/SUB_BUCKETS. Память на
+гистограмму не зависит от количества измерений.
+
+Запись без блокировок: каждый поток пишет в собственный шард метрики
+(threading.local), блокировка берется только при создании шарда и при
+снимке, который суммирует шарды. Шарды завершившихся потоков сливаются в
+общий при следующем снимке, поэтому их количество ограничено числом живых
+потоков.
+
+Использование:
+    registry = get_metrics_registry()
+    with registry.histogram("save_snapshot").time():
+        save_snapshot(state)
+    registry.counter("events_dropped").inc()
+    registry.gauge("event_queue_depth", function=event_queue.size)
+    registry.histogram("tick.phase", labels={"phase": "events"}).observe(0.002)
+    registry.snapshot()
+
+Метрика идентифицируется именем и метками; ключ метрики в реестре и в
+снимке - 'name{label="value"}' (или просто name без меток).
+"""
+
+import math
+import threading
+import time
+import weakref
+from types import TracebackType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+SUB_BUCKETS = 16  # Корзин на степень двойки
+MIN_EXPONENT = -20  # Нижняя граница диапазона: 2^-20 (~0.95 мкс)
+MAX_EXPONENT = 12  # Верхняя граница диапазона: 2^12 (~68 мин)
+
+# Корзина 0 - значения ниже диапазона, последняя - выше диапазона
+BUCKET_COUNT = (MAX_EXPONENT - MIN_EXPONENT) * SUB_BUCKETS + 2
+
+# Функция значения метрики; None - значение сейчас недоступно
+MetricFunction = Callable[[], Optional[float]]
+
+_frexp = math.frexp
+
+
+def bucket_index(value: float) -> int:
+    """Номер лог-линейной корзины для значения."""
+    if value <= 0.0:
+        return 0
+    mantissa, exponent = _frexp(value)  # value = mantissa * 2^exponent, 0.5 <= mantissa < 1
+    if exponent <= MIN_EXPONENT:
+        return 0
+    if exponent > MAX_EXPONENT:
+        return BUCKET_COUNT - 1
+    return 1 + (exponent - MIN_EXPONENT - 1) * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def metric_key(name: str, labels: Optional[Dict[str, str]] = None) -> str:
+    """Ключ метрики в реестре: имя и метки в порядке сортировки."""
+    if not labels:
+        return name
+    rendered = ",".join(f'{label}="{labels[label]}"' for label in sorted(labels))
+    return f"{name}{{{rendered}}}"
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Верхняя граница корзины (inf для корзины выше диапазона)."""
+    if index <= 0:
+        return 2.0**MIN_EXPONENT
+    if index >= BUCKET_COUNT - 1:
+        return math.inf
+    octave, sub = divmod(index - 1, SUB_BUCKETS)
+    return 2.0 ** (MIN_EXPONENT + octave) * (1.0 + (sub + 1) / SUB_BUCKETS)
+
+
+class _HistogramShard:
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def merge(self, other: "_HistogramShard") -> None:
+        counts = self.counts
+        for index, value in enumerate(other.counts):
+            if value:
+                counts[index] += value
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class _CounterShard:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+    def merge(self, other: "_CounterShard") -> None:
+        self.value += other.value
+
+
+ShardT = TypeVar("ShardT", _HistogramShard, _CounterShard)
+
+
+class _ShardedMetric(Generic[ShardT]):
+    """Метрика с шардом на поток; снимок суммирует шарды под блокировкой."""
+
+    shard_class: Type[ShardT]
+    kind = ""
+
+    def __init__(self, name: str, description: str = "", labels: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple["weakref.ref[threading.Thread]", ShardT]] = []
+        self._retired: ShardT = self.shard_class()  # Данные завершившихся потоков
+
+    def _new_shard(self) -> ShardT:
+        shard = self.shard_class()
+        self._local.shard = shard
+        with self._lock:
+            self._shards.append((weakref.ref(threading.current_thread()), shard))
+        return shard
+
+    def _merged(self) -> ShardT:
+        merged = self.shard_class()
+        with self._lock:
+            alive = []
+            for thread_ref, shard in self._shards:
+                thread = thread_ref()
+                if thread is None or not thread.is_alive():
+                    self._retired.merge(shard)
+                else:
+                    alive.append((thread_ref, shard))
+                    merged.merge(shard)
+            self._shards = alive
+            merged.merge(self._retired)
+        return merged
+
+    def _reset(self) -> None:
+        with self._lock:
+            for _, shard in self._shards:
+                shard.reset()
+            self._retired = self.shard_class()
+
+
+class Histogram(_ShardedMetric[_HistogramShard]):
+    """Лог-линейная гистограмма с фиксированной памятью."""
+
+    shard_class = _HistogramShard
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        unit: str = "seconds",
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        super().__init__(name, description, labels)
+        self.unit = unit
+        self.last: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        """Записать значение."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        # bucket_index, встроенный ради накладных расходов на горячем пути
+        if value > 0.0:
+            mantissa, exponent = _frexp(value)
+            if exponent <= MIN_EXPONENT:
+                index = 0
+            elif exponent > MAX_EXPONENT:
+                index = BUCKET_COUNT - 1
+            else:
+                index = (
+                    1
+                    + (exponent - MIN_EXPONENT - 1) * SUB_BUCKETS
+                    + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+                )
+        else:
+            index = 0
+        shard.counts[index] += 1
+        shard.count += 1
+        shard.total += value
+        if value > shard.max:
+            shard.max = value
+        if value < shard.min:
+            shard.min = value
+        self.last = value
+
+    def time(self) -> "_Timer":
+        """Контекстный менеджер, записывающий длительность блока в секундах."""
+        return _Timer(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Сводка гистограммы.
+
+        Returns:
+            {"count", "sum", "mean", "min", "max", "p50", "p95", "p99", "last"}
+        """
+        merged = self._merged()
+        if merged.count == 0:
+            return {
+                "count": 0, "sum": 0.0, "mean": 0.0, "min": 0.0, "max": 0.0,
+                "p50": 0.0, "p95": 0.0, "p99": 0.0, "last": self.last,
+            }
+        p50, p95, p99 = _quantiles(merged, (0.50, 0.95, 0.99))
+        return {
+            "count": merged.count,
+            "sum": merged.total,
+            "mean": merged.total / merged.count,
+            "min": merged.min,
+            "max": merged.max,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "last": self.last,
+        }
+
+    def quantile(self, q: float) -> float:
+        """Оценка перцентиля q (0..1); 0.0 для пустой гистограммы."""
+        merged = self._merged()
+        if merged.count == 0:
+            return 0.0
+        return _quantiles(merged, (q,))[0]
+
+    def buckets(self) -> Tuple[List[Tuple[float, int]], int, float]:
+        """
+        Накопленные корзины для экспорта с фиксированными границами 2^e.
+
+        Границы степеней двойки совпадают с границами лог-линейных корзин,
+        поэтому накопленные количества точные, а набор границ не меняется
+        между снимками.
+
+        Returns:
+            ([(граница, накопленное количество), ...] от 2^MIN_EXPONENT до inf,
+            общее количество, сумма значений)
+        """
+        merged = self._merged()
+        counts = merged.counts
+        cumulative = counts[0]
+        result = [(2.0**MIN_EXPONENT, cumulative)]
+        for octave in range(MAX_EXPONENT - MIN_EXPONENT):
+            start = 1 + octave * SUB_BUCKETS
+            cumulative += sum(counts[start : start + SUB_BUCKETS])
+            result.append((2.0 ** (MIN_EXPONENT + octave + 1), cumulative))
+        result.append((math.inf, merged.count))
+        return result, merged.count, merged.total
+
+    def reset(self) -> None:
+        self._reset()
+        self.last = None
+
+
+def _quantiles(merged: _HistogramShard, qs: Iterable[float]) -> List[float]:
+    """Перцентили по корзинам: верхняя граница корзины, ограниченная min/max."""
+    results: List[float] = []
+    targets = [max(1, math.ceil(q * merged.count)) for q in qs]
+    cumulative = 0
+    position = 0
+    for index, value in enumerate(merged.counts):
+        if not value:
+            continue
+        cumulative += value
+        while position < len(targets) and cumulative >= targets[position]:
+            results.append(min(max(bucket_upper_bound(index), merged.min), merged.max))
+            position += 1
+        if position == len(targets):
+            break
+    return results
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Counter(_ShardedMetric[_CounterShard]):
+    """
+    Монотонный счетчик.
+
+    Значение накапливается inc() или берется у функции при снимке - для
+    счетчиков, которые уже ведет сам компонент (например, отброшенные события
+    EventQueue).
+    """
+
+    shard_class = _CounterShard
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        function: Optional[MetricFunction] = None,
+    ):
+        super().__init__(name, description, labels)
+        self.function = function
+
+    def set_function(self, function: Optional[MetricFunction]) -> None:
+        self.function = function
+
+    def inc(self, amount: float = 1.0) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard.value += amount
+
+    def value(self) -> Optional[float]:
+        if self.function is not None:
+            return _call_metric_function(self.function)
+        return self._merged().value
+
+    def reset(self) -> None:
+        self._reset()
+
+
+class Gauge:
+    """Текущее значение: задается set() или вычисляется функцией при снимке."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        function: Optional[MetricFunction] = None,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = dict(labels or {})
+        self.function = function
+        self._value = 0.0
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def set_function(self, function: Optional[MetricFunction]) -> None:
+        self.function = function
+
+    def value(self) -> Optional[float]:
+        if self.function is None:
+            return self._value
+        return _call_metric_function(self.function)
+
+    def reset(self) -> None:
+        self._value = 0.0
+
+
+def _call_metric_function(function: MetricFunction) -> Optional[float]:
+    """Значение метрики от функции; None, если функция упала или вернула None."""
+    try:
+        value = function()
+    except Exception:
+        return None
+    return None if value is None else float(value)
+
+
+Metric = Union[Histogram, Counter, Gauge]
+MetricT = TypeVar("MetricT", Histogram, Counter, Gauge)
+
+
+class MetricsRegistry:
+    """
+    Реестр именованных метрик.
+
+    histogram/counter/gauge возвращают существующую метрику с тем же именем
+    и метками или создают новую; повторная регистрация ключа с другим типом -
+    TypeError. Переданная function заменяет функцию существующей метрики, так
+    что повторный запуск компонента перепривязывает метрики к новым объектам.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(
+        self,
+        name: str,
+        metric_class: Type[MetricT],
+        labels: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> MetricT:
+        key = metric_key(name, labels)
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = metric_class(name, labels=labels, **kwargs)
+                    self._metrics[key] = metric
+        if not isinstance(metric, metric_class):
+            raise TypeError(f"Metric '{key}' already registered as {metric.kind}")
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        unit: str = "seconds",
+        labels: Optional[Dict[str, str]] = None,
+    ) -> Histogram:
+        return self._get_or_create(
+            name, Histogram, labels=labels, description=description, unit=unit
+        )
+
+    def counter(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        function: Optional[MetricFunction] = None,
+    ) -> Counter:
+        counter = self._get_or_create(name, Counter, labels=labels, description=description)
+        if function is not None:
+            counter.set_function(function)
+        return counter
+
+    def gauge(
+        self,
+        name: str,
+        description: str = "",
+        labels: Optional[Dict[str, str]] = None,
+        function: Optional[MetricFunction] = None,
+    ) -> Gauge:
+        gauge = self._get_or_create(name, Gauge, labels=labels, description=description)
+        if function is not None:
+            gauge.set_function(function)
+        return gauge
+
+    def time(self, name: str) -> _Timer:
+        """Контекстный менеджер: длительность блока в гистограмму name."""
+        return self.histogram(name).time()
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[Metric]:
+        return self._metrics.get(metric_key(name, labels))
+
+    def unregister(self, name: str, labels: Optional[Dict[str, str]] = None) -> None:
+        """Удалить метрику из реестра."""
+        with self._lock:
+            self._metrics.pop(metric_key(name, labels), None)
+
+    def names(self, prefix: str = "") -> List[str]:
+        return sorted(name for name in list(self._metrics) if name.startswith(prefix))
+
+    def metrics(self) -> List[Metric]:
+        """Все зарегистрированные метрики (для экспорта)."""
+        return [self._metrics[name] for name in self.names()]
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Dict[str, Any]]:
+        """
+        Снимок метрик с именами, начинающимися с prefix.
+
+        Returns:
+            {"histograms": {name: сводка}, "counters": {name: value}, "gauges": {name: value}}
+        """
+        result: Dict[str, Dict[str, Any]] = {"histograms": {}, "counters": {}, "gauges": {}}
+        for name in self.names(prefix):
+            metric = self._metrics[name]
+            if isinstance(metric, Histogram):
+                result["histograms"][name] = metric.snapshot()
+            elif isinstance(metric, Counter):
+                result["counters"][name] = metric.value()
+            else:
+                result["gauges"][name] = metric.value()
+        return result
+
+    def format_summary(self, prefix: str = "", scale: float = 1000.0, unit: str = "ms") -> str:
+        """Однострочная сводка гистограмм для логов: name p50/p95/p99/max (n)."""
+        parts = []
+        for name, summary in self.snapshot(prefix)["histograms"].items():
+            if summary["count"]:
+                parts.append(
+                    f"{name}(p50={summary['p50'] * scale:.2f}{unit}, "
+                    f"p95={summary['p95'] * scale:.2f}{unit}, "
+                    f"p99={summary['p99'] * scale:.2f}{unit}, "
+                    f"max={summary['max'] * scale:.2f}{unit}, "
+                    f"n={summary['count']})"
+                )
+        return ", ".join(parts)
+
+    def reset(self, prefix: str = "") -> None:
+        """Обнулить метрики с именами, начинающимися с prefix (метрики остаются в реестре)."""
+        for name in self.names(prefix):
+            self._metrics[name].reset()
+
+
+# Глобальный экземпляр реестра
+_metrics_registry: Optional[MetricsRegistry] = None
+_metrics_registry_lock = threading.Lock()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Получить глобальный реестр метрик."""
+    global _metrics_registry
+    if _metrics_registry is None:
+        with _metrics_registry_lock:
+            if _metrics_registry is None:
+                _metrics_registry = MetricsRegistry()
+    return _metrics_registry
@@ -0,0 +1,125 @@
+"""
+Экспорт реестра метрик в текстовом формате OpenMetrics / Prometheus.
+
+Имя семейства строится из имени метрики реестра: точки и прочие недопустимые
+символы заменяются на '_', добавляются пространство имен и суффикс единицы
+измерения гистограммы ("tick.duration" -> "life_tick_duration_seconds").
+Метрики с одинаковым именем и разными метками попадают в одно семейство.
+
+Гистограммы экспортируются с фиксированными границами корзин 2^e (см.
+Histogram.buckets), поэтому набор рядов не меняется между опросами.
+
+Значения gauge и счетчиков с функциями вычисляются при рендеринге - в потоке
+обработчика запроса, а не в потоке runtime loop.
+"""
+
+import math
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .metrics_registry import Counter, Histogram, Metric, MetricsRegistry
+
+DEFAULT_NAMESPACE = "life"
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def family_name(name: str, namespace: str = DEFAULT_NAMESPACE, unit: str = "") -> str:
+    """Имя семейства метрик OpenMetrics для имени метрики реестра."""
+    family = _INVALID_NAME_CHARS.sub("_", name)
+    if namespace:
+        family = f"{namespace}_{family}"
+    if unit and not family.endswith(f"_{unit}"):
+        family = f"{family}_{unit}"
+    return family
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [(_INVALID_NAME_CHARS.sub("_", key), value) for key, value in sorted(labels.items())]
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render(
+    registry: MetricsRegistry, namespace: str = DEFAULT_NAMESPACE, openmetrics: bool = True
+) -> str:
+    """
+    Рендерит метрики реестра в текстовый формат.
+
+    Args:
+        registry: Реестр метрик
+        namespace: Префикс имен семейств
+        openmetrics: True - OpenMetrics 1.0 (с UNIT и '# EOF'),
+            False - Prometheus text format 0.0.4
+
+    Returns:
+        Текст экспозиции
+    """
+    families: Dict[str, Tuple[str, str, str, List[Metric]]] = {}
+    for metric in registry.metrics():
+        unit = metric.unit if isinstance(metric, Histogram) else ""
+        family = family_name(metric.name, namespace, unit)
+        entry = families.get(family)
+        if entry is None:
+            families[family] = (metric.kind, unit, metric.description, [metric])
+        elif entry[0] == metric.kind:  # Метрика другого типа с тем же именем семейства пропускается
+            entry[3].append(metric)
+
+    lines: List[str] = []
+    for family, (kind, unit, description, metrics) in families.items():
+        samples = _render_samples(family, metrics)
+        if not samples:
+            continue
+        # В формате 0.0.4 имя счетчика в TYPE совпадает с именем ряда
+        type_name = f"{family}_total" if kind == "counter" and not openmetrics else family
+        lines.append(f"# TYPE {type_name} {kind}")
+        if openmetrics and unit:
+            lines.append(f"# UNIT {family} {unit}")
+        if description:
+            lines.append(f"# HELP {type_name} {_escape(description)}")
+        lines.extend(samples)
+
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _render_samples(family: str, metrics: List[Metric]) -> List[str]:
+    samples = []
+    for metric in metrics:
+        if isinstance(metric, Histogram):
+            buckets, count, total = metric.buckets()
+            for bound, cumulative in buckets:
+                labels = _format_labels(metric.labels, ("le", _format_value(bound)))
+                samples.append(f"{family}_bucket{labels} {cumulative}")
+            labels = _format_labels(metric.labels)
+            samples.append(f"{family}_count{labels} {count}")
+            samples.append(f"{family}_sum{labels} {_format_value(total)}")
+            continue
+
+        value = metric.value()
+        if value is None:
+            continue
+        suffix = "_total" if isinstance(metric, Counter) else ""
+        samples.append(f"{family}{suffix}{_format_labels(metric.labels)} {_format_value(value)}")
+    return samples
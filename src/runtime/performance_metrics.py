@@ -1,70 +1,106 @@
 """
 Модуль для измерения производительности критических операций.
+
+Длительности записываются в гистограммы реестра метрик
+(src/runtime/metrics_registry.py) с именами "operation.<операция>",
+поэтому память не растет с количеством измерений.
 """
 
 import logging
+import threading
 import time
-from contextlib import contextmanager
 from typing import Dict, List, Optional
 
+from .metrics_registry import Histogram, MetricsRegistry, get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
+OPERATION_PREFIX = "operation."
+
 
 class PerformanceMetrics:
     """Класс для сбора метрик производительности."""
 
-    def __init__(self):
-        self.metrics: Dict[str, List[float]] = {}
-        self.current_measurements: Dict[str, float] = {}
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self._histograms: Dict[str, Histogram] = {}
+        # Начатые измерения - стек на поток, чтобы параллельные операции не затирали друг друга
+        self._local = threading.local()
+
+    def _histogram(self, operation: str) -> Histogram:
+        histogram = self._histograms.get(operation)
+        if histogram is None:
+            histogram = self.registry.histogram(OPERATION_PREFIX + operation)
+            self._histograms[operation] = histogram
+        return histogram
 
     def start_measurement(self, operation: str):
         """Начинает измерение времени выполнения операции."""
-        self.current_measurements[operation] = time.perf_counter()
+        pending = getattr(self._local, "pending", None)
+        if pending is None:
+            pending = self._local.pending = {}
+        pending.setdefault(operation, []).append(time.perf_counter())
 
     def end_measurement(self, operation: str) -> float:
         """Завершает измерение и возвращает время выполнения."""
-        if operation not in self.current_measurements:
+        starts = getattr(self._local, "pending", {}).get(operation)
+        if not starts:
             return 0.0
 
-        start_time = self.current_measurements.pop(operation)
-        duration = time.perf_counter() - start_time
+        duration = time.perf_counter() - starts.pop()
+        self._histogram(operation).observe(duration)
+        return duration
+
+    def measure(self, operation: str):
+        """Контекстный менеджер, записывающий длительность блока."""
+        return self._histogram(operation).time()
 
-        if operation not in self.metrics:
-            self.metrics[operation] = []
-        self.metrics[operation].append(duration)
+    def operations(self) -> List[str]:
+        """Операции, для которых есть измерения."""
+        return [
+            name[len(OPERATION_PREFIX):]
+            for name in self.registry.names(OPERATION_PREFIX)
+            if self.registry.get(name).snapshot()["count"]
+        ]
 
-        return duration
+    def get_count(self, operation: str) -> int:
+        """Возвращает количество измерений операции."""
+        return self._histogram(operation).snapshot()["count"]
 
     def get_average_time(self, operation: str) -> Optional[float]:
         """Возвращает среднее время выполнения операции."""
-        if operation not in self.metrics or not self.metrics[operation]:
+        summary = self._histogram(operation).snapshot()
+        if not summary["count"]:
             return None
-        return sum(self.metrics[operation]) / len(self.metrics[operation])
+        return summary["mean"]
 
     def get_last_time(self, operation: str) -> Optional[float]:
         """Возвращает время последнего выполнения операции."""
-        if operation not in self.metrics or not self.metrics[operation]:
-            return None
-        return self.metrics[operation][-1]
+        return self._histogram(operation).last
+
+    def get_summary(self, operation: str) -> Dict[str, float]:
+        """Возвращает сводку операции: count, mean, min, max, p50, p95, p99."""
+        return self._histogram(operation).snapshot()
 
     def log_summary(self):
         """Логирует сводку по метрикам производительности."""
-        for operation, times in self.metrics.items():
-            if times:
-                avg_time = sum(times) / len(times)
-                max_time = max(times)
-                min_time = min(times)
-                logger.info(
-                    f"Performance: {operation} - avg: {avg_time:.4f}s, "
-                    f"min: {min_time:.4f}s, max: {max_time:.4f}s, count: {len(times)}"
-                )
+        for operation in self.operations():
+            summary = self.get_summary(operation)
+            logger.info(
+                f"Performance: {operation} - avg: {summary['mean']:.4f}s, "
+                f"p95: {summary['p95']:.4f}s, p99: {summary['p99']:.4f}s, "
+                f"min: {summary['min']:.4f}s, max: {summary['max']:.4f}s, count: {summary['count']}"
+            )
+
+    def reset(self):
+        """Сбрасывает накопленные измерения."""
+        self.registry.reset(OPERATION_PREFIX)
 
 
 # Глобальный экземпляр для метрик
-performance_metrics = PerformanceMetrics()
+performance_metrics = PerformanceMetrics(get_metrics_registry())
 
 
-@contextmanager
 def measure_time(operation: str):
     """
     Контекстный менеджер для измерения времени выполнения операции.
@@ -73,9 +109,4 @@ def measure_time(operation: str):
         with measure_time("save_snapshot"):
             save_snapshot(state)
     """
-    performance_metrics.start_measurement(operation)
-    try:
-        yield
-    finally:
-        duration = performance_metrics.end_measurement(operation)
-        logger.debug(f"Operation {operation} took {duration:.4f}s")
+    return performance_metrics.measure(operation)
@@ -2,48 +2,32 @@
 Performance Monitor для измерения влияния компонентов на производительность системы.
 
 Отслеживает время выполнения ключевых операций и их влияние на общую производительность.
+Измерения хранятся в гистограммах реестра метрик (src/runtime/metrics_registry.py)
+с именами "component.<компонент>.<операция>".
 """
 
-import time
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, Callable
-from contextlib import contextmanager
-from dataclasses import dataclass, field
-from collections import defaultdict
-
-
-@dataclass
-class PerformanceMetrics:
-    """Метрики производительности для компонента."""
-    total_calls: int = 0
-    total_time: float = 0.0
-    avg_time: float = 0.0
-    min_time: float = float('inf')
-    max_time: float = 0.0
-    recent_calls: list = field(default_factory=list)  # Последние 10 вызовов
-
-    def add_measurement(self, execution_time: float):
-        """Добавить измерение времени выполнения."""
-        self.total_calls += 1
-        self.total_time += execution_time
-        self.avg_time = self.total_time / self.total_calls
-        self.min_time = min(self.min_time, execution_time)
-        self.max_time = max(self.max_time, execution_time)
-
-        # Храним последние 10 измерений
-        self.recent_calls.append(execution_time)
-        if len(self.recent_calls) > 10:
-            self.recent_calls = self.recent_calls[-10:]
-
-    def get_summary(self) -> Dict[str, Any]:
-        """Получить сводку метрик."""
-        return {
-            "total_calls": self.total_calls,
-            "total_time": self.total_time,
-            "avg_time": self.avg_time,
-            "min_time": self.min_time if self.min_time != float('inf') else 0.0,
-            "max_time": self.max_time,
-            "recent_avg": sum(self.recent_calls) / len(self.recent_calls) if self.recent_calls else 0.0,
-        }
+
+from .metrics_registry import Histogram, MetricsRegistry, get_metrics_registry
+
+COMPONENT_PREFIX = "component."
+
+
+def _summary_from_histogram(histogram: Histogram) -> Dict[str, Any]:
+    """Сводка метрик компонента из гистограммы."""
+    summary = histogram.snapshot()
+    return {
+        "total_calls": summary["count"],
+        "total_time": summary["sum"],
+        "avg_time": summary["mean"],
+        "min_time": summary["min"],
+        "max_time": summary["max"],
+        "p50_time": summary["p50"],
+        "p95_time": summary["p95"],
+        "p99_time": summary["p99"],
+        "last_time": summary["last"] or 0.0,
+    }
 
 
 class PerformanceMonitor:
@@ -53,9 +37,15 @@ class PerformanceMonitor:
     Отслеживает время выполнения операций и их влияние на общую производительность.
     """
 
-    def __init__(self):
-        """Инициализация монитора."""
-        self.metrics: Dict[str, PerformanceMetrics] = defaultdict(PerformanceMetrics)
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Инициализация монитора.
+
+        Args:
+            registry: Реестр метрик (по умолчанию - собственный реестр монитора)
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self._histograms: Dict[str, Histogram] = {}
         self.enabled = True
 
     def enable(self):
@@ -66,7 +56,6 @@ class PerformanceMonitor:
         """Отключить мониторинг производительности."""
         self.enabled = False
 
-    @contextmanager
     def measure(self, component_name: str, operation_name: str = "default"):
         """
         Контекстный менеджер для измерения времени выполнения операции.
@@ -76,17 +65,14 @@ class PerformanceMonitor:
             operation_name: Имя операции
         """
         if not self.enabled:
-            yield
-            return
+            return nullcontext()
 
         key = f"{component_name}.{operation_name}"
-        start_time = time.time()
-
-        try:
-            yield
-        finally:
-            execution_time = time.time() - start_time
-            self.metrics[key].add_measurement(execution_time)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self.registry.histogram(COMPONENT_PREFIX + key)
+            self._histograms[key] = histogram
+        return histogram.time()
 
     def measure_function(self, component_name: str, operation_name: str = "default"):
         """
@@ -111,22 +97,16 @@ class PerformanceMonitor:
             component_name: Имя компонента (если None, возвращает все метрики)
 
         Returns:
-            Dict с метриками
+            Dict с метриками: total_calls, total_time, avg_time, min_time, max_time,
+            p50_time, p95_time, p99_time, last_time
         """
-        if component_name:
-            # Метрики конкретного компонента
-            component_metrics = {
-                key: metrics.get_summary()
-                for key, metrics in self.metrics.items()
-                if key.startswith(f"{component_name}.")
-            }
-            return component_metrics
-        else:
-            # Все метрики
-            return {
-                key: metrics.get_summary()
-                for key, metrics in self.metrics.items()
-            }
+        prefix = COMPONENT_PREFIX + (f"{component_name}." if component_name else "")
+        metrics = {}
+        for name in self.registry.names(prefix):
+            summary = _summary_from_histogram(self.registry.get(name))
+            if summary["total_calls"]:
+                metrics[name[len(COMPONENT_PREFIX):]] = summary
+        return metrics
 
     def get_overall_impact(self) -> Dict[str, Any]:
         """
@@ -159,6 +139,7 @@ class PerformanceMonitor:
                 {
                     "operation": op,
                     "avg_time": metrics["avg_time"],
+                    "p99_time": metrics["p99_time"],
                     "total_calls": metrics["total_calls"],
                     "total_time": metrics["total_time"]
                 }
@@ -169,8 +150,8 @@ class PerformanceMonitor:
 
     def reset(self):
         """Сбросить все метрики."""
-        self.metrics.clear()
+        self.registry.reset(COMPONENT_PREFIX)
 
 
 # Глобальный экземпляр монитора производительности
-performance_monitor = PerformanceMonitor()
\ No newline at end of file
+performance_monitor = PerformanceMonitor(get_metrics_registry())
@@ -0,0 +1,253 @@
+"""
+Регистрация метрик компонентов runtime loop в реестре метрик.
+
+Компоненты уже ведут собственную статистику (get_stats/get_metrics), поэтому
+в реестр регистрируются gauge и счетчики с функциями, которые читают ее при
+снимке или экспорте /metrics. Поток runtime loop при этом ничего не делает:
+чтение выполняется в потоке обработчика запроса, а get_stats компонентов
+потокобезопасны (берут собственные блокировки или читают атомарно).
+
+Длительности тиков и фаз пишет TickScheduler, длительности записи snapshot -
+measure_time в save_snapshot/save_delta_snapshot (в потоке писателя snapshot).
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics_registry import MetricFunction, MetricsRegistry
+
+if TYPE_CHECKING:
+    from ..environment.event_queue import EventQueue
+    from ..observability.passive_data_sink import PassiveDataSink
+    from ..observability.structured_logger import StructuredLogger
+    from ..state.self_state import SelfState
+    from .async_data_queue import AsyncDataQueue
+    from .computation_cache import ComputationCache
+    from .data_collection_manager import DataCollectionManager
+    from .snapshot_manager import SnapshotManager
+    from .tick_scheduler import TickScheduler
+
+MetricRef = Tuple[str, Optional[Dict[str, str]]]
+# (метка writer, get_stats, ключ backlog, ключ потерь, ключ ошибок)
+WriterSpec = Tuple[str, Callable[[], Dict[str, Any]], str, Optional[str], Optional[str]]
+
+
+def _stat(
+    get_stats: Callable[[], Dict[str, Any]], key: str, scale: float = 1.0
+) -> Callable[[], Optional[float]]:
+    """Функция метрики: значение key из статистики компонента (None, если ключа нет)."""
+
+    def read() -> Optional[float]:
+        value = get_stats().get(key)
+        return None if value is None else value * scale
+
+    return read
+
+
+def register_runtime_metrics(
+    registry: MetricsRegistry,
+    self_state: Optional["SelfState"] = None,
+    tick_scheduler: Optional["TickScheduler"] = None,
+    event_queue: Optional["EventQueue"] = None,
+    computation_cache: Optional["ComputationCache"] = None,
+    snapshot_manager: Optional["SnapshotManager"] = None,
+    async_data_queue: Optional["AsyncDataQueue"] = None,
+    passive_data_sink: Optional["PassiveDataSink"] = None,
+    structured_logger: Optional["StructuredLogger"] = None,
+    data_collection_manager: Optional["DataCollectionManager"] = None,
+) -> List[MetricRef]:
+    """
+    Регистрирует метрики компонентов runtime loop.
+
+    Повторная регистрация (новый запуск run_loop) перепривязывает метрики к
+    новым объектам.
+
+    Returns:
+        Зарегистрированные метрики (имя, метки) для unregister_runtime_metrics
+    """
+    registered: List[MetricRef] = []
+
+    def gauge(
+        name: str,
+        description: str,
+        function: MetricFunction,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        registry.gauge(name, description, labels=labels, function=function)
+        registered.append((name, labels))
+
+    def counter(
+        name: str,
+        description: str,
+        function: MetricFunction,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        registry.counter(name, description, labels=labels, function=function)
+        registered.append((name, labels))
+
+    if self_state is not None:
+        gauge("runtime.ticks", "Ticks performed by the runtime loop", lambda: self_state.ticks)
+        gauge(
+            "memory.entries",
+            "Entries in active memory",
+            lambda: len(self_state.memory),
+            {"store": "active"},
+        )
+        if hasattr(self_state.memory, "get_index_stats"):
+            index_stats = self_state.memory.get_index_stats
+            gauge(
+                "memory_index.entries",
+                "Entries in the active memory index",
+                _stat(index_stats, "total_entries"),
+            )
+            gauge(
+                "memory_index.cache_hit_ratio",
+                "Memory index query cache hit ratio",
+                _stat(index_stats, "cache_hit_rate"),
+            )
+            gauge(
+                "memory_index.cache_size",
+                "Memory index query cache entries",
+                _stat(index_stats, "cache_size"),
+            )
+
+    if tick_scheduler is not None:
+        counter(
+            "tick.overruns", "Ticks longer than tick_interval", lambda: tick_scheduler.tick_overruns
+        )
+        counter(
+            "tick.missed_deadlines",
+            "Missed tick deadlines",
+            lambda: tick_scheduler.missed_deadlines,
+        )
+
+    if event_queue is not None:
+        queue_metrics = event_queue.get_metrics
+        gauge("event_queue.depth", "Events waiting in the event queue", event_queue.size)
+        gauge("event_queue.capacity", "Event queue capacity", lambda: event_queue.capacity)
+        gauge(
+            "event_queue.spilled_pending",
+            "Spilled events not yet returned",
+            _stat(queue_metrics, "spilled_pending"),
+        )
+        gauge(
+            "event_queue.max_latency_seconds",
+            "Maximum time an event spent in the queue",
+            _stat(queue_metrics, "max_latency"),
+        )
+        for name, description in (
+            ("pushed", "Events accepted by the event queue"),
+            ("popped", "Events taken from the event queue"),
+            ("evicted", "Events evicted by DROP_OLDEST"),
+            ("coalesced", "Events merged by COALESCE"),
+            ("spilled", "Events spilled to disk by SPILL"),
+        ):
+            counter(f"event_queue.{name}", description, _stat(queue_metrics, name))
+        for lane in ("internal", "external"):
+            counter(
+                "event_queue.dropped",
+                "Events dropped by the event queue",
+                _stat(queue_metrics, f"dropped_{lane}"),
+                {"lane": lane},
+            )
+
+    if computation_cache is not None:
+        for cache_name in computation_cache.get_stats():
+            labels = {"cache": cache_name}
+
+            def cache_stats(cache_name: str = cache_name) -> Dict[str, Any]:
+                return computation_cache.get_stats()[cache_name]
+
+            for name in ("hits", "misses", "evictions"):
+                counter(
+                    f"computation_cache.{name}",
+                    f"Computation cache {name}",
+                    _stat(cache_stats, name),
+                    labels,
+                )
+            gauge(
+                "computation_cache.hit_ratio",
+                "Computation cache hit ratio",
+                _stat(cache_stats, "hit_rate", scale=0.01),
+                labels,
+            )
+            gauge(
+                "computation_cache.size",
+                "Computation cache entries",
+                _stat(cache_stats, "size"),
+                labels,
+            )
+
+    # Очереди фоновых писателей: backlog, потери и ошибки записи
+    writers: List[WriterSpec] = []
+    if snapshot_manager is not None and snapshot_manager.writer is not None:
+        writer_stats = snapshot_manager.writer.get_stats
+        writers.append(("snapshot", writer_stats, "pending", None, "errors"))
+        counter("snapshot.written", "Snapshots written", _stat(writer_stats, "written"))
+        counter(
+            "snapshot.coalesced",
+            "Snapshots replaced by a newer one before writing",
+            _stat(writer_stats, "coalesced"),
+        )
+    if async_data_queue is not None:
+        queue_stats = async_data_queue.get_stats
+        writers.append(
+            ("async_data_queue", queue_stats, "queue_size_current", None, "operations_failed")
+        )
+        writers.append(
+            ("async_data_queue_retry", queue_stats, "retry_queue_size_current", None, None)
+        )
+    if passive_data_sink is not None:
+        writers.append(
+            (
+                "passive_data_sink",
+                passive_data_sink.get_stats,
+                "pending_size",
+                "pending_dropped",
+                "flush_errors",
+            )
+        )
+    if structured_logger is not None:
+        writers.append(
+            (
+                "structured_logger",
+                structured_logger.get_stats,
+                "size",
+                "dropped_entries",
+                "io_errors",
+            )
+        )
+    if data_collection_manager is not None:
+        writers.append(
+            ("data_collection", data_collection_manager.get_stats, "queue_size_current", None, None)
+        )
+
+    for writer, get_stats, backlog_key, dropped_key, errors_key in writers:
+        labels = {"writer": writer}
+        gauge(
+            "writer.backlog",
+            "Items waiting in background writer queues",
+            _stat(get_stats, backlog_key),
+            labels,
+        )
+        if dropped_key is not None:
+            counter(
+                "writer.dropped",
+                "Items dropped by background writers",
+                _stat(get_stats, dropped_key),
+                labels,
+            )
+        if errors_key is not None:
+            counter(
+                "writer.errors",
+                "Background write errors",
+                _stat(get_stats, errors_key),
+                labels,
+            )
+
+    return registered
+
+
+def unregister_runtime_metrics(registry: MetricsRegistry, registered: List[MetricRef]) -> None:
+    """Удаляет метрики register_runtime_metrics, освобождая ссылки на компоненты."""
+    for name, labels in registered:
+        registry.unregister(name, labels)
@@ -0,0 +1,330 @@
+"""
+SamplingProfiler: постоянно включаемый сэмплирующий профилировщик runtime loop.
+
+В отличие от cProfile (run_loop(enable_profiling=True)), который трассирует
+каждый вызов и замедляет цикл в разы, профилировщик из отдельного потока
+с заданной частотой снимает стек потока runtime loop через
+sys._current_frames(). Поток цикла при этом ничего не делает: расходы -
+обход стека под GIL, порядка десятков микросекунд на замер.
+
+Стеки агрегируются в формате collapsed stacks ("a;b;c 42") по временным
+слотам; хранится скользящее окно последних window секунд. Вывод collapsed()
+принимают flamegraph.pl, speedscope и inferno.
+
+Профилировщик включается и выключается во время работы (start/stop), в том
+числе через API (/profile), без перезапуска экземпляра.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from types import CodeType
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLING_INTERVAL = 0.01  # секунды (100 Гц)
+DEFAULT_PROFILE_WINDOW = 60.0  # секунды
+DEFAULT_SLOT_SECONDS = 1.0
+DEFAULT_MAX_DEPTH = 128
+DEFAULT_MAX_STACKS_PER_SLOT = 5000
+
+# Стек, не поместившийся в слот из-за ограничения max_stacks_per_slot
+TRUNCATED_STACK = "[truncated]"
+# Ключ такого стека в слоте: id объекта кода не бывает отрицательным
+_TRUNCATED_KEY: Tuple[int, ...] = (-1,)
+
+
+class SamplingProfiler:
+    """
+    Сэмплирующий профилировщик одного потока.
+
+    Поток-цель задается set_target_thread() (run_loop передает свой поток);
+    пока цель не задана или поток завершился, замеры пропускаются. Поток
+    сэмплера запускается start() и останавливается stop(); после остановки
+    накопленные стеки остаются доступны до выхода из окна или reset().
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_SAMPLING_INTERVAL,
+        window: float = DEFAULT_PROFILE_WINDOW,
+        slot_seconds: float = DEFAULT_SLOT_SECONDS,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        max_stacks_per_slot: int = DEFAULT_MAX_STACKS_PER_SLOT,
+    ):
+        """
+        Args:
+            interval: Интервал между замерами (сек)
+            window: Длина скользящего окна хранимых стеков (сек)
+            slot_seconds: Длина временного слота агрегации (сек)
+            max_depth: Максимальная глубина стека (внешние кадры отбрасываются)
+            max_stacks_per_slot: Максимум различных стеков в одном слоте
+        """
+        if interval <= 0:
+            raise ValueError(f"interval должен быть положительным: {interval}")
+        if slot_seconds <= 0:
+            raise ValueError(f"slot_seconds должен быть положительным: {slot_seconds}")
+        if window < slot_seconds:
+            raise ValueError(f"window должен быть не меньше slot_seconds: {window}")
+
+        self.interval = interval
+        self.window = window
+        self.slot_seconds = slot_seconds
+        self.max_depth = max_depth
+        self.max_stacks_per_slot = max_stacks_per_slot
+
+        self._target_thread_id: Optional[int] = None
+
+        # Слоты (номер слота, {стек: число замеров}), старые вытесняются deque
+        self._slots: Deque[Tuple[int, Dict[Tuple[int, ...], int]]] = deque(
+            maxlen=max(1, int(round(window / slot_seconds)))
+        )
+        self._codes: Dict[int, CodeType] = {}
+        self._labels: Dict[int, str] = {}
+
+        self._samples = 0
+        self._missed_samples = 0
+        self._sampling_time = 0.0
+        self._running_time = 0.0
+        self._started_at: Optional[float] = None
+
+        # Слоты пишет поток сэмплера, читают обработчики API
+        self._lock = threading.Lock()
+        self._lifecycle_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Запущен ли поток сэмплера."""
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def set_target_thread(self, thread_id: Optional[int]) -> None:
+        """Задает поток, стек которого снимается (None - замеры не выполняются)."""
+        self._target_thread_id = thread_id
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """
+        Запускает поток сэмплера (повторный вызов только меняет интервал).
+
+        Args:
+            interval: Новый интервал между замерами (сек)
+        """
+        if interval is not None:
+            if interval <= 0:
+                raise ValueError(f"interval должен быть положительным: {interval}")
+            self.interval = interval
+        with self._lifecycle_lock:
+            if self.is_running:
+                return
+            self._stop_event.clear()
+            self._started_at = time.perf_counter()
+            self._thread = threading.Thread(
+                target=self._run, name="SamplingProfiler", daemon=True
+            )
+            self._thread.start()
+        logger.info(f"[PROFILING] Sampling profiler started: interval={self.interval}s")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Останавливает поток сэмплера.
+
+        Args:
+            timeout: Максимальное время ожидания потока (None - interval + 1 сек)
+        """
+        with self._lifecycle_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stop_event.set()
+            thread.join(timeout if timeout is not None else self.interval + 1.0)
+            self._thread = None
+            if self._started_at is not None:
+                self._running_time += time.perf_counter() - self._started_at
+                self._started_at = None
+        logger.info("[PROFILING] Sampling profiler stopped")
+
+    def _run(self) -> None:
+        next_sample = time.perf_counter()
+        while not self._stop_event.is_set():
+            self.sample()
+            # Расписание по дедлайнам: длительность замера не сдвигает частоту
+            next_sample += self.interval
+            delay = next_sample - time.perf_counter()
+            if delay < 0:
+                next_sample = time.perf_counter()
+                delay = 0.0
+            self._stop_event.wait(delay)
+
+    def sample(self) -> bool:
+        """
+        Снимает стек потока-цели и добавляет его в текущий слот.
+
+        Returns:
+            True, если стек снят
+        """
+        # Процессорное время потока сэмплера: ожидание GIL в расходы не входит
+        start = time.thread_time()
+        thread_id = self._target_thread_id
+        frame = sys._current_frames().get(thread_id) if thread_id is not None else None
+        if frame is None:
+            self._missed_samples += 1
+            return False
+
+        codes = []
+        depth = self.max_depth
+        while frame is not None and depth:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+            depth -= 1
+        del frame
+        codes.reverse()
+        # Ключ стека - id объектов кода: хэш самого объекта кода считается по
+        # байткоду и константам и для больших функций (run_main_loop) дорог
+        stack = tuple(map(id, codes))
+
+        slot_id = int(time.monotonic() // self.slot_seconds)
+        with self._lock:
+            if not self._slots or self._slots[-1][0] != slot_id:
+                self._slots.append((slot_id, {}))
+            counts = self._slots[-1][1]
+            count = counts.get(stack)
+            if count is None:
+                if len(counts) >= self.max_stacks_per_slot:
+                    stack = _TRUNCATED_KEY
+                    count = counts.get(stack, 0)
+                else:
+                    count = 0
+                    # Объекты кода удерживаются, чтобы их id не были переиспользованы
+                    for code in codes:
+                        self._codes.setdefault(id(code), code)
+            counts[stack] = count + 1
+            self._samples += 1
+        self._sampling_time += time.thread_time() - start
+        return True
+
+    def _label(self, code_id: int) -> str:
+        label = self._labels.get(code_id)
+        if label is None:
+            code = self._codes[code_id]
+            filename = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            # ';' разделяет кадры в формате collapsed stacks
+            label = label.replace(";", ":")
+            self._labels[code_id] = label
+        return label
+
+    def get_stacks(self, seconds: Optional[float] = None) -> Dict[str, int]:
+        """
+        Агрегированные стеки за последние seconds секунд окна.
+
+        Args:
+            seconds: Длина интервала (None - все окно)
+
+        Returns:
+            {"кадр;кадр;кадр": число замеров}, корневой кадр первым
+        """
+        with self._lock:
+            slots = list(self._slots)
+            if slots:
+                # Текущий слот продолжает заполняться - копируем его
+                slots[-1] = (slots[-1][0], dict(slots[-1][1]))
+
+        # Слоты старше окна остаются в deque, пока не вытеснены новыми замерами
+        seconds = self.window if seconds is None else min(seconds, self.window)
+        first_slot = int(time.monotonic() // self.slot_seconds) - int(seconds // self.slot_seconds)
+        slots = [slot for slot in slots if slot[0] >= first_slot]
+
+        merged: Dict[Tuple[int, ...], int] = {}
+        for _, counts in slots:
+            for stack, count in counts.items():
+                merged[stack] = merged.get(stack, 0) + count
+
+        result: Dict[str, int] = {}
+        for stack, count in merged.items():
+            key = TRUNCATED_STACK if stack == _TRUNCATED_KEY else ";".join(map(self._label, stack))
+            result[key] = result.get(key, 0) + count
+        return result
+
+    def collapsed(self, seconds: Optional[float] = None) -> str:
+        """
+        Стеки в формате collapsed stacks для построения flamegraph.
+
+        Args:
+            seconds: Длина интервала (None - все окно)
+
+        Returns:
+            Строки "кадр;кадр;кадр число_замеров", по убыванию числа замеров
+        """
+        stacks = sorted(self.get_stacks(seconds).items(), key=lambda item: -item[1])
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def top_functions(
+        self, seconds: Optional[float] = None, limit: int = 10
+    ) -> List[Tuple[str, int]]:
+        """
+        Функции с наибольшим собственным временем (по верхнему кадру стека).
+
+        Returns:
+            [(кадр, число замеров)] по убыванию
+        """
+        self_counts: Dict[str, int] = {}
+        for stack, count in self.get_stacks(seconds).items():
+            leaf = stack.rsplit(";", 1)[-1]
+            self_counts[leaf] = self_counts.get(leaf, 0) + count
+        return sorted(self_counts.items(), key=lambda item: -item[1])[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Статистика профилировщика.
+
+        sampling_time - процессорное время замеров (сек), overhead - его доля
+        от времени работы потока сэмплера.
+        """
+        running_time = self._running_time
+        if self._started_at is not None:
+            running_time += time.perf_counter() - self._started_at
+        with self._lock:
+            stacks = sum(len(counts) for _, counts in self._slots)
+        return {
+            "running": self.is_running,
+            "interval": self.interval,
+            "window": self.window,
+            "target_thread_id": self._target_thread_id,
+            "samples": self._samples,
+            "missed_samples": self._missed_samples,
+            "stacks": stacks,
+            "sampling_time": self._sampling_time,
+            "overhead": self._sampling_time / running_time if running_time > 0 else 0.0,
+        }
+
+    def reset(self) -> None:
+        """Очищает накопленные стеки и счетчики."""
+        with self._lock:
+            self._slots.clear()
+            self._samples = 0
+        self._missed_samples = 0
+        self._sampling_time = 0.0
+        self._running_time = 0.0
+        if self._started_at is not None:
+            self._started_at = time.perf_counter()
+
+
+# Глобальный экземпляр профилировщика
+_sampling_profiler: Optional[SamplingProfiler] = None
+_sampling_profiler_lock = threading.Lock()
+
+
+def get_sampling_profiler() -> SamplingProfiler:
+    """Получить глобальный сэмплирующий профилировщик."""
+    global _sampling_profiler
+    if _sampling_profiler is None:
+        with _sampling_profiler_lock:
+            if _sampling_profiler is None:
+                _sampling_profiler = SamplingProfiler()
+    return _sampling_profiler
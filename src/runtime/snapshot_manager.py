@@ -6,9 +6,13 @@ SnapshotManager: управление снапшотами состояния Li
 """
 
 import logging
-from typing import Any, Callable, Dict, Optional
+import threading
+from typing import Any, Callable, Dict, Optional, Union
 
-from src.state.self_state import SelfState
+import src.state.self_state as self_state_module
+from src.runtime.snapshot_writer import AsyncSnapshotWriter
+from src.state.self_state import CapturedSnapshot, SelfState, capture_snapshot
+from src.state.snapshot_catalog import RetentionPolicy, get_snapshot_catalog
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +23,30 @@ class SnapshotManager:
 
     Управляет периодичностью создания снапшотов на основе количества тиков,
     изолирует обработку ошибок и I/O операции от основного цикла.
+    При заданной политике хранения удаляет устаревшие снапшоты в фоне.
+
+    В асинхронном режиме поток тика только захватывает копию состояния
+    (capture_snapshot), а saver вызывается в потоке AsyncSnapshotWriter.
     """
 
-    def __init__(self, period_ticks: int, saver: Callable[[SelfState], None]):
+    def __init__(
+        self,
+        period_ticks: int,
+        saver: Callable[[Union[SelfState, CapturedSnapshot]], None],
+        retention_policy: Optional[RetentionPolicy] = None,
+        async_write: bool = False,
+        max_pending: int = 1,
+    ):
         """
         Инициализация менеджера снапшотов.
 
         Args:
             period_ticks: Периодичность снапшотов (каждые N тиков)
-            saver: Функция сохранения снапшота (например, save_snapshot)
+            saver: Функция сохранения снапшота (например, save_snapshot): получает
+                SelfState в синхронном режиме и CapturedSnapshot в асинхронном
+            retention_policy: Политика хранения снапшотов (None - хранить все)
+            async_write: Записывать снапшоты в фоновом потоке
+            max_pending: Максимум ожидающих фоновой записи снапшотов (старые вытесняются)
 
         Raises:
             ValueError: Если saver равен None или period_ticks <= 0
@@ -39,12 +58,21 @@ class SnapshotManager:
 
         self.period_ticks = period_ticks
         self.saver = saver
+        self.retention_policy = retention_policy
+        self._retention_thread: Optional[threading.Thread] = None
+        self.retention_deleted_total = 0
 
         # Статус последней операции
         self.last_operation_success: Optional[bool] = None
         self.last_operation_error: Optional[str] = None
         self.last_operation_timestamp: Optional[float] = None
 
+        self.writer: Optional[AsyncSnapshotWriter] = None
+        if async_write:
+            self.writer = AsyncSnapshotWriter(
+                saver=self.saver, max_pending=max_pending, on_complete=self._on_write_complete
+            )
+
     def should_snapshot(self, ticks: int) -> bool:
         """
         Проверяет, нужно ли делать снапшот на текущем тике.
@@ -81,6 +109,9 @@ class SnapshotManager:
 
         import time
 
+        if self.writer is not None:
+            return self._maybe_snapshot_async(self_state)
+
         if self.should_snapshot(self_state.ticks):
             try:
                 self.saver(self_state)
@@ -88,6 +119,7 @@ class SnapshotManager:
                 self.last_operation_success = True
                 self.last_operation_error = None
                 self.last_operation_timestamp = time.time()
+                self._schedule_retention()
                 return True
             except Exception as e:
                 error_msg = str(e)
@@ -103,6 +135,89 @@ class SnapshotManager:
         self.last_operation_error = None
         return False
 
+    def _maybe_snapshot_async(self, self_state: SelfState) -> bool:
+        """
+        Захватывает состояние и передает его фоновому писателю.
+
+        Статус последней операции обновляется писателем по завершении записи,
+        поэтому на тиках без снапшота он не сбрасывается.
+        """
+        import time
+
+        assert self.writer is not None
+        if not self.should_snapshot(self_state.ticks):
+            return False
+        try:
+            return self.writer.submit(capture_snapshot(self_state))
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"Ошибка при захвате snapshot: {error_msg}", exc_info=True)
+            self.last_operation_success = False
+            self.last_operation_error = error_msg
+            self.last_operation_timestamp = time.time()
+            return False
+
+    def _on_write_complete(self, captured: CapturedSnapshot, error: Optional[Exception]) -> None:
+        """Обновляет статус после фоновой записи (вызывается в потоке писателя)."""
+        import time
+
+        self.last_operation_success = error is None
+        self.last_operation_error = str(error) if error is not None else None
+        self.last_operation_timestamp = time.time()
+        if error is None:
+            self._schedule_retention()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидает записи всех захваченных снапшотов (в синхронном режиме - сразу True).
+
+        Args:
+            timeout: Максимальное время ожидания
+
+        Returns:
+            True если ожидающих снапшотов не осталось
+        """
+        if self.writer is None:
+            return True
+        return self.writer.flush(timeout)
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Останавливает фоновый писатель, дописав ожидающие снапшоты."""
+        if self.writer is not None:
+            self.writer.stop(timeout)
+
+    def _schedule_retention(self) -> None:
+        """
+        Запускает применение политики хранения в фоновом потоке.
+
+        Если предыдущий проход еще выполняется, новый не запускается:
+        следующий снапшот все равно вызовет очередной проход.
+        """
+        if self.retention_policy is None:
+            return
+        if self._retention_thread is not None and self._retention_thread.is_alive():
+            return
+        self._retention_thread = threading.Thread(
+            target=self._apply_retention, name="SnapshotRetention", daemon=True
+        )
+        self._retention_thread.start()
+
+    def _apply_retention(self) -> None:
+        """Удаляет снапшоты, не попадающие под политику хранения."""
+        if self.retention_policy is None:
+            return
+        try:
+            catalog = get_snapshot_catalog(self_state_module.SNAPSHOT_DIR)
+            self.retention_deleted_total += catalog.apply_retention(self.retention_policy)
+        except Exception as e:
+            logger.error(f"Ошибка при применении политики хранения snapshot: {e}", exc_info=True)
+
+    def wait_for_retention(self, timeout: Optional[float] = None) -> None:
+        """Ожидает завершения текущего прохода политики хранения (для тестов и shutdown)."""
+        thread = self._retention_thread
+        if thread is not None:
+            thread.join(timeout)
+
     def get_last_operation_status(self) -> Dict[str, Optional[Any]]:
         """
         Получает статус последней операции сохранения снапшота.
@@ -112,12 +227,16 @@ class SnapshotManager:
             - success: True/False/None (None если операция не выполнялась)
             - error: Сообщение об ошибке или None
             - timestamp: Время последней операции или None
+            - writer: Статистика фонового писателя (только в асинхронном режиме)
         """
-        return {
+        status: Dict[str, Optional[Any]] = {
             "success": self.last_operation_success,
             "error": self.last_operation_error,
             "timestamp": self.last_operation_timestamp,
         }
+        if self.writer is not None:
+            status["writer"] = self.writer.get_stats()
+        return status
 
     def was_last_operation_successful(self) -> Optional[bool]:
         """
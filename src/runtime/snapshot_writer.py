@@ -0,0 +1,191 @@
+"""
+AsyncSnapshotWriter: фоновая запись снапшотов состояния Life.
+
+Поток тика только захватывает копию данных состояния (capture_snapshot),
+а сериализация JSON, gzip-сжатие и атомарное переименование выполняются
+в отдельном потоке писателя.
+
+Очередь ожидающих снапшотов ограничена: если писатель не успевает, самые
+старые ожидающие снапшоты вытесняются новыми (coalescing) - на диск
+попадает самое свежее состояние, а тик никогда не блокируется.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, TypedDict
+
+from src.state.self_state import CapturedSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class _WriterStats(TypedDict):
+    """Счетчики писателя (get_stats дополняет их состоянием очереди)."""
+
+    submitted: int
+    written: int
+    coalesced: int
+    errors: int
+    last_write_duration_ms: float
+    last_written_ticks: Optional[int]
+
+
+class AsyncSnapshotWriter:
+    """
+    Фоновый писатель снапшотов.
+
+    Писатель один на процесс runtime loop; submit вызывается из потока тика.
+    """
+
+    def __init__(
+        self,
+        saver: Callable[[CapturedSnapshot], None],
+        max_pending: int = 1,
+        on_complete: Optional[Callable[[CapturedSnapshot, Optional[Exception]], None]] = None,
+    ):
+        """
+        Инициализация писателя.
+
+        Args:
+            saver: Функция записи захваченного снапшота (save_snapshot, save_delta_snapshot)
+            max_pending: Максимум ожидающих записи снапшотов (старые вытесняются)
+            on_complete: Вызывается в потоке писателя после каждой записи
+                (снапшот, исключение или None)
+
+        Raises:
+            ValueError: Если saver равен None или max_pending <= 0
+        """
+        if saver is None:
+            raise ValueError("saver cannot be None")
+        if max_pending <= 0:
+            raise ValueError("max_pending must be positive")
+
+        self.saver = saver
+        self.max_pending = max_pending
+        self.on_complete = on_complete
+
+        self._pending: Deque[CapturedSnapshot] = deque()
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._in_progress = False
+
+        self._stats: _WriterStats = {
+            "submitted": 0,
+            "written": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "last_write_duration_ms": 0.0,
+            "last_written_ticks": None,
+        }
+
+        self._thread = threading.Thread(
+            target=self._run, name="AsyncSnapshotWriter", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, captured: CapturedSnapshot) -> bool:
+        """
+        Ставит захваченный снапшот в очередь записи (не блокирует).
+
+        Args:
+            captured: Захваченные данные состояния
+
+        Returns:
+            True если снапшот принят, False если писатель остановлен
+        """
+        if self._stop_event.is_set():
+            return False
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                dropped = self._pending.popleft()
+                self._stats["coalesced"] += 1
+                logger.debug(f"Снапшот тика {dropped.ticks} вытеснен более новым")
+            self._pending.append(captured)
+            self._stats["submitted"] += 1
+            self._condition.notify()
+        return True
+
+    def _run(self) -> None:
+        """Цикл потока писателя."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._stop_event.is_set():
+                    self._condition.wait()
+                if not self._pending:
+                    return  # остановлен и очередь пуста
+                captured = self._pending.popleft()
+                self._in_progress = True
+            try:
+                self._write(captured)
+            finally:
+                with self._condition:
+                    self._in_progress = False
+                    self._condition.notify_all()
+
+    def _write(self, captured: CapturedSnapshot) -> None:
+        """Записывает один снапшот и сообщает результат."""
+        start = time.perf_counter()
+        error: Optional[Exception] = None
+        try:
+            self.saver(captured)
+            self._stats["written"] += 1
+            self._stats["last_written_ticks"] = captured.ticks
+        except Exception as e:
+            error = e
+            self._stats["errors"] += 1
+            logger.error(f"Ошибка фоновой записи snapshot {captured.ticks}: {e}", exc_info=True)
+        self._stats["last_write_duration_ms"] = (time.perf_counter() - start) * 1000
+
+        if self.on_complete is not None:
+            try:
+                self.on_complete(captured, error)
+            except Exception as e:
+                logger.error(f"Ошибка в обработчике завершения записи snapshot: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидает записи всех ожидающих снапшотов.
+
+        Args:
+            timeout: Максимальное время ожидания (None - без ограничения)
+
+        Returns:
+            True если очередь опустела, False по таймауту
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._in_progress:
+                if not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Останавливает писатель, дописав ожидающие снапшоты.
+
+        Args:
+            timeout: Максимальное время ожидания потока писателя
+        """
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика писателя."""
+        with self._condition:
+            pending = len(self._pending)
+            in_progress = self._in_progress
+        return {
+            **self._stats,
+            "pending": pending,
+            "in_progress": in_progress,
+            "max_pending": self.max_pending,
+            "writer_thread_alive": self._thread.is_alive(),
+        }
@@ -0,0 +1,444 @@
+"""
+StatusPublisher: канал публикации живого состояния для /status API.
+
+Runtime loop публикует неизменяемый, заранее сериализованный документ
+статуса не чаще publish_interval (maybe_publish), чтобы сериализация не
+ложилась на каждый тик. API отдает его напрямую, без поиска и парсинга
+snapshot-файлов и без создания нового SelfState на каждый запрос.
+
+Два канала доставки:
+- in-process: атомарная замена ссылки на PublishedStatus (двойной буфер без
+  блокировок для читателей - в CPython присваивание ссылки атомарно)
+- межпроцессный: файл data/status/live_status.json, который обновляется
+  атомарно (tmp + rename) не чаще file_publish_interval; читатели
+  (StatusFileReader) перечитывают его только при изменении stat-сигнатуры.
+
+Документ публикуется без лимитов; записи памяти (в /status они включаются
+только по memory_limit) публикуются рядом с ним, не более
+DEFAULT_PUBLISHED_MEMORY_LIMIT последних. Запросы с лимитами (memory_limit,
+events_limit, *_history_limit) получают представление опубликованного
+документа (PublishedStatus.view), которое строится один раз на документ и
+набор лимитов.
+
+Snapshot-файлы используются при холодном старте, когда ни один канал еще не
+содержит опубликованного состояния, и для запросов с memory_limit больше
+числа опубликованных записей, если память была обрезана (PublishedStatus.covers). Файл статуса старше
+max_age (runtime остановлен) не отдается, /clear-data удаляет его.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUS_DIR = Path("data/status")
+STATUS_FILE = STATUS_DIR / "live_status.json"
+DEFAULT_PUBLISH_INTERVAL = 0.25  # секунды; не чаще публикуется документ из runtime loop
+DEFAULT_FILE_PUBLISH_INTERVAL = 1.0  # секунды
+DEFAULT_MAX_FILE_AGE = 60.0  # секунды; более старый файл статуса считается брошенным
+DEFAULT_PUBLISHED_MEMORY_LIMIT = 1000  # записей памяти в опубликованном документе
+MAX_CACHED_VIEWS = 32  # представлений с лимитами на один документ
+
+# Лимиты /status, применимые к опубликованному документу -> поле документа
+STATUS_VIEW_LIMITS = {
+    "memory_limit": "memory",
+    "events_limit": "recent_events",
+    "energy_history_limit": "energy_history",
+    "stability_history_limit": "stability_history",
+    "adaptation_history_limit": "adaptation_history",
+}
+
+LimitsKey = Tuple[Tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class PublishedStatus:
+    """
+    Опубликованный документ статуса.
+
+    Attributes:
+        body: Сериализованный JSON статуса (готов к отправке клиенту)
+        etag: Строгий ETag документа (в кавычках, как в HTTP заголовке)
+        ticks: Тик, на котором документ был опубликован
+        published_at: Время публикации (time.time())
+        memory: Сериализованный JSON-массив записей памяти (для memory_limit)
+        memory_cap: Количество опубликованных записей памяти, если память
+            обрезана до него (None - опубликованы все записи)
+    """
+
+    body: bytes
+    etag: str
+    ticks: int
+    published_at: float
+    memory: bytes = b"[]"
+    memory_cap: Optional[int] = None
+    _views: Dict[LimitsKey, "PublishedStatus"] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Десериализует документ (для API, которым нужен dict)."""
+        result: Dict[str, Any] = json.loads(self.body)
+        return result
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Проверяет заголовок If-None-Match.
+
+        Args:
+            if_none_match: Значение заголовка (может содержать список ETag или *)
+
+        Returns:
+            True если клиент уже имеет актуальную версию документа
+        """
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or self.etag in candidates or f"W/{self.etag}" in candidates
+
+    def covers(self, limits: Optional[Mapping[str, int]] = None) -> bool:
+        """
+        Можно ли ответить на запрос с лимитами из опубликованного документа.
+
+        False, если memory_limit больше числа опубликованных записей памяти, а
+        память при публикации была обрезана: такой запрос обслуживается из
+        snapshot с полным лимитом.
+        """
+        if self.memory_cap is None or not limits:
+            return True
+        memory_limit = limits.get("memory_limit")
+        return memory_limit is None or memory_limit <= self.memory_cap
+
+    def view(self, limits: Optional[Mapping[str, int]] = None) -> "PublishedStatus":
+        """
+        Представление документа с лимитами больших полей, как у get_safe_status_dict.
+
+        Без лимитов возвращается сам документ. Представление строится один раз
+        на набор лимитов и живет, пока документ не заменен новым.
+
+        Args:
+            limits: Лимиты из STATUS_VIEW_LIMITS (прочие ключи игнорируются)
+
+        Returns:
+            PublishedStatus с собственными body и ETag
+        """
+        key = _limits_key(limits)
+        if not key:
+            return self
+        cached = self._views.get(key)
+        if cached is not None:
+            return cached
+
+        status = self.to_dict()
+        for name, limit in key:
+            field_name = STATUS_VIEW_LIMITS[name]
+            if name == "memory_limit":
+                memory: List[Any] = json.loads(self.memory)
+                status[field_name] = memory[-limit:] if limit > 0 else []
+            elif limit > 0 and isinstance(status.get(field_name), list):
+                status[field_name] = status[field_name][-limit:]
+        body = json.dumps(status, separators=(",", ":"), default=str).encode("utf-8")
+        view = PublishedStatus(
+            body=body,
+            etag=make_etag(body, self.ticks),
+            ticks=self.ticks,
+            published_at=self.published_at,
+        )
+        if len(self._views) >= MAX_CACHED_VIEWS:
+            self._views.clear()
+        self._views[key] = view
+        return view
+
+
+def _limits_key(limits: Optional[Mapping[str, int]]) -> LimitsKey:
+    """Нормализованный ключ лимитов представления."""
+    if not limits:
+        return ()
+    return tuple(
+        sorted(
+            (name, int(limit))
+            for name, limit in limits.items()
+            if name in STATUS_VIEW_LIMITS and limit is not None
+        )
+    )
+
+
+def make_etag(body: bytes, ticks: int) -> str:
+    """Строит ETag из тика и CRC32 тела документа."""
+    return f'"{ticks}-{zlib.crc32(body):08x}"'
+
+
+def build_published_status(
+    status_dict: Dict[str, Any],
+    memory: Optional[List[Any]] = None,
+    memory_cap: Optional[int] = None,
+) -> PublishedStatus:
+    """
+    Сериализует словарь статуса в PublishedStatus.
+
+    Args:
+        status_dict: Статус без лимитов (get_safe_status_dict())
+        memory: Записи памяти для представлений с memory_limit
+        memory_cap: Лимит, до которого обрезаны записи памяти (None - не обрезаны)
+    """
+    body = json.dumps(status_dict, separators=(",", ":"), default=str).encode("utf-8")
+    memory_body = json.dumps(memory or [], separators=(",", ":"), default=str).encode("utf-8")
+    ticks = int(status_dict.get("ticks", 0) or 0)
+    return PublishedStatus(
+        body=body,
+        etag=make_etag(body, ticks),
+        ticks=ticks,
+        published_at=time.time(),
+        memory=memory_body,
+        memory_cap=memory_cap,
+    )
+
+
+class StatusPublisher:
+    """
+    Издатель живого состояния для API.
+
+    Писатель один (runtime loop), читателей может быть сколько угодно.
+    """
+
+    def __init__(
+        self,
+        status_file: Optional[Path] = STATUS_FILE,
+        file_publish_interval: float = DEFAULT_FILE_PUBLISH_INTERVAL,
+        memory_limit: int = DEFAULT_PUBLISHED_MEMORY_LIMIT,
+        publish_interval: float = DEFAULT_PUBLISH_INTERVAL,
+    ):
+        """
+        Инициализация издателя.
+
+        Args:
+            status_file: Файл для межпроцессной публикации (None - только in-process)
+            file_publish_interval: Минимальный интервал между записями файла (секунды)
+            publish_interval: Минимальный интервал между публикациями maybe_publish (секунды)
+            memory_limit: Максимум публикуемых записей памяти (для memory_limit в
+                /status); запросы с большим лимитом обслуживаются из snapshot
+        """
+        self.status_file = Path(status_file) if status_file is not None else None
+        self.file_publish_interval = file_publish_interval
+        self.memory_limit = memory_limit
+        self.publish_interval = publish_interval
+
+        self._latest: Optional[PublishedStatus] = None
+        self._last_publish = 0.0
+        self._last_file_write = 0.0
+        self._file_lock = threading.Lock()
+
+        self._stats: Dict[str, Any] = {
+            "publications": 0,
+            "skipped_publications": 0,
+            "file_writes": 0,
+            "file_errors": 0,
+            "last_publish_duration_ms": 0.0,
+        }
+
+    def maybe_publish(self, self_state: Any) -> Optional[PublishedStatus]:
+        """
+        Публикует состояние, если с прошлой публикации прошло publish_interval.
+
+        Вызывается runtime loop на каждом тике: между публикациями тик не платит
+        за get_safe_status_dict и json.dumps, а читатели получают документ
+        не старше publish_interval.
+
+        Args:
+            self_state: Состояние Life (используется get_safe_status_dict)
+
+        Returns:
+            Опубликованный документ или None, если публикация пропущена
+        """
+        if time.time() - self._last_publish < self.publish_interval:
+            self._stats["skipped_publications"] += 1
+            return None
+        return self.publish(self_state)
+
+    def publish(self, self_state: Any) -> PublishedStatus:
+        """
+        Публикует текущее состояние без учета publish_interval.
+
+        Args:
+            self_state: Состояние Life (используется get_safe_status_dict)
+
+        Returns:
+            Опубликованный документ
+        """
+        start = time.perf_counter()
+        self._last_publish = time.time()
+        limits = {"memory_limit": self.memory_limit}
+        status_dict = dict(self_state.get_safe_status_dict(limits=limits))
+        memory = status_dict.pop("memory", None)
+        state_memory = getattr(self_state, "memory", None)
+        truncated = state_memory is not None and len(state_memory) > self.memory_limit
+        published = build_published_status(
+            status_dict, memory, self.memory_limit if truncated else None
+        )
+
+        # Атомарная замена ссылки - читатели видят либо старый, либо новый документ
+        self._latest = published
+
+        if self.status_file is not None:
+            now = time.time()
+            if now - self._last_file_write >= self.file_publish_interval:
+                self._write_status_file(published)
+                self._last_file_write = now
+
+        self._stats["publications"] += 1
+        self._stats["last_publish_duration_ms"] = (time.perf_counter() - start) * 1000
+        return published
+
+    def get_latest(self) -> Optional[PublishedStatus]:
+        """Возвращает последний опубликованный документ (None до первой публикации)."""
+        return self._latest
+
+    def clear(self) -> None:
+        """Сбрасывает опубликованное состояние и удаляет файл статуса (для /clear-data)."""
+        self._latest = None
+        self._last_publish = 0.0
+        if self.status_file is None:
+            return
+        with self._file_lock:
+            self._last_file_write = 0.0
+            try:
+                self.status_file.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._stats["file_errors"] += 1
+                logger.error(f"Не удалось удалить файл статуса {self.status_file}: {e}")
+
+    def _write_status_file(self, published: PublishedStatus) -> None:
+        """Атомарно записывает документ в файл для других процессов."""
+        assert self.status_file is not None
+        with self._file_lock:
+            try:
+                self.status_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_file = self.status_file.with_suffix(".tmp")
+                with tmp_file.open("wb") as f:
+                    # Две строки JSON: документ статуса и записи памяти; третья
+                    # строка - memory_cap, если записи памяти обрезаны
+                    data = published.body + b"\n" + published.memory
+                    if published.memory_cap is not None:
+                        data += b"\n" + str(published.memory_cap).encode("ascii")
+                    f.write(data)
+                os.replace(tmp_file, self.status_file)
+                self._stats["file_writes"] += 1
+            except OSError as e:
+                self._stats["file_errors"] += 1
+                logger.error(f"Не удалось записать файл статуса {self.status_file}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика публикаций."""
+        latest = self._latest
+        return {
+            **self._stats,
+            "published": latest is not None,
+            "published_ticks": latest.ticks if latest else None,
+        }
+
+
+class StatusFileReader:
+    """
+    Читатель файла статуса с кэшированием по stat-сигнатуре.
+
+    Файл перечитывается только если изменились inode, mtime или размер,
+    поэтому опрос /status стоит один вызов stat(). Файл, не обновлявшийся
+    дольше max_age (runtime остановлен), не отдается.
+    """
+
+    def __init__(
+        self, status_file: Path = STATUS_FILE, max_age: Optional[float] = DEFAULT_MAX_FILE_AGE
+    ):
+        """
+        Args:
+            status_file: Файл статуса
+            max_age: Максимальный возраст файла в секундах (None - без проверки)
+        """
+        self.status_file = Path(status_file)
+        self.max_age = max_age
+        self._cached: Optional[Tuple[Tuple[int, int, int], PublishedStatus]] = None
+        self._lock = threading.Lock()
+
+    def read(self) -> Optional[PublishedStatus]:
+        """
+        Возвращает опубликованный документ из файла.
+
+        Returns:
+            PublishedStatus или None, если файл отсутствует, устарел или поврежден
+        """
+        try:
+            st = os.stat(self.status_file)
+        except OSError:
+            return None
+        if self.max_age is not None and time.time() - st.st_mtime > self.max_age:
+            return None
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+        cached = self._cached
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        with self._lock:
+            try:
+                with open(self.status_file, "rb") as f:
+                    body, _, rest = f.read().partition(b"\n")
+                memory, _, memory_cap = rest.partition(b"\n")
+                ticks = int(json.loads(body).get("ticks", 0) or 0)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Не удалось прочитать файл статуса {self.status_file}: {e}")
+                return None
+            published = PublishedStatus(
+                body=body,
+                etag=make_etag(body, ticks),
+                ticks=ticks,
+                published_at=st.st_mtime,
+                memory=memory or b"[]",
+                memory_cap=int(memory_cap) if memory_cap else None,
+            )
+            self._cached = (signature, published)
+            return published
+
+
+# Глобальный экземпляр издателя
+_status_publisher: Optional[StatusPublisher] = None
+
+
+def get_status_publisher() -> StatusPublisher:
+    """Получает глобальный экземпляр издателя статуса."""
+    global _status_publisher
+    if _status_publisher is None:
+        _status_publisher = StatusPublisher()
+    return _status_publisher
+
+
+def get_published_status(
+    reader: Optional[StatusFileReader] = None,
+    limits: Optional[Mapping[str, int]] = None,
+) -> Optional[PublishedStatus]:
+    """
+    Возвращает опубликованный статус: сначала in-process, затем из файла.
+
+    Args:
+        reader: Читатель файла статуса (None - файл не используется)
+        limits: Лимиты запроса; документ, который их не покрывает
+            (PublishedStatus.covers), не возвращается
+
+    Returns:
+        PublishedStatus или None при холодном старте и при memory_limit больше
+        опубликованного - тогда статус строится из snapshot
+    """
+    published = get_status_publisher().get_latest()
+    if published is None and reader is not None:
+        published = reader.read()
+    if published is not None and not published.covers(limits):
+        return None
+    return published
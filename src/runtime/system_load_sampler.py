@@ -0,0 +1,240 @@
+"""
+SystemLoadSampler: фоновый сбор показателей нагрузки системы.
+
+Один поток раз в period секунд снимает CPU, память и loadavg через psutil
+и публикует неизменяемый SystemLoad со скользящими средними по последним
+window замерам. Читатели (AdaptiveBatchSizer, DataCollectionManager) берут
+последний опубликованный снимок без блокировок - в CPython присваивание
+ссылки атомарно - и не ждут замера на горячем пути тика.
+
+CPU измеряется через psutil.cpu_percent(interval=None): загрузка за время
+с предыдущего замера, без сна внутри вызова.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_PERIOD = 1.0  # секунды
+DEFAULT_SAMPLE_WINDOW = 10  # замеров в скользящем среднем
+
+# Безопасные значения до первого замера и при ошибке psutil
+DEFAULT_CPU_PERCENT = 50.0
+DEFAULT_MEMORY_PERCENT = 50.0
+DEFAULT_LOAD_AVG = (0.5, 0.5, 0.5)
+
+
+@dataclass(frozen=True)
+class SystemLoad:
+    """
+    Опубликованный снимок нагрузки системы.
+
+    Attributes:
+        cpu_percent: Загрузка CPU за последний период (%)
+        memory_percent: Занятая память (%)
+        load_avg: Средняя загрузка за 1, 5 и 15 минут
+        cpu_percent_avg: Скользящее среднее загрузки CPU (%)
+        memory_percent_avg: Скользящее среднее занятой памяти (%)
+        samples: Количество замеров с момента запуска (0 - значения по умолчанию)
+        timestamp: Время замера (time.time())
+    """
+
+    cpu_percent: float
+    memory_percent: float
+    load_avg: Tuple[float, float, float]
+    cpu_percent_avg: float
+    memory_percent_avg: float
+    samples: int
+    timestamp: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Метрики в формате AdaptiveBatchSizer (cpu_percent, memory_percent, load_avg, timestamp)."""
+        return {
+            "cpu_percent": self.cpu_percent,
+            "memory_percent": self.memory_percent,
+            "load_avg": self.load_avg,
+            "cpu_percent_avg": self.cpu_percent_avg,
+            "memory_percent_avg": self.memory_percent_avg,
+            "samples": self.samples,
+            "timestamp": self.timestamp,
+        }
+
+
+DEFAULT_SYSTEM_LOAD = SystemLoad(
+    cpu_percent=DEFAULT_CPU_PERCENT,
+    memory_percent=DEFAULT_MEMORY_PERCENT,
+    load_avg=DEFAULT_LOAD_AVG,
+    cpu_percent_avg=DEFAULT_CPU_PERCENT,
+    memory_percent_avg=DEFAULT_MEMORY_PERCENT,
+    samples=0,
+    timestamp=0.0,
+)
+
+
+class SystemLoadSampler:
+    """
+    Фоновый сэмплер нагрузки системы.
+
+    Поток запускается start() и останавливается stop(); после остановки
+    сэмплер можно запустить снова. Последний снимок доступен через
+    get_latest() из любого потока.
+    """
+
+    def __init__(
+        self,
+        period: float = DEFAULT_SAMPLE_PERIOD,
+        window: int = DEFAULT_SAMPLE_WINDOW,
+    ):
+        """
+        Args:
+            period: Интервал между замерами (сек)
+            window: Количество замеров в скользящем среднем
+        """
+        if period <= 0:
+            raise ValueError(f"period должен быть положительным: {period}")
+        if window <= 0:
+            raise ValueError(f"window должен быть положительным: {window}")
+
+        self.period = period
+        self.window = window
+
+        self._latest: SystemLoad = DEFAULT_SYSTEM_LOAD
+        self._cpu_window: Deque[float] = deque(maxlen=window)
+        self._memory_window: Deque[float] = deque(maxlen=window)
+        self._samples = 0
+        self._errors = 0
+
+        # Замеры выполняются из потока сэмплера или из sample() - сериализуем их
+        self._sample_lock = threading.Lock()
+        self._lifecycle_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Запущен ли поток сэмплера."""
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self) -> None:
+        """Запускает поток сэмплера (повторный вызов игнорируется)."""
+        with self._lifecycle_lock:
+            if self.is_running:
+                return
+            # Первый вызов cpu_percent(None) задает точку отсчета для следующего
+            self.sample()
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="SystemLoadSampler", daemon=True
+            )
+            self._thread.start()
+        logger.debug(f"SystemLoadSampler started: period={self.period}s, window={self.window}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Останавливает поток сэмплера.
+
+        Args:
+            timeout: Максимальное время ожидания потока (None - period + 1 сек)
+        """
+        with self._lifecycle_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stop_event.set()
+            thread.join(timeout if timeout is not None else self.period + 1.0)
+            self._thread = None
+        logger.debug("SystemLoadSampler stopped")
+
+    def get_latest(self) -> SystemLoad:
+        """Последний опубликованный снимок нагрузки (без блокировок)."""
+        return self._latest
+
+    def sample(self) -> SystemLoad:
+        """
+        Выполняет замер немедленно и публикует его.
+
+        Не блокируется на интервале измерения CPU; используется потоком
+        сэмплера и читателями, когда поток не запущен.
+        """
+        with self._sample_lock:
+            try:
+                cpu_percent = float(psutil.cpu_percent(interval=None))
+                memory_percent = float(psutil.virtual_memory().percent)
+                try:
+                    load_avg = tuple(psutil.getloadavg())
+                except (AttributeError, OSError):
+                    # getloadavg недоступен на Windows
+                    load_avg = (cpu_percent / 100.0,) * 3
+            except Exception as e:
+                self._errors += 1
+                logger.warning(f"Failed to sample system load: {e}")
+                return self._latest
+
+            self._cpu_window.append(cpu_percent)
+            self._memory_window.append(memory_percent)
+            self._samples += 1
+
+            load = SystemLoad(
+                cpu_percent=cpu_percent,
+                memory_percent=memory_percent,
+                load_avg=load_avg,
+                cpu_percent_avg=sum(self._cpu_window) / len(self._cpu_window),
+                memory_percent_avg=sum(self._memory_window) / len(self._memory_window),
+                samples=self._samples,
+                timestamp=time.time(),
+            )
+            self._latest = load
+            return load
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика сэмплера."""
+        latest = self._latest
+        return {
+            "running": self.is_running,
+            "period": self.period,
+            "window": self.window,
+            "samples": self._samples,
+            "errors": self._errors,
+            "last_sample_age": time.time() - latest.timestamp if latest.samples else None,
+        }
+
+    def _run(self) -> None:
+        """Цикл потока: замер раз в period секунд до stop()."""
+        while not self._stop_event.wait(self.period):
+            self.sample()
+
+
+# Глобальный экземпляр сэмплера
+_system_load_sampler: Optional[SystemLoadSampler] = None
+
+
+def get_system_load_sampler() -> SystemLoadSampler:
+    """Получает глобальный экземпляр сэмплера нагрузки."""
+    global _system_load_sampler
+    if _system_load_sampler is None:
+        _system_load_sampler = SystemLoadSampler()
+    return _system_load_sampler
+
+
+def get_system_load(sampler: Optional[SystemLoadSampler] = None) -> SystemLoad:
+    """
+    Возвращает актуальный снимок нагрузки.
+
+    Если поток сэмплера запущен - последний опубликованный снимок, иначе
+    немедленный неблокирующий замер.
+
+    Args:
+        sampler: Сэмплер (None - глобальный экземпляр)
+    """
+    sampler = sampler or get_system_load_sampler()
+    if sampler.is_running:
+        return sampler.get_latest()
+    return sampler.sample()
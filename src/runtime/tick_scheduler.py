@@ -0,0 +1,514 @@
+"""
+TickScheduler: планирование тика runtime loop по дедлайну с бюджетами фаз.
+
+Тик состоит из фаз (feedback, events, learning, snapshot, ...). Планировщик:
+- отсчитывает дедлайны тиков от первого тика (next_deadline += tick_interval),
+  а не спит tick_interval - elapsed, поэтому длительность сна не накапливает дрейф;
+  после перерасхода дедлайн сдвигается к текущему моменту, без серии "догоняющих" тиков;
+- замеряет фазы "кругами": end_phase(name) фиксирует время с конца предыдущей фазы,
+  и ведет по каждой фазе статистику вызовов и перерасходов бюджета;
+- откладывает некритичные периодические задачи (learning, adaptation, обслуживание
+  памяти, метрики) на тики со свободным бюджетом: задача запускается, если остаток
+  бюджета тика не меньше оценки ее длительности (EWMA прошлых запусков), и
+  принудительно - если отложена уже max_defer тиков;
+- автоматически разносит задачи с кратными интервалами по разным тикам (смещение
+  выбирается так, чтобы минимизировать совпадения с уже зарегистрированными задачами);
+- выполняет задачи без доступа к SelfState в одном фоновом потоке (run_in_background);
+- пишет длительности тиков и фаз в гистограммы реестра метрик ("tick.duration",
+  "tick.phase" с меткой phase) для снимков и эндпоинтов мониторинга.
+
+Все методы, кроме run_in_background и счетчиков ticks/tick_overruns/missed_deadlines,
+вызываются только из потока runtime loop.
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .metrics_registry import Histogram, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK_BUDGET_FRACTION = 0.8  # Доля tick_interval, доступная фазам тика
+DEFAULT_STATS_WINDOW = 1000  # Тиков в окне перцентилей длительности
+STAGGER_HORIZON = 10000  # Тиков, на которых считаются совпадения при выборе смещения
+COST_EWMA_ALPHA = 0.3  # Сглаживание оценки длительности задачи
+
+
+@dataclass
+class PhaseStats:
+    """
+    Статистика фазы тика.
+
+    Attributes:
+        budget: Бюджет фазы в секундах (None - без контроля перерасхода)
+        calls: Количество выполнений
+        total_time: Суммарная длительность (сек)
+        max_time: Максимальная длительность (сек)
+        overruns: Количество выполнений дольше бюджета
+        overrun_time: Суммарное превышение бюджета (сек)
+    """
+
+    budget: Optional[float] = None
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    overruns: int = 0
+    overrun_time: float = 0.0
+
+    def record(self, duration: float) -> None:
+        self.calls += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        if self.budget is not None and duration > self.budget:
+            self.overruns += 1
+            self.overrun_time += duration - self.budget
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budget": self.budget,
+            "calls": self.calls,
+            "avg_time": self.total_time / self.calls if self.calls else 0.0,
+            "max_time": self.max_time,
+            "overruns": self.overruns,
+            "overrun_time": self.overrun_time,
+        }
+
+
+@dataclass
+class PeriodicTask:
+    """
+    Периодическая задача тика.
+
+    Attributes:
+        name: Имя задачи (совпадает с именем фазы для замера длительности)
+        interval: Период в тиках
+        offset: Смещение: задача назначается на тики с (tick - offset) % interval == 0
+        critical: Критичная задача не откладывается
+        max_defer: Максимальная задержка в тиках, после которой задача запускается принудительно
+        next_due: Ближайший тик назначения (None - определяется при первой проверке)
+        pending_since: Тик, с которого задача ожидает запуска (None - не ожидает)
+        cost_estimate: Оценка длительности (EWMA прошлых запусков, сек)
+        runs: Количество запусков
+        deferrals: Количество тиков, на которые задача была отложена
+        forced_runs: Количество принудительных запусков после max_defer
+    """
+
+    name: str
+    interval: int
+    offset: int
+    critical: bool
+    max_defer: int
+    next_due: Optional[int] = None
+    pending_since: Optional[int] = None
+    cost_estimate: float = 0.0
+    runs: int = 0
+    deferrals: int = 0
+    forced_runs: int = 0
+
+    def first_due_at_or_after(self, tick: int) -> int:
+        """Первый тик назначения, не меньший tick (и не меньший 1)."""
+        tick = max(tick, 1)
+        remainder = (tick - self.offset) % self.interval
+        return tick if remainder == 0 else tick + self.interval - remainder
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "interval": self.interval,
+            "offset": self.offset,
+            "critical": self.critical,
+            "runs": self.runs,
+            "deferrals": self.deferrals,
+            "forced_runs": self.forced_runs,
+            "pending": self.pending_since is not None,
+            "cost_estimate": self.cost_estimate,
+        }
+
+
+class TickScheduler:
+    """
+    Планировщик тика runtime loop.
+
+    Использование в цикле:
+        scheduler.begin_tick()
+        ...                                   # фаза
+        scheduler.end_phase("events")
+        if scheduler.due("learning", tick):   # периодическая задача
+            ...
+            scheduler.end_phase("learning")
+        sleep_duration = scheduler.end_tick()
+    """
+
+    def __init__(
+        self,
+        tick_interval: float,
+        tick_budget_fraction: float = DEFAULT_TICK_BUDGET_FRACTION,
+        stats_window: int = DEFAULT_STATS_WINDOW,
+        registry: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Args:
+            tick_interval: Интервал между тиками (сек); при 0 задачи не откладываются
+            tick_budget_fraction: Доля интервала, доступная фазам тика
+            stats_window: Количество последних тиков для перцентилей длительности
+            registry: Реестр метрик для гистограмм тиков и фаз
+                (по умолчанию - собственный реестр планировщика)
+        """
+        if not 0.0 < tick_budget_fraction <= 1.0:
+            raise ValueError(f"tick_budget_fraction должен быть в (0, 1]: {tick_budget_fraction}")
+
+        self.tick_interval = max(0.0, tick_interval)
+        self.tick_budget = self.tick_interval * tick_budget_fraction
+
+        self._tasks: Dict[str, PeriodicTask] = {}
+        self._phases: Dict[str, PhaseStats] = {}
+
+        self._tick_start: Optional[float] = None
+        self._phase_mark = 0.0
+        self._next_deadline: Optional[float] = None
+        self._tick_durations: Deque[float] = deque(maxlen=stats_window)
+        self._ticks = 0
+        self._tick_overruns = 0
+        self._missed_deadlines = 0
+
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self._tick_histogram = self.registry.histogram("tick.duration")
+        self._phase_histograms: Dict[str, Histogram] = {}
+
+        # Фоновый исполнитель задач без доступа к SelfState
+        self._background_queue: "queue.Queue[Optional[Tuple[str, Callable[[], Any]]]]" = (
+            queue.Queue()
+        )
+        self._background_thread: Optional[threading.Thread] = None
+        self._background_lock = threading.Lock()
+        self._background_active: Dict[str, bool] = {}
+        self._background_stats: Dict[str, Dict[str, Any]] = {}
+
+    # === Регистрация ===
+
+    def set_phase_budget(self, name: str, budget: Optional[float]) -> None:
+        """Задает бюджет фазы в секундах (None - без контроля перерасхода)."""
+        self._phase(name).budget = budget
+
+    def register(
+        self,
+        name: str,
+        interval: int,
+        budget: Optional[float] = None,
+        critical: bool = False,
+        max_defer: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> PeriodicTask:
+        """
+        Регистрирует периодическую задачу.
+
+        Args:
+            name: Имя задачи и ее фазы
+            interval: Период в тиках
+            budget: Бюджет фазы задачи (сек)
+            critical: Не откладывать задачу
+            max_defer: Максимальная задержка в тиках (None - половина периода)
+            offset: Смещение в тиках (None - подобрать автоматически)
+
+        Returns:
+            PeriodicTask
+        """
+        if interval <= 0:
+            raise ValueError(f"interval должен быть положительным: {interval}")
+        if offset is None:
+            offset = self._choose_offset(interval)
+        task = PeriodicTask(
+            name=name,
+            interval=interval,
+            offset=offset % interval,
+            critical=critical,
+            max_defer=max_defer if max_defer is not None else max(1, interval // 2),
+        )
+        self._tasks[name] = task
+        self.set_phase_budget(name, budget)
+        return task
+
+    def _choose_offset(self, interval: int) -> int:
+        """Смещение с минимальным числом совпадений с уже зарегистрированными задачами."""
+        if not self._tasks:
+            return 0
+        best_offset = 0
+        best_collisions = None
+        for offset in range(interval):
+            collisions = 0
+            for task in self._tasks.values():
+                # Совпадения t ≡ offset (mod interval) и t ≡ task.offset (mod task.interval)
+                # существуют, только если разность смещений делится на НОД периодов
+                gcd = math.gcd(interval, task.interval)
+                if (offset - task.offset) % gcd == 0:
+                    lcm = interval // gcd * task.interval
+                    collisions += max(1, STAGGER_HORIZON // lcm)
+            if best_collisions is None or collisions < best_collisions:
+                best_offset, best_collisions = offset, collisions
+                if collisions == 0:
+                    break
+        return best_offset
+
+    # === Тик ===
+
+    def begin_tick(self) -> None:
+        """Отмечает начало тика."""
+        now = time.monotonic()
+        self._tick_start = now
+        self._phase_mark = now
+        if self._next_deadline is None or now - self._next_deadline > self.tick_interval:
+            # Первый тик или тик после долгой паузы (например, исключения)
+            self._next_deadline = now + self.tick_interval
+
+    def end_phase(self, name: str) -> float:
+        """
+        Завершает фазу: длительность - время с конца предыдущей фазы (или начала тика).
+
+        Returns:
+            Длительность фазы (сек)
+        """
+        now = time.monotonic()
+        duration = now - self._phase_mark
+        self._phase_mark = now
+        self._phase(name).record(duration)
+        histogram = self._phase_histograms.get(name)
+        if histogram is None:
+            histogram = self._phase_histograms[name] = self.registry.histogram(
+                "tick.phase", labels={"phase": name}
+            )
+        histogram.observe(duration)
+        task = self._tasks.get(name)
+        if task is not None:
+            if task.cost_estimate == 0.0:
+                task.cost_estimate = duration
+            else:
+                task.cost_estimate += COST_EWMA_ALPHA * (duration - task.cost_estimate)
+        return duration
+
+    def skip_phase(self) -> None:
+        """Исключает время с конца предыдущей фазы из замера следующей."""
+        self._phase_mark = time.monotonic()
+
+    def remaining(self) -> float:
+        """Остаток бюджета текущего тика (сек)."""
+        if self._tick_start is None:
+            return self.tick_budget
+        return self.tick_budget - (time.monotonic() - self._tick_start)
+
+    def end_tick(self) -> float:
+        """
+        Завершает тик и возвращает длительность сна до дедлайна следующего тика.
+
+        Returns:
+            Длительность сна (сек, >= 0)
+        """
+        now = time.monotonic()
+        if self._tick_start is None:
+            return self.tick_interval
+        duration = now - self._tick_start
+        self._tick_durations.append(duration)
+        self._tick_histogram.observe(duration)
+        self._ticks += 1
+        if duration > self.tick_interval:
+            self._tick_overruns += 1
+
+        deadline = self._next_deadline if self._next_deadline is not None else now
+        if now >= deadline:
+            # Дедлайн пропущен: следующий тик начинается сразу, отсчет от текущего момента
+            if now > deadline:
+                self._missed_deadlines += 1
+            self._next_deadline = now + self.tick_interval
+            sleep_duration = 0.0
+        else:
+            sleep_duration = deadline - now
+            self._next_deadline = deadline + self.tick_interval
+        self._tick_start = None
+        return sleep_duration
+
+    # === Периодические задачи ===
+
+    def due(self, name: str, tick: int) -> bool:
+        """
+        Проверяет, нужно ли выполнить периодическую задачу на этом тике.
+
+        Задача назначается по своему периоду и смещению и запускается на первом
+        тике со свободным бюджетом (или по истечении max_defer). Вызывается на
+        каждом тике; после True задача должна быть выполнена и завершена end_phase(name).
+        """
+        task = self._tasks[name]
+        if task.next_due is None:
+            task.next_due = task.first_due_at_or_after(tick)
+        if task.pending_since is None:
+            if tick < task.next_due:
+                return False
+            task.pending_since = tick
+        if not self._admit(task, tick):
+            return False
+        task.next_due = task.first_due_at_or_after(tick + 1)
+        return True
+
+    def admit(self, name: str, tick: int) -> bool:
+        """
+        Допускает запуск задачи, необходимость которой определил вызывающий код
+        (например, по накопленным счетчикам), с учетом свободного бюджета.
+
+        После True задача должна быть выполнена и завершена end_phase(name).
+        """
+        task = self._tasks[name]
+        if task.pending_since is None:
+            task.pending_since = tick
+        return self._admit(task, tick)
+
+    def _admit(self, task: PeriodicTask, tick: int) -> bool:
+        if not task.critical and self.tick_interval > 0:
+            pending_since = task.pending_since if task.pending_since is not None else tick
+            waited = tick - pending_since
+            if waited < task.max_defer:
+                # Оценка не выше бюджета фазы: единичный выброс длительности
+                # не должен откладывать задачу до max_defer
+                estimate = task.cost_estimate
+                budget = self._phase(task.name).budget
+                if budget is not None:
+                    estimate = min(estimate, budget)
+                if self.remaining() < estimate:
+                    task.deferrals += 1
+                    return False
+            else:
+                task.forced_runs += 1
+        task.pending_since = None
+        task.runs += 1
+        # Время ожидания решения не относится к фазе задачи
+        self.skip_phase()
+        return True
+
+    # === Фоновый исполнитель ===
+
+    def run_in_background(self, name: str, fn: Callable[[], Any]) -> bool:
+        """
+        Ставит задачу в фоновый поток.
+
+        Если предыдущий запуск задачи с тем же именем еще не завершен,
+        новый не ставится.
+
+        Returns:
+            True если задача поставлена в очередь
+        """
+        with self._background_lock:
+            stats = self._background_stats.setdefault(
+                name, {"runs": 0, "skipped": 0, "failures": 0, "last_duration": 0.0}
+            )
+            if self._background_active.get(name):
+                stats["skipped"] += 1
+                return False
+            self._background_active[name] = True
+            if self._background_thread is None or not self._background_thread.is_alive():
+                self._background_thread = threading.Thread(
+                    target=self._background_worker, name="TickSchedulerWorker", daemon=True
+                )
+                self._background_thread.start()
+        self._background_queue.put((name, fn))
+        return True
+
+    def _background_worker(self) -> None:
+        while True:
+            item = self._background_queue.get()
+            if item is None:
+                return
+            name, fn = item
+            start = time.monotonic()
+            failed = False
+            try:
+                fn()
+            except Exception as e:
+                failed = True
+                logger.warning(f"Фоновая задача {name} завершилась ошибкой: {e}")
+            with self._background_lock:
+                stats = self._background_stats[name]
+                stats["runs"] += 1
+                stats["failures"] += int(failed)
+                stats["last_duration"] = time.monotonic() - start
+                self._background_active[name] = False
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Останавливает фоновый поток, дождавшись поставленных задач."""
+        with self._background_lock:
+            thread = self._background_thread
+            self._background_thread = None
+        if thread is not None and thread.is_alive():
+            self._background_queue.put(None)
+            thread.join(timeout)
+
+    # === Статистика ===
+
+    @property
+    def ticks(self) -> int:
+        """Количество завершенных тиков."""
+        return self._ticks
+
+    @property
+    def tick_overruns(self) -> int:
+        """Количество тиков дольше tick_interval."""
+        return self._tick_overruns
+
+    @property
+    def missed_deadlines(self) -> int:
+        """Количество пропущенных дедлайнов тиков."""
+        return self._missed_deadlines
+
+    def _phase(self, name: str) -> PhaseStats:
+        stats = self._phases.get(name)
+        if stats is None:
+            stats = self._phases[name] = PhaseStats()
+        return stats
+
+    def get_tick_percentiles(self) -> Dict[str, float]:
+        """Перцентили длительности тика по окну последних тиков (сек)."""
+        if not self._tick_durations:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        durations = sorted(self._tick_durations)
+        last = len(durations) - 1
+        return {
+            "p50": durations[int(last * 0.50)],
+            "p95": durations[int(last * 0.95)],
+            "p99": durations[int(last * 0.99)],
+            "max": durations[last],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика тиков, фаз, периодических и фоновых задач."""
+        with self._background_lock:
+            background = {name: dict(stats) for name, stats in self._background_stats.items()}
+        return {
+            "tick_interval": self.tick_interval,
+            "tick_budget": self.tick_budget,
+            "ticks": self._ticks,
+            "tick_overruns": self._tick_overruns,
+            "missed_deadlines": self._missed_deadlines,
+            "tick_duration": self.get_tick_percentiles(),
+            "phases": {name: stats.to_dict() for name, stats in self._phases.items()},
+            "tasks": {name: task.to_dict() for name, task in self._tasks.items()},
+            "background": background,
+        }
+
+    def format_summary(self) -> str:
+        """Краткая сводка для лога: перцентили тика и фазы с перерасходом бюджета."""
+        percentiles = self.get_tick_percentiles()
+        overrun_phases = ", ".join(
+            f"{name}={stats.overruns}/{stats.calls}"
+            for name, stats in self._phases.items()
+            if stats.overruns
+        )
+        deferrals = ", ".join(
+            f"{name}={task.deferrals}" for name, task in self._tasks.items() if task.deferrals
+        )
+        return (
+            f"tick p50={percentiles['p50'] * 1000:.1f}ms p99={percentiles['p99'] * 1000:.1f}ms "
+            f"max={percentiles['max'] * 1000:.1f}ms, overruns={self._tick_overruns}/{self._ticks}, "
+            f"phase_overruns=[{overrun_phases}], deferrals=[{deferrals}]"
+        )
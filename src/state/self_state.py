@@ -4,7 +4,7 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Any, Dict, List, TYPE_CHECKING
+from typing import Optional, Any, Dict, List, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from src.experimental.memory_hierarchy.hierarchy_manager import MemoryHierarchyManager
@@ -20,6 +20,16 @@ from .components.time_state import TimeState
 from .components.memory_state import MemoryState
 from .components.cognitive_state import CognitiveState
 from .components.event_state import EventState
+from .snapshot_catalog import get_snapshot_catalog, snapshot_checksum
+from .snapshot_codec import BinarySnapshotCodec, get_codec, get_configured_snapshot_format
+from .snapshot_delta import (
+    DeltaChain,
+    build_delta,
+    encode_snapshot_fields,
+    join_full_snapshot,
+    read_snapshot_data,
+    snapshot_path_for_tick,
+)
 
 # Папка для снимков
 SNAPSHOT_DIR = Path("data/snapshots")
@@ -2036,32 +2046,29 @@ class SelfState(SerializationContract, ThreadSafeSerializable):
         return history
 
     def load_latest_snapshot(self) -> "SelfState":
-        # Найти последний snapshot_*.json
-        snapshots = list(SNAPSHOT_DIR.glob("snapshot_*.json"))
-        if not snapshots:
+        # Последний snapshot ищется по каталогу, без glob/sort всей директории
+        catalog = get_snapshot_catalog(SNAPSHOT_DIR)
+        latest = catalog.latest()
+        if latest is None:
             raise FileNotFoundError("No snapshots found")
-        # Сортировать по номеру тика
-        snapshots.sort(key=lambda p: int(p.stem.split("_")[1]))
-        latest = snapshots[-1]
 
         import logging
 
         logger = logging.getLogger(__name__)
 
         try:
-            with latest.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            logger.error(f"Failed to parse snapshot file {latest}: {e}")
+            data = read_snapshot_data(catalog.path_for(latest))
+        except (ValueError, UnicodeDecodeError, OSError, EOFError) as e:
+            logger.error(f"Failed to parse snapshot file {catalog.path_for(latest)}: {e}")
             # Попробовать предыдущий snapshot, если есть
-            if len(snapshots) > 1:
-                prev_snapshot = snapshots[-2]
-                logger.warning(f"Trying previous snapshot: {prev_snapshot}")
+            prev_snapshot = catalog.at_or_before(latest.tick - 1)
+            if prev_snapshot is not None:
+                prev_path = catalog.path_for(prev_snapshot)
+                logger.warning(f"Trying previous snapshot: {prev_path}")
                 try:
-                    with prev_snapshot.open("r", encoding="utf-8") as f:
-                        data = json.load(f)
-                    logger.info(f"Successfully loaded previous snapshot: {prev_snapshot}")
-                except (json.JSONDecodeError, UnicodeDecodeError) as e2:
+                    data = read_snapshot_data(prev_path)
+                    logger.info(f"Successfully loaded previous snapshot: {prev_path}")
+                except (ValueError, UnicodeDecodeError, OSError, EOFError) as e2:
                     logger.error(f"Previous snapshot also corrupted: {e2}")
                     raise RuntimeError(
                         f"All available snapshots are corrupted. Latest: {e}, Previous: {e2}"
@@ -2218,9 +2225,65 @@ def create_initial_state() -> SelfState:
     return state
 
 
-def save_snapshot(state: SelfState, compress_large: bool = True):
+@dataclass(frozen=True)
+class CapturedSnapshot:
     """
-    Сохраняет текущее состояние жизни как отдельный JSON файл.
+    Снимок данных состояния, захваченный для отложенной записи.
+
+    Содержит независимую от живого SelfState копию данных snapshot, поэтому
+    сериализация, сжатие и запись могут выполняться в другом потоке.
+
+    Attributes:
+        ticks: Тик, на котором захвачено состояние
+        data: Данные snapshot (как _create_optimized_snapshot_data)
+        captured_at: Время захвата (time.time())
+    """
+
+    ticks: int
+    data: Dict[str, Any]
+    captured_at: float
+
+
+def _copy_containers(value: Any) -> Any:
+    """Копирует вложенные dict/list, не трогая скалярные значения и прочие объекты."""
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    return value
+
+
+def capture_snapshot(state: SelfState) -> CapturedSnapshot:
+    """
+    Захватывает согласованную копию данных snapshot под _api_lock.
+
+    Копируются только контейнеры (dict/list), без сериализации - это
+    дешевая часть сохранения, которая выполняется на потоке тика.
+
+    Args:
+        state: Состояние для захвата
+
+    Returns:
+        CapturedSnapshot для save_snapshot / save_delta_snapshot
+    """
+    logging_was_enabled = state._logging_enabled
+    state.disable_logging()
+    try:
+        with state._api_lock:
+            data = _copy_containers(state._create_optimized_snapshot_data())
+    finally:
+        if logging_was_enabled:
+            state.enable_logging()
+    return CapturedSnapshot(ticks=data["ticks"], data=data, captured_at=time.time())
+
+
+def save_snapshot(
+    state: Union[SelfState, CapturedSnapshot],
+    compress_large: bool = True,
+    snapshot_format: Optional[str] = None,
+):
+    """
+    Сохраняет текущее состояние жизни как отдельный файл (JSON или бинарный).
     Оптимизированная сериализация с компрессией больших файлов.
 
     ПРИМЕЧАНИЕ: Логирование временно отключается во время сериализации для производительности.
@@ -2231,12 +2294,19 @@ def save_snapshot(state: SelfState, compress_large: bool = True):
     а не внутри этой функции. Это обеспечивает правильное разделение ответственности.
 
     Args:
-        state: Состояние для сохранения
+        state: Состояние для сохранения или захваченный capture_snapshot снимок
         compress_large: Если True, использует gzip компрессию для больших snapshots (>50KB)
+        snapshot_format: Формат файла ("json", "binary"); None - snapshots.format из конфигурации
     """
-    import gzip
     from src.runtime.performance_metrics import measure_time
 
+    codec = get_codec(snapshot_format or get_configured_snapshot_format())
+
+    if isinstance(state, CapturedSnapshot):
+        with measure_time("save_snapshot"):
+            _write_snapshot_data(state.data, codec.name, compress_large)
+        return
+
     # Временно отключаем логирование для сериализации
     # Это предотвращает логирование изменений, которые могут произойти при конвертации dataclass
     logging_was_enabled = state._logging_enabled
@@ -2246,52 +2316,7 @@ def save_snapshot(state: SelfState, compress_large: bool = True):
         with measure_time("save_snapshot"):
             # Создаем snapshot с оптимизацией
             snapshot = state._create_optimized_snapshot_data()
-
-            tick = snapshot["ticks"]
-            filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json"
-
-            # Атомарная замена: сначала пишем во временный файл, затем переименовываем
-            temp_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.tmp"
-
-            # Проверяем размер данных для решения о компрессии
-            json_str = json.dumps(snapshot, separators=(",", ":"), default=str)
-            data_size = len(json_str.encode("utf-8"))
-
-            # Компрессия для больших файлов (>50KB)
-            if compress_large and data_size > 50 * 1024:
-                compressed_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json.gz"
-                compressed_temp = SNAPSHOT_DIR / f"snapshot_{tick:06d}.tmp.gz"
-
-                # Пишем сжатый файл
-                with gzip.open(compressed_temp, "wt", encoding="utf-8", compresslevel=6) as f:
-                    f.write(json_str)
-
-                # Атомарное переименование сжатого файла
-                compressed_temp.replace(compressed_filename)
-
-                # Удаляем несжатый файл если существует
-                if filename.exists():
-                    filename.unlink()
-
-                # Создаем символическую ссылку для обратной совместимости
-                try:
-                    if not filename.exists():
-                        filename.symlink_to(compressed_filename.name + ".gz")
-                except OSError:
-                    # Игнорируем ошибки создания symlink (например, на Windows)
-                    pass
-            else:
-                # Стандартная запись без компрессии
-                with temp_filename.open("w") as f:
-                    f.write(json_str)
-
-                # Атомарное переименование
-                temp_filename.replace(filename)
-
-                # Удаляем сжатый файл если существует
-                compressed_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json.gz"
-                if compressed_filename.exists():
-                    compressed_filename.unlink()
+            _write_snapshot_data(snapshot, codec.name, compress_large)
     finally:
         # Восстанавливаем логирование
         if logging_was_enabled:
@@ -2588,33 +2613,241 @@ def save_snapshot(state: SelfState, compress_large: bool = True):
         return trends
 
 
-def load_snapshot(tick: int) -> SelfState:
+def _write_snapshot_data(
+    snapshot: Dict[str, Any], snapshot_format: str, compress_large: bool = True
+) -> None:
+    """Сериализует данные snapshot в заданном формате и записывает файл."""
+    if snapshot_format == BinarySnapshotCodec.name:
+        _write_binary_snapshot(snapshot, compress_large)
+    else:
+        json_str = json.dumps(snapshot, separators=(",", ":"), default=str)
+        _write_full_snapshot(snapshot["ticks"], json_str, compress_large)
+
+
+def _write_binary_snapshot(snapshot: Dict[str, Any], compress_large: bool = True) -> None:
     """
-    Загружает снимок по номеру тика с валидацией параметров.
-    Поддерживает как обычные, так и сжатые (gzip) файлы.
+    Атомарно записывает бинарный snapshot и регистрирует его в каталоге.
+
+    Args:
+        snapshot: Данные snapshot
+        compress_large: Если True, сжимает тело больших snapshots (>50KB)
+    """
+    tick = snapshot["ticks"]
+    payload = get_codec(BinarySnapshotCodec.name).encode(snapshot, compress_large)
+
+    filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.bin"
+    temp_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.bin.tmp"
+    with temp_filename.open("wb") as f:
+        f.write(payload)
+    temp_filename.replace(filename)
+
+    # JSON-варианты того же тика перекрывали бы бинарный snapshot при загрузке
+    for suffix in (".json", ".json.gz", ".delta.json"):
+        stale = SNAPSHOT_DIR / f"snapshot_{tick:06d}{suffix}"
+        if stale.exists() or stale.is_symlink():
+            stale.unlink()
+
+    _record_snapshot_in_catalog(tick, filename, snapshot_checksum(payload))
+
+
+def _write_full_snapshot(tick: int, json_str: str, compress_large: bool = True) -> None:
+    """
+    Атомарно записывает полный snapshot и регистрирует его в каталоге.
+
+    Args:
+        tick: Тик snapshot
+        json_str: Сериализованные данные snapshot
+        compress_large: Если True, использует gzip компрессию для больших snapshots (>50KB)
     """
     import gzip
-    from src.runtime.performance_metrics import measure_time
 
     filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json"
-    compressed_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json.gz"
 
-    with measure_time("load_snapshot"):
-        # Проверяем обычный файл
+    # Атомарная замена: сначала пишем во временный файл, затем переименовываем
+    temp_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.tmp"
+
+    # Проверяем размер данных для решения о компрессии
+    json_bytes = json_str.encode("utf-8")
+    data_size = len(json_bytes)
+
+    # Компрессия для больших файлов (>50KB)
+    if compress_large and data_size > 50 * 1024:
+        compressed_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json.gz"
+        compressed_temp = SNAPSHOT_DIR / f"snapshot_{tick:06d}.tmp.gz"
+
+        # Пишем сжатый файл
+        with gzip.open(compressed_temp, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(json_str)
+
+        # Атомарное переименование сжатого файла
+        compressed_temp.replace(compressed_filename)
+
+        # Удаляем несжатый файл если существует
         if filename.exists():
-            with filename.open("r") as f:
-                data = json.load(f)
-        # Проверяем сжатый файл
-        elif compressed_filename.exists():
-            with gzip.open(compressed_filename, "rt", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
+            filename.unlink()
+
+        # Создаем символическую ссылку для обратной совместимости
+        try:
+            if not filename.exists():
+                filename.symlink_to(compressed_filename.name + ".gz")
+        except OSError:
+            # Игнорируем ошибки создания symlink (например, на Windows)
+            pass
+    else:
+        # Стандартная запись без компрессии
+        with temp_filename.open("w") as f:
+            f.write(json_str)
+
+        # Атомарное переименование
+        temp_filename.replace(filename)
+
+        # Удаляем сжатый файл если существует
+        compressed_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.json.gz"
+        if compressed_filename.exists():
+            compressed_filename.unlink()
+
+    # Полный snapshot заменяет дельту и бинарный snapshot того же тика, если они были
+    for suffix in (".delta.json", ".bin"):
+        stale = SNAPSHOT_DIR / f"snapshot_{tick:06d}{suffix}"
+        if stale.exists():
+            stale.unlink()
+
+    _record_snapshot_in_catalog(
+        tick,
+        compressed_filename if compress_large and data_size > 50 * 1024 else filename,
+        snapshot_checksum(json_bytes),
+    )
+
+
+def _write_delta_snapshot(tick: int, delta_str: str, parent_tick: int) -> None:
+    """Атомарно записывает дельту snapshot и регистрирует ее в каталоге."""
+    filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.delta.json"
+    temp_filename = SNAPSHOT_DIR / f"snapshot_{tick:06d}.delta.tmp"
+    delta_bytes = delta_str.encode("utf-8")
+    with temp_filename.open("wb") as f:
+        f.write(delta_bytes)
+    temp_filename.replace(filename)
+
+    # Устаревший полный snapshot того же тика (от прошлого запуска) не должен перекрывать дельту
+    for suffix in (".json", ".json.gz", ".bin"):
+        stale = SNAPSHOT_DIR / f"snapshot_{tick:06d}{suffix}"
+        if stale.exists() or stale.is_symlink():
+            stale.unlink()
+    _record_snapshot_in_catalog(
+        tick, filename, snapshot_checksum(delta_bytes), parent_tick=parent_tick
+    )
+
+
+# Цепочки дельт по директориям snapshot (SNAPSHOT_DIR может подменяться в тестах)
+_delta_chains: Dict[Path, DeltaChain] = {}
+
+
+def save_delta_snapshot(
+    state: Union[SelfState, CapturedSnapshot], full_every: int = 10, compress_large: bool = True
+):
+    """
+    Сохраняет snapshot в режиме дельт.
+
+    Полный snapshot (база) пишется раз в full_every снимков, между ними -
+    компактные дельты относительно предыдущего снимка (изменившиеся поля,
+    добавленные и удаленные записи памяти). load_snapshot и
+    load_latest_snapshot восстанавливают любой тик, применяя дельты к базе.
+
+    Полный snapshot пишется также при первом сохранении в процессе, при
+    откате тиков назад и если файл предыдущего снимка пропал.
+
+    Args:
+        state: Состояние для сохранения или захваченный capture_snapshot снимок
+        full_every: Периодичность полных snapshot (1 - только полные)
+        compress_large: Если True, использует gzip компрессию для больших баз (>50KB)
+    """
+    from src.runtime.performance_metrics import measure_time
+
+    if full_every <= 0:
+        raise ValueError("full_every must be positive")
+
+    captured = isinstance(state, CapturedSnapshot)
+    logging_was_enabled = not captured and state._logging_enabled
+    if not captured:
+        state.disable_logging()
+
+    try:
+        with measure_time("save_delta_snapshot"):
+            snapshot = state.data if captured else state._create_optimized_snapshot_data()
+            tick = snapshot["ticks"]
+            encoded = encode_snapshot_fields(snapshot)
+
+            key = SNAPSHOT_DIR.resolve()
+            chain = _delta_chains.get(key)
+            need_base = (
+                chain is None
+                or chain.deltas_since_base + 1 >= full_every
+                or tick <= chain.tick
+                or snapshot_path_for_tick(SNAPSHOT_DIR, chain.tick) is None
+            )
+
+            if need_base:
+                _write_full_snapshot(tick, join_full_snapshot(encoded), compress_large)
+                _delta_chains[key] = DeltaChain(base_tick=tick, tick=tick, encoded=encoded)
+            else:
+                assert chain is not None
+                delta_str = build_delta(chain.encoded, encoded, tick, chain.tick, chain.base_tick)
+                _write_delta_snapshot(tick, delta_str, chain.tick)
+                chain.tick = tick
+                chain.encoded = encoded
+                chain.deltas_since_base += 1
+    finally:
+        if logging_was_enabled:
+            state.enable_logging()
+
+
+def _record_snapshot_in_catalog(
+    tick: int, path: Path, checksum: str, parent_tick: Optional[int] = None
+) -> None:
+    """Регистрирует сохраненный snapshot в каталоге (ошибки каталога не прерывают сохранение)."""
+    try:
+        get_snapshot_catalog(SNAPSHOT_DIR).record(
+            tick,
+            path,
+            size=path.stat().st_size,
+            compressed=path.suffix == ".gz",
+            checksum=checksum,
+            parent_tick=parent_tick,
+        )
+    except Exception as e:
+        logger.warning(f"Не удалось зарегистрировать snapshot {tick} в каталоге: {e}")
+
+
+def load_snapshot(tick: int) -> SelfState:
+    """
+    Загружает снимок по номеру тика с валидацией параметров.
+    Поддерживает обычные, сжатые (gzip), бинарные файлы и дельты (восстанавливаются от базы).
+    """
+    from src.runtime.performance_metrics import measure_time
+
+    with measure_time("load_snapshot"):
+        # Порядок поиска: обычный, сжатый, бинарный файл, дельта
+        path = snapshot_path_for_tick(SNAPSHOT_DIR, tick)
+        if path is None:
             raise FileNotFoundError(f"Snapshot {tick} не найден")
+        data = read_snapshot_data(path)
 
         # Создаем временный экземпляр для доступа к методам валидации
         temp_state = SelfState()
         return temp_state._load_snapshot_from_data(data)
 
 
+def load_snapshot_at_or_before(tick: int) -> SelfState:
+    """
+    Загружает ближайший снимок на тике tick или раньше.
+
+    Поиск выполняется по каталогу snapshot (O(log n)), без сканирования директории.
+    """
+    record = get_snapshot_catalog(SNAPSHOT_DIR).at_or_before(tick)
+    if record is None:
+        raise FileNotFoundError(f"Snapshot на тике {tick} или раньше не найден")
+    return load_snapshot(record.tick)
+
+
 # Инициализация логгера для модуля
 logger = get_logger(__name__)
@@ -0,0 +1,495 @@
+"""
+SnapshotCatalog: индекс каталога snapshot-файлов.
+
+Хранит в SQLite (data/snapshots/catalog.sqlite3) запись о каждом snapshot:
+тик, имя файла, размер, сжатие и контрольную сумму. Это дает:
+- поиск последнего snapshot без glob/sort всего каталога
+- поиск snapshot "на тике N или раньше" за O(log n) по первичному ключу
+- политику хранения (последние K + прореживание по часам/дням)
+
+Файлы, записанные или удаленные в обход каталога (другим процессом, вручную),
+подхватываются сверкой с каталогом при чтении, которая выполняется только когда
+меняется mtime директории. record() не сверяет каталог: переименование своего
+файла в директорию меняет ее mtime, и сверка на каждом сохранении снова
+сделала бы его O(n).
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .snapshot_codec import decode_binary_snapshot
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "catalog.sqlite3"
+SNAPSHOT_NAME_RE = re.compile(r"^snapshot_(\d+)\.(json|json\.gz|bin|delta\.json)$")
+# Предпочтение при нескольких файлах одного тика: полный, сжатый, бинарный, дельта
+_SUFFIX_PRIORITY = {"json": 0, "json.gz": 1, "bin": 2, "delta.json": 3}
+
+
+@dataclass(frozen=True)
+class SnapshotRecord:
+    """Запись каталога о snapshot-файле."""
+
+    tick: int
+    filename: str
+    size: int
+    compressed: bool
+    checksum: Optional[str]
+    created_at: float
+    parent_tick: Optional[int] = None
+
+    @property
+    def is_delta(self) -> bool:
+        """Является ли snapshot дельтой относительно parent_tick."""
+        return self.parent_tick is not None
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    Политика хранения snapshot.
+
+    Attributes:
+        keep_last: Сколько последних snapshot хранить всегда
+        hourly_hours: Сколько часов хранить по одному snapshot на час
+        daily_days: Сколько дней хранить по одному snapshot на день
+    """
+
+    keep_last: int = 100
+    hourly_hours: int = 24
+    daily_days: int = 30
+
+    def select_for_deletion(
+        self, records: List[SnapshotRecord], now: Optional[float] = None
+    ) -> List[SnapshotRecord]:
+        """
+        Выбирает snapshot для удаления.
+
+        Args:
+            records: Записи каталога в любом порядке
+            now: Текущее время (по умолчанию time.time())
+
+        Returns:
+            Записи, которые политика не сохраняет (дельты сохраненных
+            snapshot не удаляются вместе со своей цепочкой до базы)
+        """
+        if now is None:
+            now = time.time()
+        ordered = sorted(records, key=lambda r: r.tick, reverse=True)
+
+        seen_hours = set()
+        seen_days = set()
+        to_delete = []
+        for index, record in enumerate(ordered):
+            if index < max(1, self.keep_last):
+                continue
+            age = now - record.created_at
+            if age <= self.hourly_hours * 3600:
+                bucket = int(record.created_at // 3600)
+                if bucket not in seen_hours:
+                    seen_hours.add(bucket)
+                    continue
+            elif age <= self.daily_days * 86400:
+                bucket = int(record.created_at // 86400)
+                if bucket not in seen_days:
+                    seen_days.add(bucket)
+                    continue
+            to_delete.append(record)
+
+        if not to_delete:
+            return to_delete
+
+        # Сохраняем цепочки дельт сохраняемых snapshot до ближайшей базы
+        by_tick = {record.tick: record for record in ordered}
+        deleted_ticks = {record.tick for record in to_delete}
+        for record in ordered:
+            if record.tick in deleted_ticks:
+                continue
+            parent = record.parent_tick
+            while parent is not None and parent in by_tick:
+                deleted_ticks.discard(parent)
+                parent = by_tick[parent].parent_tick
+        return [record for record in to_delete if record.tick in deleted_ticks]
+
+
+def snapshot_checksum(data: bytes) -> str:
+    """Контрольная сумма содержимого snapshot (до сжатия)."""
+    return f"crc32:{zlib.crc32(data):08x}"
+
+
+def read_snapshot_file(path: Path) -> Dict[str, Any]:
+    """Читает snapshot-файл (обычный, gzip или бинарный)."""
+    data: Dict[str, Any]
+    if path.suffix == ".bin":
+        data = decode_binary_snapshot(path.read_bytes())
+    elif path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    return data
+
+
+class SnapshotCatalog:
+    """
+    Индекс snapshot-файлов одной директории.
+
+    Потокобезопасен: все операции с базой выполняются под lock.
+    """
+
+    def __init__(self, directory: Path):
+        """
+        Инициализация каталога.
+
+        Args:
+            directory: Директория snapshot-файлов
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / CATALOG_FILENAME
+        self._lock = threading.RLock()
+        self._known_dir_mtime: Optional[int] = None
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=5.0)
+        # PERSIST не создает/удаляет журнал на каждой транзакции, mtime директории не меняется
+        self._conn.execute("PRAGMA journal_mode=PERSIST")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                tick INTEGER PRIMARY KEY,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                compressed INTEGER NOT NULL,
+                checksum TEXT,
+                created_at REAL NOT NULL,
+                parent_tick INTEGER
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(snapshots)")}
+        if "parent_tick" not in columns:
+            self._conn.execute("ALTER TABLE snapshots ADD COLUMN parent_tick INTEGER")
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Запись
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        tick: int,
+        path: Path,
+        size: int,
+        compressed: bool,
+        checksum: Optional[str] = None,
+        created_at: Optional[float] = None,
+        parent_tick: Optional[int] = None,
+    ) -> SnapshotRecord:
+        """
+        Регистрирует сохраненный snapshot.
+
+        Args:
+            tick: Тик snapshot
+            path: Путь к файлу (должен лежать в директории каталога)
+            size: Размер файла в байтах
+            compressed: Сжат ли файл gzip
+            checksum: Контрольная сумма содержимого
+            created_at: Время создания (по умолчанию time.time())
+            parent_tick: Тик родителя, если snapshot - дельта
+
+        Returns:
+            Созданная запись
+        """
+        record = SnapshotRecord(
+            tick=tick,
+            filename=Path(path).name,
+            size=size,
+            compressed=compressed,
+            checksum=checksum,
+            created_at=created_at if created_at is not None else time.time(),
+            parent_tick=parent_tick,
+        )
+        with self._lock:
+            # Свой файл только что переименован в директорию и меняет ее mtime -
+            # полная сверка нужна только при первом обращении к каталогу
+            if self._known_dir_mtime is None:
+                self._sync_with_directory()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.tick,
+                    record.filename,
+                    record.size,
+                    int(record.compressed),
+                    record.checksum,
+                    record.created_at,
+                    record.parent_tick,
+                ),
+            )
+            self._conn.commit()
+            self._remember_dir_mtime()
+        return record
+
+    def remove(self, tick: int, delete_file: bool = False) -> None:
+        """Удаляет запись (и при необходимости файл) snapshot."""
+        with self._lock:
+            record = self._fetch_one("SELECT * FROM snapshots WHERE tick = ?", (tick,))
+            self._conn.execute("DELETE FROM snapshots WHERE tick = ?", (tick,))
+            self._conn.commit()
+            if delete_file and record is not None:
+                self._delete_files(record)
+            self._remember_dir_mtime()
+
+    def clear(self) -> int:
+        """
+        Удаляет все файлы snapshot (любого формата, включая дельты) и записи каталога.
+
+        Returns:
+            Количество удаленных файлов
+        """
+        removed = 0
+        with self._lock:
+            with os.scandir(self.directory) as entries:
+                names = [
+                    entry.name
+                    for entry in entries
+                    if SNAPSHOT_NAME_RE.match(entry.name) and entry.is_file()
+                ]
+            for name in names:
+                try:
+                    os.remove(self.directory / name)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+            self._conn.execute("DELETE FROM snapshots")
+            self._conn.commit()
+            self._remember_dir_mtime()
+        return removed
+
+    # ------------------------------------------------------------------
+    # Чтение
+    # ------------------------------------------------------------------
+
+    def path_for(self, record: SnapshotRecord) -> Path:
+        """Полный путь к файлу snapshot."""
+        return self.directory / record.filename
+
+    def latest(self) -> Optional[SnapshotRecord]:
+        """Последний snapshot (по тику) или None."""
+        return self._lookup("SELECT * FROM snapshots ORDER BY tick DESC LIMIT 1", ())
+
+    def at_or_before(self, tick: int) -> Optional[SnapshotRecord]:
+        """Snapshot с наибольшим тиком, не превышающим tick, или None."""
+        return self._lookup(
+            "SELECT * FROM snapshots WHERE tick <= ? ORDER BY tick DESC LIMIT 1", (tick,)
+        )
+
+    def get(self, tick: int) -> Optional[SnapshotRecord]:
+        """Snapshot ровно на тике tick или None."""
+        return self._lookup("SELECT * FROM snapshots WHERE tick = ?", (tick,))
+
+    def list_records(self) -> List[SnapshotRecord]:
+        """Все записи каталога по возрастанию тика."""
+        with self._lock:
+            self._sync_with_directory()
+            rows = self._conn.execute("SELECT * FROM snapshots ORDER BY tick").fetchall()
+        return [self._row_to_record(row) for row in rows]
+
+    def count(self) -> int:
+        """Количество snapshot в каталоге."""
+        with self._lock:
+            self._sync_with_directory()
+            return int(self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0])
+
+    def _lookup(self, query: str, params: Tuple[Any, ...]) -> Optional[SnapshotRecord]:
+        """Выполняет поиск, отбрасывая записи, чьи файлы исчезли."""
+        with self._lock:
+            self._sync_with_directory()
+            while True:
+                record = self._fetch_one(query, params)
+                if record is None or self.path_for(record).exists():
+                    return record
+                # Файл удален в обход каталога - убираем запись и ищем дальше
+                self._conn.execute("DELETE FROM snapshots WHERE tick = ?", (record.tick,))
+                self._conn.commit()
+
+    def _fetch_one(self, query: str, params: Tuple[Any, ...]) -> Optional[SnapshotRecord]:
+        row = self._conn.execute(query, params).fetchone()
+        return self._row_to_record(row) if row is not None else None
+
+    @staticmethod
+    def _row_to_record(row: Tuple[Any, ...]) -> SnapshotRecord:
+        return SnapshotRecord(
+            tick=int(row[0]),
+            filename=row[1],
+            size=int(row[2]),
+            compressed=bool(row[3]),
+            checksum=row[4],
+            created_at=float(row[5]),
+            parent_tick=int(row[6]) if row[6] is not None else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Сверка с директорией
+    # ------------------------------------------------------------------
+
+    def _dir_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _remember_dir_mtime(self) -> None:
+        self._known_dir_mtime = self._dir_mtime()
+
+    def _sync_with_directory(self) -> None:
+        """Сверяет каталог с директорией, если она менялась в обход каталога."""
+        mtime = self._dir_mtime()
+        if mtime is not None and mtime == self._known_dir_mtime:
+            return
+        self.rebuild()
+
+    def rebuild(self) -> int:
+        """
+        Сверяет каталог с содержимым директории.
+
+        Добавляет записи для неизвестных файлов (без контрольной суммы)
+        и удаляет записи для исчезнувших. Используется при первом
+        открытии существующей директории и после внешних изменений.
+
+        Returns:
+            Количество snapshot в каталоге после сверки
+        """
+        with self._lock:
+            on_disk: Dict[int, "os.DirEntry[str]"] = {}
+            priorities: Dict[int, int] = {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    match = SNAPSHOT_NAME_RE.match(entry.name)
+                    if match is None or not entry.is_file():
+                        continue
+                    tick = int(match.group(1))
+                    priority = _SUFFIX_PRIORITY[match.group(2)]
+                    if tick not in on_disk or priority < priorities[tick]:
+                        on_disk[tick] = entry
+                        priorities[tick] = priority
+
+            known = {
+                int(row[0]): row[1]
+                for row in self._conn.execute("SELECT tick, filename FROM snapshots")
+            }
+
+            stale = [tick for tick, name in known.items() if on_disk.get(tick) is None
+                     or on_disk[tick].name != name]
+            self._conn.executemany("DELETE FROM snapshots WHERE tick = ?", [(t,) for t in stale])
+
+            added = []
+            for tick, entry in on_disk.items():
+                if tick in known and tick not in stale:
+                    continue
+                st = entry.stat()
+                added.append(
+                    (tick, entry.name, st.st_size, int(entry.name.endswith(".gz")), None,
+                     st.st_mtime, self._read_parent_tick(entry))
+                )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)", added
+            )
+            self._conn.commit()
+            self._remember_dir_mtime()
+
+            if stale or added:
+                logger.debug(
+                    f"Snapshot catalog {self.directory}: +{len(added)} / -{len(stale)} записей"
+                )
+            return len(on_disk)
+
+    @staticmethod
+    def _read_parent_tick(entry: "os.DirEntry[str]") -> Optional[int]:
+        """Читает parent_tick из файла дельты (для полных snapshot - None)."""
+        if not entry.name.endswith(".delta.json"):
+            return None
+        try:
+            with open(entry.path, "r", encoding="utf-8") as f:
+                parent = json.load(f).get("parent_tick")
+            return int(parent) if parent is not None else None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Не удалось прочитать дельту snapshot {entry.path}: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Политика хранения
+    # ------------------------------------------------------------------
+
+    def apply_retention(self, policy: RetentionPolicy, now: Optional[float] = None) -> int:
+        """
+        Удаляет snapshot, не попадающие под политику хранения.
+
+        Args:
+            policy: Политика хранения
+            now: Текущее время (по умолчанию time.time())
+
+        Returns:
+            Количество удаленных snapshot
+        """
+        to_delete = policy.select_for_deletion(self.list_records(), now)
+        if not to_delete:
+            return 0
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM snapshots WHERE tick = ?", [(r.tick,) for r in to_delete]
+            )
+            self._conn.commit()
+            for record in to_delete:
+                self._delete_files(record)
+            self._remember_dir_mtime()
+        logger.info(f"Snapshot retention: удалено {len(to_delete)} snapshot из {self.directory}")
+        return len(to_delete)
+
+    def _delete_files(self, record: SnapshotRecord) -> None:
+        """Удаляет файл snapshot и все его варианты (несжатый, сжатый, бинарный, дельта)."""
+        base = f"snapshot_{record.tick:06d}"
+        for suffix in _SUFFIX_PRIORITY:
+            path = self.directory / f"{base}.{suffix}"
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Не удалось удалить snapshot {path}: {e}")
+
+    def close(self) -> None:
+        """Закрывает соединение с базой каталога."""
+        with self._lock:
+            self._conn.close()
+
+
+# Каталоги по директориям (SNAPSHOT_DIR может подменяться в тестах)
+_catalogs: Dict[Path, SnapshotCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_snapshot_catalog(directory: Path) -> SnapshotCatalog:
+    """Получает каталог для директории snapshot (один экземпляр на директорию)."""
+    key = Path(directory).resolve()
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None or not catalog.db_path.exists():
+            if catalog is not None:
+                # Директория была удалена вместе с базой - открываем заново
+                catalog.close()
+            catalog = SnapshotCatalog(key)
+            _catalogs[key] = catalog
+        return catalog
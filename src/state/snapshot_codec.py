@@ -0,0 +1,278 @@
+"""
+Кодеки snapshot-файлов состояния Life.
+
+Поддерживаются два формата:
+- json: исторический формат (snapshot_NNNNNN.json, gzip для больших файлов)
+- binary: компактный бинарный формат (snapshot_NNNNNN.bin)
+
+Бинарный формат:
+    [заголовок фиксированного размера]
+        magic b"LSNP", версия, флаги, ticks и витальные скаляры
+        (energy, integrity, stability, fatigue, tension, age, subjective_time)
+        по фиксированным смещениям, число секций
+    [таблица секций]
+        для каждой секции: имя (16 байт), смещение и длина тела
+    [тела секций]
+        scalars - остальные поля верхнего уровня
+        memory - memory, activated_memory, memory_entries_by_type
+        params - learning/adaptation параметры и их истории
+
+Витальные скаляры читаются из заголовка через mmap без разбора тела
+(read_binary_vitals). Тела секций - JSON, при флаге FLAG_ZLIB сжатые zlib.
+
+Формат для записи выбирается в config/config.yaml (snapshots.format).
+"""
+
+import json
+import logging
+import math
+import mmap
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BINARY_MAGIC = b"LSNP"
+BINARY_VERSION = 1
+FLAG_ZLIB = 0x1
+
+# Витальные скаляры заголовка в порядке расположения
+VITAL_FIELDS = (
+    "energy",
+    "integrity",
+    "stability",
+    "fatigue",
+    "tension",
+    "age",
+    "subjective_time",
+)
+HEADER_STRUCT = struct.Struct("<4sHHq" + "d" * len(VITAL_FIELDS) + "I")
+SECTION_STRUCT = struct.Struct("<16sQQ")
+
+MEMORY_SECTION_FIELDS = ("memory", "activated_memory", "memory_entries_by_type")
+PARAMS_SECTION_FIELDS = (
+    "learning_params",
+    "adaptation_params",
+    "parameter_history",
+    "learning_params_history",
+    "adaptation_params_history",
+)
+
+# Порог сжатия тела, как у gzip для JSON snapshot
+COMPRESS_THRESHOLD = 50 * 1024
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def encode_binary_snapshot(data: Dict[str, Any], compress_large: bool = True) -> bytes:
+    """
+    Кодирует данные snapshot в бинарный формат.
+
+    Args:
+        data: Данные snapshot (как _create_optimized_snapshot_data)
+        compress_large: Сжимать тела секций zlib, если они больше 50KB
+
+    Returns:
+        Байты snapshot
+    """
+    sections: Dict[str, Dict[str, Any]] = {"scalars": {}, "memory": {}, "params": {}}
+    for key, value in data.items():
+        if key == "ticks" or key in VITAL_FIELDS and isinstance(value, (int, float)):
+            continue
+        if key in MEMORY_SECTION_FIELDS:
+            sections["memory"][key] = value
+        elif key in PARAMS_SECTION_FIELDS:
+            sections["params"][key] = value
+        else:
+            sections["scalars"][key] = value
+
+    bodies = [(name, _dumps(fields)) for name, fields in sections.items()]
+    flags = 0
+    if compress_large and sum(len(body) for _, body in bodies) > COMPRESS_THRESHOLD:
+        flags |= FLAG_ZLIB
+        bodies = [(name, zlib.compress(body, 6)) for name, body in bodies]
+
+    vitals = []
+    for field_name in VITAL_FIELDS:
+        value = data.get(field_name)
+        vitals.append(float(value) if isinstance(value, (int, float)) else math.nan)
+
+    header = HEADER_STRUCT.pack(
+        BINARY_MAGIC, BINARY_VERSION, flags, int(data.get("ticks", -1)), *vitals, len(bodies)
+    )
+    offset = HEADER_STRUCT.size + SECTION_STRUCT.size * len(bodies)
+    table = []
+    for name, body in bodies:
+        table.append(SECTION_STRUCT.pack(name.encode("ascii"), offset, len(body)))
+        offset += len(body)
+
+    return b"".join([header, *table, *(body for _, body in bodies)])
+
+
+def _unpack_header(buffer: Any) -> Tuple[int, Dict[str, Any], int]:
+    """Разбирает заголовок: (флаги, витальные скаляры и ticks, число секций)."""
+    if len(buffer) < HEADER_STRUCT.size:
+        raise ValueError("Бинарный snapshot короче заголовка")
+    magic, version, flags, ticks, *rest = HEADER_STRUCT.unpack_from(buffer, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Неверная сигнатура бинарного snapshot")
+    if version > BINARY_VERSION:
+        raise ValueError(f"Неподдерживаемая версия бинарного snapshot: {version}")
+    section_count = rest.pop()
+    vitals: Dict[str, Any] = {"ticks": ticks}
+    for field_name, value in zip(VITAL_FIELDS, rest):
+        if not math.isnan(value):
+            vitals[field_name] = value
+    return flags, vitals, section_count
+
+
+def decode_binary_snapshot(buffer: bytes) -> Dict[str, Any]:
+    """
+    Декодирует бинарный snapshot в словарь данных.
+
+    Raises:
+        ValueError: Если данные повреждены
+    """
+    flags, vitals, section_count = _unpack_header(buffer)
+    data: Dict[str, Any] = {}
+    for index in range(section_count):
+        position = HEADER_STRUCT.size + SECTION_STRUCT.size * index
+        _, offset, length = SECTION_STRUCT.unpack_from(buffer, position)
+        if offset + length > len(buffer):
+            raise ValueError("Секция бинарного snapshot выходит за границы файла")
+        body = bytes(buffer[offset : offset + length])
+        if flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+        data.update(json.loads(body))
+    data.update(vitals)
+    return data
+
+
+def read_binary_vitals(path: Path) -> Dict[str, Any]:
+    """
+    Читает ticks и витальные скаляры из заголовка без разбора тела.
+
+    Args:
+        path: Путь к бинарному snapshot
+
+    Returns:
+        Словарь ticks/energy/integrity/stability/...
+    """
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            _, vitals, _ = _unpack_header(mapped)
+    return vitals
+
+
+class SnapshotCodec:
+    """Кодек snapshot: формат файла и его расширение."""
+
+    name = ""
+    extension = ""
+
+    def encode(self, data: Dict[str, Any], compress_large: bool = True) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, buffer: bytes) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class JsonSnapshotCodec(SnapshotCodec):
+    """Исторический JSON формат (сжатие gzip выполняет писатель snapshot)."""
+
+    name = "json"
+    extension = ".json"
+
+    def encode(self, data: Dict[str, Any], compress_large: bool = True) -> bytes:
+        return _dumps(data)
+
+    def decode(self, buffer: bytes) -> Dict[str, Any]:
+        result: Dict[str, Any] = json.loads(buffer)
+        return result
+
+
+class BinarySnapshotCodec(SnapshotCodec):
+    """Бинарный формат с витальными скалярами в заголовке."""
+
+    name = "binary"
+    extension = ".bin"
+
+    def encode(self, data: Dict[str, Any], compress_large: bool = True) -> bytes:
+        return encode_binary_snapshot(data, compress_large)
+
+    def decode(self, buffer: bytes) -> Dict[str, Any]:
+        return decode_binary_snapshot(buffer)
+
+
+_codecs: Dict[str, SnapshotCodec] = {
+    JsonSnapshotCodec.name: JsonSnapshotCodec(),
+    BinarySnapshotCodec.name: BinarySnapshotCodec(),
+}
+
+
+def register_codec(codec: SnapshotCodec) -> None:
+    """Регистрирует дополнительный кодек snapshot."""
+    _codecs[codec.name] = codec
+
+
+def get_codec(name: str) -> SnapshotCodec:
+    """
+    Получает кодек по имени формата.
+
+    Raises:
+        ValueError: Если формат неизвестен
+    """
+    try:
+        return _codecs[name]
+    except KeyError:
+        raise ValueError(
+            f"Неизвестный формат snapshot: {name} (доступны: {', '.join(sorted(_codecs))})"
+        ) from None
+
+
+def available_formats() -> List[str]:
+    """Имена зарегистрированных форматов."""
+    return sorted(_codecs)
+
+
+DEFAULT_SNAPSHOT_FORMAT = JsonSnapshotCodec.name
+_configured_format: Optional[str] = None
+_configured_format_lock = threading.Lock()
+
+
+def get_configured_snapshot_format() -> str:
+    """
+    Формат записи snapshot из конфигурации (snapshots.format в config/config.yaml).
+
+    Значение читается один раз; при ошибке загрузки конфигурации или
+    неизвестном формате используется json.
+    """
+    global _configured_format
+    if _configured_format is not None:
+        return _configured_format
+    with _configured_format_lock:
+        if _configured_format is None:
+            snapshot_format = DEFAULT_SNAPSHOT_FORMAT
+            try:
+                from src.config_loader import ConfigLoader
+
+                snapshot_format = ConfigLoader().get("snapshots.format", DEFAULT_SNAPSHOT_FORMAT)
+                get_codec(snapshot_format)
+            except Exception as e:
+                logger.debug(f"Формат snapshot из конфигурации недоступен, используется json: {e}")
+                snapshot_format = DEFAULT_SNAPSHOT_FORMAT
+            _configured_format = snapshot_format
+    return _configured_format
+
+
+def set_snapshot_format(snapshot_format: Optional[str]) -> None:
+    """Переопределяет формат записи snapshot (None - снова читать из конфигурации)."""
+    global _configured_format
+    if snapshot_format is not None:
+        get_codec(snapshot_format)
+    _configured_format = snapshot_format
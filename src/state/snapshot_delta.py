@@ -0,0 +1,244 @@
+"""
+Дельта-снимки состояния Life.
+
+Полный snapshot (база) сохраняется раз в N снимков, между ними пишутся
+компактные дельты относительно предыдущего снимка:
+- set: поля верхнего уровня, значение которых изменилось
+- removed: исчезнувшие поля
+- lists: для списков записей (память, истории параметров) - сколько
+  записей отброшено с начала, сколько сохранено и какие дописаны
+
+Сравнение выполняется по JSON-представлению полей, поэтому каждое поле
+сериализуется один раз: из тех же строк собирается и полный snapshot,
+и дельта.
+
+Чтобы восстановить тик, дельты применяются по цепочке parent_tick к
+ближайшей базе.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .snapshot_catalog import read_snapshot_file
+from .snapshot_codec import VITAL_FIELDS, read_binary_vitals
+
+# Списки, которые сравниваются поэлементно (добавление/удаление записей)
+LIST_FIELDS = (
+    "memory",
+    "activated_memory",
+    "parameter_history",
+    "learning_params_history",
+    "adaptation_params_history",
+)
+DELTA_FORMAT = "delta"
+
+EncodedSnapshot = Dict[str, Union[str, List[str]]]
+
+
+@dataclass
+class DeltaChain:
+    """
+    Состояние цепочки дельт одной директории snapshot.
+
+    Attributes:
+        base_tick: Тик последнего полного snapshot
+        tick: Тик последнего сохраненного snapshot (родитель следующей дельты)
+        encoded: Закодированные поля последнего snapshot
+        deltas_since_base: Сколько дельт записано после базы
+    """
+
+    base_tick: int
+    tick: int
+    encoded: EncodedSnapshot
+    deltas_since_base: int = 0
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def encode_snapshot_fields(snapshot: Dict[str, Any]) -> EncodedSnapshot:
+    """
+    Сериализует поля snapshot по отдельности.
+
+    Списки из LIST_FIELDS сериализуются поэлементно.
+    """
+    encoded: EncodedSnapshot = {}
+    for key, value in snapshot.items():
+        if key in LIST_FIELDS and isinstance(value, list):
+            encoded[key] = [_dumps(item) for item in value]
+        else:
+            encoded[key] = _dumps(value)
+    return encoded
+
+
+def _join_value(value: Union[str, List[str]]) -> str:
+    if isinstance(value, list):
+        return "[" + ",".join(value) + "]"
+    return value
+
+
+def _join_object(items: Dict[str, Union[str, List[str]]]) -> str:
+    return "{" + ",".join(f"{_dumps(k)}:{_join_value(v)}" for k, v in items.items()) + "}"
+
+
+def join_full_snapshot(encoded: EncodedSnapshot) -> str:
+    """Собирает JSON полного snapshot (совпадает с json.dumps исходного словаря)."""
+    return _join_object(encoded)
+
+
+def _diff_list(prev: List[str], curr: List[str]) -> Dict[str, Any]:
+    """
+    Описывает curr как prev[drop_head:drop_head + keep] + append.
+
+    Покрывает типичные изменения памяти: дописывание новых записей и
+    удаление старых с начала списка (архивация/забывание).
+    """
+    drop_head = 0
+    if prev and curr and prev[0] != curr[0]:
+        try:
+            drop_head = prev.index(curr[0])
+        except ValueError:
+            drop_head = len(prev)
+
+    keep = 0
+    limit = min(len(prev) - drop_head, len(curr))
+    while keep < limit and prev[drop_head + keep] == curr[keep]:
+        keep += 1
+
+    return {"drop_head": drop_head, "keep": keep, "append": curr[keep:]}
+
+
+def build_delta(
+    prev: EncodedSnapshot,
+    curr: EncodedSnapshot,
+    tick: int,
+    parent_tick: int,
+    base_tick: int,
+) -> str:
+    """
+    Строит JSON дельты curr относительно prev.
+
+    Args:
+        prev: Закодированный предыдущий snapshot
+        curr: Закодированный текущий snapshot
+        tick: Тик текущего snapshot
+        parent_tick: Тик предыдущего snapshot (к нему применяется дельта)
+        base_tick: Тик полного snapshot, с которого начинается цепочка
+
+    Returns:
+        Сериализованная дельта
+    """
+    changed: Dict[str, Union[str, List[str]]] = {}
+    lists: List[str] = []
+    for key, value in curr.items():
+        old = prev.get(key)
+        if old == value:
+            continue
+        if isinstance(value, list) and isinstance(old, list):
+            diff = _diff_list(old, value)
+            lists.append(
+                f'{_dumps(key)}:{{"drop_head":{diff["drop_head"]},"keep":{diff["keep"]},'
+                f'"append":{_join_value(diff["append"])}}}'
+            )
+        else:
+            changed[key] = value
+    removed = [key for key in prev if key not in curr]
+
+    return (
+        f'{{"format":"{DELTA_FORMAT}","ticks":{tick},"parent_tick":{parent_tick},'
+        f'"base_tick":{base_tick},"set":{_join_object(changed)},'
+        f'"removed":{_dumps(removed)},"lists":{{{",".join(lists)}}}}}'
+    )
+
+
+def is_delta(data: Dict[str, Any]) -> bool:
+    """Проверяет, является ли прочитанный документ дельтой."""
+    return data.get("format") == DELTA_FORMAT and "parent_tick" in data
+
+
+def apply_delta(snapshot: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Применяет дельту к данным предыдущего snapshot (изменяет и возвращает snapshot).
+
+    Args:
+        snapshot: Данные snapshot на тике delta["parent_tick"]
+        delta: Прочитанная дельта
+
+    Returns:
+        Данные snapshot на тике delta["ticks"]
+    """
+    for key in delta.get("removed", []):
+        snapshot.pop(key, None)
+    snapshot.update(delta.get("set", {}))
+    for key, diff in delta.get("lists", {}).items():
+        old = snapshot.get(key) or []
+        start = diff["drop_head"]
+        snapshot[key] = old[start : start + diff["keep"]] + diff["append"]
+    return snapshot
+
+
+def snapshot_path_for_tick(directory: Path, tick: int) -> Optional[Path]:
+    """Находит файл snapshot тика: полный, сжатый, бинарный или дельту."""
+    base = directory / f"snapshot_{tick:06d}"
+    for suffix in (".json", ".json.gz", ".bin", ".delta.json"):
+        path = base.with_name(base.name + suffix)
+        if path.is_file():
+            return path
+    return None
+
+
+def read_snapshot_data(path: Path) -> Dict[str, Any]:
+    """
+    Читает snapshot, восстанавливая дельту по цепочке до ближайшей базы.
+
+    Args:
+        path: Файл snapshot (полный, сжатый или дельта)
+
+    Returns:
+        Данные полного snapshot
+
+    Raises:
+        FileNotFoundError: Если в цепочке не хватает файла
+        ValueError: Если цепочка дельт зациклена
+    """
+    chain: List[Dict[str, Any]] = []
+    data = read_snapshot_file(path)
+    seen = set()
+    while is_delta(data):
+        parent_tick = int(data["parent_tick"])
+        if parent_tick in seen or parent_tick >= int(data["ticks"]):
+            raise ValueError(f"Некорректная цепочка дельт snapshot на тике {parent_tick}")
+        seen.add(parent_tick)
+        chain.append(data)
+        parent_path = snapshot_path_for_tick(path.parent, parent_tick)
+        if parent_path is None:
+            raise FileNotFoundError(
+                f"Snapshot {parent_tick} (родитель дельты {data['ticks']}) не найден"
+            )
+        data = read_snapshot_file(parent_path)
+
+    for delta in reversed(chain):
+        data = apply_delta(data, delta)
+    return data
+
+
+def read_snapshot_vitals(path: Path) -> Dict[str, Any]:
+    """
+    Читает ticks и витальные скаляры (energy, integrity, stability, ...).
+
+    Для бинарного snapshot читается только заголовок, без разбора тела;
+    для JSON и дельт - полный snapshot.
+
+    Args:
+        path: Файл snapshot
+
+    Returns:
+        Словарь ticks и витальных скаляров, присутствующих в snapshot
+    """
+    if path.suffix == ".bin":
+        return read_binary_vitals(path)
+    data = read_snapshot_data(path)
+    return {key: data[key] for key in ("ticks", *VITAL_FIELDS) if key in data}
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Нагрузочное тестирование API: задержка POST /event при опросе /status.
+
+Несколько читателей непрерывно опрашивают /status (чтение статуса
+имитирует разбор snapshot с диска заданной длительности), а производитель
+отправляет события через POST /event по новому соединению на каждое событие.
+Сравниваются прежний однопоточный цикл handle_request (HTTP/1.0) и
+StoppableHTTPServer с пулом обработчиков. Отдельный сценарий "idle" - читателей
+с keep-alive больше, чем обработчиков, и они опрашивают /status раз в
+--poll-interval: простаивающие соединения не должны занимать обработчики.
+
+Использование:
+    python src/test/benchmark_api_concurrency.py [--readers 4] [--events 200] [--status-delay 0.05]
+        [--idle-readers 16] [--poll-interval 0.5]
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+# Настройка путей
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+import requests
+
+from src.environment.event_queue import EventQueue
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+
+
+class SlowStatusState:
+    """Состояние, чтение статуса которого занимает delay секунд (как разбор snapshot)."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def get_safe_status_dict(self, limits=None):
+        time.sleep(self.delay)
+        return {"ticks": 1}
+
+
+class LegacyHandler(LifeHandler):
+    """LifeHandler без keep-alive, как до пула обработчиков."""
+
+    protocol_version = "HTTP/1.0"
+    handle = BaseHTTPRequestHandler.handle
+
+
+class LegacyServer(HTTPServer):
+    """Прежний StoppableHTTPServer: handle_request в одном потоке."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.event_queue = None
+        self.stopped = False
+        self.dev_mode = False
+
+    def serve_forever(self, poll_interval=0.5):
+        self.timeout = poll_interval
+        while not self.stopped:
+            self.handle_request()
+
+    def shutdown(self):
+        self.stopped = True
+        self.server_close()
+
+
+def run(server, readers: int, events: int, status_delay: float, poll_interval: float = 0.0) -> dict:
+    server.event_queue = EventQueue(enable_silence_detection=False, capacity=events + 1)
+    server.self_state = SlowStatusState(status_delay)
+    server.dev_mode = False
+    base_url = f"http://localhost:{server.server_address[1]}"
+    server_thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    server_thread.start()
+
+    stop = threading.Event()
+    status_reads = [0]
+
+    def read_status():
+        with requests.Session() as session:
+            while not stop.is_set():
+                session.get(f"{base_url}/status", timeout=30)
+                status_reads[0] += 1
+                stop.wait(poll_interval)
+
+    reader_threads = [threading.Thread(target=read_status, daemon=True) for _ in range(readers)]
+    for thread in reader_threads:
+        thread.start()
+    time.sleep(0.2)
+
+    # Новое соединение на каждое событие: его задерживают занятые обработчики
+    latencies = []
+    for i in range(events):
+        start = time.perf_counter()
+        requests.post(f"{base_url}/event", json={"type": "noise", "intensity": 0.1}, timeout=30)
+        latencies.append(time.perf_counter() - start)
+
+    stop.set()
+    for thread in reader_threads:
+        thread.join(timeout=30)
+    server.shutdown()
+    server_thread.join(timeout=5)
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p99": latencies[int((len(latencies) - 1) * 0.99)],
+        "max": latencies[-1],
+        "status_reads": status_reads[0],
+        "events_queued": server.event_queue.size(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark /event latency under /status polling")
+    parser.add_argument("--readers", type=int, default=4, help="Потоков, опрашивающих /status")
+    parser.add_argument("--events", type=int, default=200, help="Событий POST /event")
+    parser.add_argument("--status-delay", type=float, default=0.05, help="Длительность чтения статуса (сек)")
+    parser.add_argument("--workers", type=int, default=8, help="Обработчиков StoppableHTTPServer")
+    parser.add_argument("--idle-readers", type=int, default=16, help="Читателей keep-alive в сценарии idle")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Пауза читателя в сценарии idle (сек)")
+    args = parser.parse_args()
+
+    results = {
+        "legacy": run(LegacyServer(("localhost", 0), LegacyHandler), args.readers, args.events, args.status_delay),
+        "pooled": run(
+            StoppableHTTPServer(("localhost", 0), LifeHandler, max_workers=args.workers),
+            args.readers,
+            args.events,
+            args.status_delay,
+        ),
+        "idle": run(
+            StoppableHTTPServer(("localhost", 0), LifeHandler, max_workers=args.workers),
+            args.idle_readers,
+            args.events,
+            args.status_delay,
+            args.poll_interval,
+        ),
+    }
+
+    for name, result in results.items():
+        print(
+            f"{name:8s} /event p50={result['p50'] * 1000:8.2f} ms  p99={result['p99'] * 1000:8.2f} ms  "
+            f"max={result['max'] * 1000:8.2f} ms  status reads={result['status_reads']:5d}  "
+            f"queued={result['events_queued']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -97,11 +97,11 @@ def benchmark_runtime_loop_ticks(
 
     # Добавление метрик из PerformanceMetrics
     performance_summary = {}
-    for operation in performance_metrics.metrics.keys():
-        avg_time = performance_metrics.get_average_time(operation)
-        if avg_time is not None:
-            performance_summary[f"{operation}_avg_time"] = avg_time
-            performance_summary[f"{operation}_count"] = len(performance_metrics.metrics[operation])
+    for operation in performance_metrics.operations():
+        summary = performance_metrics.get_summary(operation)
+        performance_summary[f"{operation}_avg_time"] = summary["mean"]
+        performance_summary[f"{operation}_p99_time"] = summary["p99"]
+        performance_summary[f"{operation}_count"] = summary["count"]
 
     metrics["performance_metrics"] = performance_summary
 
@@ -397,22 +397,7 @@ class TestSerializationPerformance:
     def test_eventqueue_serialization_performance(self):
         """Тест производительности сериализации EventQueue."""
         # Создаем очередь с большим размером для теста производительности
-        import queue as queue_module
-
-        # Создаем EventQueue с инициализацией новых полей
-        queue = EventQueue.__new__(EventQueue)
-        queue._queue = queue_module.Queue(maxsize=0)  # Без ограничения размера
-        queue._dropped_events_count = 0
-        queue.silence_detector = None
-
-        # Инициализируем новые поля для сериализации
-        queue._serialization_lock = threading.RLock()
-        queue._serialization_timeout = 5.0
-        queue._component_timeout = 2.0
-
-        # Инициализируем поля для version-based concurrency control
-        queue._version = 0
-        queue._version_lock = threading.RLock()
+        queue = EventQueue(enable_silence_detection=False, capacity=500)
 
         # Добавляем события (меньше, чтобы тест был быстрее)
         for i in range(500):
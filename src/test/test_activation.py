@@ -8,12 +8,13 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
+import random
 import time
 
 import pytest
 
 from src.activation.activation import activate_memory
-from src.memory.memory import MemoryEntry
+from src.memory.memory import Memory, MemoryEntry
 from src.state.self_state import SelfState
 
 
@@ -278,5 +279,86 @@ class TestActivateMemory:
         assert len(activated) == 1  # Должен использоваться явный лимит
 
 
+def _scan_activate(event_type, entries, limit):
+    """Эталон: полный перебор списка с сортировкой по significance (desc)."""
+    matching = [entry for entry in entries if entry.event_type == event_type]
+    matching.sort(key=lambda e: e.meaning_significance, reverse=True)
+    return matching[:limit]
+
+
+@pytest.mark.unit
+class TestActivateMemoryIndexed:
+    """Тесты activate_memory для Memory (индекс по типу события и значимости)"""
+
+    EVENT_TYPES = ("noise", "shock", "recovery", "decay", "idle")
+
+    def _fill(self, memory, rng, count):
+        for i in range(count):
+            memory.append(
+                MemoryEntry(
+                    rng.choice(self.EVENT_TYPES),
+                    rng.uniform(0.2, 1.0),
+                    float(i),
+                )
+            )
+
+    def test_matches_scan_on_random_memory(self):
+        """Результат совпадает с полным перебором на случайной памяти"""
+        rng = random.Random(7)
+        memory = Memory()
+        self._fill(memory, rng, 400)
+
+        for event_type in self.EVENT_TYPES + ("unknown",):
+            for limit in (0, 1, 2, 3, 5, 50, 1000):
+                assert activate_memory(event_type, memory, limit=limit) == _scan_activate(
+                    event_type, list(memory), limit
+                )
+
+    def test_matches_scan_after_mutations(self):
+        """Индекс остается согласованным после удаления, вставки и очистки"""
+        rng = random.Random(11)
+        memory = Memory()
+        self._fill(memory, rng, 200)
+
+        memory.pop(0)
+        del memory[10:20]
+        memory.remove(memory[5])
+        memory.insert(3, MemoryEntry("shock", 0.99, 500.0))
+        memory.extend([MemoryEntry("noise", rng.uniform(0.2, 1.0), 600.0 + i) for i in range(20)])
+        memory[7] = MemoryEntry("idle", 0.95, 700.0)
+
+        for event_type in self.EVENT_TYPES:
+            assert activate_memory(event_type, memory, limit=5) == _scan_activate(
+                event_type, list(memory), 5
+            )
+
+        memory.clear()
+        assert activate_memory("shock", memory) == []
+
+    def test_subjective_time_limit(self):
+        """Лимит по субъективному времени применяется и к Memory"""
+        memory = Memory()
+        for i in range(6):
+            memory.append(MemoryEntry("event", 0.9 - i * 0.1, float(i)))
+
+        state = SelfState()
+        state.subjective_time = 2.2
+        state.age = 2.0
+
+        activated = activate_memory("event", memory, self_state=state)
+        assert [e.meaning_significance for e in activated] == pytest.approx(
+            [0.9, 0.8, 0.7, 0.6, 0.5]
+        )
+
+    def test_equal_significance_in_insertion_order(self):
+        """Записи с равной significance возвращаются в порядке добавления"""
+        memory = Memory()
+        entries = [MemoryEntry("event", 0.5, float(i)) for i in range(4)]
+        for entry in entries:
+            memory.append(entry)
+
+        assert activate_memory("event", memory, limit=3) == entries[:3]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
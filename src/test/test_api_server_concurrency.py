@@ -0,0 +1,205 @@
+"""
+Тесты для конкурентной обработки запросов StoppableHTTPServer.
+
+Проверяет:
+- Прием событий во время медленного /status
+- Keep-alive соединения: возврат простаивающих в селектор и их таймаут
+- Отклонение соединений сверх max_pending
+- Корректную остановку с ожиданием начатых запросов и закрытием ожидающих
+"""
+
+import http.client
+import json
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+import requests
+
+from src.environment.event_queue import EventQueue
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+
+
+class _SlowState:
+    """Состояние, чтение статуса которого занимает заданное время."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.started = threading.Event()
+
+    def get_safe_status_dict(self, limits=None):
+        self.started.set()
+        time.sleep(self.delay)
+        return {"ticks": 1}
+
+
+def _start_server(**kwargs):
+    server = StoppableHTTPServer(("localhost", 0), LifeHandler, **kwargs)
+    server.event_queue = EventQueue(enable_silence_detection=False)
+    server.dev_mode = False
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    return server, thread
+
+
+@pytest.fixture
+def api_server():
+    servers = []
+
+    def factory(**kwargs):
+        server, thread = _start_server(**kwargs)
+        servers.append((server, thread))
+        return server, f"http://localhost:{server.server_address[1]}"
+
+    yield factory
+    for server, thread in servers:
+        if not server.stopped:
+            server.shutdown()
+        thread.join(timeout=2.0)
+
+
+@pytest.mark.integration
+class TestConcurrentServing:
+    """Конкурентная обработка запросов"""
+
+    def test_event_not_blocked_by_slow_status(self, api_server):
+        server, base_url = api_server(max_workers=4)
+        server.self_state = _SlowState(delay=1.0)
+
+        status_thread = threading.Thread(target=requests.get, args=(f"{base_url}/status",), kwargs={"timeout": 5})
+        status_thread.start()
+        assert server.self_state.started.wait(2.0)
+
+        start = time.perf_counter()
+        response = requests.post(f"{base_url}/event", json={"type": "noise", "intensity": 0.1}, timeout=5)
+        elapsed = time.perf_counter() - start
+        status_thread.join()
+
+        assert response.status_code == 200
+        assert elapsed < 0.5
+        assert server.event_queue.size() == 1
+
+    def test_keep_alive_reuses_connection(self, api_server):
+        server, _ = api_server()
+        connection = http.client.HTTPConnection("localhost", server.server_address[1], timeout=5)
+        try:
+            for i in range(3):
+                connection.request(
+                    "POST", "/event", body=json.dumps({"type": "noise", "intensity": 0.1}),
+                    headers={"Content-Type": "application/json"},
+                )
+                response = connection.getresponse()
+                assert response.status == 200
+                assert response.read() == b"Event accepted"
+                if i == 0:
+                    sock = connection.sock
+                assert connection.sock is sock
+        finally:
+            connection.close()
+        assert server.event_queue.size() == 3
+
+    def test_idle_connection_does_not_hold_worker(self, api_server):
+        """Простаивающее keep-alive соединение возвращается в селектор и не занимает обработчик"""
+        server, base_url = api_server(max_workers=1)
+        connection = http.client.HTTPConnection("localhost", server.server_address[1], timeout=5)
+        connection.request("GET", "/refresh-cache")
+        assert connection.getresponse().read()
+
+        start = time.perf_counter()
+        response = requests.get(f"{base_url}/refresh-cache", timeout=5)
+        assert response.status_code == 200
+        assert time.perf_counter() - start < 0.5
+
+        # Вернувшееся соединение продолжает обслуживаться
+        connection.request("GET", "/refresh-cache")
+        assert connection.getresponse().status == 200
+        connection.close()
+
+    def test_readers_outnumber_workers(self, api_server):
+        """Keep-alive читателей больше, чем обработчиков: новые соединения не ждут"""
+        server, base_url = api_server(max_workers=2)
+        connections = []
+        for _ in range(6):
+            connection = http.client.HTTPConnection("localhost", server.server_address[1], timeout=5)
+            connection.request("GET", "/refresh-cache")
+            assert connection.getresponse().read()
+            connections.append(connection)
+
+        start = time.perf_counter()
+        response = requests.post(f"{base_url}/event", json={"type": "noise", "intensity": 0.1}, timeout=5)
+        elapsed = time.perf_counter() - start
+        for connection in connections:
+            connection.close()
+
+        assert response.status_code == 200
+        assert elapsed < 0.5
+
+    def test_idle_connection_times_out(self, api_server):
+        """Простаивающее соединение закрывается через keep_alive_timeout"""
+        server, _ = api_server(keep_alive_timeout=0.2)
+        connection = http.client.HTTPConnection("localhost", server.server_address[1], timeout=5)
+        connection.request("GET", "/refresh-cache")
+        assert connection.getresponse().read()
+        assert server.get_stats()["idle"] == 1
+
+        time.sleep(0.5)
+        assert server.get_stats()["idle"] == 0
+        assert connection.sock.recv(1) == b""
+        connection.close()
+
+    def test_rejects_over_max_pending(self, api_server):
+        server, base_url = api_server(max_workers=1, max_pending=1)
+        server.self_state = _SlowState(delay=0.5)
+
+        status_thread = threading.Thread(target=requests.get, args=(f"{base_url}/status",), kwargs={"timeout": 5})
+        status_thread.start()
+        assert server.self_state.started.wait(2.0)
+
+        response = requests.get(f"{base_url}/refresh-cache", timeout=5)
+        status_thread.join()
+
+        assert response.status_code == 503
+        assert server.get_stats()["rejected"] == 1
+
+    def test_graceful_shutdown_waits_for_inflight(self, api_server):
+        server, base_url = api_server(max_workers=2)
+        server.self_state = _SlowState(delay=0.3)
+        responses = []
+
+        status_thread = threading.Thread(
+            target=lambda: responses.append(requests.get(f"{base_url}/status", timeout=5))
+        )
+        status_thread.start()
+        assert server.self_state.started.wait(2.0)
+
+        server.shutdown()
+        status_thread.join(timeout=2.0)
+
+        assert responses and responses[0].status_code == 200
+        assert server.get_stats()["inflight"] == 0
+
+    def test_shutdown_closes_queued_connections(self, api_server):
+        """Соединения, не дождавшиеся обработчика до shutdown_timeout, закрываются"""
+        server, base_url = api_server(max_workers=1, shutdown_timeout=0.2)
+        server.self_state = _SlowState(delay=1.0)
+
+        status_thread = threading.Thread(target=requests.get, args=(f"{base_url}/status",), kwargs={"timeout": 5})
+        status_thread.start()
+        assert server.self_state.started.wait(2.0)
+
+        queued = socket.create_connection(server.server_address, timeout=5)
+        queued.sendall(b"GET /refresh-cache HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        deadline = time.monotonic() + 2.0
+        while server.get_stats()["inflight"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        server.shutdown()
+        assert queued.recv(1) == b""
+        queued.close()
+        status_thread.join()
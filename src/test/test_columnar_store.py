@@ -0,0 +1,266 @@
+"""
+Тесты для колоночного хранилища записей памяти (ColumnarEntryStore).
+
+Проверяет:
+- Совместимость MemoryEntryView с MemoryEntry (атрибуты, asdict, copy, pickle)
+- Операции MutableSequence и стабильность представлений
+- Колоночные агрегаты с numpy и без него
+- ArchiveMemory в колоночном режиме: поиск, статистика, сохранение и загрузка
+- Совпадение LearningEngine.process_statistics со списком записей
+"""
+
+import copy
+import pickle
+import random
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.learning.learning import LearningEngine
+from src.memory import columnar_store
+from src.memory.columnar_store import ColumnarEntryStore, MemoryEntryView
+from src.memory.memory import ArchiveMemory, Memory
+from src.memory.memory_types import MemoryEntry
+
+
+def _entries(count=200, seed=7):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        event_type = rng.choice(["noise", "shock", "recovery", "feedback"])
+        feedback_data = None
+        if event_type == "feedback" and i % 3:
+            feedback_data = {
+                "action_pattern": rng.choice(["dampen", "absorb"]),
+                "state_delta": {"energy": rng.uniform(-0.1, 0.1)},
+            }
+        entries.append(
+            MemoryEntry(
+                event_type=event_type,
+                meaning_significance=rng.random(),
+                timestamp=1000.0 + i,
+                weight=rng.random(),
+                feedback_data=feedback_data,
+                subjective_timestamp=None if i % 2 else 900.0 + i,
+            )
+        )
+    return entries
+
+
+@pytest.mark.unit
+class TestMemoryEntryView:
+    """Представление строки совместимо с MemoryEntry"""
+
+    def test_attributes_and_equality(self):
+        entries = _entries()
+        store = ColumnarEntryStore(entries)
+        assert len(store) == len(entries)
+        assert list(store) == entries
+        view = store[1]
+        assert isinstance(view, MemoryEntryView)
+        assert view.event_type == entries[1].event_type
+        assert view.subjective_timestamp is None
+        assert store[0].subjective_timestamp == entries[0].subjective_timestamp
+
+    def test_asdict_copy_and_pickle_produce_entries(self):
+        entries = _entries()
+        view = ColumnarEntryStore(entries)[2]
+        assert asdict(view) == asdict(entries[2])
+        for clone in (copy.copy(view), copy.deepcopy(view), pickle.loads(pickle.dumps(view))):
+            assert type(clone) is MemoryEntry
+            assert clone == entries[2]
+
+    def test_writes_go_to_columns(self):
+        store = ColumnarEntryStore(_entries(10))
+        view = store[3]
+        view.weight = 0.25
+        view.event_type = "new_type"
+        view.subjective_timestamp = None
+        view.feedback_data = {"action_pattern": "x"}
+        assert store[3].weight == 0.25
+        assert store[3].event_type == "new_type"
+        assert store[3].subjective_timestamp is None
+        assert store[3].feedback_data == {"action_pattern": "x"}
+        assert store.column("weight")[3] == 0.25
+
+    def test_source_entries_are_copied(self):
+        entry = MemoryEntry("noise", 0.5, 1.0)
+        store = ColumnarEntryStore([entry])
+        entry.weight = 0.1
+        assert store[0].weight == 1.0
+
+
+@pytest.mark.unit
+class TestColumnarEntryStoreSequence:
+    """Операции MutableSequence совпадают со списком"""
+
+    def test_mutations_match_list(self):
+        entries = _entries(50)
+        store = ColumnarEntryStore(entries)
+        expected = list(entries)
+        extra = MemoryEntry("extra", 0.9, 5000.0)
+
+        for target in (store, expected):
+            del target[5]
+            target.insert(0, extra)
+            target[10] = extra
+            target[20:23] = [extra, extra]
+            target.append(extra)
+            target.sort(key=lambda e: (e.weight, e.timestamp))
+        assert list(store) == expected
+        assert store[-1] == expected[-1]
+        assert store[3:7] == expected[3:7]
+
+    def test_views_survive_reordering(self):
+        entries = _entries(20)
+        store = ColumnarEntryStore(entries)
+        view = store[10]
+        del store[0]
+        store.insert(0, MemoryEntry("extra", 0.1, 1.0))
+        store.sort(key=lambda e: e.weight)
+        assert view == entries[10]
+
+    def test_copy_and_compact(self):
+        entries = _entries(30)
+        store = ColumnarEntryStore(entries)
+        del store[::2]
+        expected = entries[1::2]
+
+        copied = store.copy()
+        assert list(copied) == expected
+        assert copied.get_stats()["slots"] == len(expected)
+
+        assert store.get_stats()["slots"] == len(entries)
+        store.compact()
+        assert list(store) == expected
+        assert store.get_stats()["slots"] == len(expected)
+
+    def test_clear(self):
+        store = ColumnarEntryStore(_entries(5))
+        store.clear()
+        assert len(store) == 0
+        assert store.event_type_summary() == {}
+
+
+@pytest.mark.unit
+class TestColumnarAggregates:
+    """Колоночные агрегаты"""
+
+    @pytest.mark.parametrize("has_numpy", [True, False])
+    def test_event_type_summary(self, monkeypatch, has_numpy):
+        if has_numpy and not columnar_store.HAS_NUMPY:
+            pytest.skip("numpy не установлен")
+        monkeypatch.setattr(columnar_store, "HAS_NUMPY", has_numpy)
+        entries = _entries()
+        store = ColumnarEntryStore(entries)
+        del store[0]
+        entries = entries[1:]
+
+        expected = {}
+        for entry in entries:
+            count, total = expected.get(entry.event_type, (0, 0.0))
+            expected[entry.event_type] = (count + 1, total + entry.meaning_significance)
+        assert store.event_type_summary() == expected
+
+    def test_columns_follow_order(self):
+        entries = _entries(40)
+        store = ColumnarEntryStore(entries)
+        store.sort(key=lambda e: e.timestamp, reverse=True)
+        assert list(store.column("timestamp")) == sorted(
+            (e.timestamp for e in entries), reverse=True
+        )
+        codes = store.event_type_codes()
+        assert [codes[c] for c in store.column("event_code")] == [e.event_type for e in store]
+        with pytest.raises(ValueError):
+            store.column("feedback_data")
+
+    def test_feedback_items_in_order(self):
+        entries = _entries()
+        store = ColumnarEntryStore(entries)
+        expected = [(e.event_type, e.feedback_data) for e in entries if e.feedback_data]
+        assert list(store.feedback_items()) == expected
+        store.sort(key=lambda e: e.weight)
+        expected = [(e.event_type, e.feedback_data) for e in store if e.feedback_data]
+        assert list(store.feedback_items()) == expected
+
+
+@pytest.mark.unit
+class TestColumnarArchive:
+    """ArchiveMemory в колоночном режиме"""
+
+    def test_matches_list_archive(self, tmp_path):
+        entries = _entries()
+        plain = ArchiveMemory(archive_file=tmp_path / "plain" / "archive.json")
+        columnar = ArchiveMemory(archive_file=tmp_path / "columnar" / "archive.json",
+                                 columnar=True)
+        plain.add_entries(entries)
+        columnar.add_entries(entries)
+
+        assert isinstance(columnar.get_all_entries(), ColumnarEntryStore)
+        assert list(columnar.get_all_entries()) == plain.get_all_entries()
+        assert columnar.get_statistics() == plain.get_statistics()
+        assert columnar.get_entries(event_type="shock", min_significance=0.5) == plain.get_entries(
+            event_type="shock", min_significance=0.5
+        )
+        # Индекс после первого поиска обновляется инкрементально
+        columnar.add_entry(event_type="shock", meaning_significance=0.99, timestamp=9999.0)
+        plain.add_entry(event_type="shock", meaning_significance=0.99, timestamp=9999.0)
+        assert columnar.get_entries(event_type="shock", min_significance=0.5) == plain.get_entries(
+            event_type="shock", min_significance=0.5
+        )
+        assert columnar.validate_integrity()
+
+    def test_save_and_lazy_load(self, tmp_path):
+        archive_file = tmp_path / "archive.json"
+        entries = _entries(60)
+        archive = ArchiveMemory(archive_file=archive_file, columnar=True)
+        archive.add_entries(entries[:40])
+        archive.save_archive()
+        archive.add_entries(entries[40:])
+        archive.save_archive()
+
+        reloaded = ArchiveMemory(archive_file=archive_file, load_existing=True, columnar=True)
+        extra = MemoryEntry("extra", 0.5, 5000.0)
+        reloaded.add_entry(extra)
+        assert reloaded.size() == 61
+        assert list(reloaded.get_all_entries()) == entries + [extra]
+        assert reloaded.search_by_type("extra") == [extra]
+
+        reloaded.clear()
+        assert reloaded.size() == 0
+        assert isinstance(reloaded.get_all_entries(), ColumnarEntryStore)
+
+    def test_memory_with_columnar_archive(self, tmp_path):
+        archive = ArchiveMemory(archive_file=tmp_path / "archive.json", columnar=True)
+        memory = Memory(archive=archive)
+        entries = _entries(10)
+        archive.add_entries(entries)
+        archived = memory.get_archived_entries()
+        assert len(archived) == 10
+        assert random.choice(archived) in entries
+        assert Memory(columnar_archive=True).archive.columnar
+
+
+@pytest.mark.unit
+class TestColumnarLearningStatistics:
+    """LearningEngine.process_statistics по колонкам"""
+
+    def test_matches_entry_scan(self):
+        engine = LearningEngine()
+        entries = _entries(500)
+        store = ColumnarEntryStore(entries)
+        del store[:3]
+        store.sort(key=lambda e: e.weight)
+        expected_entries = sorted(entries[3:], key=lambda e: e.weight)
+
+        expected = engine.process_statistics(expected_entries)
+        actual = engine.process_statistics(store)
+        assert actual["memory_entries"] is store
+        for key in expected:
+            if key != "memory_entries":
+                assert actual[key] == expected[key], key
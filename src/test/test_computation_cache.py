@@ -0,0 +1,173 @@
+"""
+Тесты кэша вычислений (ComputationCache).
+
+- Ключи из квантованных чисел: попадание в пределах кванта, без коллизий int/float
+- Политики пространств имен: емкость (LRU), TTL, квант
+- Счетчики попаданий, промахов, вытеснений и истечений в get_stats
+- Кэшированный compute_subjective_dt совпадает с некэшированным
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.runtime import computation_cache
+from src.runtime.computation_cache import (
+    DEFAULT_POLICIES,
+    CacheNamespace,
+    CachePolicy,
+    ComputationCache,
+    cached_compute_subjective_dt,
+)
+from src.runtime.subjective_time import compute_subjective_dt
+
+SUBJECTIVE_DT_PARAMS = {
+    "dt": 1.0,
+    "base_rate": 1.0,
+    "intensity": 0.5,
+    "stability": 0.8,
+    "energy": 50.0,
+    "intensity_coeff": 1.0,
+    "stability_coeff": 1.0,
+    "energy_coeff": 1.0,
+    "rate_min": 0.1,
+    "rate_max": 3.0,
+}
+
+
+@pytest.mark.unit
+class TestCacheKeys:
+    """Ключи пространства имен"""
+
+    def test_floats_within_quantum_share_key(self):
+        namespace = CacheNamespace("test", capacity=10, quantum=1e-3)
+        assert namespace.make_key("event", 0.5, 0.7) == namespace.make_key("event", 0.5001, 0.7)
+        assert namespace.make_key("event", 0.5, 0.7) != namespace.make_key("event", 0.502, 0.7)
+
+    def test_int_and_float_do_not_collide(self):
+        namespace = CacheNamespace("test", capacity=10, quantum=1e-6)
+        assert namespace.make_key(50) == namespace.make_key(50.0)
+        assert namespace.make_key(50) != namespace.make_key(5e-05)
+
+    def test_non_finite_values_are_kept(self):
+        namespace = CacheNamespace("test", capacity=10, quantum=1e-6)
+        key = namespace.make_key(float("inf"), 1e308, 0.5)
+        assert key == (float("inf"), 1e308, 500000)
+        hash(namespace.make_key(float("nan")))
+
+    def test_without_quantum_keys_are_arguments(self):
+        namespace = CacheNamespace("test", capacity=10)
+        assert namespace.make_key("a", 0.123456789) == ("a", 0.123456789)
+
+    def test_invalid_quantum_rejected(self):
+        with pytest.raises(ValueError):
+            CacheNamespace("test", capacity=10, quantum=0.0)
+
+    def test_freeze_ignores_dict_order(self):
+        namespace = CacheNamespace("test", capacity=10)
+        first = namespace.freeze({"a": [1, 2], "b": {"c": 3}, "d": {4}})
+        second = namespace.freeze({"d": {4}, "b": {"c": 3}, "a": [1, 2]})
+        assert first == second
+        hash(first)
+        hash(namespace.freeze({1: "a", "b": 2}))  # Несравнимые ключи
+
+    @given(st.lists(st.floats(allow_nan=False, allow_infinity=False), min_size=1, max_size=6))
+    @settings(max_examples=200, deadline=None)
+    def test_equal_arguments_give_equal_keys(self, values):
+        namespace = CacheNamespace("test", capacity=10, quantum=1e-6)
+        assert namespace.make_key(*values) == namespace.make_key(*list(values))
+        hash(namespace.make_key(*values))
+
+
+@pytest.mark.unit
+class TestCachePolicies:
+    """Емкость, TTL и счетчики пространств имен"""
+
+    def test_lru_eviction_counted(self):
+        namespace = CacheNamespace("test", capacity=2)
+        namespace.put("a", 1)
+        namespace.put("b", 2)
+        assert namespace.get("a") == 1  # "a" становится недавно использованным
+        namespace.put("c", 3)
+        assert namespace.get("b") is None
+        assert namespace.get("a") == 1
+        assert namespace.get("c") == 3
+        stats = namespace.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["size"] == 2
+        assert (stats["hits"], stats["misses"]) == (3, 1)
+
+    def test_ttl_expiration(self, monkeypatch):
+        clock = [100.0]
+        monkeypatch.setattr(computation_cache.time, "monotonic", lambda: clock[0])
+        namespace = CacheNamespace("test", capacity=10, ttl=5.0)
+        namespace.put("a", 1)
+        clock[0] += 4.0
+        assert namespace.get("a") == 1
+        clock[0] += 1.0
+        assert namespace.get("a") is None
+        stats = namespace.get_stats()
+        assert (stats["expirations"], stats["misses"], stats["size"]) == (1, 1, 0)
+
+    def test_cached_none_is_a_hit(self):
+        namespace = CacheNamespace("test", capacity=10)
+        namespace.put("a", None)
+        assert namespace.get("a", "missing") is None
+        assert namespace.get("b", "missing") == "missing"
+
+    def test_policies_override_defaults(self):
+        cache = ComputationCache(
+            max_size=7, policies={"decision": CachePolicy(capacity=3, ttl=30.0)}
+        )
+        stats = cache.get_stats()
+        assert set(stats) == set(DEFAULT_POLICIES)
+        assert (stats["decision"]["capacity"], stats["decision"]["ttl"]) == (3, 30.0)
+        assert stats["subjective_dt"]["capacity"] == 7
+        assert stats["subjective_dt"]["quantum"] == DEFAULT_POLICIES["subjective_dt"].quantum
+
+    def test_clear_resets_all_namespaces(self):
+        cache = ComputationCache()
+        cache.cache_decision(3, 0.9, "noise", 50.0, 0.8, "act")
+        cache.cache_meaning_appraisal("noise", 0.5, 50.0, 0.8, 0.9, "appraisal")
+        assert cache.get_cached_decision(3, 0.9001, "noise", 50.0, 0.8) == "act"
+        cache.clear()
+        assert cache.get_cached_meaning_appraisal("noise", 0.5, 50.0, 0.8, 0.9) is None
+        stats = cache.get_stats()
+        assert stats["decision"]["hits"] == 0
+        assert all(namespace["size"] == 0 for namespace in stats.values())
+
+
+@pytest.mark.unit
+class TestComputationCache:
+    """Типизированные методы кэша"""
+
+    def test_validation_and_memory_search_roundtrip(self):
+        cache = ComputationCache()
+        cache.cache_validation("state", {"energy": 50.0, "tags": ["a"]}, True)
+        assert cache.get_cached_validation("state", {"tags": ["a"], "energy": 50.0}) is True
+        cache.cache_memory_search("by_type", {"event_type": "noise", "limit": 5}, ["entry"])
+        assert cache.get_cached_memory_search("by_type", {"limit": 5, "event_type": "noise"}) == [
+            "entry"
+        ]
+        assert cache.get_cached_memory_search("by_type", {"event_type": "noise"}) is None
+
+    def test_activate_memory_grouping(self):
+        cache = ComputationCache()
+        cache.cache_activate_memory("noise", 42, 1234.5, 310.0, 5, ["entry"])
+        assert cache.get_cached_activate_memory("noise", 47, 1299.0, 399.0, 5) == ["entry"]
+        assert cache.get_cached_activate_memory("noise", 50, 1234.5, 310.0, 5) is None
+        assert cache.get_stats()["memory_search"]["size"] == 1
+
+    def test_cached_subjective_dt_matches_direct(self, monkeypatch):
+        monkeypatch.setattr(computation_cache, "_computation_cache", ComputationCache())
+        expected = compute_subjective_dt(**SUBJECTIVE_DT_PARAMS)
+        assert cached_compute_subjective_dt(**SUBJECTIVE_DT_PARAMS) == expected
+        assert cached_compute_subjective_dt(**SUBJECTIVE_DT_PARAMS) == expected
+        stats = computation_cache.get_computation_cache().get_stats()["subjective_dt"]
+        assert (stats["hits"], stats["misses"]) == (1, 1)
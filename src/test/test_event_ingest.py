@@ -0,0 +1,177 @@
+"""
+Тесты для пакетного приема событий POST /events.
+
+Проверяет:
+- Разбор JSON массива и NDJSON и проверку элементов
+- Постановку событий в очередь порциями с результатом для каждого элемента
+- Эндпоинт /events LifeHandler (JSON массив, NDJSON, chunked поток)
+- Пакетную отправку generator_cli
+- Проверку пакета в FastAPI API (api.py)
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+import requests
+
+from src.environment.event_ingest import (
+    MAX_BATCH_EVENTS,
+    BatchTooLargeError,
+    event_from_payload,
+    ingest_events,
+    iter_json_array,
+    iter_ndjson,
+)
+from src.environment.event_queue import EventQueue
+from src.environment.generator_cli import send_events
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+
+
+def _payload(index, event_type="noise"):
+    return {"type": event_type, "intensity": 0.5, "timestamp": 1000.0 + index, "metadata": {"i": index}}
+
+
+@pytest.mark.unit
+class TestEventIngest:
+    """Разбор и постановка пакета событий"""
+
+    def test_event_from_payload(self):
+        event = event_from_payload({"type": "shock", "intensity": "0.7"})
+        assert event.type == "shock"
+        assert event.intensity == 0.7
+        assert event.metadata == {}
+
+        for invalid in ({"intensity": 0.1}, [], {"type": "noise", "intensity": "x"}, {"type": "a", "metadata": 1}):
+            with pytest.raises(ValueError):
+                event_from_payload(invalid)
+
+    def test_ndjson_reports_invalid_lines(self):
+        lines = [json.dumps(_payload(0)).encode(), b"", b"{broken", json.dumps({"intensity": 1}).encode()]
+        result = ingest_events(EventQueue(enable_silence_detection=False), iter_ndjson(lines))
+
+        assert result["accepted"] == 1
+        assert result["invalid"] == 2
+        assert [r["status"] for r in result["results"]] == ["accepted", "invalid", "invalid"]
+        assert "invalid JSON" in result["results"][1]["error"]
+
+    def test_chunks_use_single_queue_operation(self):
+        """События ставятся в очередь порциями через push_batch"""
+        queue = EventQueue(enable_silence_detection=False, capacity=1000)
+        calls = []
+        original = queue.push_batch
+
+        def counting_push_batch(events):
+            calls.append(len(events))
+            return original(events)
+
+        queue.push_batch = counting_push_batch
+        raw = json.dumps([_payload(i) for i in range(25)]).encode()
+        result = ingest_events(queue, iter_json_array(raw), chunk_size=10)
+
+        assert calls == [10, 10, 5]
+        assert result["accepted"] == 25
+        assert [e.metadata["i"] for e in queue.pop_all()] == list(range(25))
+
+    def test_dropped_events_reported_per_item(self):
+        queue = EventQueue(enable_silence_detection=False, capacity=3)
+        result = ingest_events(queue, iter_json_array(json.dumps([_payload(i) for i in range(5)]).encode()))
+
+        assert result["accepted"] == 3
+        assert result["dropped"] == 2
+        assert [r["status"] for r in result["results"]][-2:] == ["dropped", "dropped"]
+
+    def test_json_array_validation(self):
+        with pytest.raises(ValueError):
+            iter_json_array(b'{"type": "noise"}')
+        with pytest.raises(BatchTooLargeError):
+            iter_json_array(json.dumps([{}] * (MAX_BATCH_EVENTS + 1)).encode())
+
+
+@pytest.mark.integration
+class TestEventsEndpoint:
+    """Интеграционные тесты POST /events"""
+
+    @pytest.fixture
+    def events_server(self):
+        server = StoppableHTTPServer(("localhost", 0), LifeHandler)
+        server.event_queue = EventQueue(enable_silence_detection=False, capacity=1000)
+        server.dev_mode = False
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        time.sleep(0.1)
+        yield f"http://localhost:{server.server_address[1]}", server.event_queue
+        server.shutdown()
+        thread.join(timeout=2.0)
+
+    def test_json_array(self, events_server):
+        base_url, queue = events_server
+        response = requests.post(f"{base_url}/events", json=[_payload(0), {"intensity": 1}, _payload(2)], timeout=5)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["accepted"] == 2
+        assert body["invalid"] == 1
+        assert [e.metadata["i"] for e in queue.pop_all()] == [0, 2]
+
+    def test_ndjson_via_generator_cli(self, events_server):
+        base_url, queue = events_server
+        host, port = base_url.rsplit("//", 1)[1].split(":")
+        with requests.Session() as session:
+            success, code, _, body = send_events(host, int(port), [_payload(i) for i in range(50)], session=session)
+
+        assert success and code == 200
+        assert json.loads(body)["accepted"] == 50
+        assert queue.size() == 50
+
+    def test_chunked_ndjson_stream(self, events_server):
+        """NDJSON поток без Content-Length (Transfer-Encoding: chunked)"""
+        base_url, queue = events_server
+
+        def stream():
+            for i in range(20):
+                line = json.dumps(_payload(i)) + "\n"
+                # Строки разрезаны между чанками
+                yield line[:7].encode()
+                yield line[7:].encode()
+
+        response = requests.post(
+            f"{base_url}/events", data=stream(), headers={"Content-Type": "application/x-ndjson"}, timeout=5
+        )
+
+        assert response.status_code == 200
+        assert response.json()["accepted"] == 20
+        assert [e.metadata["i"] for e in queue.pop_all()] == list(range(20))
+
+    def test_invalid_body(self, events_server):
+        base_url, _ = events_server
+        response = requests.post(f"{base_url}/events", data=b"[1, 2", timeout=5)
+        assert response.status_code == 400
+
+
+@pytest.mark.integration
+class TestFastAPIEventsEndpoint:
+    """POST /events в FastAPI API"""
+
+    def test_validates_ndjson(self):
+        from fastapi.testclient import TestClient
+
+        from api import app
+
+        body = json.dumps(_payload(0)) + "\n" + json.dumps({"intensity": 1}) + "\n"
+        response = TestClient(app).post(
+            "/events", content=body, headers={"Content-Type": "application/x-ndjson"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["valid"] == 1
+        assert data["invalid"] == 1
+        assert "accepted" not in data
+        assert [r["status"] for r in data["results"]] == ["valid", "invalid"]
@@ -43,33 +43,7 @@ class TestEventQueueEdgeCases:
         events2 = event_queue.pop_all()
         assert events2 == []
 
-        # Симулируем race condition: очередь становится пустой между проверкой empty() и get_nowait()
-        # Это покрывает строки 38-39 (обработка Empty в цикле)
-        import queue as q
-
-        # Создаем очередь, которая выбросит Empty при get_nowait на пустой очереди
         event_queue2 = EventQueue()
-        # Не добавляем события, очередь пуста
-        # При вызове pop_all, empty() вернет True, но если между проверкой и get_nowait
-        # что-то изменится, может быть Empty - но в нашем случае очередь действительно пуста
-        # Поэтому нужно создать ситуацию, когда empty() может вернуть False, но get_nowait выбросит Empty
-        # Это сложно симулировать без моков, но реально это может произойти в многопоточной среде
-
-        # Альтернативный подход: используем мок для симуляции
-        original_get = event_queue2._queue.get_nowait
-        call_count = [0]
-
-        def mock_get_nowait():
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # Первый вызов выбрасывает Empty (симулируем race condition)
-                raise q.Empty()
-            return original_get()
-
-        # Но это не сработает, так как empty() вернет True и цикл не начнется
-        # Реальная ситуация: между empty() и get_nowait() другой поток может очистить очередь
-        # В однопоточном тесте это сложно симулировать
-
         # Просто проверяем, что код обрабатывает Empty корректно
         result = event_queue2.pop_all()
         assert result == []
@@ -0,0 +1,223 @@
+"""
+Тесты для EventQueue - емкость, политики переполнения и пакетные операции.
+
+Проверяет:
+- Раздельные полосы внутренних и внешних событий
+- Политики переполнения DROP_NEWEST, BLOCK, DROP_OLDEST, COALESCE, SPILL
+- push_many и совместимость с интерфейсом queue.Queue
+- Метрики очереди и сериализацию без извлечения событий
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.environment.event import Event
+from src.environment.event_queue import EventQueue, OverflowPolicy
+
+
+def _event(event_type="noise", intensity=0.5, index=0):
+    return Event(type=event_type, intensity=intensity, timestamp=time.time(), metadata={"index": index})
+
+
+@pytest.mark.unit
+class TestEventQueueLanes:
+    """Полосы и порядок извлечения"""
+
+    def test_internal_events_first(self):
+        """Внутренние события извлекаются раньше внешних, каждая полоса в FIFO порядке"""
+        queue = EventQueue(enable_silence_detection=False)
+        queue.push(_event("noise", index=1))
+        queue.push(_event("memory_echo", index=2), internal=True)
+        queue.push(_event("shock", index=3))
+        queue.push(_event("clarity_moment", index=4), internal=True)
+
+        assert [e.metadata["index"] for e in queue.pop_all()] == [2, 4, 1, 3]
+
+    def test_external_flood_does_not_drop_internal(self):
+        """Переполнение внешней полосы не мешает внутренним событиям"""
+        queue = EventQueue(enable_silence_detection=False, capacity=10)
+        for i in range(50):
+            queue.push(_event("noise", index=i))
+
+        assert queue.push(_event("memory_echo"), internal=True)
+        metrics = queue.get_metrics()
+        assert metrics["dropped_external"] == 40
+        assert metrics["dropped_internal"] == 0
+        assert queue.size() == 11
+
+    def test_lane_is_chosen_by_producer_not_type(self):
+        """Внешнее событие с типом внутреннего не попадает во внутреннюю полосу"""
+        queue = EventQueue(enable_silence_detection=False, capacity=2)
+        for i in range(5):
+            queue.push(_event("memory_echo", index=i))
+        assert queue.push_many([_event("silence"), _event("clarity_moment")]) == 0
+
+        metrics = queue.get_metrics()
+        assert metrics["dropped_external"] == 5
+        assert metrics["dropped_internal"] == 0
+        assert queue.push(_event("memory_echo", index=99), internal=True)
+        assert queue.pop().metadata["index"] == 99
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            EventQueue(capacity=0)
+
+    def test_queue_compatible_aliases(self):
+        """qsize/put_nowait, которыми пользуются runtime loop и API"""
+        queue = EventQueue(enable_silence_detection=False)
+        queue.put_nowait(_event())
+        assert queue.qsize() == 1
+
+
+@pytest.mark.unit
+class TestOverflowPolicies:
+    """Политики переполнения"""
+
+    def test_drop_newest_default(self):
+        queue = EventQueue(enable_silence_detection=False, capacity=3)
+        results = [queue.push(_event(index=i)) for i in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert [e.metadata["index"] for e in queue.pop_all()] == [0, 1, 2]
+        assert queue.get_dropped_events_count() == 2
+
+    def test_drop_oldest(self):
+        queue = EventQueue(enable_silence_detection=False, capacity=3, overflow_policy="drop_oldest")
+        for i in range(5):
+            assert queue.push(_event(index=i))
+
+        assert [e.metadata["index"] for e in queue.pop_all()] == [2, 3, 4]
+        assert queue.get_metrics()["evicted"] == 2
+
+    def test_drop_oldest_logs_evicted_event(self, caplog):
+        """В предупреждении о вытеснении - тип вытесненного события, а не нового"""
+        queue = EventQueue(enable_silence_detection=False, capacity=1, overflow_policy="drop_oldest")
+        queue.push(_event("noise"))
+        with caplog.at_level("WARNING", logger="src.environment.event_queue"):
+            queue.push(_event("shock"))
+        assert "evicted oldest (type: noise" in caplog.text
+
+    def test_coalesce_same_type(self):
+        """Событие того же типа сливается с ожидающим, сохраняя его позицию"""
+        queue = EventQueue(enable_silence_detection=False, capacity=2, overflow_policy=OverflowPolicy.COALESCE)
+        queue.push(_event("noise", 0.2, index=0))
+        queue.push(_event("shock", 0.5, index=1))
+        assert queue.push(_event("noise", -0.9, index=2))
+        assert queue.push(_event("noise", 0.1, index=3))
+        assert not queue.push(_event("recovery", 0.3, index=4))
+
+        events = queue.pop_all()
+        assert [e.type for e in events] == ["noise", "shock"]
+        assert events[0].intensity == -0.9
+        assert events[0].metadata["index"] == 3
+        assert events[0].metadata["coalesced"] == 3
+        assert queue.get_metrics()["coalesced"] == 2
+
+    def test_coalesce_after_pop(self):
+        """После извлечения слитое событие не затрагивается новыми"""
+        queue = EventQueue(enable_silence_detection=False, capacity=1, overflow_policy="coalesce")
+        queue.push(_event("noise", index=0))
+        assert queue.pop().metadata["index"] == 0
+        queue.push(_event("shock", index=1))
+        assert not queue.push(_event("noise", index=2))
+
+    def test_block_waits_for_consumer(self):
+        """BLOCK ждет освобождения места вместо потери события"""
+        queue = EventQueue(enable_silence_detection=False, capacity=1, overflow_policy="block", block_timeout=2.0)
+        queue.push(_event(index=0))
+
+        consumer = threading.Timer(0.05, queue.pop_all)
+        consumer.start()
+        assert queue.push(_event(index=1))
+        consumer.join()
+
+        assert [e.metadata["index"] for e in queue.pop_all()] == [1]
+        assert queue.get_metrics()["blocked_waits"] >= 1
+        assert queue.get_dropped_events_count() == 0
+
+    def test_block_timeout_drops(self):
+        queue = EventQueue(enable_silence_detection=False, capacity=1, overflow_policy="block", block_timeout=0.01)
+        queue.push(_event(index=0))
+        assert not queue.push(_event(index=1))
+        assert queue.get_dropped_events_count() == 1
+
+    def test_spill_is_lossless(self, tmp_path):
+        """SPILL выгружает избыток на диск и возвращает его в порядке поступления"""
+        spill_path = tmp_path / "spill.jsonl"
+        queue = EventQueue(enable_silence_detection=False, capacity=3, overflow_policy="spill", spill_path=spill_path)
+        assert queue.push_many(_event(index=i) for i in range(8)) == 8
+        assert queue.size() == 8
+
+        first = queue.pop_all()
+        assert [e.metadata["index"] for e in first] == [0, 1, 2, 3, 4, 5]
+        # Пока на диске есть события, новые идут за ними
+        queue.push(_event(index=8))
+        assert [e.metadata["index"] for e in queue.pop_all()] == [6, 7, 8]
+        assert queue.is_empty()
+        # Полностью прочитанный файл выгрузки очищается
+        assert spill_path.stat().st_size == 0
+
+        metrics = queue.get_metrics()
+        assert metrics["spilled"] == 6
+        assert metrics["dropped"] == 0
+        queue.close()
+
+    def test_spill_survives_restart(self, tmp_path):
+        """Невозвращенные события файла выгрузки подхватывает следующий процесс"""
+        spill_path = tmp_path / "spill.jsonl"
+        queue = EventQueue(enable_silence_detection=False, capacity=1, overflow_policy="spill", spill_path=spill_path)
+        queue.push_many(_event(index=i) for i in range(3))
+        queue.close()
+        with open(spill_path, "ab") as spill_file:
+            spill_file.write(b'{"type": "noise"')  # Оборванная запись
+
+        restarted = EventQueue(enable_silence_detection=False, capacity=3, overflow_policy="spill", spill_path=spill_path)
+        assert restarted.size() == 2
+        restarted.push(_event(index=3))
+        assert [e.metadata["index"] for e in restarted.pop_all()] == [1, 2, 3]
+        assert restarted.is_empty()
+        assert restarted.get_metrics()["dropped"] == 0
+        restarted.close()
+
+    def test_spill_pop(self, tmp_path):
+        queue = EventQueue(enable_silence_detection=False, capacity=1, overflow_policy="spill", spill_path=tmp_path / "s.jsonl")
+        queue.push_many(_event(index=i) for i in range(3))
+        assert [queue.pop().metadata["index"] for _ in range(3)] == [0, 1, 2]
+        assert queue.pop() is None
+        queue.close()
+
+
+@pytest.mark.unit
+class TestEventQueueMetrics:
+    """Метрики и сериализация"""
+
+    def test_push_many_and_metrics(self):
+        queue = EventQueue(enable_silence_detection=False, capacity=5)
+        assert queue.push_many(_event(index=i) for i in range(7)) == 5
+
+        queue.pop()
+        queue.pop_all()
+        metrics = queue.get_metrics()
+        assert metrics["pushed"] == 5
+        assert metrics["popped"] == 5
+        assert metrics["dropped"] == 2
+        assert metrics["max_depth"] == 5
+        assert metrics["max_latency"] >= metrics["avg_latency"] >= 0.0
+
+    def test_to_dict_keeps_events(self):
+        """Сериализация не извлекает события из очереди"""
+        queue = EventQueue(enable_silence_detection=False)
+        queue.push(_event("noise", index=0))
+        queue.push(_event("silence", index=1), internal=True)
+
+        snapshot = queue.to_dict()
+        assert snapshot["metadata"]["event_count"] == 2
+        assert [e["metadata"]["index"] for e in snapshot["data"]["events"]] == [1, 0]
+        assert queue.size() == 2
@@ -1,5 +1,5 @@
 """
-Тесты для покрытия race condition в EventQueue.pop_all (строки 38-39)
+Тесты для race condition в EventQueue.pop_all
 """
 
 import sys
@@ -8,7 +8,6 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
-import queue
 import threading
 import time
 
@@ -23,88 +22,67 @@ from src.environment.event_queue import EventQueue
 class TestEventQueueRaceCondition:
     """Тесты для race condition в pop_all"""
 
-    def test_pop_all_empty_exception_handling(self):
-        """Тест обработки Empty exception в pop_all (строки 38-39)"""
-        event_queue = EventQueue()
-
-        # Создаем ситуацию, когда между проверкой empty() и get_nowait()
-        # очередь становится пустой (race condition)
-        # Это покрывает строки 38-39
-
-        # Добавляем событие
-        event = Event(type="test", intensity=0.5, timestamp=time.time())
-        event_queue.push(event)
-
-        # Мокаем _queue.get_nowait чтобы симулировать Empty после первого вызова
-        original_get = event_queue._queue.get_nowait
-        call_count = [0]
-
-        def mock_get_nowait():
-            call_count[0] += 1
-            if call_count[0] == 1:
-                # Первый вызов возвращает событие
-                return original_get()
-            else:
-                # Второй вызов выбрасывает Empty (симулируем race condition)
-                # Это покрывает строки 38-39: except queue.Empty: break
-                raise queue.Empty()
-
-        # Заменяем метод
-        event_queue._queue.get_nowait = mock_get_nowait
-
-        # Мокаем empty() чтобы вернуть False первый раз, True второй
-        empty_call_count = [0]
-
-        def mock_empty():
-            empty_call_count[0] += 1
-            if empty_call_count[0] == 1:
-                return False  # Первый раз очередь не пуста
-            else:
-                return True  # Второй раз пуста (но мы уже внутри цикла)
-
-        event_queue._queue.empty = mock_empty
-
-        # Теперь pop_all должен обработать Empty exception
-        events = event_queue.pop_all()
-
-        # Должно быть одно событие (первый вызов успешен)
-        assert len(events) == 1
-        assert events[0] == event
-
-        # Второй вызов get_nowait выбросил Empty, который был обработан в строке 38-39
-        assert call_count[0] >= 1
+    def test_pop_all_concurrent_with_push(self):
+        """pop_all во время конкурентных push не теряет и не дублирует события"""
+        event_queue = EventQueue(enable_silence_detection=False, capacity=100000)
+        producers = 4
+        per_producer = 2000
+        collected = []
+        done = threading.Event()
+
+        def produce(worker):
+            for i in range(per_producer):
+                event_queue.push(Event(type="test", intensity=0.5, timestamp=time.time(), metadata={"id": (worker, i)}))
+
+        def consume():
+            while not done.is_set():
+                collected.extend(event_queue.pop_all())
+            collected.extend(event_queue.pop_all())
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        threads = [threading.Thread(target=produce, args=(w,)) for w in range(producers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        consumer.join(timeout=5.0)
+
+        ids = [event.metadata["id"] for event in collected]
+        assert len(ids) == producers * per_producer
+        assert len(set(ids)) == len(ids)
+        # FIFO внутри каждого производителя
+        for worker in range(producers):
+            assert [i for w, i in ids if w == worker] == list(range(per_producer))
+        assert event_queue.get_dropped_events_count() == 0
 
     def test_pop_all_concurrent_access(self):
-        """Тест pop_all при конкурентном доступе"""
+        """pop и pop_all из разных потоков делят события без потерь"""
         event_queue = EventQueue()
 
-        # Добавляем несколько событий
-        for i in range(5):
+        for i in range(50):
             event = Event(type=f"event_{i}", intensity=0.5, timestamp=time.time())
             event_queue.push(event)
 
-        # В отдельном потоке удаляем события
-        removed_count = [0]
+        removed = []
 
         def remove_events():
-            while not event_queue.is_empty():
-                try:
-                    event_queue._queue.get_nowait()
-                    removed_count[0] += 1
-                except queue.Empty:
+            while True:
+                event = event_queue.pop()
+                if event is None:
                     break
+                removed.append(event)
 
-        # Запускаем pop_all в основном потоке
-        # и удаление в другом потоке одновременно
         thread = threading.Thread(target=remove_events)
         thread.start()
 
         events = event_queue.pop_all()
         thread.join(timeout=1.0)
 
-        # Проверяем, что Empty exception был обработан корректно
-        # (не должно быть необработанных исключений)
         assert isinstance(events, list)
+        assert len(events) + len(removed) == 50
+        assert event_queue.is_empty()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+"""
+Тесты для инкрементального анализатора структурированных логов.
+
+Проверяет:
+- Совпадение результатов с функциями log_analysis на том же файле
+- Разбор только дописанных строк и отложенную незавершенную строку
+- Ротацию (переименование) и усечение файла
+- Закрытие цепочек correlation_id по TTL
+- Использование анализатора в ActiveRuntimeAnalysisEngine
+"""
+
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.observability import log_analysis
+from src.observability.incremental_log_analyzer import IncrementalLogAnalyzer
+from src.observability.runtime_analysis_engine import ActiveRuntimeAnalysisEngine
+
+
+def _write(path, entries, mode="a"):
+    with open(path, mode, encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+def _tick(number, start, duration):
+    return [
+        {"timestamp": start, "stage": "tick_start", "tick_number": number},
+        {"timestamp": start + duration, "stage": "tick_end", "tick_number": number},
+    ]
+
+
+def _chain(correlation_id, start, stages=("event", "meaning", "decision", "action", "feedback")):
+    return [
+        {
+            "timestamp": start + i * 0.01,
+            "stage": stage,
+            "correlation_id": correlation_id,
+            "event_type": "noise",
+            "data": {"pattern": "ignore"},
+        }
+        for i, stage in enumerate(stages)
+    ]
+
+
+def _error(timestamp, error_type="ValueError"):
+    return {
+        "timestamp": timestamp,
+        "stage": "error_decision",
+        "correlation_id": "system_error",
+        "error_type": error_type,
+        "error_message": "boom",
+    }
+
+
+def _sample_log(path):
+    entries = []
+    for tick in range(1, 41):
+        entries += _tick(tick, 1000.0 + tick, 0.01 * (tick % 12))
+    entries += _chain("chain_1", 1000.5)
+    entries += _chain("chain_2", 1010.5, stages=("event", "meaning"))
+    entries += [_error(1020.0 + i, "ValueError" if i % 2 else "KeyError") for i in range(15)]
+    _write(path, entries, mode="w")
+
+
+@pytest.mark.unit
+class TestParity:
+    """Совпадение с полным разбором файла"""
+
+    def test_matches_full_file_analysis(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _sample_log(log_path)
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        analyzer.update()
+
+        expected = log_analysis.analyze_logs(str(log_path))
+        actual = analyzer.get_log_analysis()
+        for key in ("total_entries", "stages", "event_types", "decision_patterns", "error_count"):
+            assert actual[key] == expected[key]
+
+        expected = log_analysis.get_performance_metrics(str(log_path))
+        actual = analyzer.get_performance_metrics()
+        for key in ("total_ticks", "slow_ticks_50ms", "slow_ticks_100ms"):
+            assert actual[key] == expected[key]
+        for key in ("avg_tick_duration", "min_tick_duration", "max_tick_duration"):
+            assert actual[key] == pytest.approx(expected[key])
+        for key in ("median_tick_duration", "p95_tick_duration"):
+            assert actual[key] == pytest.approx(expected[key], rel=0.07)
+
+        expected = log_analysis.get_error_summary(str(log_path))
+        actual = analyzer.get_error_summary()
+        assert actual["total_errors"] == expected["total_errors"]
+        assert actual["error_types"] == expected["error_types"]
+
+    def test_chain_summary_matches(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _sample_log(log_path)
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        analyzer.update()
+
+        expected = log_analysis.analyze_correlation_chains(str(log_path))["summary"]
+        actual = analyzer.get_correlation_summary()
+        # system_error ошибок тоже образует цепочку в полном разборе
+        for key in ("total_chains", "complete_chains", "incomplete_chains"):
+            assert actual[key] == expected[key]
+        for key in ("avg_duration", "median_duration", "max_duration", "avg_completeness"):
+            assert actual[key] == pytest.approx(expected[key])
+
+    def test_recent_errors_are_latest(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _write(log_path, [_error(float(i)) for i in range(25)], mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        analyzer.update()
+        timestamps = [error["timestamp"] for error in analyzer.get_error_summary()["recent_errors"]]
+        assert timestamps == [float(i) for i in range(24, 14, -1)]
+
+
+@pytest.mark.unit
+class TestIncrementalReading:
+    """Чтение дописанных строк"""
+
+    def test_parses_only_appended_lines(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _write(log_path, _tick(1, 100.0, 0.02), mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        assert analyzer.update() == 2
+        assert analyzer.update() == 0
+
+        _write(log_path, _tick(2, 101.0, 0.2))
+        assert analyzer.update() == 2
+        metrics = analyzer.get_performance_metrics()
+        assert metrics["total_ticks"] == 2
+        assert metrics["slow_ticks_100ms"] == 1
+        assert analyzer.get_stats()["lines_parsed"] == 4
+
+    def test_partial_line_is_deferred(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        line = json.dumps({"timestamp": 1.0, "stage": "event", "event_type": "noise"})
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write(line[:10])
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        assert analyzer.update() == 0
+
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(line[10:] + "\n")
+        assert analyzer.update() == 1
+        assert analyzer.get_log_analysis()["event_types"] == {"noise": 1}
+        assert analyzer.get_stats()["parse_errors"] == 0
+
+    def test_invalid_lines_are_skipped(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        with open(log_path, "w", encoding="utf-8") as f:
+            f.write("not json\n[1, 2]\n" + json.dumps({"timestamp": 1.0, "stage": "event"}) + "\n")
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        assert analyzer.update() == 1
+        assert analyzer.get_stats()["parse_errors"] == 2
+
+    def test_missing_file(self, tmp_path):
+        analyzer = IncrementalLogAnalyzer(str(tmp_path / "missing.jsonl"))
+        assert analyzer.update() == 0
+        assert analyzer.get_performance_metrics()["total_ticks"] == 0
+
+    def test_max_bytes_per_update_catches_up(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        entries = []
+        for tick in range(1, 101):
+            entries += _tick(tick, float(tick), 0.01)
+        _write(log_path, entries, mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path), max_bytes_per_update=2048)
+
+        updates = 0
+        while analyzer.update():
+            updates += 1
+        assert updates > 1
+        assert analyzer.get_performance_metrics()["total_ticks"] == 100
+
+
+@pytest.mark.unit
+class TestRotation:
+    """Ротация и усечение файла"""
+
+    def test_reads_tail_of_rotated_file(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _write(log_path, _tick(1, 100.0, 0.01), mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        analyzer.update()
+
+        # Строки, дописанные перед ротацией, и новый файл
+        _write(log_path, _tick(2, 101.0, 0.01))
+        log_path.rename(tmp_path / "structured_log.1700000000.jsonl")
+        _write(log_path, _tick(3, 102.0, 0.01), mode="w")
+
+        assert analyzer.update() == 4
+        assert analyzer.get_performance_metrics()["total_ticks"] == 3
+        assert analyzer.get_stats()["rotations"] == 1
+
+        _write(log_path, _tick(4, 103.0, 0.01))
+        assert analyzer.update() == 2
+        assert analyzer.get_performance_metrics()["total_ticks"] == 4
+
+    def test_truncated_file_is_read_from_start(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _write(log_path, _tick(1, 100.0, 0.01) + _tick(2, 101.0, 0.01), mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path))
+        analyzer.update()
+
+        with open(log_path, "r+", encoding="utf-8") as f:
+            f.truncate(0)
+        _write(log_path, _tick(3, 102.0, 0.01))
+        assert analyzer.update() == 2
+        assert analyzer.get_stats()["truncations"] == 1
+        assert analyzer.get_performance_metrics()["total_ticks"] == 3
+
+
+@pytest.mark.unit
+class TestChains:
+    """Цепочки correlation_id"""
+
+    def test_chains_close_after_ttl(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _write(log_path, _chain("chain_1", 100.0), mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path), chain_ttl=10.0)
+        analyzer.update()
+        assert analyzer.get_stats()["active_chains"] == 1
+
+        _write(log_path, _chain("chain_2", 200.0, stages=("event",)))
+        analyzer.update()
+        summary = analyzer.get_correlation_summary()
+        assert analyzer.get_stats()["active_chains"] == 1
+        assert summary["total_chains"] == 2
+        assert summary["complete_chains"] == 1
+        assert summary["incomplete_chains"] == 1
+
+    def test_max_active_chains(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        entries = []
+        for i in range(10):
+            entries += _chain(f"chain_{i}", 100.0 + i * 0.001, stages=("event",))
+        _write(log_path, entries, mode="w")
+        analyzer = IncrementalLogAnalyzer(str(log_path), max_active_chains=3)
+        analyzer.update()
+        assert analyzer.get_stats()["active_chains"] == 3
+        assert analyzer.get_correlation_summary()["total_chains"] == 10
+
+
+@pytest.mark.unit
+class TestAnalysisEngine:
+    """ActiveRuntimeAnalysisEngine читает лог инкрементально"""
+
+    def test_engine_uses_appended_lines(self, tmp_path):
+        log_path = tmp_path / "structured_log.jsonl"
+        _write(log_path, _tick(1, 100.0, 0.02), mode="w")
+        engine = ActiveRuntimeAnalysisEngine(log_path=str(log_path), analysis_interval=0.0)
+
+        results = engine.trigger_immediate_analysis()
+        assert results["performance"]["total_ticks"] == 1
+
+        _write(log_path, _tick(2, 101.0, 0.02) + [_error(102.0)])
+        results = engine.trigger_immediate_analysis()
+        assert results["performance"]["total_ticks"] == 2
+        assert results["errors"]["total_errors"] == 1
+        assert results["trends"]["total_entries"] == 5
+        assert results["trends"]["chains"]["total_chains"] == 1
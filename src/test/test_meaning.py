@@ -8,13 +8,16 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "src"))
 
+import random
 import time
 
 import pytest
 
 from src.environment.event import Event
-from src.meaning.engine import MeaningEngine
+from src.meaning import engine as engine_module
+from src.meaning.engine import MeaningEngine, MeaningStateView
 from src.meaning.meaning import Meaning
+from src.state.self_state import SelfState
 
 
 @pytest.mark.unit
@@ -341,6 +344,129 @@ class TestMeaningEngine:
             0.01 * 0.2 * 0.5, abs=0.001
         )  # +0.01 * intensity * significance
 
+    def test_appraisal_table_invalidated_on_sensitivity_change(self, engine):
+        """Таблица коэффициентов пересчитывается при изменении чувствительности на месте"""
+        state = {
+            "energy": 50.0,
+            "stability": 0.7,
+            "integrity": 0.8,
+            "learning_params": {"event_type_sensitivity": {"noise": 1.0}},
+        }
+        event = Event(type="noise", intensity=0.8, timestamp=time.time())
+
+        assert engine.appraisal(event, state) == pytest.approx(0.8 * 0.5)
+
+        state["learning_params"]["event_type_sensitivity"]["noise"] = 0.0
+        # learning_modifier = 0.5, adaptation_modifier = 1.0 -> среднее 0.75
+        assert engine.appraisal(event, state) == pytest.approx(0.8 * 0.5 * 0.75)
+
+    def test_state_view_matches_status_dict(self, engine):
+        """MeaningStateView дает тот же результат, что и словарь состояния"""
+        self_state = SelfState()
+        self_state.stability = 0.4
+        self_state.integrity = 0.25
+        status = self_state.get_safe_status_dict(include_optional=False)
+        view = MeaningStateView(self_state)
+
+        for event_type in ("shock", "noise", "recovery", "unknown_type"):
+            event = Event(type=event_type, intensity=0.6, timestamp=time.time())
+            expected = engine.process(event, status)
+            actual = engine.process(event, view)
+            assert actual.significance == expected.significance
+            assert actual.impact == expected.impact
+
+        self_state.stability = 0.9
+        assert view.stability == 0.9
+
+
+@pytest.mark.unit
+class TestMeaningEngineBatch:
+    """Тесты пакетной обработки MeaningEngine.process_batch"""
+
+    EVENT_TYPES = list(MeaningEngine.TYPE_WEIGHTS) + ["unknown_type"]
+
+    @pytest.fixture(params=[True, False], ids=["numpy", "python"])
+    def use_numpy(self, request, monkeypatch):
+        """Проверяет векторизованный путь и путь без NumPy"""
+        if request.param and not engine_module.HAS_NUMPY:
+            pytest.skip("NumPy не установлен")
+        monkeypatch.setattr(engine_module, "HAS_NUMPY", request.param)
+        return request.param
+
+    @staticmethod
+    def _events(count: int, seed: int = 7):
+        rng = random.Random(seed)
+        events = []
+        for i in range(count):
+            event_type = rng.choice(TestMeaningEngineBatch.EVENT_TYPES)
+            metadata = {}
+            if event_type == "memory_echo" and i % 2:
+                metadata["original_memory"] = {
+                    "event_type": "shock",
+                    "emotional_impact": "negative",
+                }
+            events.append(
+                Event(
+                    type=event_type,
+                    intensity=rng.uniform(-1.0, 1.0),
+                    timestamp=time.time(),
+                    metadata=metadata,
+                )
+            )
+        return events
+
+    @staticmethod
+    def _apply(state: SelfState, meaning: Meaning) -> None:
+        # Последовательные изменения состояния между событиями батча
+        state.stability = min(1.0, max(0.0, state.stability + meaning.impact["stability"] * 5))
+        state.integrity = min(1.0, max(0.0, state.integrity + meaning.impact["integrity"] * 5))
+
+    def test_batch_matches_scalar_path(self, use_numpy):
+        """process_batch совпадает с последовательными process при изменении состояния"""
+        events = self._events(400)
+        scalar_state = SelfState()
+        batch_state = SelfState()
+        for state in (scalar_state, batch_state):
+            state.stability = 0.5
+            state.integrity = 0.4
+            state.learning_params["event_type_sensitivity"]["shock"] = 0.3
+            state.adaptation_params.setdefault("behavior_sensitivity", {})["noise"] = 0.1
+
+        scalar_engine = MeaningEngine()
+        expected = []
+        for event in events:
+            meaning = scalar_engine.process(event, scalar_state)
+            expected.append(meaning)
+            self._apply(scalar_state, meaning)
+
+        batch = MeaningEngine().process_batch(events, batch_state)
+        assert len(batch) == len(events)
+        for index, event in enumerate(events):
+            meaning = batch.meaning(index)
+            assert meaning.significance == expected[index].significance
+            assert meaning.impact == expected[index].impact
+            assert type(meaning.significance) is float
+            self._apply(batch_state, meaning)
+
+    def test_batch_with_state_view(self, use_numpy):
+        """Пакетный путь с MeaningStateView совпадает со скалярным"""
+        self_state = SelfState()
+        self_state.stability = 0.85
+        events = self._events(50, seed=11)
+        engine = MeaningEngine()
+        view = MeaningStateView(self_state)
+
+        batch_meanings = list(engine.process_batch(events, view))
+
+        for event, meaning in zip(events, batch_meanings):
+            expected = engine.process(event, view)
+            assert meaning.significance == expected.significance
+            assert meaning.impact == expected.impact
+
+    def test_empty_batch(self, use_numpy):
+        """Пустой батч"""
+        assert list(MeaningEngine().process_batch([], {"stability": 0.5})) == []
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -618,6 +618,117 @@ class TestArchiveMemory:
             assert loaded_entry.weight == 0.8
 
 
+@pytest.mark.unit
+@pytest.mark.order(2)
+class TestSegmentedArchiveStorage:
+    """Тесты для сегментированного append-only хранилища архива"""
+
+    def _entries(self, count, start=0):
+        return [
+            MemoryEntry(event_type=f"event_{i}", meaning_significance=0.5, timestamp=1000.0 + i)
+            for i in range(start, start + count)
+        ]
+
+    def test_save_appends_only_new_entries(self, tmp_path):
+        """Повторное сохранение дописывает только новые записи"""
+        archive = ArchiveMemory(archive_file=tmp_path / "archive.json", load_existing=False)
+        archive.add_entries(self._entries(10))
+        archive.save_archive()
+        written_after_first = archive.get_storage_stats()["bytes_written"]
+
+        archive.add_entries(self._entries(2, start=10))
+        archive.save_archive()
+        stats = archive.get_storage_stats()
+
+        assert stats["total_entries"] == 12
+        # Вторая запись значительно меньше первой - архив не перезаписывается
+        assert stats["bytes_written"] - written_after_first < written_after_first / 2
+
+        reloaded = ArchiveMemory(archive_file=tmp_path / "archive.json", load_existing=True)
+        assert [e.event_type for e in reloaded.get_all_entries()] == [
+            f"event_{i}" for i in range(12)
+        ]
+
+    def test_segments_rotate_and_lazy_load(self, tmp_path):
+        """Записи распределяются по сегментам, загрузка откладывается до обращения"""
+        archive_file = tmp_path / "archive.json"
+        archive = ArchiveMemory(archive_file=archive_file, segment_max_entries=4)
+        archive.add_entries(self._entries(10))
+        archive.save_archive()
+        assert archive.get_storage_stats()["segments"] == 3
+
+        reloaded = ArchiveMemory(
+            archive_file=archive_file, load_existing=True, segment_max_entries=4
+        )
+        assert reloaded.size() == 10
+        assert reloaded._entries == []  # Ничего не прочитано до обращения
+
+        reloaded.add_entry(MemoryEntry("late", 0.5, 5000.0))
+        reloaded.save_archive()
+        assert len(reloaded.search_by_type("event_3")) == 1
+        assert reloaded.get_all_entries()[-1].event_type == "late"
+        assert reloaded.size() == 11
+
+    def test_torn_tail_is_ignored(self, tmp_path):
+        """Незафиксированный в манифесте хвост сегмента отбрасывается"""
+        archive_file = tmp_path / "archive.json"
+        archive = ArchiveMemory(archive_file=archive_file)
+        archive.add_entries(self._entries(3))
+        archive.save_archive()
+
+        segment = next(archive_file.with_suffix(".segments").glob("segment_*.jsonl"))
+        with segment.open("ab") as f:
+            f.write(b'{"event_type": "torn", "meaning_sig')
+
+        reloaded = ArchiveMemory(archive_file=archive_file, load_existing=True)
+        assert reloaded.size() == 3
+        reloaded.add_entries(self._entries(1, start=3))
+        reloaded.save_archive()
+
+        final = ArchiveMemory(archive_file=archive_file, load_existing=True)
+        assert [e.event_type for e in final.get_all_entries()] == [
+            f"event_{i}" for i in range(4)
+        ]
+
+    def test_legacy_archive_migration(self, tmp_path):
+        """Legacy JSON-архив переносится в сегменты при загрузке"""
+        archive_file = tmp_path / "memory_archive.json"
+        with archive_file.open("w") as f:
+            json.dump({"entries": [e.__dict__ for e in self._entries(5)]}, f)
+
+        archive = ArchiveMemory(archive_file=archive_file, load_existing=True)
+        assert archive.size() == 5
+        assert archive.get_all_entries()[0].event_type == "event_0"
+        assert (archive_file.with_suffix(".segments") / "manifest.json").exists()
+
+        # Повторная загрузка идет из сегментов
+        again = ArchiveMemory(archive_file=archive_file, load_existing=True)
+        assert again.size() == 5
+
+    def test_clear_then_save_rewrites_and_compaction(self, tmp_path):
+        """clear() приводит к полной перезаписи, compact объединяет сегменты"""
+        archive_file = tmp_path / "archive.json"
+        archive = ArchiveMemory(archive_file=archive_file, segment_max_entries=3)
+        archive.add_entries(self._entries(7))
+        archive.save_archive()
+
+        archive.clear()
+        archive.add_entries(self._entries(2, start=100))
+        archive.save_archive()
+        reloaded = ArchiveMemory(
+            archive_file=archive_file, load_existing=True, segment_max_entries=3
+        )
+        assert [e.event_type for e in reloaded.get_all_entries()] == ["event_100", "event_101"]
+
+        big = ArchiveMemory(archive_file=archive_file, load_existing=True, segment_max_entries=10)
+        big.add_entries(self._entries(5, start=200))
+        big.compact_archive()
+        stats = big.get_storage_stats()
+        assert stats["segments"] == 1
+        assert stats["total_entries"] == 7
+        assert len(list(archive_file.with_suffix(".segments").glob("segment_*.jsonl"))) == 1
+
+
 @pytest.mark.unit
 @pytest.mark.order(2)
 class TestMemoryArchive:
@@ -3,6 +3,7 @@
 """
 
 import inspect
+import random
 import time
 from pathlib import Path
 import sys
@@ -12,6 +13,7 @@ sys.path.insert(0, str(project_root / "src"))
 
 import pytest
 
+from src.memory import index_engine
 from src.memory.index_engine import MemoryIndexEngine, MemoryQuery
 from src.memory.memory_types import MemoryEntry
 
@@ -125,15 +127,15 @@ class TestMemoryIndexEngineStatic:
         assert hasattr(engine, "_filter_by_timestamp_range")
         assert hasattr(engine, "_filter_by_significance_range")
         assert hasattr(engine, "_sort_results")
-        assert hasattr(engine, "_insert_sorted")
-        assert hasattr(engine, "_binary_search_left")
+        assert hasattr(engine, "_range_slice")
+        assert hasattr(engine, "_invalidate_for_added")
 
         # Проверяем что они приватные (начинаются с _)
         assert "_filter_by_timestamp_range" in dir(engine)
         assert "_filter_by_significance_range" in dir(engine)
         assert "_sort_results" in dir(engine)
-        assert "_insert_sorted" in dir(engine)
-        assert "_binary_search_left" in dir(engine)
+        assert "_range_slice" in dir(engine)
+        assert "_invalidate_for_added" in dir(engine)
 
     def test_memory_index_engine_attributes_initialization(self):
         """Проверка инициализации атрибутов MemoryIndexEngine"""
@@ -163,9 +165,14 @@ class TestMemoryIndexEngineStatic:
         # Проверяем типы
         assert isinstance(engine.event_type_index, dict)
         assert isinstance(engine.entries_by_id, dict)
-        assert isinstance(engine.timestamp_entries, list)
-        assert isinstance(engine.significance_entries, list)
-        assert isinstance(engine.weight_entries, list)
+        for sorted_index in (
+            engine.timestamp_entries,
+            engine.significance_entries,
+            engine.weight_entries,
+        ):
+            assert hasattr(sorted_index, "add")
+            assert hasattr(sorted_index, "bisect_left")
+            assert len(sorted_index) == 0
         assert isinstance(engine.query_cache, dict)
         assert isinstance(engine.stats, dict)
 
@@ -800,7 +807,8 @@ class TestMemoryIndexEngine:
 
         # Добавляем запись
         engine.add_entry(entry)
-        assert id(entry) in engine.event_type_index["test_event"]
+        entry_id = engine.get_entry_id(entry)
+        assert entry_id in engine.event_type_index["test_event"]
         assert entry in engine.entries_by_id.values()
         assert len(engine.timestamp_entries) == 1
         assert len(engine.significance_entries) == 1
@@ -808,7 +816,8 @@ class TestMemoryIndexEngine:
 
         # Удаляем запись
         engine.remove_entry(entry)
-        assert id(entry) not in engine.event_type_index.get("test_event", set())
+        assert entry_id not in engine.event_type_index.get("test_event", set())
+        assert engine.get_entry_id(entry) is None
         assert entry not in engine.entries_by_id.values()
         assert len(engine.timestamp_entries) == 0
         assert len(engine.significance_entries) == 0
@@ -1073,3 +1082,228 @@ class TestMemoryQuery:
 
         # Разные запросы должны иметь разные хэши
         assert query1.get_hash() != query3.get_hash()
+
+
+@pytest.mark.unit
+class TestOrderedIndexes:
+    """Упорядоченные индексы, стабильные id и точечная инвалидация кэша"""
+
+    @pytest.fixture(params=["sortedcontainers", "bisect"])
+    def engine(self, request, monkeypatch):
+        if request.param == "sortedcontainers" and not index_engine.HAS_SORTEDCONTAINERS:
+            pytest.skip("sortedcontainers не установлен")
+        if request.param == "bisect":
+            monkeypatch.setattr(index_engine, "HAS_SORTEDCONTAINERS", False)
+        return MemoryIndexEngine()
+
+    def test_remove_keeps_other_entries_ordered(self, engine):
+        entries = [MemoryEntry(f"event_{i % 3}", (i % 10) / 10, 1000.0 + i) for i in range(30)]
+        for entry in entries:
+            engine.add_entry(entry)
+        for entry in entries[::2]:
+            engine.remove_entry(entry)
+
+        remaining = entries[1::2]
+        assert engine.get_entries_by_timestamp_range() == remaining
+        assert engine.get_entries_by_timestamp_range(1005.0, 1009.0) == remaining[2:5]
+        significances = [e.meaning_significance for e in engine.get_entries_by_significance_range()]
+        assert significances == sorted(significances)
+        assert len(engine.weight_entries) == len(remaining)
+        assert engine.get_stats()["total_entries"] == len(remaining)
+
+    def test_remove_uses_keys_from_indexing(self, engine):
+        entry = MemoryEntry("event", 0.5, 1000.0, weight=1.0)
+        engine.add_entry(entry)
+        entry.weight = 0.2
+        engine.remove_entry(entry)
+        assert len(engine.weight_entries) == 0
+
+    def test_remove_unknown_entry_is_noop(self, engine):
+        engine.add_entry(MemoryEntry("event", 0.5, 1000.0))
+        engine.remove_entry(MemoryEntry("event", 0.5, 1000.0))
+        assert engine.get_stats()["total_entries"] == 1
+
+    def test_stable_ids(self, engine):
+        first = MemoryEntry("event", 0.5, 1000.0)
+        second = MemoryEntry("event", 0.5, 1000.0)
+        engine.add_entry(first)
+        engine.add_entry(second)
+        first_id = engine.get_entry_id(first)
+        assert first_id != engine.get_entry_id(second)
+
+        # Повторное добавление и перестройка сохраняют id
+        engine.add_entry(first)
+        assert engine.get_stats()["total_entries"] == 2
+        engine.rebuild_indexes([second, first])
+        assert engine.get_entry_id(first) == first_id
+
+    def test_ties_in_indexing_order(self, engine):
+        entries = [MemoryEntry("event", 0.5, 1000.0 + i) for i in range(5)]
+        for entry in entries:
+            engine.add_entry(entry)
+        assert engine.get_top_by_significance("event", 5) == entries
+
+    def test_add_keeps_unaffected_cached_queries(self, engine):
+        engine.add_entry(MemoryEntry("event_a", 0.9, 1000.0))
+        engine.add_entry(MemoryEntry("event_b", 0.2, 1001.0))
+        query_a = MemoryQuery(event_type="event_a")
+        query_high = MemoryQuery(min_significance=0.8)
+        engine.search(query_a)
+        engine.search(query_high)
+
+        # Не подходит ни под один из запросов - кэш сохраняется
+        engine.add_entry(MemoryEntry("event_b", 0.3, 1002.0))
+        assert engine.get_stats()["cache_size"] == 2
+
+        # Подходит под query_high - удаляется только он
+        new_entry = MemoryEntry("event_b", 0.95, 1003.0)
+        engine.add_entry(new_entry)
+        assert engine.get_stats()["cache_size"] == 1
+        assert new_entry in engine.search(query_high)
+        hits = engine.get_stats()["cache_hits"]
+        engine.search(query_a)
+        assert engine.get_stats()["cache_hits"] == hits + 1
+
+    def test_remove_drops_only_queries_containing_entry(self, engine):
+        entry_a = MemoryEntry("event_a", 0.9, 1000.0)
+        engine.add_entry(entry_a)
+        engine.add_entry(MemoryEntry("event_b", 0.2, 1001.0))
+        engine.search(MemoryQuery(event_type="event_a"))
+        engine.search(MemoryQuery(event_type="event_b"))
+
+        engine.remove_entry(entry_a)
+        assert engine.get_stats()["cache_size"] == 1
+        assert engine.search(MemoryQuery(event_type="event_a")) == []
+
+    def test_refresh_weights(self, engine):
+        entries = [MemoryEntry("event", 0.5, 1000.0 + i, weight=1.0) for i in range(4)]
+        for entry in entries:
+            engine.add_entry(entry)
+        by_weight = MemoryQuery(min_weight=0.5)
+        by_time = MemoryQuery()
+        assert len(engine.search(by_weight)) == 4
+        engine.search(by_time)
+
+        entries[0].weight = 0.1
+        engine.refresh_weights()
+        assert engine.get_entries_by_weight_range(0.0, 0.2) == [entries[0]]
+        assert engine.get_stats()["cache_size"] == 1
+        assert entries[0] not in engine.search(by_weight)
+
+
+def _brute_force(entries, query):
+    """Эталонный поиск полным перебором."""
+    engine = MemoryIndexEngine(enable_query_cache=False)
+    matched = [entry for entry in entries if engine._matches_query(entry, query)]
+    return engine._sort_results(matched, query)[: query.limit]
+
+
+@pytest.mark.unit
+class TestQueryPlanner:
+    """Выбор самого селективного пути доступа в _find_candidates"""
+
+    @pytest.fixture
+    def entries(self):
+        rng = random.Random(7)
+        return [
+            MemoryEntry(f"event_{i % 4}", rng.random(), 1000.0 + i, rng.random())
+            for i in range(2000)
+        ]
+
+    def test_picks_most_selective_path(self, entries):
+        engine = MemoryIndexEngine()
+        engine.rebuild_indexes(entries)
+
+        narrow_time = MemoryQuery(event_type="event_1", start_timestamp=2900.0)
+        plan = engine.explain(narrow_time)
+        assert plan["access_path"] == "event_type_timestamp"
+        assert plan["candidates"] == 25
+        assert plan["paths"]["event_type"] == 500
+
+        narrow_significance = MemoryQuery(
+            event_type="event_1", min_significance=0.99, start_timestamp=1000.0
+        )
+        assert engine.explain(narrow_significance)["access_path"] == "event_type_significance"
+
+        untyped = MemoryQuery(start_timestamp=2990.0)
+        plan = engine.explain(untyped)
+        assert plan["access_path"] == "timestamp"
+        assert plan["candidates"] == plan["matched"] == 10
+
+    def test_joins_comparable_paths(self, entries):
+        engine = MemoryIndexEngine()
+        engine.rebuild_indexes(entries)
+        query = MemoryQuery(event_type="event_1", min_significance=0.8, start_timestamp=2600.0)
+        plan = engine.explain(query)
+        assert len(plan["joins"]) == 1
+        assert {plan["access_path"], *plan["joins"]} == {
+            "event_type_significance",
+            "event_type_timestamp",
+        }
+        # Соединение оставляет только записи, подходящие под оба диапазона
+        assert plan["candidates"] == plan["matched"]
+        assert plan["steps"][-1]["candidates"] < plan["steps"][0]["candidates"]
+
+        # Путь намного больше кандидатов не присоединяется
+        plan = engine.explain(
+            MemoryQuery(event_type="event_1", min_significance=0.0, start_timestamp=2990.0)
+        )
+        assert plan["access_path"] == "event_type_timestamp"
+        assert plan["joins"] == []
+
+    def test_event_type_probe_without_composite_indexes(self, entries):
+        engine = MemoryIndexEngine(enable_composite_indexes=False)
+        engine.rebuild_indexes(entries)
+        plan = engine.explain(MemoryQuery(event_type="event_1", start_timestamp=2900.0))
+        assert plan["access_path"] == "timestamp"
+        assert plan["joins"] == ["event_type"]
+        assert plan["candidates"] == 25
+
+    def test_full_scan_and_weight_filter(self, entries):
+        engine = MemoryIndexEngine()
+        engine.rebuild_indexes(entries)
+        # Вес не служит путем доступа - проверяется фильтром
+        plan = engine.explain(MemoryQuery(min_weight=0.9, limit=1000))
+        assert plan["access_path"] == "full_scan"
+        assert plan["candidates"] == 2000
+        assert plan["returned"] == plan["matched"]
+
+    def test_unknown_event_type_has_no_candidates(self, entries):
+        engine = MemoryIndexEngine()
+        engine.rebuild_indexes(entries)
+        plan = engine.explain(MemoryQuery(event_type="missing", start_timestamp=1000.0))
+        assert plan["candidates"] == 0
+        assert engine.search(MemoryQuery(event_type="missing")) == []
+
+    def test_explain_reports_cache(self, entries):
+        engine = MemoryIndexEngine()
+        engine.rebuild_indexes(entries)
+        query = MemoryQuery(event_type="event_2")
+        assert engine.explain(query)["cached"] is False
+        engine.search(query)
+        assert engine.explain(query)["cached"] is True
+        assert engine.get_stats()["query_count"] == 1
+
+    @pytest.mark.parametrize("composite", [True, False])
+    def test_matches_brute_force(self, entries, composite):
+        engine = MemoryIndexEngine(enable_composite_indexes=composite, enable_query_cache=False)
+        engine.rebuild_indexes(entries)
+        rng = random.Random(11)
+        for _ in range(200):
+            low_sig, high_sig = sorted((rng.random(), rng.random()))
+            start = rng.uniform(900.0, 3100.0)
+            query = MemoryQuery(
+                event_type=rng.choice([None, "event_0", "event_3", "missing"]),
+                min_significance=rng.choice([None, low_sig]),
+                max_significance=rng.choice([None, high_sig]),
+                start_timestamp=rng.choice([None, start]),
+                end_timestamp=rng.choice([None, start + rng.uniform(0.0, 500.0)]),
+                min_weight=rng.choice([None, 0.5]),
+                limit=rng.choice([5, 100, 5000]),
+                sort_by=rng.choice(["timestamp", "significance", "weight"]),
+                sort_order=rng.choice(["asc", "desc"]),
+            )
+            expected = _brute_force(entries, query)
+            actual = engine.search(query)
+            # Значения ключей сортировки случайны и уникальны - порядок однозначен
+            assert [id(e) for e in actual] == [id(e) for e in expected]
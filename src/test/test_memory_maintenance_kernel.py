@@ -0,0 +1,235 @@
+"""
+Тесты ядра обслуживания памяти (maintenance_kernel).
+
+Property-based проверка эквивалентности: векторный путь (numpy) и цикл Python
+дают те же веса и те же записи, что и прежний построчный проход Memory
+(decay_weights, archive_old_entries, clamp_size).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from src.memory import maintenance_kernel
+from src.memory.maintenance_kernel import clamp_order, maintenance_pass
+from src.memory.memory import ArchiveMemory, Memory
+from src.memory.memory_types import MemoryEntry
+
+NOW = 1_700_000_000.0
+
+BACKENDS = ["numpy", "python"]
+
+entry_values = st.tuples(
+    st.floats(min_value=0.0, max_value=2.0, allow_nan=False),  # weight
+    st.floats(min_value=NOW - 30 * 86400.0, max_value=NOW + 60.0, allow_nan=False),  # timestamp
+    st.floats(min_value=-0.5, max_value=1.5, allow_nan=False),  # significance
+)
+entry_lists = st.lists(entry_values, max_size=120)
+maintenance_params = st.fixed_dictionaries(
+    {
+        "decay_factor": st.floats(min_value=0.5, max_value=1.5, allow_nan=False),
+        "min_weight": st.floats(min_value=0.0, max_value=0.5, allow_nan=False),
+        "max_age_seconds": st.floats(min_value=0.0, max_value=20 * 86400.0, allow_nan=False),
+        "archive_min_weight": st.floats(min_value=0.0, max_value=0.5, allow_nan=False),
+        "archive_min_significance": st.floats(min_value=-0.2, max_value=0.5, allow_nan=False),
+    }
+)
+
+
+def _backend(monkeypatch, backend):
+    if backend == "numpy":
+        if not maintenance_kernel.HAS_NUMPY:
+            pytest.skip("numpy не установлен")
+        monkeypatch.setattr(maintenance_kernel, "NUMPY_MIN_ENTRIES", 0)
+    else:
+        monkeypatch.setattr(maintenance_kernel, "HAS_NUMPY", False)
+
+
+def _entries(values):
+    return [
+        MemoryEntry(event_type=f"type_{i % 3}", meaning_significance=s, timestamp=t, weight=w)
+        for i, (w, t, s) in enumerate(values)
+    ]
+
+
+def _bits(weights):
+    return [float(weight).hex() for weight in weights]
+
+
+def _reference_decay(entries, current_time, decay_factor, min_weight):
+    """Прежний построчный проход Memory.decay_weights."""
+    min_weight_count = 0
+    decay_factor_clamped = max(0.9, min(1.0, decay_factor))
+    for entry in entries:
+        entry.weight *= decay_factor_clamped
+        age = current_time - entry.timestamp
+        age_factor = 1.0 / (1.0 + age / 86400.0)
+        entry.weight *= age_factor
+        significance_factor = 0.5 + 0.5 * entry.meaning_significance
+        entry.weight *= significance_factor
+        if entry.weight < min_weight:
+            entry.weight = min_weight
+            min_weight_count += 1
+    return min_weight_count
+
+
+def _reference_archive(entries, current_time, max_age_seconds, min_weight, min_significance):
+    """Прежний построчный проход Memory.archive_old_entries."""
+    cutoff_time = current_time - max_age_seconds
+    to_archive = [
+        entry
+        for entry in entries
+        if entry.timestamp < cutoff_time
+        or entry.weight < min_weight
+        or entry.meaning_significance < min_significance
+    ]
+    for entry in to_archive:
+        if entry in entries:
+            entries.remove(entry)
+    return len(to_archive)
+
+
+def _reference_clamp(entries, threshold, max_size):
+    """Прежний проход Memory.clamp_size."""
+    entries = [entry for entry in entries if entry.weight >= threshold]
+    if len(entries) > max_size:
+        entries.sort(key=lambda x: x.weight)
+        del entries[: len(entries) - max_size]
+    return entries
+
+
+def _memory(values, tmp_path):
+    memory = Memory(archive=ArchiveMemory(archive_file=tmp_path / "archive.json"))
+    list.extend(memory, _entries(values))
+    memory._mark_index_stale()
+    return memory
+
+
+@pytest.mark.unit
+class TestMaintenanceKernelEquivalence:
+    """Ядро совпадает с прежним построчным проходом"""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @settings(max_examples=150, deadline=None)
+    @given(values=entry_lists, params=maintenance_params)
+    def test_maintenance_pass_matches_reference(self, backend, values, params):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            _backend(monkeypatch, backend)
+            cutoff_time = NOW - params["max_age_seconds"]
+            result = maintenance_pass(
+                [w for w, _, _ in values],
+                [t for _, t, _ in values],
+                [s for _, _, s in values],
+                NOW,
+                max(0.9, min(1.0, params["decay_factor"])),
+                params["min_weight"],
+                cutoff_time=cutoff_time,
+                archive_min_weight=params["archive_min_weight"],
+                archive_min_significance=params["archive_min_significance"],
+            )
+
+        expected = _entries(values)
+        expected_count = _reference_decay(
+            expected, NOW, params["decay_factor"], params["min_weight"]
+        )
+        assert _bits(result.weights) == _bits(entry.weight for entry in expected)
+        assert result.min_weight_count == expected_count
+
+        archived = set(result.archive_positions)
+        kept = [entry for i, entry in enumerate(expected) if i not in archived]
+        _reference_archive(
+            expected,
+            NOW,
+            params["max_age_seconds"],
+            params["archive_min_weight"],
+            params["archive_min_significance"],
+        )
+        assert kept == expected
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @settings(max_examples=150, deadline=None)
+    @given(
+        weights=st.lists(st.sampled_from([0.0, 0.05, 0.1, 0.3, 0.5, 1.0]) | st.floats(0, 2),
+                         max_size=120),
+        threshold=st.floats(min_value=0.0, max_value=0.5),
+        max_size=st.integers(min_value=0, max_value=60),
+    )
+    def test_clamp_order_matches_reference(self, backend, weights, threshold, max_size):
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            _backend(monkeypatch, backend)
+            keep = clamp_order(weights, threshold, max_size)
+
+        entries = _entries([(w, NOW, 0.5) for w in weights])
+        expected = _reference_clamp(entries, threshold, max_size)
+        assert [entries[i] for i in keep] == expected
+        assert [id(entries[i]) for i in keep] == [id(entry) for entry in expected]
+
+
+@pytest.mark.unit
+class TestMemoryMaintenance:
+    """Memory использует ядро и дает прежний результат"""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    @settings(max_examples=60, deadline=None)
+    @given(values=entry_lists, params=maintenance_params)
+    def test_batch_maintenance_matches_reference(self, tmp_path_factory, backend, values, params):
+        tmp_path = tmp_path_factory.mktemp("maintenance")
+        memory = _memory(values, tmp_path)
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            _backend(monkeypatch, backend)
+            monkeypatch.setattr(time, "time", lambda: NOW)
+            result = memory.batch_memory_maintenance(**params)
+
+        expected = _entries(values)
+        decayed = _reference_decay(expected, NOW, params["decay_factor"], params["min_weight"])
+        archived = _reference_archive(
+            expected,
+            NOW,
+            params["max_age_seconds"],
+            params["archive_min_weight"],
+            params["archive_min_significance"],
+        )
+        assert list(memory) == expected
+        assert _bits(entry.weight for entry in memory) == _bits(e.weight for e in expected)
+        assert result == {
+            "decayed_count": decayed,
+            "archived_count": archived,
+            "total_processed": len(values),
+        }
+        # Индекс содержит ровно оставшиеся записи с новыми весами
+        engine = memory._ensure_index()
+        assert engine.get_stats()["total_entries"] == len(expected)
+        assert sorted(engine.get_entries_by_weight_range(-1.0, 10.0), key=id) == sorted(
+            memory, key=id
+        )
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_decay_weights_matches_reference(self, tmp_path, monkeypatch, backend):
+        values = [(1.0 - i / 200, NOW - i * 3600.0, (i % 11) / 10) for i in range(200)]
+        memory = _memory(values, tmp_path)
+        _backend(monkeypatch, backend)
+        monkeypatch.setattr(time, "time", lambda: NOW)
+
+        count = memory.decay_weights(decay_factor=0.95, min_weight=0.2)
+        expected = _entries(values)
+        assert count == _reference_decay(expected, NOW, 0.95, 0.2)
+        assert _bits(entry.weight for entry in memory) == _bits(e.weight for e in expected)
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_clamp_size_matches_reference(self, tmp_path, monkeypatch, backend):
+        values = [((i * 37 % 100) / 100, NOW, 0.5) for i in range(150)]
+        memory = _memory(values, tmp_path)
+        entries = list(memory)
+        _backend(monkeypatch, backend)
+
+        memory.clamp_size()
+        expected = _reference_clamp(entries, memory._min_weight_threshold, memory._max_size)
+        assert [id(entry) for entry in memory] == [id(entry) for entry in expected]
+        assert memory.get_index_stats()["total_entries"] == len(expected)
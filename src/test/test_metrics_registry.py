@@ -0,0 +1,255 @@
+"""
+Тесты для реестра метрик runtime и адаптеров мониторов производительности.
+
+Проверяет:
+- Точность перцентилей лог-линейной гистограммы и фиксированный размер
+- Шардирование по потокам и слияние шардов завершившихся потоков
+- Счетчики, gauge и снимок реестра
+- measure_time и PerformanceMonitor поверх реестра
+"""
+
+import math
+import random
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.runtime.metrics_registry import (
+    BUCKET_COUNT,
+    MAX_EXPONENT,
+    MIN_EXPONENT,
+    SUB_BUCKETS,
+    Histogram,
+    MetricsRegistry,
+    bucket_index,
+    bucket_upper_bound,
+    get_metrics_registry,
+)
+from src.runtime.performance_metrics import PerformanceMetrics
+from src.runtime.performance_monitor import PerformanceMonitor
+from src.utils.performance_monitor import PerformanceMonitor as UtilsPerformanceMonitor
+
+
+@pytest.mark.unit
+class TestHistogram:
+    """Лог-линейная гистограмма"""
+
+    def test_bucket_bounds_contain_value(self):
+        for value in (1e-6, 3.3e-5, 0.001, 0.0123, 0.5, 1.0, 7.7, 1000.0):
+            index = bucket_index(value)
+            assert bucket_upper_bound(index - 1) <= value < bucket_upper_bound(index)
+
+    def test_out_of_range_values(self):
+        assert bucket_index(0.0) == 0
+        assert bucket_index(-1.0) == 0
+        assert bucket_index(1e-9) == 0
+        assert bucket_index(1e9) == BUCKET_COUNT - 1
+
+    def test_quantiles_within_bucket_error(self):
+        rng = random.Random(42)
+        values = [rng.lognormvariate(-6, 1) for _ in range(20000)]
+        histogram = Histogram("latency")
+        for value in values:
+            histogram.observe(value)
+
+        values.sort()
+        summary = histogram.snapshot()
+        for key, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            exact = values[int(q * len(values)) - 1]
+            assert summary[key] == pytest.approx(exact, rel=1.0 / SUB_BUCKETS)
+        assert summary["count"] == len(values)
+        assert summary["max"] == values[-1]
+        assert summary["min"] == values[0]
+        assert summary["mean"] == pytest.approx(sum(values) / len(values))
+
+    def test_memory_is_fixed(self):
+        histogram = Histogram("fixed")
+        for i in range(10000):
+            histogram.observe(i * 1e-4)
+        shard = histogram._local.shard
+        assert len(shard.counts) == BUCKET_COUNT
+
+    def test_empty_snapshot(self):
+        summary = Histogram("empty").snapshot()
+        assert summary["count"] == 0
+        assert summary["p99"] == 0.0
+        assert summary["last"] is None
+
+    def test_timer_records_duration(self):
+        histogram = Histogram("timer")
+        with histogram.time():
+            pass
+        assert histogram.snapshot()["count"] == 1
+        assert histogram.last >= 0.0
+
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram("buckets")
+        for value in (0.001, 0.001, 0.01, 1.0):
+            histogram.observe(value)
+        buckets, count, total = histogram.buckets()
+        cumulative = dict(buckets)
+        assert len(buckets) == MAX_EXPONENT - MIN_EXPONENT + 2
+        assert cumulative[2.0**-9] == 2  # 0.001 < 2^-9
+        assert cumulative[2.0**-6] == 3  # 0.01 < 2^-6
+        assert cumulative[2.0] == 4
+        assert cumulative[math.inf] == 4
+        assert count == 4
+        assert total == pytest.approx(1.012)
+
+
+@pytest.mark.unit
+class TestSharding:
+    """Запись из нескольких потоков"""
+
+    def test_concurrent_observations_are_merged(self):
+        histogram = Histogram("concurrent")
+
+        def worker():
+            for _ in range(5000):
+                histogram.observe(0.002)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert histogram.snapshot()["count"] == 40000
+        # Шарды завершившихся потоков слиты в общий
+        assert histogram._shards == []
+        assert histogram.snapshot()["count"] == 40000
+
+    def test_counter_sums_threads(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("events")
+
+        def worker():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(5)
+
+        assert counter.value() == 4005
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    """Реестр метрик"""
+
+    def test_get_or_create_returns_same_metric(self):
+        registry = MetricsRegistry()
+        assert registry.histogram("a") is registry.histogram("a")
+        assert registry.counter("b") is registry.counter("b")
+
+    def test_type_conflict_raises(self):
+        registry = MetricsRegistry()
+        registry.counter("name")
+        with pytest.raises(TypeError):
+            registry.histogram("name")
+
+    def test_snapshot_by_prefix(self):
+        registry = MetricsRegistry()
+        registry.histogram("tick.duration").observe(0.01)
+        registry.counter("events.dropped").inc(3)
+        registry.gauge("queue.depth").set(7)
+        registry.gauge("cache.size", function=lambda: 42)
+
+        snapshot = registry.snapshot()
+        assert snapshot["histograms"]["tick.duration"]["count"] == 1
+        assert snapshot["counters"]["events.dropped"] == 3
+        assert snapshot["gauges"] == {"cache.size": 42.0, "queue.depth": 7}
+        assert list(registry.snapshot("tick.")["histograms"]) == ["tick.duration"]
+
+    def test_failing_gauge_function(self):
+        registry = MetricsRegistry()
+        registry.gauge("broken", function=lambda: 1 / 0)
+        assert registry.snapshot()["gauges"]["broken"] is None
+
+    def test_reset_keeps_metrics_registered(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("op")
+        histogram.observe(0.5)
+        registry.reset()
+        assert registry.get("op") is histogram
+        assert histogram.snapshot()["count"] == 0
+
+    def test_format_summary(self):
+        registry = MetricsRegistry()
+        registry.histogram("save").observe(0.002)
+        registry.histogram("unused")
+        summary = registry.format_summary()
+        assert summary.startswith("save(p50=")
+        assert "unused" not in summary
+
+    def test_global_registry_is_singleton(self):
+        assert get_metrics_registry() is get_metrics_registry()
+
+    def test_labels_are_part_of_key(self):
+        registry = MetricsRegistry()
+        events = registry.histogram("tick.phase", labels={"phase": "events"})
+        assert events is not registry.histogram("tick.phase", labels={"phase": "learning"})
+        assert registry.get("tick.phase", {"phase": "events"}) is events
+        assert 'tick.phase{phase="events"}' in registry.names()
+
+
+@pytest.mark.unit
+class TestMonitorAdapters:
+    """Мониторы производительности поверх реестра"""
+
+    def test_nested_measurements_do_not_clobber(self):
+        metrics = PerformanceMetrics()
+        metrics.start_measurement("op")
+        metrics.start_measurement("op")
+        assert metrics.end_measurement("op") >= 0.0
+        assert metrics.end_measurement("op") >= 0.0
+        assert metrics.end_measurement("op") == 0.0
+        assert metrics.get_count("op") == 2
+
+    def test_measure_and_averages(self):
+        metrics = PerformanceMetrics()
+        assert metrics.get_average_time("op") is None
+        for _ in range(3):
+            with metrics.measure("op"):
+                pass
+        assert metrics.operations() == ["op"]
+        assert metrics.get_count("op") == 3
+        assert metrics.get_average_time("op") >= 0.0
+        assert metrics.get_last_time("op") is not None
+        metrics.reset()
+        assert metrics.operations() == []
+
+    def test_runtime_monitor_summary_keys(self):
+        monitor = PerformanceMonitor()
+        with monitor.measure("DecisionEngine", "decide_response"):
+            pass
+        monitor.disable()
+        with monitor.measure("DecisionEngine", "decide_response"):
+            pass
+
+        metrics = monitor.get_metrics("DecisionEngine")
+        summary = metrics["DecisionEngine.decide_response"]
+        assert summary["total_calls"] == 1
+        for key in ("avg_time", "min_time", "max_time", "p99_time"):
+            assert key in summary
+        monitor.reset()
+        assert monitor.get_metrics() == {}
+
+    def test_utils_monitor_evicts_rarest_operation(self):
+        monitor = UtilsPerformanceMonitor(max_metrics_history=2)
+        for name, calls in (("a", 3), ("b", 1), ("c", 1)):
+            for _ in range(calls):
+                with monitor.measure(name):
+                    pass
+        assert set(monitor.get_metrics()) == {"a", "c"}
+        assert monitor.registry.get("monitor.b") is None
+        assert monitor.get_metrics("a")["a"]["call_count"] == 3
@@ -11,6 +11,7 @@
 
 import pytest
 import asyncio
+import json
 import time
 from unittest.mock import Mock, patch
 from pathlib import Path
@@ -159,6 +160,69 @@ class TestPassiveDataSink:
         assert stats["enabled"] is True
         assert stats["total_entries"] == 3
 
+    def test_incremental_flush_writes_each_entry_once(self):
+        """Тест инкрементальной записи: каждое наблюдение попадает в файл один раз."""
+        import os
+
+        sink = self.create_sink(max_entries=100, flush_batch_size=4, flush_interval=0.05)
+        for i in range(10):
+            sink.receive_data(f"event_{i}", {"id": i}, "source")
+        sink.stop()
+
+        with open(os.path.join(self.temp_dir, self.obs_file), encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert [line["event_type"] for line in lines] == [f"event_{i}" for i in range(10)]
+
+        stats = sink.get_stats()
+        assert stats["entries_written"] == 10
+        assert stats["pending_size"] == 0
+        assert stats["writer_thread_alive"] is False
+
+    def test_pending_queue_is_bounded(self):
+        """Тест ограничения очереди незаписанных наблюдений."""
+        sink = self.create_sink(max_entries=100, auto_flush=False, max_pending=3)
+        for i in range(5):
+            sink.receive_data(f"event_{i}", {"id": i}, "source")
+
+        stats = sink.get_stats()
+        assert stats["pending_size"] == 3
+        assert stats["pending_dropped"] == 2
+        assert len(sink.get_recent_data()) == 5  # История в памяти не теряется
+
+        assert sink.flush() == 3
+        assert sink.get_stats()["pending_size"] == 0
+
+    def test_failed_flush_keeps_batch(self, monkeypatch):
+        """Тест повторной записи пакета после ошибки диска."""
+        import os
+        from src.observability import passive_data_sink
+
+        sink = self.create_sink(
+            max_entries=100, auto_flush=False, flush_batch_size=2, max_pending=3
+        )
+        for i in range(3):
+            sink.receive_data(f"event_{i}", {"id": i}, "source")
+
+        def failing_open(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(passive_data_sink, "open", failing_open, raising=False)
+        assert sink.flush() == 0
+        stats = sink.get_stats()
+        assert stats["flush_errors"] == 1
+        assert stats["pending_size"] == 3
+        assert stats["pending_dropped"] == 0
+
+        # Пакет возвращается в начало очереди с учетом max_pending
+        sink.receive_data("event_3", {"id": 3}, "source")
+        assert sink.get_stats()["pending_dropped"] == 1
+        monkeypatch.undo()
+
+        assert sink.flush() == 3
+        with open(os.path.join(self.temp_dir, self.obs_file), encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert [line["event_type"] for line in lines] == ["event_1", "event_2", "event_3"]
+
 
 class TestAsyncDataSink:
     """Статические тесты для AsyncDataSink."""
@@ -0,0 +1,153 @@
+"""
+Тесты для экспорта метрик в формате OpenMetrics и эндпоинта /metrics.
+
+Проверяет:
+- Рендеринг гистограмм, счетчиков и gauge (OpenMetrics и Prometheus 0.0.4)
+- Метрики компонентов runtime loop, читаемые при опросе
+- GET /metrics и GET /performance встроенного API
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+import requests
+
+from src.environment.event import Event
+from src.environment.event_queue import EventQueue
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+from src.runtime import openmetrics
+from src.runtime.computation_cache import ComputationCache
+from src.runtime.metrics_registry import MetricsRegistry, get_metrics_registry
+from src.runtime.runtime_metrics import register_runtime_metrics, unregister_runtime_metrics
+
+
+def _samples(text):
+    """Ряды экспозиции: {'имя{метки}': значение}."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            samples[name] = value
+    return samples
+
+
+@pytest.mark.unit
+class TestRender:
+    """Рендеринг реестра"""
+
+    def test_family_name(self):
+        assert openmetrics.family_name("tick.duration", unit="seconds") == "life_tick_duration_seconds"
+        assert openmetrics.family_name("a-b.c", namespace="") == "a_b_c"
+        assert openmetrics.family_name("x_seconds", unit="seconds") == "life_x_seconds"
+
+    def test_histogram_exposition(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("tick.phase", "Phase duration", labels={"phase": "events"})
+        histogram.observe(0.003)
+        histogram.observe(0.2)
+
+        text = openmetrics.render(registry)
+        samples = _samples(text)
+        assert "# TYPE life_tick_phase_seconds histogram" in text
+        assert "# UNIT life_tick_phase_seconds seconds" in text
+        assert "# HELP life_tick_phase_seconds Phase duration" in text
+        assert samples['life_tick_phase_seconds_bucket{phase="events",le="0.00390625"}'] == "1"
+        assert samples['life_tick_phase_seconds_bucket{phase="events",le="+Inf"}'] == "2"
+        assert samples['life_tick_phase_seconds_count{phase="events"}'] == "2"
+        assert float(samples['life_tick_phase_seconds_sum{phase="events"}']) == pytest.approx(0.203)
+        assert text.endswith("# EOF\n")
+
+    def test_counters_and_gauges(self):
+        registry = MetricsRegistry()
+        registry.counter("event_queue.dropped", labels={"lane": "external"}).inc(3)
+        registry.gauge("event_queue.depth", function=lambda: 7)
+        registry.gauge("broken", function=lambda: 1 / 0)
+
+        samples = _samples(openmetrics.render(registry))
+        assert samples['life_event_queue_dropped_total{lane="external"}'] == "3.0"
+        assert samples["life_event_queue_depth"] == "7.0"
+        assert not any(name.startswith("life_broken") for name in samples)
+
+    def test_prometheus_format(self):
+        registry = MetricsRegistry()
+        registry.counter("events").inc()
+        text = openmetrics.render(registry, openmetrics=False)
+        assert "# TYPE life_events_total counter" in text
+        assert "# EOF" not in text
+
+    def test_label_values_escaped(self):
+        registry = MetricsRegistry()
+        registry.gauge("g", labels={"path": 'a"b\\c'}).set(1)
+        assert 'life_g{path="a\\"b\\\\c"} 1' in openmetrics.render(registry)
+
+
+@pytest.mark.unit
+class TestRuntimeMetrics:
+    """Метрики компонентов runtime loop"""
+
+    def test_event_queue_and_cache_metrics(self):
+        registry = MetricsRegistry()
+        event_queue = EventQueue(enable_silence_detection=False, capacity=1)
+        event_queue.push(Event(type="noise", intensity=0.1, timestamp=0.0))
+        event_queue.push(Event(type="noise", intensity=0.1, timestamp=0.0))
+        cache = ComputationCache()
+
+        refs = register_runtime_metrics(registry, event_queue=event_queue, computation_cache=cache)
+        snapshot = registry.snapshot()
+        assert snapshot["gauges"]["event_queue.depth"] == 1
+        assert snapshot["counters"]['event_queue.dropped{lane="external"}'] == 1
+        assert 'computation_cache.hit_ratio{cache="subjective_dt"}' in snapshot["gauges"]
+
+        # Значения читаются при опросе, а не при регистрации
+        event_queue.pop_all()
+        assert registry.snapshot()["gauges"]["event_queue.depth"] == 0
+
+        unregister_runtime_metrics(registry, refs)
+        assert registry.names() == []
+
+
+@pytest.fixture
+def api_server():
+    server = StoppableHTTPServer(("localhost", 0), LifeHandler)
+    server.event_queue = EventQueue(enable_silence_detection=False)
+    server.dev_mode = False
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    thread.join(timeout=2.0)
+
+
+@pytest.mark.integration
+class TestMetricsEndpoints:
+    """GET /metrics и GET /performance"""
+
+    def test_metrics_openmetrics(self, api_server):
+        get_metrics_registry().histogram("test.endpoint_latency").observe(0.01)
+        response = requests.get(
+            f"{api_server}/metrics",
+            headers={"Accept": "application/openmetrics-text; version=1.0.0"},
+            timeout=5,
+        )
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("application/openmetrics-text")
+        assert "life_test_endpoint_latency_seconds_count" in response.text
+        assert response.text.endswith("# EOF\n")
+
+    def test_metrics_prometheus_text(self, api_server):
+        response = requests.get(f"{api_server}/metrics", timeout=5)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+
+    def test_performance_json(self, api_server):
+        get_metrics_registry().histogram("test.endpoint_latency").observe(0.01)
+        response = requests.get(f"{api_server}/performance", timeout=5)
+        assert response.status_code == 200
+        summary = json.loads(response.text)["histograms"]["test.endpoint_latency"]
+        assert summary["count"] >= 1
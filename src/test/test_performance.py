@@ -96,11 +96,8 @@ class TestPerformanceBenchmarks:
 
     def test_event_queue_performance(self):
         """Benchmark: производительность EventQueue"""
-        queue = EventQueue()
         # Увеличиваем размер очереди для performance теста
-        import queue as queue_module
-
-        queue._queue = queue_module.Queue(maxsize=2000)
+        queue = EventQueue(capacity=2000)
         num_events = 1000
 
         # Тест push
@@ -528,11 +525,8 @@ class TestPerformanceBenchmarks:
 
     def test_event_queue_overflow_performance(self):
         """Benchmark: производительность EventQueue при переполнении"""
-        queue = EventQueue()
         # Маленькая очередь для тестирования переполнения
-        import queue as queue_module
-
-        queue._queue = queue_module.Queue(maxsize=10)
+        queue = EventQueue(capacity=10)
         num_events = 50  # Больше максимального размера
 
         start_time = time.time()
@@ -0,0 +1,204 @@
+"""
+Тесты для сэмплирующего профилировщика runtime loop.
+
+Проверяет:
+- Снятие стека потока-цели и формат collapsed stacks
+- Скользящее окно и ограничение числа стеков в слоте
+- Запуск и остановку потока сэмплера, статистику накладных расходов
+- Эндпоинты GET /profile, GET /profile/status и POST /profile
+"""
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+import requests
+
+from src.environment.event_queue import EventQueue
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+from src.runtime.sampling_profiler import (
+    TRUNCATED_STACK,
+    SamplingProfiler,
+    get_sampling_profiler,
+)
+
+
+def _blocked_in_marker(release: threading.Event, entered: threading.Event):
+    entered.set()
+    release.wait(10.0)
+
+
+@pytest.fixture
+def target_thread():
+    """Поток, ожидающий в _blocked_in_marker до конца теста."""
+    release = threading.Event()
+    entered = threading.Event()
+    thread = threading.Thread(target=_blocked_in_marker, args=(release, entered), daemon=True)
+    thread.start()
+    assert entered.wait(2.0)
+    yield thread
+    release.set()
+    thread.join(timeout=2.0)
+
+
+@pytest.mark.unit
+class TestSampling:
+    """Снятие и агрегация стеков"""
+
+    def test_collapsed_stack_of_target(self, target_thread):
+        profiler = SamplingProfiler()
+        profiler.set_target_thread(target_thread.ident)
+        assert profiler.sample()
+        assert profiler.sample()
+
+        lines = profiler.collapsed().splitlines()
+        assert len(lines) == 1
+        stack, count = lines[0].rsplit(" ", 1)
+        assert count == "2"
+        frames = stack.split(";")
+        # Корневой кадр первым, ожидающая функция ниже по стеку
+        assert frames[0].startswith("_bootstrap (threading.py:")
+        assert any(f.startswith("_blocked_in_marker (test_sampling_profiler.py:") for f in frames)
+        assert frames[-1].startswith("wait (threading.py:")
+
+    def test_without_target_sample_is_missed(self):
+        profiler = SamplingProfiler()
+        assert not profiler.sample()
+        assert profiler.collapsed() == ""
+        assert profiler.get_stats()["missed_samples"] == 1
+
+    def test_top_functions_by_leaf(self, target_thread):
+        profiler = SamplingProfiler()
+        profiler.set_target_thread(target_thread.ident)
+        for _ in range(3):
+            profiler.sample()
+        top = profiler.top_functions(limit=1)
+        assert top[0][0].startswith("wait (threading.py:")
+        assert top[0][1] == 3
+
+    def test_max_depth_keeps_innermost_frames(self, target_thread):
+        profiler = SamplingProfiler(max_depth=2)
+        profiler.set_target_thread(target_thread.ident)
+        profiler.sample()
+        frames = profiler.collapsed().rsplit(" ", 1)[0].split(";")
+        assert len(frames) == 2
+        assert frames[-1].startswith("wait (")
+
+    def test_stacks_over_limit_are_truncated(self, target_thread):
+        profiler = SamplingProfiler(max_stacks_per_slot=1)
+        profiler.set_target_thread(threading.get_ident())
+        profiler.sample()
+        profiler.set_target_thread(target_thread.ident)
+        profiler.sample()
+        assert profiler.get_stacks()[TRUNCATED_STACK] == 1
+
+    def test_old_slots_leave_window(self, target_thread):
+        profiler = SamplingProfiler(window=0.1, slot_seconds=0.05)
+        profiler.set_target_thread(target_thread.ident)
+        profiler.sample()
+        assert profiler.get_stacks()
+        time.sleep(0.25)
+        assert profiler.get_stacks() == {}
+
+    def test_reset_clears_stacks(self, target_thread):
+        profiler = SamplingProfiler()
+        profiler.set_target_thread(target_thread.ident)
+        profiler.sample()
+        profiler.reset()
+        assert profiler.collapsed() == ""
+        assert profiler.get_stats()["samples"] == 0
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError):
+            SamplingProfiler(interval=0)
+        with pytest.raises(ValueError):
+            SamplingProfiler().start(interval=-1)
+
+
+@pytest.mark.unit
+class TestSamplerThread:
+    """Поток сэмплера"""
+
+    def test_start_stop_collects_samples(self, target_thread):
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.set_target_thread(target_thread.ident)
+        profiler.start()
+        assert profiler.is_running
+        time.sleep(0.3)
+        profiler.stop()
+        assert not profiler.is_running
+
+        stats = profiler.get_stats()
+        assert stats["samples"] >= 10
+        assert 0.0 < stats["overhead"] < 0.5
+        # После остановки стеки остаются доступны
+        assert profiler.collapsed()
+
+    def test_restart_after_stop(self, target_thread):
+        profiler = SamplingProfiler(interval=0.005)
+        profiler.set_target_thread(target_thread.ident)
+        profiler.start()
+        profiler.stop()
+        profiler.start(interval=0.01)
+        assert profiler.is_running
+        assert profiler.interval == 0.01
+        profiler.stop()
+
+
+@pytest.fixture
+def api_server():
+    server = StoppableHTTPServer(("localhost", 0), LifeHandler)
+    server.event_queue = EventQueue(enable_silence_detection=False)
+    server.dev_mode = False
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield f"http://localhost:{server.server_address[1]}"
+    server.shutdown()
+    thread.join(timeout=2.0)
+    profiler = get_sampling_profiler()
+    profiler.stop()
+    profiler.set_target_thread(None)
+    profiler.reset()
+
+
+@pytest.mark.integration
+class TestProfileEndpoints:
+    """GET /profile, GET /profile/status, POST /profile"""
+
+    def test_toggle_and_fetch_profile(self, api_server, target_thread):
+        get_sampling_profiler().set_target_thread(target_thread.ident)
+
+        response = requests.post(
+            f"{api_server}/profile", json={"enabled": True, "interval": 0.005}, timeout=5
+        )
+        assert response.status_code == 200
+        assert response.json()["running"] is True
+        time.sleep(0.2)
+
+        response = requests.get(f"{api_server}/profile", params={"seconds": 10}, timeout=5)
+        assert response.status_code == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "_blocked_in_marker (test_sampling_profiler.py:" in response.text
+
+        response = requests.post(f"{api_server}/profile", json={"enabled": False}, timeout=5)
+        assert response.json()["running"] is False
+
+        status = json.loads(requests.get(f"{api_server}/profile/status", timeout=5).text)
+        assert status["samples"] > 0
+        assert status["interval"] == 0.005
+
+    def test_invalid_requests(self, api_server):
+        response = requests.post(f"{api_server}/profile", data=b"not json", timeout=5)
+        assert response.status_code == 400
+        response = requests.post(f"{api_server}/profile", json={"interval": -1}, timeout=5)
+        assert response.status_code == 400
+        response = requests.get(f"{api_server}/profile", params={"seconds": "x"}, timeout=5)
+        assert response.status_code == 400
@@ -0,0 +1,275 @@
+"""
+Тесты для SnapshotCatalog - индекса snapshot-файлов, и дельта-снимков.
+
+Проверяет:
+- Регистрацию snapshot при сохранении и поиск последнего / на тике N или раньше
+- Сверку каталога с файлами, записанными или удаленными в обход него
+- Политику хранения (последние K + прореживание по часам/дням)
+- Применение политики SnapshotManager в фоне
+- Дельта-снимки: чередование баз и дельт, восстановление тика по цепочке
+"""
+
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.memory.memory_types import MemoryEntry
+from src.runtime.snapshot_manager import SnapshotManager
+from src.state import self_state as self_state_module
+from src.state.self_state import (
+    SelfState,
+    create_initial_state,
+    load_snapshot,
+    load_snapshot_at_or_before,
+    save_delta_snapshot,
+    save_snapshot,
+)
+from src.state.snapshot_catalog import (
+    RetentionPolicy,
+    SnapshotCatalog,
+    SnapshotRecord,
+    get_snapshot_catalog,
+)
+from src.state.snapshot_delta import read_snapshot_data
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """Изолированная директория snapshot."""
+    directory = tmp_path / "snapshots"
+    directory.mkdir()
+    monkeypatch.setattr(self_state_module, "SNAPSHOT_DIR", directory)
+    return directory
+
+
+def _save_at(tick: int) -> SelfState:
+    state = create_initial_state()
+    state.ticks = tick
+    save_snapshot(state)
+    return state
+
+
+@pytest.mark.unit
+class TestSnapshotCatalog:
+    """Unit тесты для SnapshotCatalog"""
+
+    def test_save_snapshot_records_entry(self, snapshot_dir):
+        """save_snapshot регистрирует snapshot с размером и контрольной суммой"""
+        _save_at(10)
+
+        record = get_snapshot_catalog(snapshot_dir).get(10)
+        assert record is not None
+        assert record.filename == "snapshot_000010.json"
+        assert record.size == (snapshot_dir / record.filename).stat().st_size
+        assert record.checksum.startswith("crc32:")
+        assert not record.compressed
+
+    def test_latest_and_at_or_before(self, snapshot_dir):
+        """Поиск последнего snapshot и snapshot на тике N или раньше"""
+        for tick in (10, 20, 30):
+            _save_at(tick)
+
+        catalog = get_snapshot_catalog(snapshot_dir)
+        assert catalog.latest().tick == 30
+        assert catalog.at_or_before(25).tick == 20
+        assert catalog.at_or_before(5) is None
+        assert isinstance(load_snapshot_at_or_before(29), SelfState)
+        assert isinstance(SelfState().load_latest_snapshot(), SelfState)
+        with pytest.raises(FileNotFoundError):
+            load_snapshot_at_or_before(5)
+
+    def test_external_files_are_reconciled(self, snapshot_dir):
+        """Файлы, записанные и удаленные в обход каталога, подхватываются"""
+        _save_at(10)
+        catalog = get_snapshot_catalog(snapshot_dir)
+        assert catalog.latest().tick == 10
+
+        # Другой процесс записал более новый snapshot
+        external = snapshot_dir / "snapshot_000050.json"
+        external.write_text(json.dumps({"ticks": 50}))
+        assert catalog.latest().tick == 50
+        assert catalog.latest().checksum is None
+
+        # Файл удален вручную
+        external.unlink()
+        assert catalog.latest().tick == 10
+
+    def test_rebuild_existing_directory(self, snapshot_dir):
+        """Новый каталог для существующей директории строится сканированием"""
+        for tick in (1, 2, 3):
+            (snapshot_dir / f"snapshot_{tick:06d}.json").write_text(json.dumps({"ticks": tick}))
+
+        catalog = SnapshotCatalog(snapshot_dir)
+        try:
+            assert catalog.count() == 3
+            assert [r.tick for r in catalog.list_records()] == [1, 2, 3]
+        finally:
+            catalog.close()
+
+    def test_record_does_not_rebuild(self, snapshot_dir, monkeypatch):
+        """Регистрация своих snapshot не пересканирует директорию"""
+        _save_at(1)
+        catalog = get_snapshot_catalog(snapshot_dir)
+        rebuild = catalog.rebuild
+        calls = []
+        monkeypatch.setattr(catalog, "rebuild", lambda: calls.append(1) or rebuild())
+
+        for tick in range(2, 52):
+            _save_at(tick)
+        assert calls == []
+        assert catalog.count() == 51
+        assert catalog.latest().tick == 51
+
+    def test_clear_removes_all_formats(self, snapshot_dir):
+        """clear() удаляет snapshot всех форматов и записи каталога"""
+        _save_at(10)
+        for name in ("snapshot_000020.json.gz", "snapshot_000030.bin",
+                     "snapshot_000040.delta.json"):
+            (snapshot_dir / name).write_bytes(b"{}")
+        (snapshot_dir / "notes.txt").write_text("keep")
+
+        catalog = get_snapshot_catalog(snapshot_dir)
+        assert catalog.count() == 4
+        assert catalog.clear() == 4
+        assert catalog.latest() is None
+        assert list(snapshot_dir.glob("snapshot_*")) == []
+        assert (snapshot_dir / "notes.txt").exists()
+        with pytest.raises(FileNotFoundError):
+            load_snapshot_at_or_before(100)
+
+
+@pytest.mark.unit
+class TestRetentionPolicy:
+    """Unit тесты для политики хранения snapshot"""
+
+    @staticmethod
+    def _record(tick: int, created_at: float) -> SnapshotRecord:
+        return SnapshotRecord(
+            tick=tick,
+            filename=f"snapshot_{tick:06d}.json",
+            size=1,
+            compressed=False,
+            checksum=None,
+            created_at=created_at,
+        )
+
+    def test_keeps_last_and_thins_by_hour_and_day(self):
+        """Последние K хранятся всегда, старые прореживаются"""
+        now = 1_000_000 * 3600.0
+        records = [
+            # Три snapshot в одном часе (5 часов назад) - остается один
+            self._record(1, now - 5 * 3600 + 10),
+            self._record(2, now - 5 * 3600 + 20),
+            self._record(3, now - 5 * 3600 + 30),
+            # Два snapshot в одном дне (3 дня назад) - остается один
+            self._record(0, now - 3 * 86400 - 100),
+            self._record(-1, now - 3 * 86400 - 200),
+            # Старше daily_days - удаляется
+            self._record(-2, now - 40 * 86400),
+            # Последние
+            self._record(10, now - 2),
+            self._record(11, now - 1),
+        ]
+        policy = RetentionPolicy(keep_last=2, hourly_hours=24, daily_days=30)
+
+        deleted = {r.tick for r in policy.select_for_deletion(records, now)}
+
+        assert deleted == {1, 2, -1, -2}
+
+    def test_snapshot_manager_applies_retention(self, snapshot_dir):
+        """SnapshotManager удаляет лишние snapshot в фоне"""
+        manager = SnapshotManager(
+            period_ticks=1,
+            saver=save_snapshot,
+            retention_policy=RetentionPolicy(keep_last=3, hourly_hours=0, daily_days=0),
+        )
+        state = create_initial_state()
+        for tick in range(1, 8):
+            state.ticks = tick
+            assert manager.maybe_snapshot(state)
+            manager.wait_for_retention(timeout=5.0)
+
+        remaining = sorted(p.name for p in snapshot_dir.glob("snapshot_*.json"))
+        assert remaining == [f"snapshot_{t:06d}.json" for t in (5, 6, 7)]
+        assert get_snapshot_catalog(snapshot_dir).count() == 3
+        assert manager.retention_deleted_total == 4
+
+
+@pytest.mark.unit
+class TestDeltaSnapshots:
+    """Unit тесты для дельта-снимков"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_chains(self, monkeypatch):
+        monkeypatch.setattr(self_state_module, "_delta_chains", {})
+
+    @staticmethod
+    def _advance(state: SelfState, tick: int) -> None:
+        state.ticks = tick
+        state.energy = max(0.0, state.energy - 1.0)
+        state.memory.append(
+            MemoryEntry(event_type="noise", meaning_significance=0.5, timestamp=float(tick))
+        )
+
+    def test_deltas_between_full_snapshots(self, snapshot_dir):
+        """База пишется раз в full_every снимков, между ними - дельты"""
+        state = create_initial_state()
+        for tick in range(1, 8):
+            self._advance(state, tick)
+            save_delta_snapshot(state, full_every=3)
+
+        names = sorted(p.name for p in snapshot_dir.iterdir() if p.name.startswith("snapshot_"))
+        assert names == [
+            "snapshot_000001.json",
+            "snapshot_000002.delta.json",
+            "snapshot_000003.delta.json",
+            "snapshot_000004.json",
+            "snapshot_000005.delta.json",
+            "snapshot_000006.delta.json",
+            "snapshot_000007.json",
+        ]
+        delta = json.loads((snapshot_dir / "snapshot_000003.delta.json").read_text())
+        assert delta["parent_tick"] == 2 and delta["base_tick"] == 1
+        assert len(delta["lists"]["memory"]["append"]) == 1
+        assert "learning_params" not in delta["set"]
+        assert get_snapshot_catalog(snapshot_dir).get(3).parent_tick == 2
+
+    def test_reconstruction_matches_full_snapshot(self, snapshot_dir):
+        """Восстановленный из дельт тик совпадает с полным snapshot того же состояния"""
+        state = create_initial_state()
+        expected = {}
+        for tick in range(1, 6):
+            self._advance(state, tick)
+            if tick == 3:
+                state.memory.pop(0)  # удаление записи с начала списка
+            save_delta_snapshot(state, full_every=10)
+            expected[tick] = json.loads(
+                json.dumps(state._create_optimized_snapshot_data(), default=str)
+            )
+
+        for tick in (2, 3, 5):
+            path = snapshot_dir / f"snapshot_{tick:06d}.delta.json"
+            assert read_snapshot_data(path) == expected[tick]
+
+        assert isinstance(load_snapshot(5), SelfState)
+        assert isinstance(SelfState().load_latest_snapshot(), SelfState)
+
+    def test_retention_keeps_delta_chain(self, snapshot_dir):
+        """Политика хранения не удаляет базу и родителей сохраняемых дельт"""
+        state = create_initial_state()
+        for tick in range(1, 6):
+            self._advance(state, tick)
+            save_delta_snapshot(state, full_every=10)
+
+        catalog = get_snapshot_catalog(snapshot_dir)
+        deleted = catalog.apply_retention(
+            RetentionPolicy(keep_last=1, hourly_hours=0, daily_days=0)
+        )
+
+        assert deleted == 0
+        assert read_snapshot_data(catalog.path_for(catalog.latest()))["ticks"] == 5
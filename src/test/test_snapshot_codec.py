@@ -0,0 +1,142 @@
+"""
+Тесты для кодеков snapshot-файлов (JSON и бинарный формат).
+
+Проверяет:
+- Кодирование/декодирование бинарного snapshot без потерь
+- Чтение витальных показателей из заголовка без разбора тела
+- Сжатие тела больших snapshots
+- Запись бинарных snapshot через save_snapshot и их загрузку
+"""
+
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.memory.memory_types import MemoryEntry
+from src.state import self_state as self_state_module
+from src.state.self_state import SelfState, create_initial_state, load_snapshot, save_snapshot
+from src.state.snapshot_catalog import get_snapshot_catalog
+from src.state.snapshot_codec import (
+    FLAG_ZLIB,
+    HEADER_STRUCT,
+    available_formats,
+    decode_binary_snapshot,
+    encode_binary_snapshot,
+    get_codec,
+    read_binary_vitals,
+)
+from src.state.snapshot_delta import read_snapshot_data, read_snapshot_vitals
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """Изолированная директория snapshot."""
+    directory = tmp_path / "snapshots"
+    directory.mkdir()
+    monkeypatch.setattr(self_state_module, "SNAPSHOT_DIR", directory)
+    return directory
+
+
+def _snapshot_data(ticks: int = 42) -> dict:
+    state = create_initial_state()
+    state.ticks = ticks
+    state.energy = 73.5
+    state.memory.append(MemoryEntry(event_type="noise", meaning_significance=0.5, timestamp=1.0))
+    return json.loads(json.dumps(state._create_optimized_snapshot_data(), default=str))
+
+
+@pytest.mark.unit
+class TestBinarySnapshotCodec:
+    """Unit тесты для бинарного формата snapshot"""
+
+    def test_roundtrip(self):
+        """Декодированный snapshot совпадает с исходными данными"""
+        data = _snapshot_data()
+        assert decode_binary_snapshot(encode_binary_snapshot(data)) == data
+
+    def test_vitals_from_header(self, tmp_path):
+        """Витальные показатели читаются из заголовка, даже если тело повреждено"""
+        data = _snapshot_data(ticks=7)
+        payload = encode_binary_snapshot(data)
+        path = tmp_path / "snapshot_000007.bin"
+        path.write_bytes(payload[: HEADER_STRUCT.size] + b"\x00" * 16)
+
+        vitals = read_binary_vitals(path)
+
+        assert vitals["ticks"] == 7
+        assert vitals["energy"] == 73.5
+        assert vitals["stability"] == data["stability"]
+        assert vitals["integrity"] == data["integrity"]
+
+    def test_large_body_is_compressed(self):
+        """Тело больших snapshots сжимается, данные восстанавливаются без потерь"""
+        data = _snapshot_data()
+        data["memory"] = [{"event_type": "noise", "index": i} for i in range(5000)]
+
+        payload = encode_binary_snapshot(data)
+
+        assert HEADER_STRUCT.unpack_from(payload, 0)[2] & FLAG_ZLIB
+        assert len(payload) < len(json.dumps(data))
+        assert decode_binary_snapshot(payload) == data
+        assert not HEADER_STRUCT.unpack_from(encode_binary_snapshot(data, False), 0)[2] & FLAG_ZLIB
+
+    def test_rejects_foreign_data(self):
+        """Данные без сигнатуры бинарного snapshot отклоняются"""
+        with pytest.raises(ValueError):
+            decode_binary_snapshot(b"{}" * HEADER_STRUCT.size)
+
+    def test_codec_registry(self):
+        """Оба формата доступны, неизвестный формат - ошибка"""
+        assert available_formats() == ["binary", "json"]
+        with pytest.raises(ValueError):
+            get_codec("xml")
+
+
+@pytest.mark.unit
+class TestBinarySnapshotFiles:
+    """Unit тесты для записи и чтения бинарных snapshot-файлов"""
+
+    def test_save_and_load_binary_snapshot(self, snapshot_dir):
+        """save_snapshot пишет .bin, загрузка и каталог его находят"""
+        state = create_initial_state()
+        state.ticks = 5
+        state.energy = 61.0
+        save_snapshot(state, snapshot_format="binary")
+
+        path = snapshot_dir / "snapshot_000005.bin"
+        assert path.is_file()
+        assert not (snapshot_dir / "snapshot_000005.json").exists()
+        assert get_snapshot_catalog(snapshot_dir).latest().filename == path.name
+
+        assert read_snapshot_data(path)["energy"] == 61.0
+        assert isinstance(load_snapshot(5), SelfState)
+        assert isinstance(SelfState().load_latest_snapshot(), SelfState)
+        assert read_snapshot_vitals(path)["energy"] == 61.0
+
+    def test_format_switch_replaces_same_tick(self, snapshot_dir):
+        """Snapshot того же тика в другом формате заменяет прежний файл"""
+        state = create_initial_state()
+        state.ticks = 3
+        save_snapshot(state, snapshot_format="json")
+        save_snapshot(state, snapshot_format="binary")
+
+        names = sorted(p.name for p in snapshot_dir.iterdir() if p.name.startswith("snapshot_"))
+        assert names == ["snapshot_000003.bin"]
+
+    def test_vitals_from_json_snapshot(self, snapshot_dir):
+        """Для JSON snapshot витальные показатели берутся из полного документа"""
+        state = create_initial_state()
+        state.ticks = 2
+        save_snapshot(state, snapshot_format="json")
+
+        vitals = read_snapshot_vitals(snapshot_dir / "snapshot_000002.json")
+
+        assert vitals["ticks"] == 2
+        assert vitals["energy"] == state.energy
+        assert "memory" not in vitals
+        assert read_snapshot_data(snapshot_dir / "snapshot_000002.json")["ticks"] == 2
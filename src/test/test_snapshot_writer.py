@@ -0,0 +1,137 @@
+"""
+Тесты для AsyncSnapshotWriter - фоновой записи снапшотов.
+
+Проверяет:
+- Захват копии состояния, независимой от живого SelfState
+- Фоновую запись и вытеснение устаревших ожидающих снапшотов
+- Асинхронный режим SnapshotManager и статус последней операции
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+from src.runtime.snapshot_manager import SnapshotManager
+from src.runtime.snapshot_writer import AsyncSnapshotWriter
+from src.state import self_state as self_state_module
+from src.state.self_state import capture_snapshot, create_initial_state, save_snapshot
+from src.state.snapshot_catalog import get_snapshot_catalog
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """Изолированная директория snapshot."""
+    directory = tmp_path / "snapshots"
+    directory.mkdir()
+    monkeypatch.setattr(self_state_module, "SNAPSHOT_DIR", directory)
+    return directory
+
+
+@pytest.mark.unit
+class TestAsyncSnapshotWriter:
+    """Unit тесты для AsyncSnapshotWriter"""
+
+    def test_capture_is_independent_from_live_state(self):
+        """Захваченные данные не меняются вместе с состоянием"""
+        state = create_initial_state()
+        state.ticks = 10
+        captured = capture_snapshot(state)
+
+        state.ticks = 11
+        state.learning_params["event_type_sensitivity"]["noise"] = 0.99
+
+        assert captured.ticks == 10
+        assert captured.data["ticks"] == 10
+        assert captured.data["learning_params"]["event_type_sensitivity"]["noise"] != 0.99
+
+    def test_writes_captured_snapshot_in_background(self, snapshot_dir):
+        """Захваченный снапшот записывается потоком писателя"""
+        writer = AsyncSnapshotWriter(saver=save_snapshot)
+        try:
+            state = create_initial_state()
+            state.ticks = 10
+            assert writer.submit(capture_snapshot(state))
+            assert writer.flush(timeout=5.0)
+        finally:
+            writer.stop()
+
+        assert (snapshot_dir / "snapshot_000010.json").exists()
+        assert get_snapshot_catalog(snapshot_dir).latest().tick == 10
+        stats = writer.get_stats()
+        assert stats["written"] == 1
+        assert stats["last_written_ticks"] == 10
+        assert not stats["writer_thread_alive"]
+
+    def test_stale_pending_snapshots_are_coalesced(self):
+        """Пока писатель занят, ожидающие снапшоты вытесняются более новыми"""
+        release = threading.Event()
+        written = []
+
+        def slow_saver(captured):
+            release.wait(5.0)
+            written.append(captured.ticks)
+
+        writer = AsyncSnapshotWriter(saver=slow_saver, max_pending=1)
+        try:
+            state = create_initial_state()
+            for tick in (10, 20, 30, 40):
+                state.ticks = tick
+                writer.submit(capture_snapshot(state))
+            release.set()
+            assert writer.flush(timeout=5.0)
+        finally:
+            writer.stop()
+
+        # Первый снапшот мог быть взят в запись до вытеснения, последний записан всегда
+        assert written[-1] == 40
+        assert len(written) <= 2
+        assert writer.get_stats()["coalesced"] >= 2
+
+
+@pytest.mark.unit
+class TestSnapshotManagerAsync:
+    """Unit тесты для асинхронного режима SnapshotManager"""
+
+    def test_async_status_updated_by_writer(self, snapshot_dir):
+        """Статус последней операции обновляется после фоновой записи"""
+        manager = SnapshotManager(period_ticks=10, saver=save_snapshot, async_write=True)
+        try:
+            state = create_initial_state()
+            state.ticks = 10
+            assert manager.maybe_snapshot(state)
+            assert manager.flush(timeout=5.0)
+
+            status = manager.get_last_operation_status()
+            assert status["success"] is True
+            assert status["writer"]["written"] == 1
+
+            # Тик без снапшота не сбрасывает статус фоновой записи
+            state.ticks = 11
+            assert not manager.maybe_snapshot(state)
+            assert manager.was_last_operation_successful() is True
+        finally:
+            manager.stop()
+
+    def test_async_error_reported(self):
+        """Ошибка фоновой записи отражается в статусе, тик не падает"""
+
+        def failing_saver(captured):
+            raise OSError("disk full")
+
+        manager = SnapshotManager(period_ticks=1, saver=failing_saver, async_write=True)
+        try:
+            state = create_initial_state()
+            state.ticks = 1
+            assert manager.maybe_snapshot(state)
+            manager.flush(timeout=5.0)
+
+            status = manager.get_last_operation_status()
+            assert status["success"] is False
+            assert "disk full" in status["error"]
+        finally:
+            manager.stop()
@@ -0,0 +1,281 @@
+"""
+Тесты для StatusPublisher - канала публикации живого состояния для /status API.
+
+Проверяет:
+- Публикацию неизменяемого документа и ETag
+- Чтение опубликованного статуса из файла с кэшированием по stat и проверкой возраста
+- Представления документа с лимитами (memory_limit, *_history_limit)
+- Запросы с memory_limit больше опубликованного числа записей - из snapshot
+- Отдачу опубликованного документа LifeHandler с поддержкой If-None-Match
+- Сброс опубликованного статуса через /clear-data
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+import requests
+
+import src.runtime.status_publisher as status_publisher_module
+from src.environment.event_queue import EventQueue
+from src.memory.memory_types import MemoryEntry
+from src.main_server_api import LifeHandler, StoppableHTTPServer
+from src.runtime.status_publisher import StatusFileReader, StatusPublisher
+from src.state.self_state import SelfState
+
+
+@pytest.fixture
+def isolated_publisher(tmp_path, monkeypatch):
+    """Подменяет глобальный издатель статуса изолированным экземпляром."""
+    publisher = StatusPublisher(status_file=tmp_path / "live_status.json", file_publish_interval=0)
+    monkeypatch.setattr(status_publisher_module, "_status_publisher", publisher)
+    return publisher
+
+
+def make_state_with_history(ticks: int = 5) -> SelfState:
+    """SelfState с записями памяти и историей адаптации."""
+    state = SelfState()
+    state.ticks = ticks
+    for i in range(4):
+        state.memory.append(MemoryEntry(f"event_{i}", 0.5, 1000.0 + i, 1.0))
+    state.adaptation_history = [{"step": 1}, {"step": 2}, {"step": 3}]
+    return state
+
+
+@pytest.mark.unit
+class TestStatusPublisher:
+    """Unit тесты для StatusPublisher"""
+
+    def test_publish_produces_immutable_document(self, isolated_publisher):
+        """Публикация создает готовый к отправке документ с ETag"""
+        state = SelfState()
+        state.ticks = 42
+
+        published = isolated_publisher.publish(state)
+
+        assert isolated_publisher.get_latest() is published
+        assert published.ticks == 42
+        assert published.etag.startswith('"42-')
+        assert published.to_dict()["ticks"] == 42
+        with pytest.raises(Exception):
+            published.ticks = 1  # frozen dataclass
+
+    def test_etag_changes_with_state(self, isolated_publisher):
+        """ETag меняется вместе с содержимым и совпадает для одинакового"""
+        state = SelfState()
+        first = isolated_publisher.publish(state)
+        state.ticks += 1
+        second = isolated_publisher.publish(state)
+
+        assert first.etag != second.etag
+        assert second.matches(second.etag)
+        assert second.matches(f'"other", {second.etag}')
+        assert second.matches("*")
+        assert not second.matches(first.etag)
+        assert not second.matches(None)
+
+    def test_maybe_publish_throttles(self, tmp_path, monkeypatch):
+        """maybe_publish сериализует состояние не чаще publish_interval"""
+        clock = [1000.0]
+        monkeypatch.setattr(status_publisher_module.time, "time", lambda: clock[0])
+        publisher = StatusPublisher(status_file=None, publish_interval=0.5)
+        state = SelfState()
+
+        state.ticks = 1
+        assert publisher.maybe_publish(state).ticks == 1
+        state.ticks = 2
+        clock[0] += 0.1
+        assert publisher.maybe_publish(state) is None
+        assert publisher.get_latest().ticks == 1
+        clock[0] += 0.5
+        assert publisher.maybe_publish(state).ticks == 2
+        stats = publisher.get_stats()
+        assert (stats["publications"], stats["skipped_publications"]) == (2, 1)
+
+    def test_file_reader_caches_by_stat(self, isolated_publisher):
+        """Читатель файла возвращает кэш, пока файл не изменился"""
+        state = SelfState()
+        state.ticks = 7
+        isolated_publisher.publish(state)
+
+        reader = StatusFileReader(isolated_publisher.status_file)
+        first = reader.read()
+        assert first is not None and first.ticks == 7
+        assert reader.read() is first
+
+        state.ticks = 8
+        time.sleep(0.01)
+        isolated_publisher.publish(state)
+        assert reader.read().ticks == 8
+
+    def test_file_reader_missing_file(self, tmp_path):
+        """Отсутствующий файл статуса - холодный старт"""
+        reader = StatusFileReader(tmp_path / "missing.json")
+        assert reader.read() is None
+
+    def test_file_reader_ignores_stale_file(self, isolated_publisher):
+        """Файл статуса остановленного runtime не отдается"""
+        isolated_publisher.publish(SelfState())
+        status_file = isolated_publisher.status_file
+        assert StatusFileReader(status_file, max_age=60.0).read() is not None
+
+        old = time.time() - 120.0
+        os.utime(status_file, (old, old))
+        assert StatusFileReader(status_file, max_age=60.0).read() is None
+        assert StatusFileReader(status_file, max_age=None).read() is not None
+
+    def test_view_applies_limits(self, isolated_publisher):
+        """Представление с лимитами совпадает с get_safe_status_dict(limits)"""
+        state = make_state_with_history()
+        published = isolated_publisher.publish(state)
+        assert "memory" not in published.to_dict()
+        assert published.view(None) is published
+        assert published.view({}) is published
+
+        limits = {"memory_limit": 2, "adaptation_history_limit": 1}
+        view = published.view(limits)
+        expected = state.get_safe_status_dict(limits=limits)
+        assert view.to_dict()["memory"] == expected["memory"]
+        assert view.to_dict()["adaptation_history"] == expected["adaptation_history"]
+        assert expected["adaptation_history"] == [{"step": 3}]
+        assert view.etag != published.etag
+        assert published.view(dict(limits)) is view  # Кэшируется на документ
+        assert published.view({"memory_limit": 0}).to_dict()["memory"] == []
+
+    def test_view_from_file(self, isolated_publisher):
+        """Записи памяти публикуются и в файл статуса"""
+        isolated_publisher.publish(make_state_with_history())
+        published = StatusFileReader(isolated_publisher.status_file).read()
+        assert published is not None
+        memory = published.view({"memory_limit": 10}).to_dict()["memory"]
+        assert [entry["event_type"] for entry in memory] == [f"event_{i}" for i in range(4)]
+
+    def test_memory_limit_above_published_cap_is_not_covered(self, tmp_path):
+        """Документ с обрезанной памятью не покрывает memory_limit больше опубликованного"""
+        publisher = StatusPublisher(
+            status_file=tmp_path / "live_status.json", file_publish_interval=0, memory_limit=2
+        )
+        published = publisher.publish(make_state_with_history())
+        assert published.memory_cap == 2
+        assert published.covers({"memory_limit": 2})
+        assert published.covers({"events_limit": 100})
+        assert not published.covers({"memory_limit": 3})
+
+        from_file = StatusFileReader(publisher.status_file).read()
+        assert from_file is not None
+        assert from_file.memory_cap == 2
+        assert not from_file.covers({"memory_limit": 3})
+
+        complete = StatusPublisher(status_file=None, memory_limit=4).publish(
+            make_state_with_history()
+        )
+        assert complete.memory_cap is None
+        assert complete.covers({"memory_limit": 5000})
+
+    def test_clear_removes_status_file(self, isolated_publisher):
+        """clear() сбрасывает документ и удаляет файл статуса"""
+        isolated_publisher.publish(SelfState())
+        isolated_publisher.clear()
+        assert isolated_publisher.get_latest() is None
+        assert not isolated_publisher.status_file.exists()
+        isolated_publisher.clear()  # Повторный вызов без файла
+
+
+@pytest.mark.integration
+class TestStatusEndpointPublished:
+    """Интеграционные тесты /status с опубликованным состоянием"""
+
+    @pytest.fixture
+    def published_server(self, isolated_publisher):
+        server = StoppableHTTPServer(("localhost", 0), LifeHandler)
+        server.event_queue = EventQueue()
+        server.dev_mode = False
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        time.sleep(0.1)
+        yield f"http://localhost:{server.server_address[1]}", isolated_publisher
+        server.shutdown()
+        thread.join(timeout=2.0)
+
+    def test_status_served_from_published_document(self, published_server):
+        """/status отдает опубликованный документ и поддерживает If-None-Match"""
+        base_url, publisher = published_server
+        state = SelfState()
+        state.ticks = 123
+        published = publisher.publish(state)
+
+        response = requests.get(f"{base_url}/status", timeout=5)
+        assert response.status_code == 200
+        assert response.headers["ETag"] == published.etag
+        assert response.json()["ticks"] == 123
+        assert response.content == published.body
+
+        not_modified = requests.get(
+            f"{base_url}/status", headers={"If-None-Match": published.etag}, timeout=5
+        )
+        assert not_modified.status_code == 304
+
+        state.ticks = 124
+        publisher.publish(state)
+        changed = requests.get(
+            f"{base_url}/status", headers={"If-None-Match": published.etag}, timeout=5
+        )
+        assert changed.status_code == 200
+        assert json.loads(changed.content)["ticks"] == 124
+
+    def test_limited_status_does_not_load_snapshot(self, published_server, monkeypatch):
+        """Запрос с лимитами отдается из опубликованного документа"""
+        base_url, publisher = published_server
+        publisher.publish(make_state_with_history(ticks=77))
+
+        def fail_load(self):
+            raise AssertionError("snapshot не должен читаться при опубликованном статусе")
+
+        monkeypatch.setattr(SelfState, "load_latest_snapshot", fail_load)
+        url = f"{base_url}/status?memory_limit=2&events_limit=100&adaptation_history_limit=2"
+        response = requests.get(url, timeout=5)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ticks"] == 77
+        assert [entry["event_type"] for entry in body["memory"]] == ["event_2", "event_3"]
+        assert body["adaptation_history"] == [{"step": 2}, {"step": 3}]
+
+        not_modified = requests.get(
+            url, headers={"If-None-Match": response.headers["ETag"]}, timeout=5
+        )
+        assert not_modified.status_code == 304
+
+    def test_memory_limit_above_published_cap_uses_snapshot(self, published_server, monkeypatch):
+        """memory_limit больше опубликованного числа записей отдается из snapshot целиком"""
+        base_url, publisher = published_server
+        publisher.memory_limit = 2
+        state = make_state_with_history(ticks=77)
+        publisher.publish(state)
+        monkeypatch.setattr(SelfState, "load_latest_snapshot", lambda self: state)
+
+        response = requests.get(f"{base_url}/status?memory_limit=4", timeout=5)
+        assert response.status_code == 200
+        assert [entry["event_type"] for entry in response.json()["memory"]] == [
+            f"event_{i}" for i in range(4)
+        ]
+
+        response = requests.get(f"{base_url}/status?memory_limit=2", timeout=5)
+        assert "ETag" in response.headers  # Из опубликованного документа
+
+    def test_clear_data_resets_published_status(self, published_server, tmp_path, monkeypatch):
+        """/clear-data удаляет опубликованный статус"""
+        base_url, publisher = published_server
+        monkeypatch.chdir(tmp_path)
+        publisher.publish(make_state_with_history())
+
+        response = requests.get(f"{base_url}/clear-data", timeout=5)
+        assert response.status_code == 200
+        assert publisher.get_latest() is None
+        assert not publisher.status_file.exists()
@@ -0,0 +1,176 @@
+"""
+Тесты для SystemLoadSampler - фонового сбора нагрузки системы.
+
+Проверяет:
+- Публикацию снимков и скользящие средние
+- Жизненный цикл потока (start/stop/повторный запуск)
+- Что AdaptiveBatchSizer и DataCollectionManager не ждут замера CPU
+"""
+
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+import src.runtime.system_load_sampler as sampler_module
+from src.runtime.adaptive_batch_sizer import AdaptiveBatchSizer
+from src.runtime.data_collection_manager import DataCollectionManager
+from src.runtime.system_load_sampler import (
+    DEFAULT_SYSTEM_LOAD,
+    SystemLoadSampler,
+    get_system_load,
+)
+
+
+@pytest.fixture
+def fake_psutil(monkeypatch):
+    """Подменяет psutil детерминированными значениями и записывает интервалы cpu_percent."""
+    calls = {"cpu": [], "values": iter([10.0, 20.0, 30.0, 40.0, 50.0] + [60.0] * 1000)}
+
+    class _Memory:
+        percent = 42.0
+
+    def cpu_percent(interval=None):
+        calls["cpu"].append(interval)
+        return next(calls["values"])
+
+    monkeypatch.setattr(sampler_module.psutil, "cpu_percent", cpu_percent)
+    monkeypatch.setattr(sampler_module.psutil, "virtual_memory", lambda: _Memory())
+    monkeypatch.setattr(sampler_module.psutil, "getloadavg", lambda: (1.0, 2.0, 3.0))
+    return calls
+
+
+@pytest.mark.unit
+class TestSystemLoadSampler:
+    """Unit тесты для SystemLoadSampler"""
+
+    def test_defaults_before_first_sample(self):
+        """До первого замера публикуются безопасные значения по умолчанию"""
+        sampler = SystemLoadSampler()
+        assert sampler.get_latest() is DEFAULT_SYSTEM_LOAD
+        assert sampler.get_latest().samples == 0
+
+    def test_sample_publishes_snapshot(self, fake_psutil):
+        """sample() публикует новый снимок без интервала ожидания CPU"""
+        sampler = SystemLoadSampler(window=3)
+        load = sampler.sample()
+
+        assert sampler.get_latest() is load
+        assert load.cpu_percent == 10.0
+        assert load.memory_percent == 42.0
+        assert load.load_avg == (1.0, 2.0, 3.0)
+        assert load.samples == 1
+        assert fake_psutil["cpu"] == [None]
+
+    def test_rolling_averages_over_window(self, fake_psutil):
+        """Скользящие средние считаются по последним window замерам"""
+        sampler = SystemLoadSampler(window=3)
+        for _ in range(5):
+            load = sampler.sample()
+
+        assert load.cpu_percent == 50.0
+        assert load.cpu_percent_avg == pytest.approx(40.0)
+        assert load.memory_percent_avg == pytest.approx(42.0)
+        assert load.samples == 5
+
+    def test_sampling_error_keeps_last_snapshot(self, monkeypatch):
+        """Ошибка psutil не меняет опубликованный снимок"""
+        sampler = SystemLoadSampler()
+
+        def failing_cpu_percent(interval=None):
+            raise RuntimeError("psutil unavailable")
+
+        monkeypatch.setattr(sampler_module.psutil, "cpu_percent", failing_cpu_percent)
+        assert sampler.sample() is DEFAULT_SYSTEM_LOAD
+        assert sampler.get_stats()["errors"] == 1
+
+    def test_invalid_parameters(self):
+        """Неположительные period и window отклоняются"""
+        with pytest.raises(ValueError):
+            SystemLoadSampler(period=0)
+        with pytest.raises(ValueError):
+            SystemLoadSampler(window=0)
+
+    def test_background_thread_lifecycle(self, fake_psutil):
+        """Поток публикует снимки, останавливается и запускается повторно"""
+        sampler = SystemLoadSampler(period=0.01)
+        sampler.start()
+        try:
+            assert sampler.is_running
+            deadline = time.time() + 2.0
+            while sampler.get_latest().samples < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            assert sampler.get_latest().samples >= 3
+        finally:
+            sampler.stop()
+        assert not sampler.is_running
+
+        samples = sampler.get_latest().samples
+        sampler.start()
+        sampler.stop()
+        assert sampler.get_latest().samples > samples
+
+    def test_get_system_load_reads_snapshot_when_running(self, fake_psutil):
+        """Запущенный сэмплер отдает опубликованный снимок без нового замера"""
+        sampler = SystemLoadSampler(period=60.0)
+        sampler.start()
+        try:
+            calls = len(fake_psutil["cpu"])
+            assert get_system_load(sampler) is sampler.get_latest()
+            assert len(fake_psutil["cpu"]) == calls
+        finally:
+            sampler.stop()
+
+
+@pytest.mark.unit
+class TestSystemLoadConsumers:
+    """AdaptiveBatchSizer и DataCollectionManager читают снимок сэмплера"""
+
+    def test_batch_sizer_does_not_block_on_cpu_interval(self, fake_psutil):
+        """get_optimal_batch_size не включает интервал замера CPU"""
+        sampler = SystemLoadSampler(period=60.0)
+        sampler.start()
+        try:
+            sizer = AdaptiveBatchSizer(adaptation_interval=1, load_sampler=sampler)
+            start = time.perf_counter()
+            for tick in range(20):
+                sizer.get_optimal_batch_size(current_tick=tick)
+            elapsed = time.perf_counter() - start
+        finally:
+            sampler.stop()
+
+        # Раньше каждый вызов спал 100 мс в psutil.cpu_percent(interval=0.1)
+        assert elapsed < 0.1
+        assert all(interval is None for interval in fake_psutil["cpu"])
+
+    def test_batch_sizer_history_records_each_snapshot_once(self, fake_psutil):
+        """Один и тот же снимок попадает в историю нагрузки один раз"""
+        sampler = SystemLoadSampler(period=60.0)
+        sampler.start()
+        try:
+            sizer = AdaptiveBatchSizer(load_sampler=sampler)
+            metrics = sizer._collect_system_metrics()
+            sizer._collect_system_metrics()
+        finally:
+            sampler.stop()
+
+        assert metrics["cpu_percent"] == sampler.get_latest().cpu_percent
+        assert len(sizer.system_load_history) == 1
+
+    def test_data_collection_manager_system_load(self, fake_psutil):
+        """DataCollectionManager отдает снимок нагрузки в get_system_load и get_stats"""
+        sampler = SystemLoadSampler(period=60.0)
+        sampler.start()
+        try:
+            manager = DataCollectionManager(load_sampler=sampler)
+            load = manager.get_system_load()
+            stats = manager.get_stats()
+        finally:
+            sampler.stop()
+
+        assert load == sampler.get_latest().to_dict()
+        assert stats["system_load"] == load
@@ -0,0 +1,294 @@
+"""
+Тесты для TickScheduler - планирования тика runtime loop по дедлайну.
+
+Проверяет:
+- Дедлайны тиков без накопления дрейфа и без "догоняющих" тиков
+- Статистику фаз и перерасхода бюджетов
+- Разнесение периодических задач и их откладывание при нехватке бюджета
+- Фоновый исполнитель задач
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import pytest
+
+import src.runtime.tick_scheduler as tick_scheduler_module
+from src.runtime.loop import (
+    ADAPTATION_INTERVAL,
+    LEARNING_INTERVAL,
+    MEMORY_CONSOLIDATION_INTERVAL,
+    METRICS_COLLECTION_INTERVAL,
+)
+from src.runtime.tick_scheduler import TickScheduler
+
+
+class _FakeTime:
+    """Управляемые часы для time.monotonic планировщика."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _FakeTime()
+    monkeypatch.setattr(tick_scheduler_module, "time", fake)
+    return fake
+
+
+def _collect_runs(scheduler, names, ticks):
+    """Тики, на которых due() разрешил запуск каждой задачи."""
+    runs = {name: [] for name in names}
+    for tick in range(1, ticks + 1):
+        scheduler.begin_tick()
+        for name in names:
+            if scheduler.due(name, tick):
+                runs[name].append(tick)
+                scheduler.end_phase(name)
+        scheduler.end_tick()
+    return runs
+
+
+@pytest.mark.unit
+class TestTickDeadlines:
+    """Дедлайны и статистика тиков"""
+
+    def test_sleep_until_deadline(self, clock):
+        """Сон отсчитывается до дедлайна, а не tick_interval - elapsed"""
+        scheduler = TickScheduler(tick_interval=1.0)
+
+        scheduler.begin_tick()
+        clock.advance(0.3)
+        assert scheduler.end_tick() == pytest.approx(0.7)
+
+        # Тик начался с опозданием 0.05 сек после сна - дедлайн не сдвигается
+        clock.advance(0.75)
+        scheduler.begin_tick()
+        clock.advance(0.2)
+        assert scheduler.end_tick() == pytest.approx(0.75)
+
+    def test_overrun_does_not_cause_catch_up_burst(self, clock):
+        """После перерасхода следующий дедлайн отсчитывается от текущего момента"""
+        scheduler = TickScheduler(tick_interval=1.0)
+
+        scheduler.begin_tick()
+        clock.advance(2.5)
+        assert scheduler.end_tick() == 0.0
+
+        scheduler.begin_tick()
+        clock.advance(0.1)
+        assert scheduler.end_tick() == pytest.approx(0.9)
+
+        stats = scheduler.get_stats()
+        assert stats["tick_overruns"] == 1
+        assert stats["missed_deadlines"] == 1
+
+    def test_phase_overrun_statistics(self, clock):
+        """Фазы дольше бюджета учитываются как перерасход"""
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.set_phase_budget("events", 0.1)
+
+        for duration in (0.05, 0.2, 0.3):
+            scheduler.begin_tick()
+            clock.advance(duration)
+            scheduler.end_phase("events")
+            clock.advance(0.01)
+            scheduler.end_phase("snapshot")
+            scheduler.end_tick()
+
+        events = scheduler.get_stats()["phases"]["events"]
+        assert events["calls"] == 3
+        assert events["overruns"] == 2
+        assert events["overrun_time"] == pytest.approx(0.3)
+        assert events["max_time"] == pytest.approx(0.3)
+        assert scheduler.get_stats()["phases"]["snapshot"]["overruns"] == 0
+
+    def test_tick_percentiles(self, clock):
+        """Перцентили длительности тика считаются по окну"""
+        scheduler = TickScheduler(tick_interval=1.0, stats_window=100)
+        for i in range(100):
+            scheduler.begin_tick()
+            clock.advance(0.5 if i == 99 else 0.01)
+            scheduler.end_tick()
+
+        percentiles = scheduler.get_tick_percentiles()
+        assert percentiles["p50"] == pytest.approx(0.01)
+        assert percentiles["max"] == pytest.approx(0.5)
+        assert "tick p50=" in scheduler.format_summary()
+
+    def test_invalid_budget_fraction(self):
+        with pytest.raises(ValueError):
+            TickScheduler(tick_interval=1.0, tick_budget_fraction=0.0)
+
+
+@pytest.mark.unit
+class TestPeriodicTasks:
+    """Разнесение и откладывание периодических задач"""
+
+    def test_runtime_intervals_are_staggered(self, clock):
+        """Задачи runtime loop с кратными интервалами не совпадают по тикам"""
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.register("learning", LEARNING_INTERVAL)
+        scheduler.register("adaptation", ADAPTATION_INTERVAL)
+        scheduler.register("consolidation", MEMORY_CONSOLIDATION_INTERVAL)
+        scheduler.register("metrics", METRICS_COLLECTION_INTERVAL)
+
+        runs = _collect_runs(scheduler, ["learning", "adaptation", "consolidation", "metrics"], 3000)
+
+        all_ticks = [tick for ticks in runs.values() for tick in ticks]
+        assert len(all_ticks) == len(set(all_ticks))
+        assert len(runs["learning"]) == 3000 // LEARNING_INTERVAL
+        assert len(runs["adaptation"]) == 3000 // ADAPTATION_INTERVAL
+        assert len(runs["consolidation"]) == 3000 // MEMORY_CONSOLIDATION_INTERVAL
+        assert runs["learning"][:2] == [LEARNING_INTERVAL, 2 * LEARNING_INTERVAL]
+
+    def test_explicit_offset(self, clock):
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.register("task", 10, offset=3)
+        assert _collect_runs(scheduler, ["task"], 30)["task"] == [3, 13, 23]
+
+    def test_deferred_until_budget_available(self, clock):
+        """Задача откладывается, пока остаток бюджета меньше оценки ее длительности"""
+        scheduler = TickScheduler(tick_interval=1.0, tick_budget_fraction=0.8)
+        scheduler.register("learning", 10, max_defer=5)
+
+        # Первый запуск дает оценку длительности 0.5 сек
+        scheduler.begin_tick()
+        assert scheduler.due("learning", 10)
+        clock.advance(0.5)
+        scheduler.end_phase("learning")
+        scheduler.end_tick()
+
+        # На тике 20 остается 0.2 сек бюджета - задача откладывается
+        scheduler.begin_tick()
+        clock.advance(0.6)
+        assert not scheduler.due("learning", 20)
+        scheduler.end_tick()
+
+        # На тике 21 бюджета достаточно
+        scheduler.begin_tick()
+        assert scheduler.due("learning", 21)
+        scheduler.end_phase("learning")
+        scheduler.end_tick()
+
+        task = scheduler.get_stats()["tasks"]["learning"]
+        assert task["runs"] == 2
+        assert task["deferrals"] == 1
+        # Отложенный запуск не сдвигает сетку назначений
+        scheduler.begin_tick()
+        assert not scheduler.due("learning", 29)
+        assert scheduler.due("learning", 30)
+
+    def test_forced_after_max_defer(self, clock):
+        """Задача запускается принудительно после max_defer тиков ожидания"""
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.register("adaptation", 10, max_defer=3)
+
+        scheduler.begin_tick()
+        assert scheduler.due("adaptation", 10)
+        clock.advance(0.5)
+        scheduler.end_phase("adaptation")
+        scheduler.end_tick()
+
+        admitted = []
+        for tick in range(20, 25):
+            scheduler.begin_tick()
+            clock.advance(0.7)
+            if scheduler.due("adaptation", tick):
+                admitted.append(tick)
+            scheduler.end_tick()
+
+        assert admitted == [23]
+        assert scheduler.get_stats()["tasks"]["adaptation"]["forced_runs"] == 1
+
+    def test_critical_task_never_deferred(self, clock):
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.register("snapshot", 5, critical=True)
+        scheduler.begin_tick()
+        clock.advance(5.0)
+        assert scheduler.due("snapshot", 5)
+
+    def test_zero_tick_interval_disables_deferral(self, clock):
+        """Без интервала тика бюджета нет, и задачи не откладываются"""
+        scheduler = TickScheduler(tick_interval=0.0)
+        scheduler.register("learning", 7)
+        assert _collect_runs(scheduler, ["learning"], 21)["learning"] == [7, 14, 21]
+
+    def test_admit_for_counter_driven_task(self, clock):
+        """admit() откладывает задачу, необходимость которой определил вызывающий код"""
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.register("maintenance", 50, max_defer=2, offset=0)
+
+        scheduler.begin_tick()
+        assert scheduler.admit("maintenance", 1)
+        clock.advance(0.5)
+        scheduler.end_phase("maintenance")
+        scheduler.end_tick()
+
+        scheduler.begin_tick()
+        clock.advance(0.7)
+        assert not scheduler.admit("maintenance", 51)
+        scheduler.end_tick()
+
+        scheduler.begin_tick()
+        assert scheduler.admit("maintenance", 52)
+
+    def test_first_check_after_restore(self, clock):
+        """После восстановления со снапшота сетка продолжается с текущего тика"""
+        scheduler = TickScheduler(tick_interval=1.0)
+        scheduler.register("learning", 75)
+        assert not scheduler.due("learning", 5001)
+        assert scheduler.due("learning", 5025)
+
+
+@pytest.mark.unit
+class TestBackgroundWorker:
+    """Фоновый исполнитель TickScheduler"""
+
+    def test_runs_task_and_skips_while_busy(self):
+        scheduler = TickScheduler(tick_interval=1.0)
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_task():
+            started.set()
+            release.wait(2.0)
+
+        try:
+            assert scheduler.run_in_background("analysis", slow_task)
+            assert started.wait(2.0)
+            assert not scheduler.run_in_background("analysis", slow_task)
+            release.set()
+
+            deadline = time.time() + 2.0
+            while scheduler.get_stats()["background"]["analysis"]["runs"] < 1 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            scheduler.stop()
+
+        stats = scheduler.get_stats()["background"]["analysis"]
+        assert stats["runs"] == 1
+        assert stats["skipped"] == 1
+        assert stats["failures"] == 0
+
+    def test_failure_is_recorded(self):
+        scheduler = TickScheduler(tick_interval=1.0)
+
+        def failing_task():
+            raise RuntimeError("analysis failed")
+
+        scheduler.run_in_background("analysis", failing_task)
+        scheduler.stop()
+        assert scheduler.get_stats()["background"]["analysis"]["failures"] == 1
@@ -3,69 +3,32 @@
 
 Предоставляет инструменты для измерения времени выполнения операций,
 отслеживания использования ресурсов и выявления узких мест производительности.
+Измерения хранятся в гистограммах реестра метрик
+(src/runtime/metrics_registry.py) с именами "monitor.<операция>".
 """
 
-import time
-import statistics
-from collections import defaultdict, deque
-from contextlib import contextmanager
+from contextlib import nullcontext
 from typing import Any, Dict, List, Optional
-from dataclasses import dataclass, field
 
+from ..runtime.metrics_registry import Histogram, MetricsRegistry, get_metrics_registry
 
-@dataclass
-class PerformanceMetrics:
-    """
-    Метрики производительности для операции или компонента.
+MONITOR_PREFIX = "monitor."
 
-    Хранит статистику о времени выполнения, частоте вызовов и трендах.
-    """
 
-    operation_name: str
-    call_count: int = 0
-    total_time: float = 0.0
-    min_time: float = float('inf')
-    max_time: float = 0.0
-    avg_time: float = 0.0
-    recent_times: deque = field(default_factory=lambda: deque(maxlen=100))
-    start_time: Optional[float] = None
-
-    def record_call(self, duration: float) -> None:
-        """Записывает вызов операции с заданным временем выполнения."""
-        self.call_count += 1
-        self.total_time += duration
-        self.min_time = min(self.min_time, duration)
-        self.max_time = max(self.max_time, duration)
-        self.recent_times.append(duration)
-
-        # Обновляем среднее время
-        if self.call_count > 0:
-            self.avg_time = self.total_time / self.call_count
-
-    def get_stats(self) -> Dict[str, Any]:
-        """Возвращает статистику производительности."""
-        recent_times_list = list(self.recent_times)
-        return {
-            "operation_name": self.operation_name,
-            "call_count": self.call_count,
-            "total_time": round(self.total_time, 4),
-            "min_time": round(self.min_time, 4) if self.min_time != float('inf') else 0.0,
-            "max_time": round(self.max_time, 4),
-            "avg_time": round(self.avg_time, 4),
-            "recent_calls": len(recent_times_list),
-            "recent_avg": round(statistics.mean(recent_times_list), 4) if recent_times_list else 0.0,
-            "recent_stdev": round(statistics.stdev(recent_times_list), 4) if len(recent_times_list) > 1 else 0.0,
-        }
-
-    def reset(self) -> None:
-        """Сбрасывает все метрики."""
-        self.call_count = 0
-        self.total_time = 0.0
-        self.min_time = float('inf')
-        self.max_time = 0.0
-        self.avg_time = 0.0
-        self.recent_times.clear()
-        self.start_time = None
+def _stats_from_histogram(operation_name: str, histogram: Histogram) -> Dict[str, Any]:
+    """Статистика производительности операции из гистограммы."""
+    summary = histogram.snapshot()
+    return {
+        "operation_name": operation_name,
+        "call_count": summary["count"],
+        "total_time": round(summary["sum"], 4),
+        "min_time": round(summary["min"], 4),
+        "max_time": round(summary["max"], 4),
+        "avg_time": round(summary["mean"], 4),
+        "p50_time": round(summary["p50"], 4),
+        "p95_time": round(summary["p95"], 4),
+        "p99_time": round(summary["p99"], 4),
+    }
 
 
 class PerformanceMonitor:
@@ -76,15 +39,17 @@ class PerformanceMonitor:
     производительности операций.
     """
 
-    def __init__(self, max_metrics_history: int = 1000):
+    def __init__(self, max_metrics_history: int = 1000, registry: Optional[MetricsRegistry] = None):
         """
         Инициализация монитора производительности.
 
         Args:
-            max_metrics_history: Максимальное количество хранимых метрик
+            max_metrics_history: Максимальное количество отслеживаемых операций
+            registry: Реестр метрик (по умолчанию - собственный реестр монитора)
         """
-        self.metrics: Dict[str, PerformanceMetrics] = {}
+        self.registry = registry if registry is not None else MetricsRegistry()
         self.max_metrics_history = max_metrics_history
+        self._histograms: Dict[str, Histogram] = {}
         self._enabled = True
 
     def enable(self) -> None:
@@ -95,7 +60,6 @@ class PerformanceMonitor:
         """Отключает сбор метрик производительности."""
         self._enabled = False
 
-    @contextmanager
     def measure(self, operation_name: str):
         """
         Контекстный менеджер для измерения времени выполнения операции.
@@ -105,16 +69,8 @@ class PerformanceMonitor:
                 result = adapter.adapt_intensity(...)
         """
         if not self._enabled:
-            yield
-            return
-
-        start_time = time.perf_counter()
-
-        try:
-            yield
-        finally:
-            duration = time.perf_counter() - start_time
-            self._record_operation(operation_name, duration)
+            return nullcontext()
+        return self._histogram(operation_name).time()
 
     def measure_func(self, operation_name: Optional[str] = None):
         """
@@ -138,18 +94,24 @@ class PerformanceMonitor:
             return wrapper
         return decorator
 
-    def _record_operation(self, operation_name: str, duration: float) -> None:
-        """Записывает выполнение операции."""
-        if operation_name not in self.metrics:
-            self.metrics[operation_name] = PerformanceMetrics(operation_name)
+    def _histogram(self, operation_name: str) -> Histogram:
+        """Гистограмма операции; при превышении лимита удаляется самая редкая операция."""
+        histogram = self._histograms.get(operation_name)
+        if histogram is not None:
+            return histogram
 
-        self.metrics[operation_name].record_call(duration)
+        if len(self._histograms) >= self.max_metrics_history:
+            rarest = min(self._histograms, key=lambda name: self._histograms[name].snapshot()["count"])
+            del self._histograms[rarest]
+            self.registry.unregister(MONITOR_PREFIX + rarest)
 
-        # Ограничиваем количество метрик
-        if len(self.metrics) > self.max_metrics_history:
-            # Удаляем самую старую метрику (простая стратегия)
-            oldest_key = min(self.metrics.keys(), key=lambda k: self.metrics[k].call_count)
-            del self.metrics[oldest_key]
+        histogram = self.registry.histogram(MONITOR_PREFIX + operation_name)
+        self._histograms[operation_name] = histogram
+        return histogram
+
+    def _record_operation(self, operation_name: str, duration: float) -> None:
+        """Записывает выполнение операции."""
+        self._histogram(operation_name).observe(duration)
 
     def get_metrics(self, operation_name: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -162,12 +124,16 @@ class PerformanceMonitor:
             Метрики производительности
         """
         if operation_name:
-            if operation_name in self.metrics:
-                return {operation_name: self.metrics[operation_name].get_stats()}
+            histogram = self._histograms.get(operation_name)
+            if histogram is not None:
+                return {operation_name: _stats_from_histogram(operation_name, histogram)}
             else:
                 return {}
 
-        return {name: metric.get_stats() for name, metric in self.metrics.items()}
+        return {
+            name: _stats_from_histogram(name, histogram)
+            for name, histogram in list(self._histograms.items())
+        }
 
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -208,10 +174,12 @@ class PerformanceMonitor:
             operation_name: Имя операции (если None, сбрасывает все)
         """
         if operation_name:
-            if operation_name in self.metrics:
-                self.metrics[operation_name].reset()
+            if operation_name in self._histograms:
+                self._histograms[operation_name].reset()
         else:
-            self.metrics.clear()
+            for name in list(self._histograms):
+                self.registry.unregister(MONITOR_PREFIX + name)
+            self._histograms.clear()
 
     def get_performance_alerts(self) -> List[str]:
         """
@@ -228,8 +196,8 @@ class PerformanceMonitor:
             if stats["avg_time"] > 0.01:  # Более 10мс в среднем
                 alerts.append(f"Операция '{name}' слишком медленная: {stats['avg_time']:.4f}s среднее время")
 
-            # Предупреждение о высоком разбросе времени
-            if stats["recent_stdev"] > stats["recent_avg"] * 0.5 and stats["recent_calls"] > 10:
+            # Предупреждение о высоком разбросе времени: хвост p99 намного длиннее медианы
+            if stats["p99_time"] > stats["p50_time"] * 3 and stats["call_count"] > 10:
                 alerts.append(f"Операция '{name}' имеет нестабильное время выполнения")
 
             # Предупреждение о большом количестве вызовов
@@ -240,4 +208,4 @@ class PerformanceMonitor:
 
 
 # Глобальный экземпляр монитора для удобства использования
-performance_monitor = PerformanceMonitor()
\ No newline at end of file
+performance_monitor = PerformanceMonitor(registry=get_metrics_registry())